@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Aderyn summon detection and archiving: per-pattern re.search vs the compiled detector.
+
+Builds ``--patterns`` summon patterns (the shipped ones, literal words and
+phrases, and a few true regexes) and ``--nodes`` node texts, about 1% of
+them holding a summon, then reports:
+
+  legacy     any(re.search(p, text.lower()) for p in patterns), the old
+             detect_summons(), timed on ``--sample`` nodes and extrapolated
+  detector   SummonDetector over every node, with agreement on the sample
+  archive    archive_summons() over the nodes as Janvier .chaos files
+             (``--per-file`` nodes each): first run, unchanged rerun,
+             --force rerun (every file read, nothing appended) and a run
+             after ``--new-files`` more files arrive
+
+    python benchmarks/bench_aderyn_summons.py --nodes 1000000 --patterns 200
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import json
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+spec = importlib.util.spec_from_file_location("aderyn_bench", ROOT / "daemons" / "Aderyn" / "aderyn.py")
+aderyn = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(aderyn)
+
+
+def build_patterns(rng: random.Random, vocab: list, count: int) -> list:
+    patterns = list(aderyn.SUMMON_PATTERNS)
+    while len(patterns) < count:
+        kind = rng.random()
+        if kind < 0.05:
+            patterns.append(r"\b" + rng.choice(vocab) + r"q\s+" + rng.choice(vocab) + r"\b")
+        elif kind < 0.35:
+            patterns.append(r"\b" + " ".join(rng.choice(vocab) + "q" for _ in range(2)) + r"\b")
+        else:
+            patterns.append(r"\b" + rng.choice(vocab) + "q" + r"\b")
+    return patterns
+
+
+def build_texts(rng: random.Random, vocab: list, patterns: list, nodes: int) -> list:
+    phrases = [p[2:-2].replace(r"\s+", " ") for p in patterns]
+    texts = []
+    for _ in range(nodes):
+        words = rng.choices(vocab, k=rng.randint(8, 30))
+        if rng.random() < 0.01:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+        texts.append(" ".join(words).capitalize() + ".")
+    return texts
+
+
+def legacy_detect(text: str, patterns: list) -> bool:
+    text_l = text.lower()
+    return any(re.search(p, text_l) for p in patterns)
+
+
+def write_files(input_dir: Path, texts: list, per_file: int, start: int = 0) -> int:
+    n = 0
+    for n, i in enumerate(range(0, len(texts), per_file), start=start):
+        nodes = [{"id": f"node_{j + 1}", "role": "KIN" if j % 2 else "DREAMBEARER", "content": t,
+                  "timestamp": "2024-05-01T00:00:00"} for j, t in enumerate(texts[i:i + per_file])]
+        chaos = {"title": f"Talk {n}", "date": "2024-05-01", "nodes": nodes}
+        (input_dir / f"2024-05-01_Talk {n}.{n:012x}.chaos").write_text(json.dumps(chaos), encoding="utf-8")
+    return n + 1
+
+
+def timed(label: str, fn, out: Path) -> None:
+    start = time.perf_counter()
+    added = fn()
+    secs = time.perf_counter() - start
+    archive, index = out / aderyn.ARCHIVE_NAME, out / aderyn.INDEX_NAME
+    print(f"{label:14} {secs:7.2f} s  +{len(added):6d} summons  archive {archive.stat().st_size / (1 << 20):6.1f} MB  "
+          f"index {index.stat().st_size / (1 << 20) if index.exists() else 0:5.1f} MB")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--nodes", type=int, default=1000000)
+    ap.add_argument("--patterns", type=int, default=200)
+    ap.add_argument("--sample", type=int, default=20000, help="Nodes scanned the legacy way")
+    ap.add_argument("--per-file", type=int, default=200)
+    ap.add_argument("--new-files", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(13)
+    letters = "etaoinshrdlcumwfgypbvkjxz"
+    vocab = ["".join(rng.choices(letters, k=rng.randint(2, 9))) for _ in range(8000)]
+    patterns = build_patterns(rng, vocab, args.patterns)
+    texts = build_texts(rng, vocab, patterns, args.nodes)
+    aderyn.SUMMON_PATTERNS = patterns
+    print(f"data:      {len(texts)} nodes, {len(patterns)} patterns")
+
+    start = time.perf_counter()
+    detector = aderyn.summon_detector()
+    built = time.perf_counter() - start
+    sample = texts[:args.sample]
+    start = time.perf_counter()
+    expected = [legacy_detect(t, patterns) for t in sample]
+    per_node = (time.perf_counter() - start) / max(1, len(sample))
+    print(f"legacy:    {per_node * 1e6:8.1f} us/node -> {per_node * len(texts):8.1f} s for all "
+          f"(extrapolated from {len(sample)})")
+    start = time.perf_counter()
+    found = [aderyn.match_summon(t, detector) for t in texts]
+    secs = time.perf_counter() - start
+    agree = sum((f is not None) == e for f, e in zip(found, expected))
+    print(f"detector:  {secs / len(texts) * 1e6:8.1f} us/node -> {secs:8.1f} s for all "
+          f"(compiled in {built * 1000:.0f} ms); {sum(f is not None for f in found)} summons; "
+          f"agrees with legacy on {agree}/{len(sample)}")
+
+    with tempfile.TemporaryDirectory(prefix="aderyn_bench_") as tmp:
+        aderyn.INPUT_DIR, aderyn.OUTPUT_DIR = Path(tmp) / "janvier", Path(tmp) / "library"
+        aderyn.INPUT_DIR.mkdir()
+        aderyn.OUTPUT_DIR.mkdir()
+        files = write_files(aderyn.INPUT_DIR, texts, args.per_file)
+        print(f"archive:   {files} .chaos files")
+        timed("first run", aderyn.archive_summons, aderyn.OUTPUT_DIR)
+        timed("rerun", aderyn.archive_summons, aderyn.OUTPUT_DIR)
+        timed("force", lambda: aderyn.archive_summons(force=True), aderyn.OUTPUT_DIR)
+        more = build_texts(random.Random(14), vocab, patterns, args.new_files * args.per_file)
+        write_files(aderyn.INPUT_DIR, more, args.per_file, start=files)
+        timed(f"+{args.new_files} files", aderyn.archive_summons, aderyn.OUTPUT_DIR)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Briar throughput on a synthetic Sheele corpus: in-process vs the process pool.
+
+Writes ``--files`` conversation JSON files (mapping turns in shuffled key
+order, a few past MAX_TURNS, some undecodable or empty so the quarantine
+path runs), then runs a private copy of daemons/Briar/briar.py once per
+``--jobs`` value in a child process, from an empty output folder each time.
+Reports wall time, files/s, speed-up over ``--jobs 1`` and the pool's
+efficiency (worker CPU time / (wall time x jobs)) from .briar_summary.json.
+
+    python benchmarks/bench_briar_pool.py --files 50000 --jobs 1 2 4 8
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def build_corpus(input_dir: Path, files: int, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    input_dir.mkdir(parents=True)
+    for i in range(files):
+        path = input_dir / f"conv_{i:06d}.json"
+        if i % 500 == 1:
+            path.write_bytes(b'{"title": "cut off')
+            continue
+        n = 1 if i % 500 == 2 else rng.choice((4, 12, 40, 140))
+        keys = list(range(n))
+        rng.shuffle(keys)
+        mapping = {str(k): {"message": {"author": {"role": "user" if k % 2 else "assistant"},
+                                        "content": {"parts": [f"turn {k}: " + "lorem ipsum " * rng.randint(3, 30)]}}}
+                   for k in keys} if i % 500 != 2 else {}
+        convo = {"title": f"Conversation {i}", "create_time": 1700000000 + i, "messages": [{"mapping": mapping}]}
+        path.write_text(json.dumps(convo), encoding="utf-8")
+
+
+def run(work: Path, jobs: int) -> dict:
+    out = work / "daemons" / "Rhea" / "outputs" / "Briar"
+    shutil.rmtree(out, ignore_errors=True)
+    script = work / "daemons" / "Briar" / "briar.py"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(script), "--jobs", str(jobs)], check=True, stdout=subprocess.DEVNULL,
+                   env=dict(os.environ, EDEN_FORCE=""))
+    wall = time.perf_counter() - start
+    summary = json.loads((out / "split_conversations_txt" / ".briar_summary.json").read_text(encoding="utf-8"))
+    summary["wall"] = wall
+    return summary
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=50000)
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="briar_pool_bench_") as tmp:
+        work = Path(tmp)
+        (work / "daemons" / "Briar").mkdir(parents=True)
+        shutil.copy2(ROOT / "daemons" / "Briar" / "briar.py", work / "daemons" / "Briar" / "briar.py")
+        tools = work / "shared" / "Daemon_tools" / "scripts"
+        tools.mkdir(parents=True)
+        for helper in ("eden_manifest.py", "eden_pool.py"):
+            shutil.copy2(ROOT / "shared" / "Daemon_tools" / "scripts" / helper, tools / helper)
+        start = time.perf_counter()
+        build_corpus(work / "daemons" / "Rhea" / "outputs" / "Sheele" / "split_conversations", args.files)
+        print(f"corpus: {args.files} files in {time.perf_counter() - start:.1f} s; {os.cpu_count()} CPU(s)")
+
+        base = None
+        for jobs in dict.fromkeys(args.jobs):
+            s = run(work, jobs)
+            base = base or s["wall"]
+            busy = sum(w["cpu"] for w in s["workers"].values())
+            print(f"jobs {jobs:3d}: {s['wall']:7.2f} s  {s['files'] / s['wall']:7.0f} files/s  "
+                  f"x{base / s['wall']:.2f}  efficiency {busy / (s['seconds'] * s['jobs']):.2f}  "
+                  f"(saved {s['saved']}, quarantined {sum(s['quarantined'].values())}, errors {s['errors']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
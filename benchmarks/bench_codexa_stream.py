@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Codexa on a large transcript corpus: whole-file regex vs the streaming, deduplicating extractor.
+
+Generates ``--size-gb`` of Briar-style transcripts (``[KIN] ```lang`` fences,
+snippets drawn with Zipf reuse from ``--unique`` distinct blocks, plus one
+``--big-mb`` transcript holding a single huge block), then runs each mode in
+a child process and reads its peak RSS from wait4():
+
+  legacy     read_text() + CODEBLOCK.finditer() per file, one file written
+             per block occurrence, the log reopened for every line
+  stream     codexa.main(): line-by-line fences, sha256 dedupe across the
+             corpus, buffered block and log writers
+  rerun      codexa.main(["--force"]) on the same output: every block is
+             already stored, nothing is rewritten
+
+    python benchmarks/bench_codexa_stream.py --size-gb 10
+    python benchmarks/bench_codexa_stream.py --size-gb 1 --skip-legacy
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CODEXA = ROOT / "daemons" / "Codexa" / "codexa.py"
+LANGS = ("python", "js", "sh", "sql", "rust", "")
+
+
+def load_codexa(data_root: Path):
+    os.environ["EDEN_DATA_ROOT"] = str(data_root)
+    spec = importlib.util.spec_from_file_location("codexa_bench", CODEXA)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def snippet(rng: random.Random, n: int) -> str:
+    lines = [f"def f{n}_{i}(x):\n    return x * {rng.randint(1, 999)}  # {'pad ' * rng.randint(0, 12)}"
+             for i in range(rng.randint(1, 12))]
+    return "\n".join(lines)
+
+
+def generate(src: Path, size_gb: float, unique: int, big_mb: int, seed: int = 9) -> int:
+    rng = random.Random(seed)
+    src.mkdir(parents=True)
+    pool = [(LANGS[n % len(LANGS)], snippet(rng, n)) for n in range(unique)]
+    cum, total = [], 0.0
+    for rank in range(1, unique + 1):
+        total += 1.0 / rank
+        cum.append(total)
+    prose = "[DREAMBEARER] " + "tell me about the lantern by the river " * 4 + "\n"
+    target = int(size_gb * (1 << 30))
+    written, n = 0, 0
+    if big_mb:
+        with open(src / "huge_transcript.txt", "w", encoding="utf-8") as f:
+            f.write("--- Conversation: huge ---\n\n[KIN] ```python\n")
+            line = "x = '" + "y" * 90 + "'\n"
+            for _ in range(big_mb * (1 << 20) // len(line)):
+                f.write(line)
+            f.write("```\n")
+            written += f.tell()
+    while written < target:
+        parts = [f"--- Conversation: talk {n} (2024-01-01) ---\n\n"]
+        for _ in range(400):
+            parts.append(prose)
+            if rng.random() < 0.4:
+                lang, code = pool[rng.choices(range(unique), cum_weights=cum)[0]]
+                parts.append(f"[KIN] Here you go:\n```{lang}\n{code}\n```\n")
+        body = "".join(parts)
+        (src / f"{n:06d}_talk.txt").write_text(body, encoding="utf-8")
+        written += len(body)
+        n += 1
+    return written
+
+
+def legacy(codexa) -> None:
+    def log(msg):
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} [CodexaV3] {msg}"
+        print(line)
+        with open(codexa.LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    # The pre-dedupe writer: one file per block occurrence.
+    def write_codeblock(chatname, lang, idx, code):
+        lang_safe = lang if lang else "plain"
+        out_folder = codexa.OUT_DIR / lang_safe
+        out_folder.mkdir(parents=True, exist_ok=True)
+        path = out_folder / f"{codexa.sanitize_name(chatname)}.block{idx}.{lang_safe}.codeblock.chaos"
+        path.write_text(codexa._header(chatname, lang_safe) + f"{code}\n", encoding="utf-8")
+        return path
+
+    codexa.OUT_DIR.mkdir(parents=True, exist_ok=True)
+    for fp in sorted(codexa.SRC_DIR.glob("*.txt")):
+        text = fp.read_text(encoding="utf-8", errors="ignore")
+        for i, m in enumerate(codexa.CODEBLOCK.finditer(text), start=1):
+            out = write_codeblock(fp.stem, m.group(1) or "plain", i, m.group(2))
+            log(f"Wrote {out.name}")
+
+
+def child(mode: str, data_root: Path) -> None:
+    codexa = load_codexa(data_root)
+    if mode == "legacy":
+        legacy(codexa)
+    else:
+        codexa.main(["--force"] if mode == "rerun" else [])
+
+
+def run(mode: str, data_root: Path):
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, __file__, "--child", mode, "--data-root", str(data_root)],
+                            stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f"{mode} child failed")
+    return time.perf_counter() - start, usage.ru_maxrss / 1024.0
+
+
+def tree_stats(out: Path):
+    files = size = 0
+    for p in out.rglob("*.chaos"):
+        files += 1
+        size += p.stat().st_size
+    return files, size
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size-gb", type=float, default=10.0)
+    ap.add_argument("--unique", type=int, default=20000, help="Distinct code blocks in the corpus")
+    ap.add_argument("--big-mb", type=int, default=512, help="Size of the single-block transcript (0 for none)")
+    ap.add_argument("--skip-legacy", action="store_true")
+    ap.add_argument("--workdir", type=Path, default=None)
+    ap.add_argument("--child", choices=("legacy", "stream", "rerun"), help=argparse.SUPPRESS)
+    ap.add_argument("--data-root", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(args.child, args.data_root)
+        return 0
+
+    tmp = Path(tempfile.mkdtemp(prefix="codexa_bench_", dir=args.workdir))
+    try:
+        exports = tmp / "exports" / "openai_exports"
+        start = time.perf_counter()
+        size = generate(exports / "conversations_text", args.size_gb, args.unique, args.big_mb)
+        print(f"corpus:  {size / (1 << 30):.2f} GB in {time.perf_counter() - start:.0f} s")
+        modes = ("stream", "rerun") if args.skip_legacy else ("legacy", "stream", "rerun")
+        for mode in modes:
+            if mode != "rerun":
+                shutil.rmtree(exports / "codeblocks", ignore_errors=True)
+                (exports / "codexa_v3.log").unlink(missing_ok=True)
+            secs, rss = run(mode, tmp)
+            files, out_bytes = tree_stats(exports / "codeblocks")
+            print(f"{mode + ':':8} {secs:7.1f} s  {size / (1 << 20) / secs:6.1f} MB/s  peak RSS {rss:7.1f} MB  "
+                  f"{files} block files, {out_bytes / (1 << 20):.0f} MB")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
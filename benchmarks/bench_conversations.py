@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Export splitting: json.load + rewrite everything vs the streaming, incremental splitter.
+
+Builds a ``--conversations`` export, then times (wall time, peak RSS, files written):
+
+  legacy     json.load() the export and write every conversation file
+  cold       split_export() with no previous state
+  resplit    split_export() on a new export with ``--added`` conversations
+             prepended and the rest unchanged
+
+Each mode runs in its own process so peak RSS is its own.
+
+    python benchmarks/bench_conversations.py --conversations 5000
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_conversations as ec  # noqa: E402
+
+
+def conversation(rng: random.Random, cid: str, turns: int) -> dict:
+    mapping = {}
+    for t in range(turns):
+        role = "user" if t % 2 == 0 else "assistant"
+        text = " ".join(rng.choice(("chaos", "thread", "memory", "eden", "lantern", "archive")) for _ in range(60))
+        mapping[f"{cid}-{t}"] = {
+            "message": {"author": {"role": role}, "content": {"parts": [text]}, "create_time": 1.7e9 + t},
+            "children": [f"{cid}-{t + 1}"] if t + 1 < turns else [],
+        }
+    return {"id": cid, "title": f"Thread {cid}", "update_time": 1.7e9, "current_node": f"{cid}-0", "mapping": mapping}
+
+
+def write_export(path: Path, ids) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, cid in enumerate(ids):
+            if i:
+                f.write(",")
+            json.dump(conversation(random.Random(cid), cid, 40), f)
+        f.write("]")
+
+
+def render(out: Path):
+    return lambda conv, n: [(out / f"conversation_{n}.json", json.dumps(conv, indent=2))]
+
+
+def child(mode: str, export: str, out: str) -> None:
+    out = Path(out)
+    start = time.perf_counter()
+    if mode == "legacy":
+        with open(export, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for idx, thread in enumerate(data):
+            with open(out / f"conversation_{idx + 1}.json", "w", encoding="utf-8") as fh:
+                json.dump(thread, fh, indent=2)
+        written = len(data)
+    else:
+        written = ec.split_export(export, out / ec.STATE_FILE, render(out))["files_written"]
+    secs = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"secs": secs, "rss_mb": rss, "written": written}))
+
+
+def run(mode: str, export: Path, out: Path) -> dict:
+    out.mkdir(exist_ok=True)
+    res = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(export), str(out)], check=True, capture_output=True, text=True
+    )
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--conversations", type=int, default=5000)
+    ap.add_argument("--added", type=int, default=5)
+    ap.add_argument("--child", nargs=3, metavar=("MODE", "EXPORT", "OUT"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="conv_bench_") as tmp:
+        tmp = Path(tmp)
+        ids = [f"c{i:06d}" for i in range(args.conversations)]
+        export = tmp / "conversations.json"
+        write_export(export, ids)
+        print(f"export:    {args.conversations} conversations, {export.stat().st_size / 2**20:.0f} MiB")
+        for mode, out in (("legacy", tmp / "legacy"), ("cold", tmp / "out")):
+            r = run(mode, export, out)
+            print(f"{mode + ':':10} {r['secs']:7.2f} s  peak RSS {r['rss_mb']:7.1f} MiB  {r['written']} files written")
+        # New conversations show up at the front, as in a fresh export.
+        write_export(export, [f"n{i:06d}" for i in range(args.added)] + ids)
+        r = run("cold", export, tmp / "out")
+        print(f"resplit:   {r['secs']:7.2f} s  peak RSS {r['rss_mb']:7.1f} MiB  {r['written']} files written")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
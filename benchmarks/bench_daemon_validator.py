@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""daemon_validator: per-daemon os.walk vs the one-walk, cached, parallel engine.
+
+Builds a ``--files`` tree of small Python modules with every name in
+``daemon_validator.DAEMONS`` buried among them, then times:
+
+  legacy     find_daemon_file() walk per daemon + scan_file() with its
+             separate regex and AST reads (the previous main loop)
+  cold       validate() with an empty cache
+  warm       validate() again, nothing changed
+  edited     validate() after rewriting ``--edit`` daemon files
+
+    python benchmarks/bench_daemon_validator.py --files 5000
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import daemon_validator as dv  # noqa: E402
+
+BODY = '''import os
+import json
+import re
+
+TOKEN = "not-a-real-token-{i}"
+
+
+def handler_{i}(path, seen=[]):
+    with open(path) as f:
+        data = json.load(f)
+    for key, value in data.items():
+        if re.match(r"\\w+", key):
+            seen.append(value)
+    return seen
+
+
+class Worker{i}:
+    def run(self):
+        while True:
+            result = handler_{i}(os.path.join("a", "b"))
+            if result:
+                return result
+'''
+
+
+def build(base: Path, files: int) -> None:
+    rng = random.Random(5)
+    names = [f"{d.lower()}.py" for d in dv.DAEMONS]
+    slots = set(rng.sample(range(files), len(names)))
+    daemon_iter = iter(names)
+    for i in range(files):
+        d = base / f"area{i % 20:02d}" / f"pkg{i // 100:03d}" / ("deep" if i % 3 else "")
+        d.mkdir(parents=True, exist_ok=True)
+        name = next(daemon_iter) if i in slots else f"module_{i:05d}.py"
+        (d / name).write_text(BODY.replace("{i}", str(i)) * 4, encoding="utf-8")
+
+
+def legacy(roots: list) -> dict:
+    out = {}
+    for daemon in dv.DAEMONS:
+        path = dv.find_daemon_file(roots, daemon)
+        out[daemon] = {"found": 1, **dv.scan_file(path)} if path else {"found": 0}
+    return out
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=5000)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--edit", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="validator_bench_") as tmp:
+        os.environ["EDEN_ROOT"] = tmp
+        os.environ["EDEN_WORK_ROOT"] = tmp
+        tree = Path(tmp) / "tree"
+        build(tree, args.files)
+        roots = [str(tree)]
+        print(f"tree:      {args.files} files, {len(dv.DAEMONS)} daemons, jobs={args.jobs or os.cpu_count()}")
+
+        secs, expected = timed(lambda: legacy(roots))
+        print(f"legacy:    {secs:8.2f} s")
+        secs, got = timed(lambda: dv.validate(roots, jobs=args.jobs))
+        assert got == expected, "engine disagrees with the legacy validator"
+        print(f"cold:      {secs:8.2f} s")
+        secs, _ = timed(lambda: dv.validate(roots, jobs=args.jobs))
+        print(f"warm:      {secs:8.2f} s")
+        index = dv.build_file_index(roots)
+        for daemon in dv.DAEMONS[:args.edit]:
+            path = Path(index[f"{daemon.lower()}.py"])
+            path.write_text(path.read_text(encoding="utf-8") + "\nEXTRA = eval('1')\n", encoding="utf-8")
+        secs, _ = timed(lambda: dv.validate(roots, jobs=args.jobs))
+        print(f"edited:    {secs:8.2f} s  ({args.edit} files re-analysed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""chaos_index.db: connection-per-insert vs the batched writer vs bulk load.
+
+  legacy     connect / INSERT / commit / close per row (the old log_to_db)
+  batched    ChaosIndexWriter.add() per row, executemany commits
+  bulk       ChaosIndexWriter.bulk_load() of the whole set
+
+    python benchmarks/bench_db_utils.py --rows 100000
+
+Legacy runs ``--legacy-rows`` rows (default: all of them) and its rate is
+compared per row, so it can be sampled on slow disks.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import db_utils  # noqa: E402
+
+
+def rows(n: int):
+    for i in range(n):
+        yield (f"memory_{i:06d}.chaos", f"memory_{i:06d}.converted.chaos", "Handel" if i % 7 == 0 else "Unknown", None)
+
+
+def legacy(db: str, n: int) -> None:
+    with sqlite3.connect(db) as conn:
+        conn.execute(db_utils.SCHEMA)
+    for original, converted, agent, tags in rows(n):
+        conn = sqlite3.connect(db)
+        c = conn.cursor()
+        c.execute('''
+            INSERT INTO chaos_files (original_name, converted_name, agent, tags)
+            VALUES (?, ?, ?, ?)
+        ''', (original, converted, agent, tags))
+        conn.commit()
+        conn.close()
+
+
+def batched(db: str, n: int, batch_size: int) -> None:
+    with db_utils.ChaosIndexWriter(db, batch_size=batch_size) as writer:
+        for row in rows(n):
+            writer.add(*row)
+
+
+def bulk(db: str, n: int) -> None:
+    with db_utils.ChaosIndexWriter(db, flush_interval=0) as writer:
+        writer.bulk_load(rows(n))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--legacy-rows", type=int, default=None)
+    ap.add_argument("--batch-size", type=int, default=500)
+    args = ap.parse_args(argv)
+    legacy_rows = args.legacy_rows or args.rows
+
+    with tempfile.TemporaryDirectory(prefix="chaos_db_bench_") as tmp:
+        def db(name):
+            return os.path.join(tmp, name + ".db")
+
+        secs = timed(lambda: legacy(db("legacy"), legacy_rows))
+        base = legacy_rows / secs
+        print(f"legacy:   {base:12,.0f} rows/s  ({legacy_rows} rows, {secs:.2f} s)")
+        for name, fn in (("batched", lambda: batched(db("batched"), args.rows, args.batch_size)),
+                         ("bulk", lambda: bulk(db("bulk"), args.rows))):
+            secs = timed(fn)
+            rate = args.rows / secs
+            print(f"{name + ':':9} {rate:12,.0f} rows/s  ({args.rows} rows, {secs:.2f} s, {rate / base:,.0f}x)")
+        with sqlite3.connect(db("batched")) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM chaos_files").fetchone()[0] == args.rows
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
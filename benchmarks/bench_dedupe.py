@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Dedupe I/O: naive full-hash-everything vs the tiered eden_dedupe engine.
+
+Builds a sparse-file tree whose logical size is ``--total-gb`` (default 100)
+but which takes almost no disk. Most files have a unique size; the rest are
+split between
+
+  decoys     same size, different head   (ruled out by the sample tier)
+  twins      same head/tail, new middle  (need the full hash)
+  dupes      byte-identical copies       (need the full hash)
+
+Reports bytes read and wall time for each pass, plus a warm re-run of the
+tiered engine against its persistent (inode, size, mtime) cache. The naive
+pass reads every byte, so it is off by default on big trees: pass --naive.
+
+    python benchmarks/bench_dedupe.py --total-gb 100 --files 2000
+    python benchmarks/bench_dedupe.py --total-gb 2 --files 400 --naive
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "shared" / "Daemon_tools" / "scripts"))
+
+from eden_dedupe import SAMPLE_BYTES, HashCache, IOCounter, find_duplicates  # noqa: E402
+
+GIB = 1024 ** 3
+
+
+def sparse_file(path: Path, size: int, head: bytes, middle: bytes, tail: bytes) -> None:
+    with open(path, "wb") as f:
+        f.truncate(size)
+        f.write(head)
+        f.seek(size // 2)
+        f.write(middle)
+        f.seek(size - len(tail))
+        f.write(tail)
+
+
+def build_tree(base: Path, total_bytes: int, files: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    avg = total_bytes // files
+    counts = {"unique": 0, "decoys": 0, "twins": 0, "dupes": 0}
+    n = 0
+    while n < files:
+        d = base / f"dir{n // 200:03d}"
+        d.mkdir(parents=True, exist_ok=True)
+        size = max(4 * SAMPLE_BYTES, int(avg * rng.uniform(0.5, 1.5)))
+        head, tail = rng.randbytes(4096), rng.randbytes(4096)
+        kind = rng.choices(["unique", "decoys", "twins", "dupes"], [85, 5, 5, 5])[0]
+        sparse_file(d / f"f{n:06d}.bin", size, head, b"m", tail)
+        n += 1
+        if kind != "unique" and n < files:
+            other_head = rng.randbytes(4096) if kind == "decoys" else head
+            middle = b"M" if kind == "twins" else b"m"
+            sparse_file(d / f"f{n:06d}.bin", size, other_head, middle, tail)
+            n += 1
+        counts[kind] += 1
+    return counts
+
+
+def naive(paths: list, counter: IOCounter) -> list:
+    seen, dupes = {}, []
+    for p in paths:
+        h = hashlib.sha256()
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+                counter.bytes_read += len(chunk)
+        digest = h.hexdigest()
+        if digest in seen:
+            dupes.append((p, seen[digest]))
+        else:
+            seen[digest] = p
+    return dupes
+
+
+def report(name: str, secs: float, counter: IOCounter, logical: int) -> None:
+    read = counter.bytes_read
+    print(f"{name + ':':16s}{secs:9.2f} s  read {read / GIB:10.3f} GiB "
+          f"({100 * read / max(logical, 1):7.3f}% of tree)")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--total-gb", type=float, default=100.0)
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--naive", action="store_true", help="Also time the read-everything pass")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="dedupe_bench_") as tmp:
+        base = Path(tmp)
+        tree = base / "tree"
+        start = time.perf_counter()
+        counts = build_tree(tree, int(args.total_gb * GIB), args.files)
+        paths = sorted(str(p) for p in tree.rglob("*.bin"))
+        logical = sum(os.path.getsize(p) for p in paths)
+        print(f"tree:           {len(paths)} files, {logical / GIB:.1f} GiB logical "
+              f"(built in {time.perf_counter() - start:.1f}s) {counts}")
+
+        if args.naive:
+            counter = IOCounter()
+            start = time.perf_counter()
+            expected = naive(paths, counter)
+            report("naive", time.perf_counter() - start, counter, logical)
+        else:
+            print(f"naive:          (skipped) would read {logical / GIB:.1f} GiB")
+            expected = None
+
+        cache = HashCache(base / "cache.sqlite3")
+        for name in ("tiered cold", "tiered warm"):
+            cache.counter = IOCounter()
+            start = time.perf_counter()
+            groups = find_duplicates(paths, cache)
+            report(name, time.perf_counter() - start, cache.counter, logical)
+        cache.conn.close()
+
+        found = sorted((p, g[0]) for g in groups for p in g[1:])
+        print(f"duplicates:     {len(found)} (expected {counts['dupes']})")
+        if expected is not None:
+            assert found == sorted(expected), "tiered engine disagrees with the naive pass"
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""eden_daemon doctor: serial in-process checks vs the parallel subprocess engine.
+
+Generates ``--daemons`` synthetic daemons in a temp EDEN_ROOT whose imports
+and health checks sleep between 0.05 and ``--max-sleep`` seconds (one sits
+at exactly ``--max-sleep``), plus one that hangs forever unless
+``--no-hang`` is given. Then times:
+
+  serial     the previous doctor loop: import + healthcheck in-process, one
+             by one (the hanging daemon is left out: it would never finish)
+  parallel   eden_doctor.run_doctor, cold cache
+  cached     the same again with nothing changed
+
+    python benchmarks/bench_doctor.py --daemons 100 --max-sleep 2
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def build(base: Path, daemons: int, max_sleep: float, hang: bool) -> None:
+    rng = random.Random(3)
+    sleeps = [rng.uniform(0.05, max_sleep / 4) for _ in range(daemons - 1)] + [max_sleep]
+    for i, secs in enumerate(sleeps):
+        scripts = base / "daemons" / f"D{i:03d}" / "scripts"
+        scripts.mkdir(parents=True)
+        (scripts / f"d{i:03d}.py").write_text(
+            "import time\n"
+            f"time.sleep({secs / 2:.3f})\n"
+            "def healthcheck():\n"
+            f"    time.sleep({secs / 2:.3f})\n"
+            "    return {'status': 'ok'}\n",
+            encoding="utf-8")
+    if hang:
+        scripts = base / "daemons" / "Hang" / "scripts"
+        scripts.mkdir(parents=True)
+        (scripts / "hang.py").write_text("import time\ntime.sleep(10**6)\n", encoding="utf-8")
+
+
+def serial(infos) -> None:
+    """The pre-engine cmd_doctor loop, minus printing."""
+    for info in infos:
+        spec = importlib.util.spec_from_file_location(f"eden.daemon.{info.name}", info.script)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        hc = getattr(mod, "healthcheck", None)
+        if callable(hc):
+            hc()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--daemons", type=int, default=100)
+    ap.add_argument("--max-sleep", type=float, default=2.0)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--timeout", type=float, default=5.0)
+    ap.add_argument("--no-hang", action="store_true")
+    ap.add_argument("--skip-serial", action="store_true")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="eden_doctor_bench_") as tmp:
+        os.environ["EDEN_ROOT"] = tmp
+        os.environ["EDEN_WORK_ROOT"] = tmp
+        from shared.Daemon_tools.scripts import eden_discovery, eden_doctor
+
+        build(Path(tmp), args.daemons, args.max_sleep, not args.no_hang)
+        infos = eden_discovery.discover()
+        jobs = args.jobs or max(eden_doctor.default_jobs(), len(infos))
+        print(f"daemons:   {len(infos)} (slowest check {args.max_sleep:.2f}s, "
+              f"hang={'no' if args.no_hang else 'yes'}, jobs={jobs}, timeout={args.timeout:g}s)")
+
+        if not args.skip_serial:
+            start = time.perf_counter()
+            serial([i for i in infos if i.name != "Hang"])
+            print(f"serial:    {time.perf_counter() - start:8.2f} s  (hang excluded)")
+        for name in ("parallel", "cached"):
+            start = time.perf_counter()
+            results = eden_doctor.run_doctor(infos, jobs=jobs, timeout=args.timeout)
+            secs = time.perf_counter() - start
+            print(f"{name + ':':10s} {secs:8.2f} s  {eden_doctor.summary(results, secs)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Emergency triage: legacy os.walk/rglob passes vs the single-pass scan engine.
+
+Builds a tree of ``--files`` files (project folders with sources, docs, assets,
+__pycache__/node_modules/build noise) and times:
+
+  legacy     top_heavy() (os.walk per top-level item) + purge_caches() dry run
+             (one rglob per pattern) + plan_repairs() (rglob("*"), per-file
+             ext_bucket lists), as the script did before
+  serial     scan_tree(workers=1), everything in one pass
+  threaded   scan_tree() with the default thread count
+  budget     scan_tree(budget=--budget) with progress snapshots, to show what
+             triage has to say after a fixed time
+
+Run it twice to compare a cold and a warm page cache; on network or spinning
+disks the threaded pass gains far more than on a warm local SSD.
+
+    python benchmarks/bench_emergency_scan.py --files 200000 --budget 0.5
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_emergency_boot as eb  # noqa: E402
+
+KINDS = (".py", ".md", ".png", ".json", ".txt", ".chaos", ".bin")
+
+
+def build_tree(root: Path, files: int) -> None:
+    per_project = 200
+    for p in range(max(1, files // per_project)):
+        base = root / f"project{p:04d}"
+        for sub, count in (("src", 90), ("docs", 30), ("assets", 30), ("__pycache__", 20),
+                           ("node_modules/pkg", 20), ("build/out", 10)):
+            d = base / sub
+            d.mkdir(parents=True, exist_ok=True)
+            for i in range(count):
+                (d / f"f{i:03d}{KINDS[(p + i) % len(KINDS)]}").write_bytes(b"x" * (64 * (i % 7 + 1)))
+
+
+# --- the pre-engine implementation, for reference ------------------------------
+
+def legacy_dir_size(path: Path) -> int:
+    total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in eb.SAFE_EXCLUDES]
+        for f in files:
+            try:
+                total += (Path(root) / f).stat().st_size
+            except Exception:
+                pass
+    return total
+
+
+def legacy_top_heavy(root: Path, topn: int = 15) -> List[Tuple[str, int]]:
+    sizes = []
+    for p in root.iterdir():
+        sizes.append((str(p), legacy_dir_size(p) if p.is_dir() else p.stat().st_size))
+    sizes.sort(key=lambda x: x[1], reverse=True)
+    return sizes[:topn]
+
+
+def legacy_purge_hits(root: Path, rules: Dict) -> List[str]:
+    return [str(p) for pattern in rules.get("purge_dirs", []) for p in root.rglob(pattern) if p.exists()]
+
+
+def legacy_ext_bucket(ext: str, rules: Dict) -> str:
+    for bucket, exts in rules.get("ext_buckets", {}).items():
+        if ext.lower() in [e.lower() for e in exts]:
+            return bucket
+    return "other"
+
+
+def legacy_plan(root: Path, rules: Dict) -> int:
+    n = 0
+    for p in root.rglob("*"):
+        if any(seg in eb.SAFE_EXCLUDES for seg in p.parts) or not p.is_file() or "daemons" in p.parts:
+            continue
+        if legacy_ext_bucket(p.suffix, rules) != "other" or p.suffix == ".py":
+            n += 1
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=200000)
+    ap.add_argument("--budget", type=float, default=0.5)
+    args = ap.parse_args(argv)
+    rules = eb.DEFAULT_RULES
+
+    with tempfile.TemporaryDirectory(prefix="triage_bench_") as tmp:
+        root = Path(tmp) / "disk"
+        start = time.perf_counter()
+        build_tree(root, args.files)
+        print(f"tree:      {args.files} files built in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        heavy = legacy_top_heavy(root)
+        hits = legacy_purge_hits(root, rules)
+        planned = legacy_plan(root, rules)
+        secs = time.perf_counter() - start
+        print(f"legacy:    {secs:6.2f} s  (4 walks; {len(hits)} purge hits, {planned} moves)")
+
+        for label, workers in (("serial", 1), ("threaded", eb.SCAN_WORKERS)):
+            report = eb.scan_tree(root, rules, purge=True, plan=True, workers=workers)
+            assert dict(report.top(15)) == dict(heavy)
+            print(f"{label + ':':10} {report.elapsed:6.2f} s  (1 walk, {workers} thread(s); {len(report.purge)} "
+                  f"purge dirs, {len(report.moves)} moves, {report.dirs} dirs)")
+
+        snaps = []
+        report = eb.scan_tree(root, rules, purge=True, plan=True, budget=args.budget,
+                              progress=snaps.append, progress_every=args.budget / 4)
+        print(f"budget:    {report.elapsed:6.2f} s  ({'complete' if report.complete else 'partial'}: "
+              f"{report.files} files, {report.pending} dirs left, {len(snaps)} snapshots, "
+              f"all {len(report.sizes)} top-level items listed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
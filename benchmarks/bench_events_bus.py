@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Indexed events bus vs whole-file scans for ``eden_daemon tail/report``.
+
+Writes ``--events`` synthetic events spread over ``--days`` daily segments,
+then times and measures peak Python memory for:
+
+* the legacy path (load every event of one big events.jsonl into a list),
+* ``report --daily`` / ``report --since`` answered from the segment indexes,
+* ``tail --daemon X -n 20`` for a chatty daemon and for a rare one (one burst
+  on a single day), which the per-daemon block lists let us seek straight to.
+
+    python benchmarks/bench_events_bus.py --events 2000000 --days 30
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_events  # noqa: E402
+from shared.Daemon_tools.scripts.eden_paths import events_bus_path, events_segments_dir  # noqa: E402
+
+OUTCOMES = ("start", "ok", "exit:0", "exit:1", "error")
+
+
+def write_events(total: int, days: int, daemons: int) -> tuple[Path, str]:
+    seg_dir = events_segments_dir()
+    legacy = seg_dir.parent / "legacy_events.jsonl"
+    per_day = total // days
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+    step = 86400 / max(per_day, 1)
+    with legacy.open("w", encoding="utf-8") as big:
+        for day in range(days):
+            base = start + timedelta(days=day)
+            target = seg_dir / f"events-{base.date().isoformat()}-000.jsonl"
+            if day == days - 1:
+                target = events_bus_path()
+            lines = []
+            for i in range(per_day):
+                ts = (base + timedelta(seconds=i * step)).isoformat(timespec="seconds")
+                name = f"Daemon{(i * 7 + day) % daemons:03d}"
+                if day == days // 2 and per_day // 2 <= i < per_day // 2 + 50:
+                    name = "Scorchick"
+                e = {"daemon": name, "action": "scan", "target": f"/data/{i}",
+                     "outcome": OUTCOMES[i % len(OUTCOMES)], "timestamp": ts}
+                lines.append(json.dumps(e) + "\n")
+            blob = "".join(lines)
+            target.write_text(blob, encoding="utf-8")
+            big.write(blob)
+    mid = (start + timedelta(days=days - 2, hours=12)).isoformat(timespec="seconds")
+    return legacy, mid
+
+
+def measure(label: str, fn) -> None:
+    # Timed without tracemalloc (it slows json parsing several-fold), then re-run for peak memory.
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:34} {elapsed * 1000:10.1f} ms  peak {peak / 2**20:8.1f} MiB  -> {result}")
+
+
+def legacy_report(path: Path) -> int:
+    rows = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            rows.append(json.loads(line))
+    agg: dict = {}
+    for r in rows:
+        key = (r.get("daemon", ""), r.get("outcome", ""))
+        agg[key] = agg.get(key, 0) + 1
+    return len(rows)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--daemons", type=int, default=40)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="eden_events_bench_") as tmp:
+        os.environ["EDEN_ROOT"] = tmp
+        os.environ["EDEN_WORK_ROOT"] = tmp
+        t0 = time.perf_counter()
+        legacy, mid = write_events(args.events, args.days, args.daemons)
+        print(f"wrote {args.events} events over {args.days} days in {time.perf_counter() - t0:.1f}s")
+        today = datetime.now().date().isoformat() + "T00:00:00"
+
+        measure("legacy full load + aggregate", lambda: legacy_report(legacy))
+        t0 = time.perf_counter()
+        indexed = sum(eden_events.index_segment(s)["count"] for s in eden_events.segments())
+        print(f"{'build indexes (one-off)':34} {(time.perf_counter() - t0) * 1000:10.1f} ms  -> {indexed}")
+        measure("report (all history)", lambda: sum(eden_events.summarize().values()))
+        measure("report --daily", lambda: sum(eden_events.summarize(since=today).values()))
+        measure("report --since <mid yesterday>", lambda: sum(eden_events.summarize(since=mid).values()))
+        measure("tail --daemon Daemon007 -n 20", lambda: len(deque(
+            eden_events.iter_events(daemon="Daemon007"), maxlen=20)))
+        measure("tail --daemon Scorchick -n 20", lambda: len(deque(
+            eden_events.iter_events(daemon="Scorchick"), maxlen=20)))
+        measure("tail --since <mid yesterday>", lambda: sum(1 for _ in eden_events.iter_events(since=mid)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
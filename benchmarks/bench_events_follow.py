@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Latency from ``log_event`` to a line on ``eden_daemon tail --follow``'s stdout.
+
+Each follower runs as a subprocess, just as in a terminal, with stdout on a
+pipe. The benchmark logs ``--events`` events, spaced ``--gap`` seconds apart
+so the follower goes idle between them. For each event it times how long
+the formatted line takes to come out of the pipe. It also reports how often
+the follower woke up (voluntary context switches) and the CPU it burned
+while idle for ``--idle`` seconds.
+
+  legacy    the previous follow loop (readline + sleep(0.5))
+  poll      eden_follow polling fallback (EDEN_FOLLOW_POLL, default 0.25s)
+  inotify   eden_follow on inotify (Linux)
+
+    python benchmarks/bench_events_follow.py --events 50 --idle 5
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_safety  # noqa: E402
+from shared.Daemon_tools.scripts.eden_paths import events_bus_path  # noqa: E402
+
+LEGACY = r"""
+import json, sys, time
+path = sys.argv[1]
+with open(path, "r", encoding="utf-8") as f:
+    f.seek(0, 2)
+    while True:
+        line = f.readline()
+        if not line:
+            time.sleep(0.5)
+            continue
+        e = json.loads(line)
+        print(f"[{e['daemon']}] {e['action']} -> {e['target']} ({e['outcome']})", flush=True)
+"""
+
+
+def follower_cmd(kind: str) -> list:
+    if kind == "legacy":
+        return [sys.executable, "-c", LEGACY, str(events_bus_path())]
+    cmd = [sys.executable, "-m", "shared.Daemon_tools.scripts.eden_daemon", "tail", "--follow", "--daemon", "Bench"]
+    return cmd + (["--poll"] if kind == "poll" else [])
+
+
+def usage(pid: int) -> tuple:
+    """(cpu seconds, voluntary context switches) from /proc; NaNs elsewhere."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return float("nan"), float("nan")
+    switches = next(int(line.split()[1]) for line in status.splitlines()
+                    if line.startswith("voluntary_ctxt_switches"))
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"), switches
+
+
+def run(kind: str, events: int, gap: float, idle: float) -> dict:
+    proc = subprocess.Popen(follower_cmd(kind), cwd=ROOT, env=os.environ.copy(),
+                            stdout=subprocess.PIPE, text=True, bufsize=1)
+    arrivals: dict = {}
+    seen = threading.Event()
+
+    def reader():
+        for line in proc.stdout:
+            if "-> " in line:
+                target = line.split("-> ", 1)[1].split(" ", 1)[0]
+                arrivals[target] = time.perf_counter()
+                seen.set()
+
+    threading.Thread(target=reader, daemon=True).start()
+    try:
+        # Warm-up event: the follower is attached once it echoes this.
+        deadline = time.time() + 30
+        while "warmup" not in arrivals and time.time() < deadline:
+            eden_safety.log_event("Bench", "ping", target="warmup", outcome="ok")
+            seen.wait(0.2)
+        if "warmup" not in arrivals:
+            raise RuntimeError(f"{kind} follower never attached")
+        cpu0, wake0 = usage(proc.pid)
+        time.sleep(idle)
+        cpu1, wake1 = usage(proc.pid)
+
+        latencies = []
+        for i in range(events):
+            seen.clear()
+            target = f"e{i}"
+            start = time.perf_counter()
+            eden_safety.log_event("Bench", "ping", target=target, outcome="ok")
+            eden_safety.log_event("Other", "ping", target=f"noise{i}", outcome="ok")
+            if not seen.wait(5):
+                raise RuntimeError(f"{kind}: event {i} never arrived")
+            latencies.append((arrivals[target] - start) * 1000)
+            time.sleep(gap)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+    latencies.sort()
+    return {"median": statistics.median(latencies), "p95": latencies[int(0.95 * (len(latencies) - 1))],
+            "max": latencies[-1], "idle_cpu": cpu1 - cpu0, "idle_wakeups": wake1 - wake0}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=50)
+    ap.add_argument("--gap", type=float, default=0.05, help="Seconds between events")
+    ap.add_argument("--idle", type=float, default=5.0, help="Idle seconds for the CPU measurement")
+    ap.add_argument("--kinds", default="legacy,poll,inotify")
+    args = ap.parse_args(argv)
+
+    eden_safety.configure_logging("direct")
+    with tempfile.TemporaryDirectory(prefix="eden_follow_bench_") as tmp:
+        os.environ["EDEN_ROOT"] = tmp
+        os.environ["EDEN_WORK_ROOT"] = tmp
+        os.environ["PYTHONPATH"] = str(ROOT)
+        events_bus_path().touch()
+        print(f"{'follower':10s}{'median ms':>11s}{'p95 ms':>10s}{'max ms':>10s}{'idle CPU s':>12s}{'idle wakeups':>14s}")
+        for kind in args.kinds.split(","):
+            if kind == "inotify" and not sys.platform.startswith("linux"):
+                continue
+            r = run(kind, args.events, args.gap, args.idle)
+            print(f"{kind:10s}{r['median']:11.2f}{r['p95']:10.2f}{r['max']:10.2f}{r['idle_cpu']:12.3f}{r['idle_wakeups']:14}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
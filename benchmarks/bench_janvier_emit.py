@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""Janvier on a synthetic Briar corpus: cold, unchanged and forced runs, then compaction.
+
+Writes ``--files`` transcripts (``--dup-share`` of them byte-identical copies
+of others, as Briar leaves when Sheele re-exports a thread), runs a private
+copy of daemons/Janvier/janvier.py in a child process per step and reports
+wall time, .chaos files and bytes on disk:
+
+  cold      empty output folder, once per ``--jobs`` value
+  rerun     nothing changed: every source is reused from the manifest
+  force     --force: every source re-parsed, same names, nothing new on disk
+  history   ``--history`` timestamped copies per output, as the old
+            ``{date}_{run time}_{title}.chaos`` naming left after each run,
+            removed by ``--compact``
+
+    python benchmarks/bench_janvier_emit.py --files 20000 --jobs 1 4
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def build_corpus(input_dir: Path, files: int, dup_share: float, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    input_dir.mkdir(parents=True)
+    bodies = []
+    for i in range(files):
+        if bodies and rng.random() < dup_share:
+            body = rng.choice(bodies)
+        else:
+            turns = []
+            for t in range(rng.choice((4, 12, 40, 100))):
+                who = "[DREAMBEARER]" if t % 2 == 0 else "[KIN]"
+                turns.append(f"{who} turn {t} of {i}: " + "lorem ipsum " * rng.randint(3, 30))
+            body = f"--- Conversation: Talk {i} (2024-02-{1 + i % 28:02d}) ---\n\n" + "\n".join(turns) + "\n"
+            bodies.append(body)
+        (input_dir / f"{i:06d}_Talk_{i}.txt").write_text(body, encoding="utf-8")
+
+
+def run(script: Path, *args: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(script), *args], check=True, stdout=subprocess.DEVNULL,
+                   env=dict(os.environ, EDEN_FORCE=""))
+    return time.perf_counter() - start
+
+
+def disk(out: Path):
+    files = [p for p in out.glob("*.chaos")]
+    return len(files), sum(p.stat().st_size for p in files)
+
+
+def add_history(out: Path, copies: int) -> None:
+    for n, path in enumerate(sorted(out.glob("*.chaos"))):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        date, title = path.name.split("_", 1)[0], path.name.split("_", 1)[1].rsplit(".", 3)[0]
+        for c in range(copies):
+            stamp = f"2024030{1 + c % 9}_{n % 24:02d}{c % 60:02d}00"
+            old = dict(data, nodes=[dict(node, timestamp=f"2024-03-0{1 + c % 9}T12:00:{c % 60:02d}")
+                                    for node in data["nodes"]])
+            (out / f"{date}_{stamp}_{title}_{c}.chaos").write_text(json.dumps(old, indent=2), encoding="utf-8")
+
+
+def report(step: str, secs: float, out: Path, files: int) -> None:
+    n, size = disk(out)
+    print(f"{step:10} {secs:7.2f} s  {files / secs:7.0f} files/s  {n:6d} .chaos  {size / (1 << 20):7.1f} MB")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=20000)
+    ap.add_argument("--dup-share", type=float, default=0.2, help="Share of sources that copy another")
+    ap.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    ap.add_argument("--history", type=int, default=3, help="Timestamped copies per output for --compact")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="janvier_bench_") as tmp:
+        work = Path(tmp)
+        script = work / "daemons" / "Janvier" / "janvier.py"
+        script.parent.mkdir(parents=True)
+        shutil.copy2(ROOT / "daemons" / "Janvier" / "janvier.py", script)
+        tools = work / "shared" / "Daemon_tools" / "scripts"
+        tools.mkdir(parents=True)
+        for helper in ("eden_manifest.py", "eden_pool.py"):
+            shutil.copy2(ROOT / "shared" / "Daemon_tools" / "scripts" / helper, tools / helper)
+        start = time.perf_counter()
+        build_corpus(work / "daemons" / "Rhea" / "outputs" / "Briar" / "split_conversations_txt",
+                     args.files, args.dup_share)
+        print(f"corpus: {args.files} files in {time.perf_counter() - start:.1f} s; {os.cpu_count()} CPU(s)")
+        out = work / "daemons" / "Rhea" / "outputs" / "Janvier" / "chaos_threads"
+
+        for jobs in dict.fromkeys(args.jobs):
+            shutil.rmtree(out, ignore_errors=True)
+            report(f"cold j{jobs}", run(script, "--jobs", str(jobs)), out, args.files)
+        jobs = str(args.jobs[-1])
+        report("rerun", run(script, "--jobs", jobs), out, args.files)
+        report("force", run(script, "--force", "--jobs", jobs), out, args.files)
+        add_history(out, args.history)
+        n, size = disk(out)
+        print(f"{'history':10} {'':7}   {'':7}         {n:6d} .chaos  {size / (1 << 20):7.1f} MB")
+        report("compact", run(script, "--compact", "--jobs", jobs), out, args.files)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Throughput of eden_safety.log_event in direct mode vs the batching writer.
+
+Each run logs ``--events`` events spread over a few daemons into a temp
+EDEN_WORK_ROOT and reports caller-side events/s (time until log_event calls
+return) and end-to-end events/s (until everything is on disk).
+
+    python benchmarks/bench_log_writer.py --events 50000
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_log_writer, eden_safety  # noqa: E402
+
+DAEMONS = ("Ranger", "Tidbit", "Archive")
+
+
+def run(events: int, mode: str, fsync: str) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory(prefix="eden_log_bench_") as tmp:
+        os.environ["EDEN_ROOT"] = tmp
+        os.environ["EDEN_WORK_ROOT"] = tmp
+        if mode == "batch":
+            eden_safety.configure_logging("batch", fsync=fsync)
+        t0 = time.perf_counter()
+        for i in range(events):
+            eden_safety.log_event(DAEMONS[i % len(DAEMONS)], "index", target=f"/data/file_{i}.txt",
+                                  outcome="ok", extra={"bytes": i})
+        caller = time.perf_counter() - t0
+        eden_safety.configure_logging("direct")
+        total = time.perf_counter() - t0
+        lines = sum(1 for _ in (Path(tmp) / "daemons" / "_logs" / "events.jsonl").open(encoding="utf-8"))
+        assert lines == events, (lines, events)
+    return events / caller, events / total
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=50000)
+    ap.add_argument("--with-fsync-every", action="store_true",
+                    help="Also run direct+batch with fsync=every (slow on real disks)")
+    args = ap.parse_args(argv)
+
+    cases = [("direct", "none"), ("batch", "none"), ("batch", "interval")]
+    if args.with_fsync_every:
+        cases.append(("batch", "every"))
+    print(f"{'mode':8} {'fsync':9} {'caller ev/s':>14} {'end-to-end ev/s':>16}")
+    for mode, fsync in cases:
+        caller, total = run(args.events, mode, fsync)
+        label = fsync if mode == "batch" else "-"
+        print(f"{mode:8} {label:9} {caller:14,.0f} {total:16,.0f}")
+    assert eden_log_writer.get_writer() is None
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
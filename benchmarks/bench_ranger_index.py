@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Ranger catalog throughput: initial crawl and a watcher event burst.
+
+Builds ``--files`` small text files in a temp tree and compares the old
+write path (a fresh connection and one transaction per file, FTS rows
+replaced by a path scan) with the batched IndexWriter:
+
+  crawl      initial crawl of the whole tree
+  recrawl    crawl again with nothing changed (skip path: stat only)
+  burst      ``--burst`` files rewritten at once, as a git checkout would,
+             delivered as modified events (upsert + log_event each)
+
+    python benchmarks/bench_ranger_index.py --files 200000 --burst 10000
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import pathlib
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_ranger(base: Path):
+    os.environ["HOME"] = str(base / "home")
+    os.environ["EDEN_ROOT"] = str(base)
+    spec = importlib.util.spec_from_file_location("bench_ranger", ROOT / "daemons" / "Ranger" / "scripts" / "ranger.py")
+    mod = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(mod)
+    mod.RHEA_INBOX = str(base / "inbox")
+    return mod
+
+
+def legacy_upsert(ranger, path: str) -> None:
+    """The pre-batching upsert_file: new connection, one transaction, FTS replaced by path."""
+    st = os.stat(path)
+    p = pathlib.Path(path)
+    cx = sqlite3.connect(ranger.DB_PATH)
+    cx.execute("PRAGMA journal_mode=WAL;")
+    with cx:
+        cx.execute("""
+        INSERT INTO files(path, name, ext, size, mtime, sha1)
+        VALUES(?,?,?,?,?,?)
+        ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime=excluded.mtime
+        """, (str(p), p.name, p.suffix.lower(), st.st_size, st.st_mtime, ranger.sha1(str(p))))
+        text = ranger.read_text_for_index(str(p))
+        if text:
+            cx.execute("DELETE FROM filetext WHERE path=?", (str(p),))
+            cx.execute("INSERT INTO filetext(path, content) VALUES(?,?)", (str(p), text))
+    cx.close()
+
+
+def legacy_log_event(ranger, evtype: str, path: str) -> None:
+    cx = sqlite3.connect(ranger.DB_PATH)
+    with cx:
+        cx.execute("INSERT INTO events(ts,type,path,info) VALUES(?,?,?,?)", (time.time(), evtype, path, ""))
+    cx.close()
+    ranger.report_to_rhea("event", {"event": evtype, "path": path, "info": ""})
+
+
+def build_tree(root: Path, files: int) -> list:
+    paths = []
+    for i in range(files):
+        d = root / f"dir{i // 1000:04d}"
+        if i % 1000 == 0:
+            d.mkdir(parents=True)
+        p = d / f"file{i:07d}.md"
+        p.write_text(f"note {i} about the lantern and the river, token{i}\n", encoding="utf-8")
+        paths.append(str(p))
+    return paths
+
+
+def rewrite(paths: list, tag: str) -> None:
+    future = time.time() + 10
+    for p in paths:
+        Path(p).write_text(f"checkout {tag} {p}\n", encoding="utf-8")
+        os.utime(p, (future, future))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=200_000)
+    ap.add_argument("--burst", type=int, default=10_000)
+    ap.add_argument("--skip-legacy", action="store_true", help="Only time the batched writer")
+    args = ap.parse_args(argv)
+    burst = min(args.burst, args.files)
+
+    with tempfile.TemporaryDirectory(prefix="ranger_bench_") as tmp:
+        base = Path(tmp)
+        ranger = load_ranger(base)
+        tree = base / "tree"
+        start = time.perf_counter()
+        paths = build_tree(tree, args.files)
+        print(f"tree:               {args.files} files (built in {time.perf_counter() - start:.1f}s)")
+        sink = io.StringIO()
+
+        def fresh_db(name: str) -> None:
+            ranger.stop_writer()
+            ranger.close_db()
+            ranger.DB_PATH = str(base / name)
+            with contextlib.redirect_stdout(sink):
+                ranger.init_db()
+
+        results = {}
+        if not args.skip_legacy:
+            fresh_db("legacy.db")
+            results["legacy crawl"] = timed(lambda: [legacy_upsert(ranger, p) for p in paths])
+            rewrite(paths[:burst], "a")
+
+            def legacy_burst():
+                for p in paths[:burst]:
+                    legacy_upsert(ranger, p)
+                    legacy_log_event(ranger, "modified", p)
+            results["legacy burst"] = timed(legacy_burst)
+
+        fresh_db("batched.db")
+        with contextlib.redirect_stdout(sink):
+            results["batched crawl"] = timed(lambda: ranger._initial_crawl([str(tree)]))
+            results["batched recrawl"] = timed(lambda: ranger._initial_crawl([str(tree)]))
+        rewrite(paths[:burst], "b")
+
+        def batched_burst():
+            writer = ranger.start_writer()
+            for p in paths[:burst]:
+                writer.upsert(p)
+                ranger.log_event("modified", p)
+            writer.flush()
+        results["batched burst"] = timed(batched_burst)
+        stats = dict(ranger._WRITER.stats)
+        ranger.stop_writer()
+        ranger.close_db()
+
+    for name, secs in results.items():
+        n = burst if "burst" in name else args.files
+        print(f"{name + ':':20s}{secs:9.2f} s  ({n / max(secs, 1e-9):9.0f} files/s)")
+    if "legacy crawl" in results:
+        print(f"crawl speedup:      {results['legacy crawl'] / results['batched crawl']:9.1f}x")
+        print(f"burst speedup:      {results['legacy burst'] / results['batched burst']:9.1f}x")
+    print(f"writer stats:       {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""eden_report_to_html: one in-memory document vs the streaming, paginated renderer.
+
+Writes ``--entries`` synthetic .chaos logs (default 1M) spread over 30 days
+and 40 daemons, then runs each mode in its own process and reports wall time
+and peak RSS:
+
+  legacy     load_logs() + extract_data() + build_html() + save_html()
+  cold       render_report() into an empty output directory
+  warm       render_report() again, nothing changed
+  touched    render_report() after rewriting ``--touch`` logs
+
+    python benchmarks/bench_report_to_html.py --entries 1000000
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_report_to_html as rep  # noqa: E402
+
+DAY = 86_400
+START = 1_700_000_000
+
+
+def build(logs: Path, entries: int) -> None:
+    rng = random.Random(15)
+    logs.mkdir(parents=True)
+    for i in range(entries):
+        path = logs / f"log_{i:07d}.chaos"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# session {i}\n[AGENT]: Daemon{rng.randrange(40):02d}\n")
+            f.write(f"[REPORT] pass {i} finished with {rng.randrange(1000)} items\n[NOTES]\n- ok\n")
+        when = START + (i * 30 // entries) * DAY + rng.randrange(DAY)
+        os.utime(path, (when, when))
+
+
+def child(mode: str, logs: str, out: str) -> None:
+    start = time.perf_counter()
+    if mode == "legacy":
+        rep.LOG_DIR = logs
+        rep.EXPORT_FILE = os.path.join(out, "legacy.html")
+        entries, activity = rep.extract_data(rep.load_logs())
+        rep.save_html(rep.build_html(entries, activity))
+        stats = {}
+    else:
+        stats = rep.render_report(logs, out)
+    secs = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"secs": secs, "rss_mb": rss, **stats}))
+
+
+def run(mode: str, logs: Path, out: Path) -> dict:
+    res = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(logs), str(out)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--entries", type=int, default=1_000_000)
+    ap.add_argument("--touch", type=int, default=100)
+    ap.add_argument("--skip-legacy", action="store_true")
+    ap.add_argument("--child", nargs=3, metavar=("MODE", "LOGS", "OUT"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="report_bench_") as tmp:
+        logs, out = Path(tmp) / "logs", Path(tmp) / "out"
+        start = time.perf_counter()
+        build(logs, args.entries)
+        print(f"logs:      {args.entries} entries written in {time.perf_counter() - start:.1f} s")
+
+        if not args.skip_legacy:
+            out.mkdir()
+            r = run("legacy", logs, out)
+            size = (out / "legacy.html").stat().st_size / 2**20
+            print(f"legacy:    {r['secs']:8.2f} s  peak RSS {r['rss_mb']:7.1f} MiB  (one {size:.0f} MiB page)")
+        for mode in ("cold", "warm", "touched"):
+            if mode == "touched":
+                for i in random.Random(3).sample(range(args.entries), args.touch):
+                    path = logs / f"log_{i:07d}.chaos"
+                    st = path.stat()
+                    path.write_text(path.read_text(encoding="utf-8") + "- touched\n", encoding="utf-8")
+                    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+            r = run(mode, logs, out)
+            print(
+                f"{mode + ':':10} {r['secs']:8.2f} s  peak RSS {r['rss_mb']:7.1f} MiB  "
+                f"({r['logs_read']} logs read, {r['pages_written']} pages written, {r['pages_kept']} kept)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""full_rhea discovery, registry saves and ``list`` over a 500-daemon tree.
+
+Builds ``--daemons`` daemons (a YAML-headed entry script, four helper modules
+and a configs/ folder with node_modules noise each) under a temp copy of Rhea's
+scripts, then times:
+
+  discover   legacy rglob + YAML parse of every file, vs the ParseCache
+             cold, warm, and after one file is edited
+  save       legacy full Draft7 validation + backup copy per save, vs the
+             incremental validator with backup dedupe, over ``--saves`` saves
+             that each touch one daemon (needs jsonschema)
+  list       ``full_rhea list`` in-process (command only) and as a fresh
+             process per call (interpreter + typer/rich startup included);
+             needs typer and rich
+
+    python benchmarks/bench_rhea_discovery.py --daemons 500
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import io
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "daemons" / "Rhea" / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+import rhea_watch as rw  # noqa: E402
+
+HEADER = '"""\ndaemon:\n  name: {name}\n  team: T{team}\n  group: G{group}\n  tags: [bench, synthetic]\n' \
+         '  env: {{LOG_LEVEL: info}}\n  start: {{type: python, args: [{file}]}}\n"""\n'
+BODY = "import os\n\n\ndef run():\n    return os.getpid()\n" * 10
+
+
+def build_tree(daemons_root: Path, count: int) -> None:
+    rhea = daemons_root / "Rhea" / "scripts"
+    rhea.mkdir(parents=True)
+    for name in ("full_rhea.complete_build.py", "rhea_watch.py", "rhea_scheduler.py", "rhea_supervisor.py"):
+        shutil.copy2(SCRIPTS / name, rhea / name)
+    for i in range(count):
+        folder = daemons_root / f"Bench{i:04d}"
+        (folder / "scripts").mkdir(parents=True)
+        (folder / "node_modules" / "pkg").mkdir(parents=True)
+        (folder / "configs").mkdir()
+        entry = f"bench{i:04d}.py"
+        (folder / "scripts" / entry).write_text(
+            HEADER.format(name=f"Bench{i:04d}", team=i % 20, group=i % 7, file=entry) + BODY, encoding="utf-8")
+        for j in range(4):
+            (folder / "scripts" / f"helper_{j}.py").write_text(BODY, encoding="utf-8")
+        (folder / "node_modules" / "pkg" / "setup.py").write_text(BODY, encoding="utf-8")
+        (folder / "configs" / f"bench{i:04d}.daemon_profile.json").write_text("{}", encoding="utf-8")
+
+
+def legacy_discover(daemons_root: Path) -> dict:
+    found = {}
+    for pyfile in daemons_root.rglob("*.py"):
+        if rw.skipped(pyfile):
+            continue
+        hit = rw.daemon_entry(pyfile, daemons_root)
+        if hit:
+            found[hit[0]] = hit[1]
+    return found
+
+
+def timed(fn, repeat: int = 1):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), out
+
+
+def bench_discover(daemons_root: Path, cache_path: Path) -> None:
+    secs, legacy = timed(lambda: legacy_discover(daemons_root), 3)
+    print(f"discover legacy:  {secs * 1000:8.1f} ms  ({len(legacy)} daemons)")
+    for label in ("cold", "warm"):
+        cache = rw.ParseCache(cache_path, daemons_root)
+        secs, found = timed(lambda: rw.discover_daemons(daemons_root, cache))
+        assert found == legacy
+        print(f"discover {label}:    {secs * 1000:8.1f} ms  (parsed {cache.parsed}, cached {cache.hits})")
+    edited = daemons_root / "Bench0003" / "scripts" / "bench0003.py"
+    edited.write_text(edited.read_text(encoding="utf-8").replace("team: T3", "team: T99"), encoding="utf-8")
+    cache = rw.ParseCache(cache_path, daemons_root)
+    secs, found = timed(lambda: rw.discover_daemons(daemons_root, cache))
+    print(f"discover 1 edit:  {secs * 1000:8.1f} ms  (parsed {cache.parsed}, cached {cache.hits})")
+
+
+def bench_save(fr, saves: int) -> None:
+    from jsonschema import Draft7Validator
+
+    reg, _ = fr.reconcile_registry(fr._load_registry(), fr.discover_daemons())
+    fr._save_registry(reg)
+    names = sorted(reg["daemons"])
+
+    def legacy(i):
+        reg["daemons"][names[i % len(names)]]["tags"] = ["bench", f"save{i}"]
+        assert not list(Draft7Validator(fr.SCHEMA_JSON).iter_errors(reg))
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        shutil.copy2(fr.REGISTRY_PATH, fr.DIR_BACKUPS / f"legacy_{ts}_{i}.json")
+        with fr.REGISTRY_PATH.open("w", encoding="utf-8") as f:
+            json.dump(reg, f, indent=2)
+
+    def current(i):
+        reg["daemons"][names[i % len(names)]]["tags"] = ["bench", f"save{i}"]
+        fr._save_registry(reg)
+
+    for label, fn in (("legacy", legacy), ("incremental", current)):
+        start = time.perf_counter()
+        for i in range(saves):
+            fn(i)
+        secs = (time.perf_counter() - start) / saves
+        print(f"save {label + ':':13} {secs * 1000:7.1f} ms per save")
+    before = len(list(fr.DIR_BACKUPS.iterdir()))
+    for _ in range(5):
+        fr._save_registry(reg)  # nothing changed: no write, no backup
+    print(f"save unchanged x5: {len(list(fr.DIR_BACKUPS.iterdir())) - before} new backups")
+
+
+def bench_list(fr, cli: Path) -> None:
+    sink = io.StringIO()
+    fr.C.file = sink
+    secs, _ = timed(lambda: fr.list_cmd("daemons"), 5)
+    print(f"list in-process:  {secs * 1000:8.1f} ms  ({len(sink.getvalue().splitlines())} lines rendered)")
+    secs, _ = timed(lambda: subprocess.run([sys.executable, str(cli), "list"], check=True,
+                                           stdout=subprocess.DEVNULL), 5)
+    base, _ = timed(lambda: subprocess.run([sys.executable, "-c", "import typer, rich.console, rich.table"],
+                                           check=True), 5)
+    print(f"list process:     {secs * 1000:8.1f} ms  (bare python + typer/rich imports: {base * 1000:.1f} ms)")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--daemons", type=int, default=500)
+    ap.add_argument("--saves", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="rhea_disc_bench_") as tmp:
+        daemons_root = Path(tmp) / "daemons"
+        build_tree(daemons_root, args.daemons)
+        bench_discover(daemons_root, Path(tmp) / "discovery_cache.json")
+
+        cli = daemons_root / "Rhea" / "scripts" / "full_rhea.complete_build.py"
+        try:
+            spec = importlib.util.spec_from_file_location("full_rhea_bench", cli)
+            fr = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(fr)
+        except ImportError as e:
+            print(f"save/list skipped: {e}")
+            return 0
+        fr._ensure_dirs()
+        fr.C.file = io.StringIO()
+        bench_save(fr, args.saves)
+        bench_list(fr, cli)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
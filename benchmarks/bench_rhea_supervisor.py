@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Team start/stop: one Popen/terminate per daemon vs one request to the Rhea supervisor.
+
+Times, for a team of ``--team`` small Python daemons:
+
+  legacy     Popen each daemon, then terminate()+wait() each in turn (what
+             full_rhea start_team/stop_team did)
+  start      one "start" request carrying every spec
+  stop       one "stop" request carrying every name
+  restart    SIGKILL one supervised daemon and time until its replacement runs
+
+    python benchmarks/bench_rhea_supervisor.py --team 50
+"""
+from __future__ import annotations
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_supervisor as rs  # noqa: E402
+
+# Behaves like a daemon: sleeps, and takes a moment to shut down on SIGTERM.
+DAEMON = (
+    "import signal, sys, time\n"
+    "signal.signal(signal.SIGTERM, lambda *a: (time.sleep(0.05), sys.exit(0)))\n"
+    "while True: time.sleep(1)\n"
+)
+
+
+def legacy(n: int, cwd: Path) -> tuple:
+    start = time.perf_counter()
+    procs = [subprocess.Popen([sys.executable, "-c", DAEMON], cwd=cwd) for _ in range(n)]
+    started = time.perf_counter() - start
+    time.sleep(1.0)  # let the handlers install
+    start = time.perf_counter()
+    for p in procs:
+        p.terminate()
+        p.wait()
+    return started, time.perf_counter() - start
+
+
+def supervised(n: int, cwd: Path, state_dir: Path) -> tuple:
+    client = rs.ensure_supervisor(state_dir)
+    specs = [{"name": f"d{i:03d}", "argv": [sys.executable, "-c", DAEMON], "cwd": str(cwd)} for i in range(n)]
+    try:
+        start = time.perf_counter()
+        client.request("start", specs=specs)
+        started = time.perf_counter() - start
+        time.sleep(1.0)
+
+        victim = {c["name"]: c for c in client.request("status")["children"]}["d000"]
+        os.kill(victim["pid"], signal.SIGKILL)
+        t0 = time.perf_counter()
+        while True:
+            c = {c["name"]: c for c in client.request("status")["children"]}["d000"]
+            if c["pid"] and c["pid"] != victim["pid"]:
+                break
+            time.sleep(0.01)
+        restart = time.perf_counter() - t0
+
+        start = time.perf_counter()
+        client.request("stop", names=[s["name"] for s in specs])
+        stopped = time.perf_counter() - start
+    finally:
+        client.request("shutdown")
+    return started, stopped, restart, c["restart_latency"]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--team", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="sup_bench_") as tmp:
+        tmp = Path(tmp)
+        l_start, l_stop = legacy(args.team, tmp)
+        s_start, s_stop, restart, latency = supervised(args.team, tmp, tmp / "sup")
+    print(f"team:       {args.team} daemons")
+    print(f"legacy:     start {l_start:6.2f} s   stop {l_stop:6.2f} s")
+    print(f"supervisor: start {s_start:6.2f} s   stop {s_stop:6.2f} s  (one request each)")
+    print(f"restart:    {restart * 1000:6.0f} ms seen by client, {latency * 1000:.0f} ms exit-to-respawn in supervisor")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Cold vs warm benchmark for Rhea daemon dispatch across the Red Thread.
+
+Copies the Red Thread modules (Sheele, Briar, Codexa, Janvier, Aderyn) into a
+temp daemons tree so their import-time side effects stay in the sandbox, then
+issues ``--runs`` sequential requests round-robin across them. Daemons with a
+``run()`` entrypoint are run; the rest are probed (describe/healthcheck).
+
+  cold subprocess  a fresh interpreter per request, like invoking each daemon script
+  cold import      re-import the module in-process on every request
+  warm pool        rhea_main.WarmPool, modules kept imported in long-lived workers
+
+    python benchmarks/bench_rhea_warm.py --runs 100 --workers 2
+"""
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_main  # noqa: E402
+
+RED_THREAD = ("Sheele", "Briar", "Codexa", "Janvier", "Aderyn")
+
+COLD_SNIPPET = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location(sys.argv[1], sys.argv[2])
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+if sys.argv[3] == "run":
+    mod.run(None)
+else:
+    getattr(mod, "describe", lambda: None)()
+    getattr(mod, "healthcheck", lambda: None)()
+"""
+
+
+def build_tree(base: Path) -> list:
+    daemons = []
+    for name in RED_THREAD:
+        src = ROOT / "daemons" / name / f"{name.lower()}.py"
+        folder = base / "daemons" / name
+        folder.mkdir(parents=True)
+        dst = folder / src.name
+        shutil.copy2(src, dst)
+        daemons.append(rhea_main.DaemonInfo(name=name, path=folder, module_path=dst))
+    # Aderyn's run() archives whatever Janvier left; give it an empty inbox.
+    (base / "Rhea" / "outputs" / "from_Janvier").mkdir(parents=True, exist_ok=True)
+    return daemons
+
+
+def plan(daemons: list, runs: int) -> list:
+    ops = {d.name: ("run" if "def run(" in d.module_path.read_text(encoding="utf-8") else "probe") for d in daemons}
+    return [(daemons[i % len(daemons)], ops[daemons[i % len(daemons)].name]) for i in range(runs)]
+
+
+def cold_subprocess(requests: list) -> None:
+    for di, op in requests:
+        subprocess.run([sys.executable, "-c", COLD_SNIPPET, di.name, str(di.module_path), op],
+                       check=True, stdout=subprocess.DEVNULL, cwd=str(di.path))
+
+
+def cold_import(requests: list) -> None:
+    for di, op in requests:
+        rhea_main._MODULE_CACHE.clear()
+        if op == "run":
+            rhea_main.try_run_daemon(di)
+        else:
+            rhea_main.probe_daemon(di)
+
+
+def warm_pool(pool: "rhea_main.WarmPool", requests: list) -> None:
+    for di, op in requests:
+        if op == "run":
+            rhea_main.try_run_daemon(di, pool=pool)
+        else:
+            rhea_main.probe_daemon(di, pool=pool)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=100, help="Sequential requests to issue")
+    ap.add_argument("--workers", type=int, default=2, help="Warm pool size")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="rhea_warm_bench_") as tmp:
+        requests = plan(build_tree(Path(tmp)), args.runs)
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            cold_proc = timed(lambda: cold_subprocess(requests))
+            cold_imp = timed(lambda: cold_import(requests))
+            start = time.perf_counter()
+            with rhea_main.WarmPool(args.workers) as pool:
+                spawn = (time.perf_counter() - start) * 1000.0
+                first = timed(lambda: warm_pool(pool, requests))
+                warm = timed(lambda: warm_pool(pool, requests))
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+
+    n = max(args.runs, 1)
+    print(f"requests:                 {args.runs} across {', '.join(RED_THREAD)}")
+    print(f"cold subprocess:          {cold_proc:9.1f} ms  ({cold_proc / n:7.3f} ms/run)")
+    print(f"cold import (in-proc):    {cold_imp:9.1f} ms  ({cold_imp / n:7.3f} ms/run)")
+    print(f"warm pool spawn:          {spawn:9.1f} ms  ({args.workers} workers)")
+    print(f"warm pool (first pass):   {first:9.1f} ms  ({first / n:7.3f} ms/run)")
+    print(f"warm pool (steady):       {warm:9.1f} ms  ({warm / n:7.3f} ms/run, "
+          f"{cold_proc / max(warm, 1e-9):.0f}x vs subprocess)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
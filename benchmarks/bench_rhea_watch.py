@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""Rhea watch mode: full rescan per event vs the debounced, targeted watch engine.
+
+Replays a 1,000-event editor save storm (or a recorded ``--trace`` JSONL of
+``{"t", "type", "src", "dest", "dir"}`` events with paths relative to the tree)
+against a daemons tree of ``--daemons`` synthetic daemons, and reports full
+rescans, batches, files parsed and wall time:
+
+  legacy     old RheaHandler: every .py/.json event -> discover_daemons() +
+             reconcile_registry() + registry write
+  engine     Debouncer (virtual clock, real recorded timing) -> WatchEngine ->
+             apply_patch(), registry written only when something changed
+
+Saves really rewrite the files at their recorded moment; every fifth save
+moves its daemon to another team.
+
+    python benchmarks/bench_rhea_watch.py --daemons 300 --events 1000
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_watch as rw  # noqa: E402
+
+HEADER = '"""\ndaemon:\n  name: {name}\n  team: {team}\n  tags: [bench]\n"""\n'
+BODY = "def run():\n    return {n}\n" * 20
+
+
+def build_tree(root: Path, daemons: int) -> None:
+    for i in range(daemons):
+        folder = root / f"D{i:04d}"
+        (folder / "scripts").mkdir(parents=True)
+        (folder / "configs").mkdir()
+        (folder / "scripts" / f"d{i:04d}.py").write_text(
+            HEADER.format(name=f"D{i:04d}", team=f"T{i % 12}") + BODY, encoding="utf-8")
+        for j in range(4):  # helpers without a header, as in real daemon folders
+            (folder / "scripts" / f"helper_{j}.py").write_text(BODY, encoding="utf-8")
+        (folder / "configs" / "profile.json").write_text("{}", encoding="utf-8")
+
+
+def storm(events: int, daemons: int, seed: int = 7) -> list:
+    """Editor-style save bursts on a handful of files: open, backup, chunked writes, atomic rename."""
+    rng = random.Random(seed)
+    hot = [f"D{i:04d}/scripts/d{i:04d}.py" for i in rng.sample(range(daemons), min(8, daemons))]
+    out, t, save = [], 0.0, 0
+    while len(out) < events:
+        src = rng.choice(hot)
+        burst = [("opened", src, ""), ("closed_no_write", src, ""), ("created", src + "~", "")]
+        burst += [("modified", src, "")] * 14
+        burst += [("created", src + ".tmp", ""), ("moved", src + ".tmp", src), ("modified", src.split("/")[0] + "/configs/profile.json", "")]
+        for kind, s, d in burst:
+            out.append({"t": round(t, 4), "type": kind, "src": s, "dest": d, "dir": False, "save": save})
+            t += 0.002
+        save += 1
+        t += rng.uniform(0.05, 1.5)
+    return out[:events]
+
+
+def apply_save(root: Path, rel: str, save: int) -> None:
+    path = root / rel
+    name = path.stem.upper()
+    team = f"Moved{save}" if save % 5 == 4 else f"T{int(name[1:]) % 12}"
+    path.write_text(HEADER.format(name=name, team=team) + BODY.replace("{n}", str(save)), encoding="utf-8")
+
+
+def replay(mode: str, trace: list, root: Path, registry: Path) -> dict:
+    reg, _ = rw.reconcile_registry({"daemons": {}, "teams": {}}, rw.discover_daemons(root), root)
+    registry.write_text(json.dumps(reg, indent=2), encoding="utf-8")
+    now = [0.0]
+    deb = rw.Debouncer(clock=lambda: now[0])
+    engine = rw.WatchEngine(root, registry)
+    engine.prime(rw.discover_daemons(root))
+    stats = {"rescans": 0, "batches": 0, "parsed": 0, "writes": 0}
+    tree_files = sum(1 for p in root.rglob("*.py") if not rw.skipped(p))
+
+    def write(reg):
+        registry.write_text(json.dumps(reg, indent=2), encoding="utf-8")
+        stats["writes"] += 1
+
+    def flush(force=False):
+        batch = deb.drain(force)
+        if not batch:
+            return
+        patch = engine.changes(batch)
+        stats["batches"] += 1
+        stats["parsed"] += patch.parsed
+        if patch:
+            reg = json.loads(registry.read_text(encoding="utf-8"))
+            if rw.apply_patch(reg, patch, root):
+                write(reg)
+                engine.note_saved()
+
+    start = time.perf_counter()
+    for ev in trace:
+        if ev["type"] == "moved" and "save" in ev:
+            apply_save(root, ev["dest"], ev["save"])
+        src = str(root / ev["src"])
+        dest = str(root / ev["dest"]) if ev["dest"] else ""
+        if mode == "legacy":
+            if not ev["dir"] and src.endswith((".py", ".json")):
+                reg = json.loads(registry.read_text(encoding="utf-8"))
+                reg, _ = rw.reconcile_registry(reg, rw.discover_daemons(root), root)
+                write(reg)
+                stats["rescans"] += 1
+                stats["batches"] += 1
+                stats["parsed"] += tree_files
+        else:
+            now[0] = ev["t"]
+            flush()
+            for p in rw.event_paths(SimpleNamespace(event_type=ev["type"], src_path=src, dest_path=dest,
+                                                    is_directory=ev["dir"])):
+                deb.add(p)
+    if mode == "engine":
+        now[0] += rw.DEBOUNCE_WINDOW
+        flush()
+    stats["secs"] = time.perf_counter() - start
+    stats["registry"] = json.loads(registry.read_text(encoding="utf-8"))
+    return stats
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--daemons", type=int, default=300)
+    ap.add_argument("--events", type=int, default=1000)
+    ap.add_argument("--trace", type=Path, help="recorded storm (JSONL) to replay instead of the generated one")
+    args = ap.parse_args(argv)
+
+    if args.trace:
+        trace = [json.loads(line) for line in args.trace.read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        trace = storm(args.events, args.daemons)
+    with tempfile.TemporaryDirectory(prefix="watch_bench_") as tmp:
+        tmp = Path(tmp)
+        build_tree(tmp / "pristine", args.daemons)
+        results = {}
+        for mode in ("legacy", "engine"):
+            root = tmp / mode
+            shutil.copytree(tmp / "pristine", root)
+            results[mode] = replay(mode, trace, root, tmp / f"{mode}_registry.json")
+    span = trace[-1]["t"] - trace[0]["t"] if trace else 0.0
+    print(f"storm:   {len(trace)} events over {span:.1f} s on a {args.daemons}-daemon tree")
+    for mode, r in results.items():
+        print(f"{mode + ':':8} {r['secs']:7.2f} s  full rescans {r['rescans']:4d}  batches {r['batches']:3d}  "
+              f"files parsed {r['parsed']:4d}  registry writes {r['writes']:4d}")
+    same = results["legacy"]["registry"] == results["engine"]["registry"]
+    print(f"final registries identical: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Sheele fragment matching: SequenceMatcher against every conversation vs the shingle index.
+
+Builds ``--conversations`` synthetic threads (Zipf-distributed words, 60-900
+characters) and ``--fractures`` id-less fragments: most are edited slices of
+a thread, the rest unrelated text. Then it reports:
+
+  exhaustive   the legacy loop (one SequenceMatcher per fragment x thread),
+               timed on ``--sample`` fragments and extrapolated to all
+  index        try_assign_fractures() over every fragment (ShingleIndex
+               build, candidate retrieval, SequenceMatcher on the top-k)
+  quality      on the sampled fragments, precision/recall of the index's
+               assignments against the exhaustive ones (same thread, over
+               the 0.6 threshold), scored against the unextended threads
+
+    python benchmarks/bench_sheele_match.py --conversations 20000 --fractures 10000
+"""
+from __future__ import annotations
+import argparse
+import copy
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+spec = importlib.util.spec_from_file_location("sheele_bench", ROOT / "daemons" / "Sheele" / "sheele.py")
+sheele = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sheele)
+
+
+def make_vocab(rng: random.Random, size: int = 8000) -> list:
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    weights = [26 - i for i in range(len(letters))]
+    return ["".join(rng.choices(letters, weights, k=rng.randint(2, 9))) for _ in range(size)]
+
+
+def sentence(rng: random.Random, vocab: list, cum: list, chars: int) -> str:
+    words = []
+    while sum(len(w) + 1 for w in words) < chars:
+        words.extend(rng.choices(vocab, cum_weights=cum, k=8))
+    return " ".join(words)[:chars]
+
+
+def build(conversations: int, fractures: int, seed: int = 11):
+    rng = random.Random(seed)
+    vocab = make_vocab(rng)
+    cum, total = [], 0.0
+    for rank in range(1, len(vocab) + 1):
+        total += 1.0 / rank
+        cum.append(total)
+    threads = {f"c{i:05d}": [{"text": sentence(rng, vocab, cum, rng.randint(60, 900))}]
+               for i in range(conversations)}
+    ids = list(threads)
+    frags, truth = [], []
+    for _ in range(fractures):
+        if rng.random() < 0.7:
+            cid = rng.choice(ids)
+            text = threads[cid][0]["text"]
+            length = max(20, int(len(text) * rng.uniform(0.5, 1.0)))
+            start = rng.randint(0, len(text) - length)
+            words = text[start:start + length].split(" ")
+            for _ in range(len(words) // 12):  # light edits
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            frags.append({"messages": [{"text": " ".join(words)}]})
+            truth.append(cid)
+        else:
+            frags.append({"messages": [{"text": sentence(rng, vocab, cum, rng.randint(60, 600))}]})
+            truth.append(None)
+    return threads, frags, truth
+
+
+def exhaustive_pick(f_text: str, ids: list, texts: list):
+    best_fit, best_score = None, 0
+    for cid, text in zip(ids, texts):
+        score = sheele.similar(f_text, text)
+        if score > best_score:
+            best_fit, best_score = cid, score
+    return best_fit if best_score > sheele.MATCH_THRESHOLD else None
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--conversations", type=int, default=20000)
+    ap.add_argument("--fractures", type=int, default=10000)
+    ap.add_argument("--sample", type=int, default=20, help="Fragments scored exhaustively")
+    args = ap.parse_args(argv)
+
+    threads, frags, truth = build(args.conversations, args.fractures)
+    ids = list(threads)
+    texts = [sheele._messages_text(threads[cid]) for cid in ids]
+    print(f"data:       {len(ids)} threads, {len(frags)} fragments "
+          f"({sum(t is not None for t in truth)} cut from a thread)")
+
+    sample = random.Random(3).sample(range(len(frags)), min(args.sample, len(frags)))
+    frag_texts = [sheele._messages_text(f["messages"]) for f in frags]
+    start = time.perf_counter()
+    expected = {i: exhaustive_pick(frag_texts[i], ids, texts) for i in sample}
+    per_frag = (time.perf_counter() - start) / max(1, len(sample))
+    print(f"exhaustive: {per_frag * 1000:8.1f} ms per fragment -> {per_frag * len(frags) / 3600:6.1f} h "
+          f"for all {len(frags)} (extrapolated from {len(sample)})")
+
+    start = time.perf_counter()
+    index = sheele.ShingleIndex()
+    for text in texts:
+        index.add(text)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    _, lost = sheele.try_assign_fractures(frags, copy.deepcopy(threads), exhaustive=False)
+    secs = time.perf_counter() - start
+    print(f"index:      {secs:8.1f} s for all {len(frags)} (index build {built:.1f} s); "
+          f"{len(frags) - len(lost)} assigned")
+
+    got = {}
+    for i in sample:
+        score, idx = sheele._best_match(frag_texts[i], index.candidates(frag_texts[i]), texts)
+        got[i] = ids[idx] if score > sheele.MATCH_THRESHOLD else None
+    tp = sum(1 for i in sample if got[i] is not None and got[i] == expected[i])
+    pos_got = sum(1 for i in sample if got[i] is not None)
+    pos_exp = sum(1 for i in sample if expected[i] is not None)
+    print(f"quality:    precision {tp / pos_got if pos_got else 1.0:.3f}  recall {tp / pos_exp if pos_exp else 1.0:.3f}  "
+          f"({pos_exp} of {len(sample)} sampled fragments assigned by the exhaustive scan)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Peak-RSS benchmark for Sheele: whole-file json.load vs streaming ingest.
+
+Generates a synthetic export with gen_conversations_export, then runs
+daemons/Sheele/sheele.py once per mode in a child process and reads each
+child's peak RSS from wait4(). Streaming memory should track the largest
+conversation, not the export size.
+
+    python benchmarks/bench_sheele_stream.py --size-mb 1024
+    python benchmarks/bench_sheele_stream.py --size-mb 4096 --skip-legacy
+"""
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gen_conversations_export import generate  # noqa: E402
+
+SHEELE = ROOT / "daemons" / "Sheele" / "sheele.py"
+
+
+def run_sheele(work: Path, raw: Path, stream: bool):
+    """Run Sheele on a private copy of the script; returns (seconds, peak RSS MB, files written)."""
+    daemon_dir = work / "daemons" / "Sheele"
+    out_dir = work / "daemons" / "Rhea" / "outputs" / "Sheele" / "split_conversations"
+    shutil.rmtree(out_dir, ignore_errors=True)
+    daemon_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(SHEELE, daemon_dir / "sheele.py")
+    tools = work / "shared" / "Daemon_tools" / "scripts"
+    tools.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(ROOT / "shared" / "Daemon_tools" / "scripts" / "eden_conversations.py", tools / "eden_conversations.py")
+    env = dict(os.environ, SHEELE_RAW_FILE=str(raw), SHEELE_STREAM="1" if stream else "0")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(daemon_dir / "sheele.py")], env=env,
+                            stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise SystemExit(f"sheele exited with {proc.returncode}")
+    files = sum(1 for _ in out_dir.glob("*.json")) - 1  # minus the fracture log
+    return elapsed, usage.ru_maxrss / 1024.0, files
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size-mb", type=float, default=512, help="Export size to generate")
+    ap.add_argument("--big-every", type=int, default=5000, help="Every Nth conversation is 50x longer")
+    ap.add_argument("--skip-legacy", action="store_true", help="Only run streaming (legacy needs several x the export in RAM)")
+    ap.add_argument("--workdir", type=Path, default=None, help="Where to put the export (default: a temp dir)")
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="sheele_stream_bench_", dir=args.workdir)
+    try:
+        work = Path(tmp)
+        raw = work / "conversations.json"
+        start = time.perf_counter()
+        count = generate(raw, args.size_mb, big_every=args.big_every)
+        gen_s = time.perf_counter() - start
+        print(f"export:     {raw.stat().st_size / 1e6:9.1f} MB, {count} entries (generated in {gen_s:.1f}s)")
+
+        s_time, s_rss, s_files = run_sheele(work, raw, stream=True)
+        print(f"streaming:  {s_time:9.1f} s   peak RSS {s_rss:9.1f} MB   {s_files} files")
+        if not args.skip_legacy:
+            l_time, l_rss, l_files = run_sheele(work, raw, stream=False)
+            print(f"json.load:  {l_time:9.1f} s   peak RSS {l_rss:9.1f} MB   {l_files} files")
+            print(f"peak RSS reduction: {l_rss / max(s_rss, 1e-9):.1f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Nightly re-run benchmark for the incremental Red Thread stages.
+
+Builds ``--count`` Sheele-style conversation files in a temp tree, then times
+Briar -> Janvier -> Aderyn three times: a first full build, a re-run with
+nothing changed, and a re-run after editing ``--changed`` conversations.
+
+    python benchmarks/bench_stage_manifest.py --count 50000 --changed 50
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def convo(i: int, text: str) -> dict:
+    mapping = {str(t): {"message": {"author": {"role": "user" if t % 2 == 0 else "assistant"},
+                                    "content": {"parts": [f"{text} turn {t}, summon the lantern" if t == 3 else
+                                                          f"{text} turn {t}"]}}}
+               for t in range(8)}
+    return {"title": f"Conversation {i}", "create_time": 1_700_000_000 + i * 60, "messages": [{"mapping": mapping}]}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--count", type=int, default=50000, help="Conversations in the corpus")
+    ap.add_argument("--changed", type=int, default=50, help="Conversations edited before the last run")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="stage_manifest_bench_") as tmp:
+        base = Path(tmp)
+        sheele_out, briar_out = base / "sheele", base / "briar"
+        janvier_out, aderyn_out = base / "janvier", base / "aderyn"
+        for d in (sheele_out, janvier_out, aderyn_out):
+            d.mkdir()
+
+        briar = _load("bench_briar", ROOT / "daemons" / "Briar" / "briar.py")
+        janvier = _load("bench_janvier", ROOT / "daemons" / "Janvier" / "janvier.py")
+        aderyn = _load("bench_aderyn", ROOT / "daemons" / "Aderyn" / "aderyn.py")
+        briar.INPUT_DIR, briar.OUTPUT_DIR, briar.QUARANTINE_DIR = sheele_out, briar_out, briar_out / "_quarantine"
+        janvier.INPUT_DIR, janvier.OUTPUT_DIR = briar_out, janvier_out
+        aderyn.INPUT_DIR, aderyn.OUTPUT_DIR = janvier_out, aderyn_out
+        sys.argv = ["bench"]
+
+        for i in range(args.count):
+            (sheele_out / f"conv_{i:06d}.json").write_text(json.dumps(convo(i, "hello")), encoding="utf-8")
+
+        def run() -> float:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                briar.main()
+                janvier.main([])
+                aderyn.archive_summons()
+            return time.perf_counter() - start
+
+        full = run()
+        unchanged = run()
+        step = max(1, args.count // max(args.changed, 1))
+        future = time.time_ns() + 10**9
+        for i in range(0, args.count, step)[: args.changed]:
+            path = sheele_out / f"conv_{i:06d}.json"
+            path.write_text(json.dumps(convo(i, "edited")), encoding="utf-8")
+            os.utime(path, ns=(future, future))
+        few_changed = run()
+        outputs = sum(1 for _ in janvier_out.glob("*.chaos"))
+
+    print(f"conversations:         {args.count}")
+    print(f"full build:            {full:8.2f} s")
+    print(f"re-run, none changed:  {unchanged:8.2f} s  ({full / max(unchanged, 1e-9):.0f}x)")
+    print(f"re-run, {args.changed} changed:    {few_changed:8.2f} s  ({full / max(few_changed, 1e-9):.0f}x)")
+    print(f"janvier outputs:       {outputs}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
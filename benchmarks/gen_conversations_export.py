@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Write a synthetic OpenAI ``conversations.json`` export of a target size.
+
+Conversations follow the export shape (title, create/update time, a ``mapping``
+of message nodes linked by parent/children) and are streamed to disk, so
+multi-GB files can be generated with flat memory. A ``--fracture-rate``
+fraction of entries carry no id, so Sheele has fragments to re-assign, and
+``--big-every`` inserts an occasional oversized conversation.
+
+    python benchmarks/gen_conversations_export.py /tmp/conversations.json --size-mb 2048
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+WORDS = ("eden", "daemon", "thread", "summon", "archive", "ritual", "mirror", "signal", "garden",
+         "lattice", "ember", "codex", "chaos", "memory", "vow", "lantern", "river", "glyph")
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def conversation(rng: random.Random, n: int, messages: int, words: int, fracture: bool) -> dict:
+    created = 1_700_000_000 + n * 37
+    mapping = {}
+    parent = None
+    for m in range(messages):
+        node_id = f"node-{n}-{m}"
+        mapping[node_id] = {
+            "id": node_id,
+            "message": {
+                "id": node_id,
+                "author": {"role": "user" if m % 2 == 0 else "assistant"},
+                "create_time": created + m,
+                "content": {"content_type": "text", "parts": [_text(rng, words)]},
+            },
+            "parent": parent,
+            "children": [],
+        }
+        if parent is not None:
+            mapping[parent]["children"].append(node_id)
+        parent = node_id
+    entry = {
+        "title": _text(rng, 4).title(),
+        "create_time": created,
+        "update_time": created + messages,
+        "mapping": mapping,
+    }
+    if fracture:
+        entry["messages"] = [{"text": _text(rng, words)} for _ in range(2)]
+    else:
+        entry["id"] = entry["conversation_id"] = f"conv-{n:08d}"
+    return entry
+
+
+def generate(path: Path, size_mb: float, messages: int = 20, words: int = 60, fracture_rate: float = 0.0005,
+             big_every: int = 0, big_factor: int = 50, seed: int = 7) -> int:
+    """Write the export; returns the number of entries."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    written = n = 0
+    with path.open("w", encoding="utf-8") as f:
+        f.write("[")
+        while written < target:
+            big = big_every and n and n % big_every == 0
+            entry = conversation(rng, n, messages * (big_factor if big else 1), words,
+                                 rng.random() < fracture_rate)
+            chunk = ("," if n else "") + json.dumps(entry, ensure_ascii=False)
+            f.write(chunk)
+            written += len(chunk)
+            n += 1
+        f.write("]")
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("path", type=Path)
+    ap.add_argument("--size-mb", type=float, default=1024)
+    ap.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    ap.add_argument("--words", type=int, default=60, help="Words per message")
+    ap.add_argument("--fracture-rate", type=float, default=0.0005)
+    ap.add_argument("--big-every", type=int, default=0, help="Every Nth conversation is --big-factor times longer")
+    ap.add_argument("--big-factor", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    n = generate(args.path, args.size_mb, args.messages, args.words, args.fracture_rate,
+                 args.big_every, args.big_factor, args.seed)
+    print(f"wrote {n} conversations to {args.path} ({args.path.stat().st_size / 1e6:.1f} MB)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
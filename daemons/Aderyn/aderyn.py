@@ -7,10 +7,24 @@
 
 import os
 import re
+import sys
 import json
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from eden_manifest import StageManifest, force_requested
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_manifest import StageManifest, force_requested
+    except ImportError:
+        StageManifest = None
+
+        def force_requested(argv=None):
+            return True
+
 # =============================
 # Unified Paths
 # =============================
@@ -19,6 +33,10 @@ INPUT_DIR = ROOT / "Rhea" / "outputs" / "from_Janvier"
 OUTPUT_DIR = ROOT / "Rhea" / "outputs" / "from_Aderyn" / "chaos_library"
 
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+# Bump when the output layout changes; SUMMON_PATTERNS are folded in below.
+STAGE_VERSION = "2"
+ARCHIVE_NAME = "summons.jsonl"
+INDEX_NAME = ".summons_index"
 
 # =============================
 # Patterns
@@ -32,9 +50,79 @@ SUMMON_PATTERNS = [
     r"\bi am become\b",
 ]
 
+# A pattern that is a plain "\bword or phrase\b" joins the detector's trie.
+_LITERAL = re.compile(r"\\b([\w' -]+)\\b")
+# The plain text any other pattern starts with; checked with "in" before searching.
+_LEAD = re.compile(r"(?:\\b)?([\w ]+)")
+
+def _lead_text(pattern: str):
+    m = _LEAD.match(pattern)
+    if not m or "|" in pattern:
+        return None
+    lead = m.group(1)
+    if pattern[m.end():m.end() + 1] in ("?", "*", "{"):
+        lead = lead[:-1]  # the last character is optional
+    return lead if len(lead) >= 3 else None
+
+def _trie_regex(node) -> str:
+    alts = [re.escape(ch) + _trie_regex(sub) for ch, sub in sorted(node.items()) if ch]
+    if "" in node:
+        alts.append(f"(?P<p{node['']}>)")  # names the pattern that ends here
+    return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+class SummonDetector:
+    """The summon patterns compiled once, reporting which one matched.
+
+    Literal ``\\bphrase\\b`` patterns are merged into a single regex over a
+    character trie, so a scan costs about the same for 6 of them or 600, and
+    the named group closed at each phrase's end tells which one it was.
+    Any other pattern is searched on its own: as one more branch of a regex
+    alternation it would be tried at every position of every text. A plain
+    substring test on its leading text skips most of those searches.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        trie, self.separate = {}, []
+        for i, pattern in enumerate(self.patterns):
+            literal = _LITERAL.fullmatch(pattern)
+            if literal:
+                node = trie
+                for ch in literal.group(1):
+                    node = node.setdefault(ch, {})
+                node.setdefault("", i)
+            else:
+                self.separate.append((i, re.compile(pattern), _lead_text(pattern)))
+        self.regex = re.compile(r"\b" + _trie_regex(trie) + r"\b") if trie else None
+
+    def search(self, text_l: str):
+        """Index in ``patterns`` of a pattern found in the lower-cased text, or None."""
+        if self.regex is not None:
+            m = self.regex.search(text_l)
+            if m:
+                return int(m.lastgroup[1:])
+        for i, regex, lead in self.separate:
+            if (lead is None or lead in text_l) and regex.search(text_l):
+                return i
+        return None
+
+_detector = None
+
+def summon_detector() -> SummonDetector:
+    """The detector for the current SUMMON_PATTERNS, compiled once."""
+    global _detector
+    if _detector is None or _detector.patterns != SUMMON_PATTERNS:
+        _detector = SummonDetector(SUMMON_PATTERNS)
+    return _detector
+
+def match_summon(text: str, detector: SummonDetector = None):
+    """The summon pattern that matches text, or None."""
+    detector = detector or summon_detector()
+    i = detector.search(text.lower())
+    return None if i is None else detector.patterns[i]
+
 def detect_summons(text: str) -> bool:
-    text_l = text.lower()
-    return any(re.search(p, text_l) for p in SUMMON_PATTERNS)
+    return match_summon(text) is not None
 
 def clean_filename(s: str, max_length: int = 50) -> str:
     # Remove or replace invalid characters
@@ -51,7 +139,8 @@ def clean_filename(s: str, max_length: int = 50) -> str:
 # =============================
 # Core Logic
 # =============================
-def process_chaos_file(path: Path) -> dict:
+def process_chaos_file(path: Path, detector: SummonDetector = None) -> dict:
+    detector = detector or summon_detector()
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception as e:
@@ -65,52 +154,148 @@ def process_chaos_file(path: Path) -> dict:
 
     for node in nodes:
         txt = node.get("content", "")
-        if detect_summons(txt):
+        pattern = match_summon(txt, detector)
+        if pattern is not None:
             summons.append({
                 "role": node.get("role"),
                 "text": txt,
                 "timestamp": node.get("timestamp"),
+                "pattern": pattern,
             })
 
     return {"title": title, "date": date, "summons": summons}
 
-def archive_summons():
+class SummonArchive:
+    """Append-only summon archive (one JSON object per line) with a dedupe index.
+
+    The index is append-only too: one "<key> <archive size>" line per summon.
+    A summon whose key is indexed is never written again, so each run only
+    adds what is new. On open, lines past the last indexed size (a run cut
+    short between the two appends) are indexed, a torn last line is cut off,
+    and an archive smaller than indexed is re-indexed from scratch.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.path = Path(out_dir) / ARCHIVE_NAME
+        self.index_path = Path(out_dir) / INDEX_NAME
+        self.keys = set()
+        self.reset = not self.path.exists()
+        size = self.path.stat().st_size if not self.reset else 0
+        covered = self._load_index()
+        if covered > size:
+            self.keys, covered, self.reset = set(), 0, True
+            self.index_path.unlink(missing_ok=True)
+        self._pending = []
+        if size > covered:
+            self._index_tail(covered, size)
+        self._archive = None
+
+    def _load_index(self) -> int:
+        covered = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return 0
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            os.truncate(self.index_path, end)
+        for line in data[:end].splitlines():
+            key, _, at = line.decode("ascii", "replace").partition(" ")
+            if at.isdigit():
+                self.keys.add(key)
+                covered = int(at)
+        return covered
+
+    def _index_tail(self, offset: int, size: int) -> None:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    key = json.loads(line)["key"]
+                except Exception:
+                    continue
+                if key not in self.keys:
+                    self.keys.add(key)
+                    self._pending.append(f"{key} {offset}\n")
+        if offset < size:
+            os.truncate(self.path, offset)
+
+    @staticmethod
+    def key(title, date, summon) -> str:
+        ident = json.dumps([title, date, summon["role"], summon["text"]], ensure_ascii=False)
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:32]
+
+    def add(self, source: str, title, date, summon):
+        """Append the summon unless it is archived already; returns the entry or None."""
+        key = self.key(title, date, summon)
+        if key in self.keys:
+            return None
+        if self._archive is None:
+            self._archive = open(self.path, "ab")
+        entry = {"key": key, "source": source, "title": title, "date": date, **summon}
+        self._archive.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.keys.add(key)
+        self._pending.append(f"{key} {self._archive.tell()}\n")
+        return entry
+
+    def close(self) -> None:
+        # Archive first, then index: a crash in between is repaired on the next open.
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        else:
+            self.path.touch()
+        if self._pending:
+            with open(self.index_path, "a", encoding="ascii") as f:
+                f.writelines(self._pending)
+            self._pending = []
+
+def _patterns_digest() -> str:
+    return hashlib.sha256("\n".join(SUMMON_PATTERNS).encode("utf-8")).hexdigest()[:12]
+
+def archive_summons(force=False):
     results = []
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    for fname in sorted(os.listdir(INPUT_DIR)):
-        if not fname.lower().endswith(".chaos"):
-            continue
-        path = INPUT_DIR / fname
-        result = process_chaos_file(path)
-        if not result or not result["summons"]:
-            continue
-
-        # Better filename construction
-        base_name = fname.rsplit('.', 1)[0]
-        safe_base = clean_filename(base_name)
-        title_part = clean_filename(result.get("title", "untitled"), 20)
-
-        # Include date and timestamp for uniqueness
-        outname = f"{result['date']}_{timestamp}_{safe_base}_{title_part}_summons.chaos"
-        outpath = OUTPUT_DIR / outname
-
-        # Ensure unique filename
-        counter = 1
-        while outpath.exists():
-            name_parts = outname.rsplit('_', 1)
-            if len(name_parts) > 1 and name_parts[1].startswith('summons'):
-                outname = f"{result['date']}_{timestamp}_{safe_base}_{title_part}_{counter}_summons.chaos"
-            else:
-                outname = f"{result['date']}_{timestamp}_{safe_base}_{title_part}_{counter}.chaos"
-            outpath = OUTPUT_DIR / outname
-            counter += 1
 
-        with open(outpath, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+    names = sorted(f for f in os.listdir(INPUT_DIR) if f.lower().endswith(".chaos"))
+    archive = SummonArchive(OUTPUT_DIR)
+    manifest = None
+    if StageManifest is not None:
+        # A lost archive means every input has to be read again.
+        manifest = StageManifest.for_dir(OUTPUT_DIR, "aderyn", f"{STAGE_VERSION}:{_patterns_digest()}",
+                                         force or archive.reset)
+        manifest.prune(INPUT_DIR / f for f in names)
+
+    detector = summon_detector()
+    try:
+        for fname in names:
+            path = INPUT_DIR / fname
+            if manifest is not None:
+                if manifest.fresh(path):
+                    continue
+                # Per-file summons files from before the archive.
+                manifest.discard_outputs(path)
+            result = process_chaos_file(path, detector)
+            added = []
+            for summon in (result or {}).get("summons", ()):
+                entry = archive.add(fname, result["title"], result["date"], summon)
+                if entry is not None:
+                    added.append(entry)
+            if added:
+                print(f"[Aderyn] ✅ Detected summons in {fname} → {ARCHIVE_NAME} (+{len(added)})")
+                results.extend(added)
+            if manifest is not None:
+                # The archive is shared and append-only: nothing per input to delete later.
+                manifest.record(path, [])
+    finally:
+        archive.close()
 
-        print(f"[Aderyn] ✅ Detected summons in {fname} → {outname}")
-        results.append(str(outpath))
+    if manifest is not None:
+        manifest.save()
+        print(f"[Aderyn] {manifest.summary()}")
     return results
 
 # =============================
@@ -120,14 +305,14 @@ def main():
     if not INPUT_DIR.exists():
         print(f"[Aderyn] {INPUT_DIR} missing; nothing to archive.")
         return
-    results = archive_summons()
+    results = archive_summons(force=force_requested(sys.argv[1:]))
     if not results:
-        print("[Aderyn] No summons found.")
+        print("[Aderyn] No new summons found.")
 
 def run(payload=None, registry=None, **kwargs):
     """Rhea-facing entrypoint."""
-    results = archive_summons()
-    return {"output_dir": str(OUTPUT_DIR), "results": results}
+    results = archive_summons(force=bool(kwargs.get("force")) or force_requested())
+    return {"output_dir": str(OUTPUT_DIR), "archive": str(OUTPUT_DIR / ARCHIVE_NAME), "results": results}
 
 # =============================
 # CLI
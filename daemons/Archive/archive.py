@@ -36,6 +36,15 @@ except Exception as e:
         return None
 
 
+# Rows are batched by db_utils' writer; commit them at the end of each pass.
+try:
+    from Daemon_tools.db_utils import flush_db
+except Exception:
+
+    def flush_db():
+        return None
+
+
 # Logging + safety helpers (optional)
 try:
     from eden_paths import eden_root
@@ -207,6 +216,10 @@ def process_once(ctx: "SafetyContext", scope_dir: str = None) -> int:
             log_line(f"[Archive] Error converting {fname}: {e}")
             traceback.print_exc()
             log_event("Archive", "convert", target=fname, outcome="error", error=str(e))
+    try:
+        flush_db()
+    except Exception as e_db:
+        log_line(f"[Archive] DB flush warning: {e_db}")
     return count
 
 
@@ -8,9 +8,19 @@ import hashlib
 import json
 import os
 import shutil
+import sys
 import time
 from pathlib import Path
 
+try:
+    from eden_dedupe import HashCache, find_duplicates
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_dedupe import HashCache, find_duplicates
+    except ImportError:
+        HashCache = find_duplicates = None
+
 DEFAULT_SKIP_DIRNAMES = {
     ".git",
     ".hg",
@@ -153,22 +163,41 @@ def hash_file(path: Path, chunk_size=65536):
     return h.hexdigest()
 
 
+def _dedupe_candidates(root: Path, log_root: Path):
+    for dirpath, dirnames, filenames in os.walk(root):
+        here = Path(dirpath)
+        # Our own reports and hash cache change every run; never dedupe them.
+        dirnames[:] = sorted(d for d in dirnames if here / d != log_root)
+        for fn in sorted(filenames):
+            yield str(here / fn)
+
+
 def blaze_dedupe(root: Path, quiet: bool):
     log_dir = ensure_log_dir(root, "dedupe")
     run_id = timestamp()
     report = log_dir / f"dedupe_{run_id}.jsonl"
 
-    seen = {}
     dupes = []
-    for dirpath, _, filenames in os.walk(root):
-        for fn in filenames:
-            p = Path(dirpath) / fn
+    if find_duplicates is not None:
+        # Size groups first, then head/tail samples, full hashes only for what still collides.
+        cache = HashCache(log_dir / "hash_cache.sqlite3")
+        try:
+            for group in find_duplicates(_dedupe_candidates(root, log_dir.parent), cache):
+                dupes.extend((p, group[0]) for p in group[1:])
+        finally:
+            cache.conn.close()
+        stats = cache.counter.as_dict()
+    else:
+        seen = {}
+        stats = {"bytes_read": 0}
+        for p in _dedupe_candidates(root, log_dir.parent):
             try:
                 h = hash_file(p)
+                stats["bytes_read"] += os.path.getsize(p)
                 if h in seen:
-                    dupes.append((str(p), seen[h]))
+                    dupes.append((p, seen[h]))
                 else:
-                    seen[h] = str(p)
+                    seen[h] = p
             except Exception as e:
                 if not quiet:
                     print(f"[Blaze] error hashing {p}: {e}")
@@ -179,6 +208,9 @@ def blaze_dedupe(root: Path, quiet: bool):
 
     if not quiet:
         print(f"[Blaze] Found {len(dupes)} duplicates. Report: {report}")
+        print(f"[Blaze] Read {stats['bytes_read'] / (1024 * 1024):.1f} MiB "
+              f"({stats.get('full_hashes', '-')} full hashes, {stats.get('cache_hits', 0)} cached)")
+    return dupes
 
 
 # ------------------------
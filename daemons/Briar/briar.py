@@ -1,10 +1,28 @@
 import json
 import os
+import sys
+import time
+from collections import Counter
 from datetime import datetime
 from datetime import timezone
 from pathlib import Path
 import re
 
+try:
+    from eden_manifest import StageManifest, file_hash, force_requested
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_manifest import StageManifest, file_hash, force_requested
+    except ImportError:
+        StageManifest = None
+        file_hash = None
+
+        def force_requested(argv=None):
+            return True
+
+from eden_pool import batches, default_jobs, pool_size, pop_jobs, run_batches, sweep_temp_files
+
 # Get paths relative to script location
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -14,9 +32,17 @@ OUTPUT_DIR = RHEA_DIR / "outputs" / "Briar" / "split_conversations_txt"
 QUARANTINE_DIR = OUTPUT_DIR / "_quarantine"
 MAX_TURNS = int(os.environ.get("BRIAR_MAX_TURNS", "100"))
 TRIM_MODE = os.environ.get("EDEN_TRIM_MODE", "strict").lower()
+# Bump when the transcript format changes; trim settings are folded in below.
+STAGE_VERSION = "1"
+# Worker processes for conversion (--jobs N); small batches stay in-process.
+JOBS = default_jobs("BRIAR_JOBS")
+PROGRESS_EVERY = 5.0
+SUMMARY_NAME = ".briar_summary.json"
+QUIET = False  # workers report through the merged summary instead
 
 def log(msg):
-    print(f"[Briar] {msg}")
+    if not QUIET:
+        print(f"[Briar] {msg}")
 
 def clean_filename(s: str, max_length: int = 50) -> str:
     # Remove or replace invalid characters
@@ -78,8 +104,7 @@ def process_json_file(filepath, idx):
             convo = json.load(f)
     except Exception as e:
         log(f"JSON decode error: {e}")
-        quarantine(filepath, "decode_error")
-        return
+        return quarantine(filepath, "decode_error")
 
     title = convo.get("title", "Untitled")
     date = extract_conversation_date(convo)
@@ -89,8 +114,7 @@ def process_json_file(filepath, idx):
 
     messages = convo.get("messages", [])
     if not messages:
-        quarantine(filepath, "no_messages")
-        return
+        return quarantine(filepath, "no_messages")
 
     count = 0
     for msg in messages:
@@ -118,29 +142,46 @@ def process_json_file(filepath, idx):
             break
 
     if count == 0:
-        quarantine(filepath, "no_valid_messages")
-        return
+        return quarantine(filepath, "no_valid_messages")
 
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Better filename construction
     safe_title = clean_filename(title)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    out_filename = f"{date}_{idx + 1:04d}_{safe_title}.txt"
+    stem = f"{date}_{idx + 1:04d}_{safe_title}"
+    outpath = publish(lines, (OUTPUT_DIR / (f"{stem}.txt" if n == 0 else f"{stem}_{n}.txt")
+                              for n in range(sys.maxsize)))
+    log(f"Saved: {outpath.name}")
+    return [outpath]
 
-    # Ensure unique filename
-    outpath = OUTPUT_DIR / out_filename
-    counter = 1
-    while outpath.exists():
-        out_filename = f"{date}_{idx + 1:04d}_{safe_title}_{counter}.txt"
-        outpath = OUTPUT_DIR / out_filename
-        counter += 1
+def publish(lines, names):
+    """Write lines to a temp file, then link it in under the first free name.
 
-    with open(outpath, "w", encoding="utf-8") as f:
+    Readers never see a partial transcript, and two workers racing for one
+    name cannot overwrite each other.
+    """
+    names = iter(names)
+    outpath = next(names)
+    tmp = outpath.with_name(f".{outpath.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         f.writelines(lines)
-    log(f"Saved: {outpath.name}")
+    try:
+        while True:
+            try:
+                os.link(tmp, outpath)
+                return outpath
+            except FileExistsError:
+                outpath = next(names)
+            except OSError:
+                # No hard links here (e.g. FAT): fall back to a checked replace.
+                while outpath.exists():
+                    outpath = next(names)
+                os.replace(tmp, outpath)
+                return outpath
+    finally:
+        if tmp.exists():
+            tmp.unlink()
 
 def quarantine(filepath, reason="unknown"):
     QUARANTINE_DIR.mkdir(parents=True, exist_ok=True)
@@ -149,21 +190,119 @@ def quarantine(filepath, reason="unknown"):
     try:
         # Ensure source file exists before trying to copy
         if filepath.exists():
-            dest.write_text(filepath.read_text(encoding="utf-8"), encoding="utf-8")
+            # Bytes, not text: undecodable files are the ones that most need keeping.
+            tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(filepath.read_bytes())
+            os.replace(tmp, dest)
             log(f"Quarantined {name} → Reason: {reason}")
+            return [dest]
         else:
             log(f"Source file not found for quarantine: {filepath}")
     except Exception as e:
         log(f"Failed to quarantine {name}: {e}")
+    return []
+
+# =============================
+# Batch conversion
+# =============================
+def _convert_batch(batch, hash_inputs):
+    """Convert [(idx, path)]; returns per-file results and this worker's tallies."""
+    start, cpu = time.perf_counter(), time.process_time()
+    results = []
+    tally = Counter()
+    for idx, path in batch:
+        result = {"idx": idx, "input": str(path), "outputs": [], "reason": None, "error": None, "sha256": None, "stat": None}
+        try:
+            if hash_inputs:
+                # Hashed here so the parent's StageManifest.record() doesn't re-read every input.
+                try:
+                    st = os.stat(path)
+                    result["sha256"] = file_hash(path)
+                    result["stat"] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    pass
+            outputs = process_json_file(path, idx)
+            result["outputs"] = [str(p) for p in outputs]
+            if outputs and outputs[0].parent == QUARANTINE_DIR:
+                result["reason"] = outputs[0].name[:-len(path.name) - 1]
+                tally["quarantined"] += 1
+            elif outputs:
+                tally["saved"] += 1
+        except Exception as e:
+            result["error"] = str(e)
+            tally["errors"] += 1
+        results.append(result)
+    tally["files"] = len(batch)
+    return {"pid": os.getpid(), "results": results, "tally": dict(tally),
+            "seconds": time.perf_counter() - start, "cpu": time.process_time() - cpu}
+
+def convert_files(todo, manifest=None, jobs=None):
+    """Convert [(idx, path)] serially or on a process pool and merge the outcome.
+
+    Outputs are recorded in the manifest as batches finish; returns the merged
+    summary (totals, quarantine reasons and per-worker tallies).
+    """
+    jobs = pool_size(jobs, JOBS, len(todo))
+    hash_inputs = manifest is not None and file_hash is not None
+    summary = {"files": len(todo), "saved": 0, "quarantined": {}, "errors": 0, "jobs": jobs, "workers": {}}
+    started = last = time.perf_counter()
+    done = 0
+
+    def merge(out):
+        nonlocal done, last
+        worker = summary["workers"].setdefault(str(out["pid"]), {"files": 0, "saved": 0, "quarantined": 0,
+                                                                  "errors": 0, "seconds": 0.0, "cpu": 0.0})
+        for key, n in out["tally"].items():
+            worker[key] += n
+        worker["seconds"] = round(worker["seconds"] + out["seconds"], 3)
+        worker["cpu"] = round(worker["cpu"] + out["cpu"], 3)
+        for r in out["results"]:
+            path = Path(r["input"])
+            if r["error"] is not None:
+                log(f"Error processing {path.name}: {r['error']}")
+                summary["errors"] += 1
+                continue
+            if r["reason"]:
+                summary["quarantined"][r["reason"]] = summary["quarantined"].get(r["reason"], 0) + 1
+            elif r["outputs"]:
+                summary["saved"] += 1
+            if manifest is not None:
+                manifest.record(path, r["outputs"], digest=r["sha256"], stat=r["stat"])
+        done += len(out["results"])
+        now = time.perf_counter()
+        if jobs > 1 and now - last >= PROGRESS_EVERY:
+            last = now
+            print(f"[Briar] {done}/{len(todo)} files ({done / (now - started):.0f}/s)", flush=True)
+
+    settings = {"OUTPUT_DIR": OUTPUT_DIR, "QUARANTINE_DIR": QUARANTINE_DIR, "MAX_TURNS": MAX_TURNS,
+                "TRIM_MODE": TRIM_MODE}
+    for out in run_batches(_convert_batch, batches(todo, jobs), jobs, (hash_inputs,), settings):
+        merge(out)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+def write_summary(summary):
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    path = OUTPUT_DIR / SUMMARY_NAME
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    reasons = ", ".join(f"{k} {v}" for k, v in sorted(summary["quarantined"].items())) or "none"
+    log(f"Converted {summary['saved']} of {summary['files']} files in {summary['seconds']:.1f}s "
+        f"with {summary['jobs']} job(s); quarantined: {reasons}; errors: {summary['errors']}")
 
 def main():
     import sys
 
-    # Get limit from command line args or environment
+    # Get limit from command line args or environment; --force rebuilds unchanged inputs,
+    # --jobs N sets the number of worker processes (1 converts in-process)
+    force = force_requested(sys.argv[1:])
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    jobs = pop_jobs(args, log)
     limit = None
-    if len(sys.argv) > 1:
+    if args:
         try:
-            limit = int(sys.argv[1])
+            limit = int(args[0])
         except ValueError:
             pass
     if limit is None:
@@ -174,8 +313,15 @@ def main():
         return
 
     files = [f for f in INPUT_DIR.iterdir() if f.suffix == ".json"]
+    manifest = None
+    if StageManifest is not None:
+        manifest = StageManifest.for_dir(OUTPUT_DIR, "briar", f"{STAGE_VERSION}:{MAX_TURNS}:{TRIM_MODE}", force)
+        # Outputs of conversations Sheele no longer produces go with them.
+        manifest.prune(files)
     if not files:
         log("No .json files to process.")
+        if manifest is not None:
+            manifest.save()
         return
 
     # Sort files by modification time or name
@@ -186,12 +332,20 @@ def main():
         files = files[:limit]
         log(f"Limiting to {limit} files (was {len(files)})")
 
+    sweep_temp_files(OUTPUT_DIR, QUARANTINE_DIR)
+    todo = []
     for idx, file_path in enumerate(files):
-        try:
-            process_json_file(file_path, idx)
-        except Exception as e:
-            log(f"Error processing {file_path.name}: {e}")
+        if manifest is not None and manifest.fresh(file_path):
+            continue
+        if manifest is not None:
+            manifest.discard_outputs(file_path)
+        todo.append((idx, file_path))
+    summary = convert_files(todo, manifest, jobs)
+    write_summary(summary)
 
+    if manifest is not None:
+        manifest.save()
+        log(manifest.summary())
     log("All conversations processed.")
 
 if __name__ == "__main__":
@@ -1,35 +1,160 @@
-import os
-import re
-import time
+import atexit
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from itertools import chain
 from pathlib import Path
 
+try:
+    from eden_manifest import StageManifest, force_requested
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_manifest import StageManifest, force_requested
+    except ImportError:
+        StageManifest = None
+
+        def force_requested(argv=None):
+            return True
+
 # === PATHS ===
-EDEN_ROOT = Path(os.environ.get("EDEN_ROOT", Path.cwd()))
-DATA_ROOT = Path(os.environ.get("EDEN_DATA_ROOT", EDEN_ROOT / "data"))
-SRC_DIR = DATA_ROOT / "exports" / "openai_exports" / "conversations_text"
-OUT_DIR = DATA_ROOT / "exports" / "openai_exports" / "codeblocks"
-LOG_FILE = DATA_ROOT / "exports" / "openai_exports" / "codexa_v3.log"
+EDEN_ROOT = Path(os.environ.get("EDEN_ROOT", Path.cwd()))
+DATA_ROOT = Path(os.environ.get("EDEN_DATA_ROOT", EDEN_ROOT / "data"))
+SRC_DIR = DATA_ROOT / "exports" / "openai_exports" / "conversations_text"
+OUT_DIR = DATA_ROOT / "exports" / "openai_exports" / "codeblocks"
+LOG_FILE = DATA_ROOT / "exports" / "openai_exports" / "codexa_v3.log"
+# Bump when the extraction regex or payload format changes.
+STAGE_VERSION = "4"
+# Blocks larger than this spill from memory to a temp file while being read.
+SPOOL_BYTES = 1 << 20
+WRITE_BUFFER = 1 << 16
 
 # === REGEX ===
+# Reference form of the fence grammar; the extractor below reads it line by line.
 CODEBLOCK = re.compile(r"```([a-zA-Z0-9_\-+.]*)\s*\n(.*?)\n```", re.DOTALL)
+FENCE_TAIL = re.compile(r"([a-zA-Z0-9_\-+.]*)\s*")
 
 
 # === UTILITIES ===
+_log_fh = None
+
+
+def _close_log():
+    global _log_fh
+    if _log_fh is not None:
+        try:
+            _log_fh.close()
+        except Exception:
+            pass
+        _log_fh = None
+
+
+atexit.register(_close_log)
+
+
 def log(msg: str):
 
+    global _log_fh
     ts = time.strftime("%Y-%m-%d %H:%M:%S")
     line = f"{ts} [CodexaV3] {msg}"
     print(line)
     try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        if _log_fh is None or _log_fh.name != str(LOG_FILE):
+            _close_log()
+            _log_fh = open(LOG_FILE, "a", encoding="utf-8", buffering=WRITE_BUFFER)
+        _log_fh.write(line + "\n")
     except Exception:
         pass
 
 
+def _find_opener(line: str, start: int = 0):
+    """Language of the first fence opening in line[start:], or None.
+
+    The fence may sit mid-line ("[KIN] ```python") but must be followed by
+    nothing except the language and whitespace up to the newline.
+    """
+    if not line.endswith("\n"):
+        return None
+    at = line.find("```", start)
+    while at != -1:
+        m = FENCE_TAIL.fullmatch(line, at + 3)
+        if m:
+            return m.group(1)
+        at = line.find("```", at + 1)
+    return None
+
+
+def iter_fence_events(lines):
+    """Stream fenced code blocks out of an iterable of lines (with their newlines).
+
+    Yields ("open", lang), then ("code", line) for each code line (without
+    the newline), then ("close", None), or ("drop", None) when the input
+    ends inside a block. ("reset", None) means the code so far is void and
+    the block restarts. Only the current line is held. Finds the same
+    blocks CODEBLOCK.finditer() finds on the whole text:
+    whitespace-only lines right after the opener are skipped, the first
+    code line never closes the block, and a later line starting with ```
+    does.
+    """
+    state = "out"
+    blank = None   # last whitespace-only line after the opener
+    salvage = None  # what the regex backtracks to if no closing fence follows
+    for line in lines:
+        start = 0
+        while True:
+            if state == "out":
+                if "```" not in line:
+                    break
+                lang = _find_opener(line, start)
+                if lang is None:
+                    break
+                yield "open", lang
+                state, blank, salvage = "lead", None, None
+                break
+            if state == "lead":
+                if not line.strip():
+                    blank = line
+                    break
+                state = "body"
+                if blank is not None and line.startswith("```"):
+                    # Without a later fence the regex closes here instead,
+                    # keeping the last blank line as the code.
+                    salvage = blank[:-1]
+                yield "code", line[:-1] if line.endswith("\n") else line
+                break
+            if line.startswith("```"):
+                yield "close", None
+                state = "out"
+                start = 3  # the rest of the closing line may open the next block
+                continue
+            yield "code", line[:-1] if line.endswith("\n") else line
+            break
+    if salvage is not None and state == "body":
+        yield "reset", None
+        yield "code", salvage
+        yield "close", None
+    elif state != "out":
+        yield "drop", None
+
+
 def extract_blocks(text: str):
     """Return list of (language, code) from code fences."""
-    return [(m.group(1) or "plain", m.group(2)) for m in CODEBLOCK.finditer(text)]
+    blocks = []
+    for event, value in iter_fence_events(io.StringIO(text)):
+        if event == "open":
+            lang, code = value or "plain", []
+        elif event == "code":
+            code.append(value)
+        elif event == "reset":
+            code = []
+        elif event == "close":
+            blocks.append((lang, "\n".join(code)))
+    return blocks
 
 
 def sanitize_name(name: str):
@@ -38,56 +163,302 @@ def sanitize_name(name: str):
     return name.strip("_")[:120]
 
 
-def write_codeblock(chatname: str, lang: str, idx: int, code: str):
-    """Write each code block as a .chaos file."""
-    safe = sanitize_name(chatname)
-    lang_safe = lang if lang else "plain"
-    out_folder = OUT_DIR / lang_safe
-    out_folder.mkdir(parents=True, exist_ok=True)
-
-    fname = f"{safe}.block{idx}.{lang_safe}.codeblock.chaos"
-    path = out_folder / fname
-
-    payload = (
+def _header(chatname: str, lang_safe: str) -> str:
+    return (
         f"# source: {chatname}\n"
         f"# lang: {lang_safe}\n"
         f"# extracted_by: CodexaV3\n\n"
-        f"{code}\n"
     )
-    path.write_text(payload, encoding="utf-8")
+
+
+class BlockStore:
+    """Corpus-wide dedupe index: one .chaos file per distinct code block.
+
+    Maps each block's sha256 to the file holding it, and each source to the
+    blocks it contains. A repeat only adds a reference; ``collect`` deletes a
+    file once no source refers to its block any more.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = Path(out_dir)
+        self.path = self.out_dir / ".codexa_blocks.json"
+        self.paths = {}    # sha256 -> path relative to out_dir (posix)
+        self.sources = {}  # source key -> [sha256, ...], each block once
+        self.dirty = False
+        try:
+            # On disk each source is a string of positions in "blocks", not a list
+            # of 64-character digests: a million-entry index loads without a
+            # million int objects.
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("stage_version") == STAGE_VERSION:
+                digests = [sys.intern(d) for d, _ in data["blocks"]]
+                sources = {k: [digests[int(i)] for i in v.split()] for k, v in data["sources"].items()}
+                self.paths = {d: rel for d, (_, rel) in zip(digests, data["blocks"])}
+                self.sources = sources
+        except Exception:
+            pass
+        # Sources per block. A popular block's digest is one shared string, not one per occurrence.
+        self.refs = dict.fromkeys(self.paths, 0)
+        for digests in self.sources.values():
+            for digest in digests:
+                self.refs[digest] += 1
+        self.owners = {rel: digest for digest, rel in self.paths.items()}
+        self.present = set()  # digests whose file was seen on disk this run
+
+    @staticmethod
+    def key(source: Path) -> str:
+        return os.path.abspath(source)
+
+    def has(self, digest: str) -> bool:
+        if digest in self.present:
+            return True
+        rel = self.paths.get(digest)
+        if rel is None or not os.path.exists(os.path.join(self.out_dir, rel)):
+            return False
+        self.present.add(digest)
+        return True
+
+    def complete(self, key: str) -> bool:
+        """Every block recorded for the source still has its file."""
+        return all(self.has(d) for d in self.sources.get(key, ()))
+
+    def release(self, key: str) -> None:
+        for digest in self.sources.pop(key, ()):
+            self.refs[digest] -= 1
+        self.dirty = True
+
+    def retain(self, keys) -> None:
+        """Release every source whose key is not in ``keys``."""
+        keys = set(keys)
+        for key in [k for k in self.sources if k not in keys]:
+            self.release(key)
+
+    def _rel(self, path: Path):
+        try:
+            return Path(path).relative_to(self.out_dir).as_posix()
+        except ValueError:
+            return None
+
+    def holds(self, path: Path) -> bool:
+        return self._rel(path) in self.owners
+
+    def claim(self, path: Path, digest: str) -> bool:
+        """True when path may hold digest: free, already its own, or left by a block no source uses."""
+        rel = self._rel(path)
+        owner = self.owners.get(rel)
+        if owner is None or owner == digest:
+            return True
+        if self.refs[owner]:
+            return False
+        del self.paths[owner], self.refs[owner], self.owners[rel]
+        self.present.discard(owner)
+        return True
+
+    def add(self, key: str, digest: str, path: Path = None) -> None:
+        """Record that source ``key`` contains the block; callers add each block once per source."""
+        digest = sys.intern(digest)
+        if path is not None:
+            old = self.paths.get(digest)
+            if old is not None and self.owners.get(old) == digest:
+                del self.owners[old]
+            rel = self._rel(path)
+            self.paths[digest] = rel
+            self.owners[rel] = digest
+            self.present.add(digest)
+        self.refs[digest] = self.refs.get(digest, 0) + 1
+        self.sources.setdefault(key, []).append(digest)
+        self.dirty = True
+
+    def collect(self) -> int:
+        """Delete the files of blocks no source contains any more."""
+        removed = 0
+        for digest in [d for d, refs in self.refs.items() if not refs]:
+            rel = self.paths.pop(digest)
+            del self.refs[digest]
+            self.present.discard(digest)
+            if self.owners.get(rel) == digest:
+                del self.owners[rel]
+                try:
+                    (self.out_dir / rel).unlink()
+                    removed += 1
+                except OSError:
+                    pass
+            self.dirty = True
+        return removed
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        ids = {digest: i for i, digest in enumerate(self.paths)}
+        with open(tmp, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            # Written source by source so the encoded index is never held whole.
+            f.write(f'{{"stage_version":{json.dumps(STAGE_VERSION)},"blocks":')
+            json.dump([[d, rel] for d, rel in self.paths.items()], f, separators=(",", ":"))
+            f.write(',"sources":{')
+            for n, (key, digests) in enumerate(self.sources.items()):
+                f.write(f'{"," if n else ""}{json.dumps(key)}:"{" ".join(str(ids[d]) for d in digests)}"')
+            f.write("}}")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class _Spool:
+    """Code of the block being read: hashed as it arrives, kept in memory up
+    to SPOOL_BYTES and moved to a temp file beyond that."""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.parts = []
+        self.size = 0
+        self.file = None
+        self.empty = True
+
+    def add_lines(self, lines):
+        if not lines:
+            return
+        data = ("\n".join(lines) if self.empty else "\n" + "\n".join(lines)).encode("utf-8")
+        self.empty = False
+        self.digest.update(data)
+        self.parts.append(data)
+        self.size += len(data)
+        if self.size > SPOOL_BYTES:
+            if self.file is None:
+                self.file = tempfile.TemporaryFile()
+            self.file.write(b"".join(self.parts))
+            self.parts, self.size = [], 0
+
+    def chunks(self):
+        if self.file is not None:
+            self.file.seek(0)
+            yield from iter(lambda: self.file.read(WRITE_BUFFER), b"")
+        yield b"".join(self.parts)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def extract_file(fp: Path, store: BlockStore, stats: dict):
+    """Stream one transcript and write the blocks the store does not hold yet.
+
+    Memory per file stays flat however long a block runs (see _Spool).
+    Returns the files written for this source.
+    """
+    key = store.key(fp)
+    seen = set()
+    written = []
+    idx = 0
+    lang_safe = "plain"
+    spool = None
+    pending, pending_size = [], 0
+    try:
+        with open(fp, "r", encoding="utf-8", errors="ignore") as fh:
+            for event, value in iter_fence_events(fh):
+                if event == "code":
+                    pending.append(value)
+                    pending_size += len(value)
+                    if pending_size > WRITE_BUFFER:
+                        spool.add_lines(pending)
+                        pending, pending_size = [], 0
+                    continue
+                if event == "close":
+                    spool.add_lines(pending)
+                    digest = spool.digest.hexdigest()
+                    if digest in seen:
+                        stats["duplicates"] += 1
+                    elif store.has(digest):
+                        stats["duplicates"] += 1
+                        seen.add(digest)
+                        store.add(key, digest)
+                    else:
+                        out = _publish_block(fp.stem, lang_safe, idx, digest, spool, store)
+                        log(f"Wrote {out.name}")
+                        written.append(out)
+                        stats["written"] += 1
+                        seen.add(digest)
+                        store.add(key, digest, out)
+                pending, pending_size = [], 0
+                if spool is not None:
+                    spool.close()
+                    spool = None
+                if event == "open":
+                    idx += 1
+                    lang_safe = value or "plain"
+                if event in ("open", "reset"):
+                    spool = _Spool()
+    finally:
+        if spool is not None:
+            spool.close()
+    return written
+
+
+def _publish_block(chatname: str, lang_safe: str, idx: int, digest: str, spool: _Spool, store: BlockStore) -> Path:
+    out_folder = OUT_DIR / lang_safe
+    out_folder.mkdir(parents=True, exist_ok=True)
+    safe = sanitize_name(chatname)
+    path = out_folder / f"{safe}.block{idx}.{lang_safe}.codeblock.chaos"
+    if not store.claim(path, digest):
+        # That name still holds another block some other source shares.
+        path = out_folder / f"{safe}.block{idx}.{digest[:12]}.{lang_safe}.codeblock.chaos"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    newline = os.linesep.encode()  # what write_text() would have written
+    with open(tmp, "wb", buffering=WRITE_BUFFER) as f:
+        for chunk in chain([_header(chatname, lang_safe).encode("utf-8")], spool.chunks(), [b"\n"]):
+            f.write(chunk if newline == b"\n" else chunk.replace(b"\n", newline))
+    os.replace(tmp, path)
     return path
 
 
 # === MAIN ===
-def main():
+def main(argv=None):
 
+    argv = sys.argv[1:] if argv is None else argv
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     if not SRC_DIR.exists():
         log(f"Source folder missing: {SRC_DIR}")
         return
 
-    total_blocks = 0
-    for fp in sorted(SRC_DIR.glob("*.txt")):
+    sources = sorted(SRC_DIR.glob("*.txt"))
+    store = BlockStore(OUT_DIR)
+    store.retain(store.key(fp) for fp in sources)
+    manifest = None
+    if StageManifest is not None:
+        manifest = StageManifest.for_dir(OUT_DIR, "codexa", STAGE_VERSION, force_requested(argv))
+        manifest.prune(sources)
+
+    stats = {"written": 0, "duplicates": 0}
+    for fp in sources:
+        key = store.key(fp)
+        if manifest is not None and manifest.fresh(fp) and store.complete(key):
+            continue
+        store.release(key)
         try:
-            text = fp.read_text(encoding="utf-8", errors="ignore")
+            extract_file(fp, store, stats)
         except Exception as e:
             log(f"WARN: Cannot read {fp.name}: {e}")
             continue
+        if manifest is not None:
+            # Block files belong to the store; this only clears outputs an older
+            # stage version recorded that the store did not take over.
+            legacy = manifest.outputs(fp)
+            if legacy:
+                manifest.discard_outputs(fp, keep=[p for p in legacy if store.holds(p)])
+            manifest.record(fp, [])
 
-        blocks = extract_blocks(text)
-        if not blocks:
-            continue
-
-        for i, (lang, code) in enumerate(blocks, start=1):
-            out = write_codeblock(fp.stem, lang, i, code)
-            log(f"Wrote {out.name}")
-            total_blocks += 1
-
-    if total_blocks == 0:
-        log("No code blocks found.")
+    removed = store.collect()
+    store.save()
+    if manifest is not None:
+        manifest.save()
+        log(manifest.summary())
+    if stats["written"] == 0:
+        log(f"No new code blocks ({stats['duplicates']} already stored, {removed} removed).")
     else:
         log(
-            f"✅ Done. Wrote {total_blocks} .codeblock.chaos files across all languages."
+            f"✅ Done. Wrote {stats['written']} .codeblock.chaos files across all languages "
+            f"({stats['duplicates']} duplicates skipped, {removed} removed)."
         )
 
 
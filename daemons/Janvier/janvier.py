@@ -1,9 +1,26 @@
 from __future__ import annotations
 
 from datetime import datetime
+import hashlib
 import json
+import os
 from pathlib import Path
 import re
+import sys
+
+try:
+    from eden_manifest import StageManifest, force_requested
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_manifest import StageManifest, force_requested
+    except ImportError:
+        StageManifest = None
+
+        def force_requested(argv=None):
+            return True
+
+from eden_pool import batches, default_jobs, pool_size, pop_jobs, run_batches, sweep_temp_files
 
 # Get paths relative to script location
 SCRIPT_DIR = Path(__file__).parent
@@ -12,6 +29,20 @@ RHEA_DIR = BASE_DIR / "Rhea"
 
 INPUT_DIR = RHEA_DIR / "outputs" / "Briar" / "split_conversations_txt"
 OUTPUT_DIR = RHEA_DIR / "outputs" / "Janvier" / "chaos_threads"
+# Bump when the .chaos layout changes; it is part of every output name, so a
+# bump rewrites everything and the old files go once nothing records them.
+STAGE_VERSION = "2"
+# Worker processes for parsing (--jobs N); small batches stay in-process.
+JOBS = default_jobs("JANVIER_JOBS")
+# Output names carry this many hex digits of the source's sha256.
+NAME_HASH = 12
+# Conversations without a usable "(YYYY-MM-DD)" in their header.
+UNDATED = "undated"
+QUIET = False  # workers report through the parent instead
+
+def log(msg):
+    if not QUIET:
+        print(f"[Janvier] {msg}")
 
 def clean_filename(raw: str, max_length: int = 50) -> str:
     # Remove or replace invalid characters
@@ -29,16 +60,19 @@ def parse_txt_file(txt_file_path: Path):
     try:
         content = txt_file_path.read_text(encoding="utf-8")
     except Exception as e:
-        print(f"[Janvier] Error reading {txt_file_path.name}: {e}")
+        log(f"Error reading {txt_file_path.name}: {e}")
         return None, None, None
+    return parse_txt(content)
 
+def parse_txt(content: str):
     lines = content.splitlines()
     if not lines:
         return None, None, None
 
     title_line = lines[0] if lines[0].startswith("--- Conversation:") else None
     title = "Untitled"
-    date = datetime.now().strftime("%Y-%m-%d")
+    # Never the run date: the same transcript must always give the same .chaos.
+    date = UNDATED
 
     if title_line:
         try:
@@ -74,6 +108,8 @@ def parse_txt_file(txt_file_path: Path):
     return title, date, conversation
 
 def convert_to_chaos(title, date, conversation):
+    # Transcripts carry no per-turn times; nodes take the conversation's date.
+    timestamp = None if date == UNDATED else f"{date}T00:00:00"
     nodes = []
     for i, turn in enumerate(conversation):
         nodes.append(
@@ -81,64 +117,179 @@ def convert_to_chaos(title, date, conversation):
                 "id": f"node_{i+1}",
                 "role": turn["role"],
                 "content": turn["text"],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
             }
         )
     return {"title": title, "date": date, "nodes": nodes}
 
-def main():
-    print("[Janvier] Booting...")
-    print("[Janvier] Rhea root:", RHEA_DIR)
-    print("[Janvier] INPUT_DIR:", INPUT_DIR)
-    print("[Janvier] OUTPUT_DIR:", OUTPUT_DIR)
+def chaos_name(title: str, date: str, digest: str) -> str:
+    """Stable output name: the same source bytes always map to the same file."""
+    return f"{date}_{clean_filename(title)}.{digest[:NAME_HASH]}.v{STAGE_VERSION}.chaos"
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    if not INPUT_DIR.exists():
-        print(f"[Janvier] Input directory not found: {INPUT_DIR}")
-        return
+def write_chaos(chaos_data, outpath: Path):
+    tmp = outpath.with_name(f".{outpath.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(chaos_data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, outpath)
 
-    print("[Janvier] INPUT_DIR exists:", INPUT_DIR.exists())
-    txt_files = list(INPUT_DIR.glob("*.txt"))
-    print("[Janvier] Files found:", len(txt_files))
+def emit_file(txt_path: Path, rewrite: bool = False):
+    """Parse one transcript and write its .chaos unless that name already exists.
 
-    if not txt_files:
-        print("[Janvier] No .txt files found to process.")
-        return
+    Returns a result dict with the source's sha256 and stat for the manifest.
+    """
+    log(f"Reading: {txt_path.name}")
+    result = {"input": str(txt_path), "output": None, "written": False, "error": None, "sha256": None, "stat": None}
+    try:
+        st = os.stat(txt_path)
+        data = txt_path.read_bytes()
+    except OSError as e:
+        result["error"] = f"Error reading {txt_path.name}: {e}"
+        return result
+    result["sha256"] = hashlib.sha256(data).hexdigest()
+    result["stat"] = (st.st_size, st.st_mtime_ns)
+    try:
+        title, date, conversation = parse_txt(data.decode("utf-8"))
+    except UnicodeDecodeError as e:
+        log(f"Error reading {txt_path.name}: {e}")
+        return result
+    if title is None:
+        return result
+    outpath = OUTPUT_DIR / chaos_name(title, date, result["sha256"])
+    result["output"] = str(outpath)
+    if rewrite or not outpath.exists():
+        write_chaos(convert_to_chaos(title, date, conversation), outpath)
+        result["written"] = True
+    return result
+
+# =============================
+# Batch parsing
+# =============================
+def _emit_batch(batch, rewrite):
+    results = []
+    for path in batch:
+        try:
+            results.append(emit_file(path, rewrite))
+        except Exception as e:
+            results.append({"input": str(path), "output": None, "written": False, "error": str(e),
+                            "sha256": None, "stat": None})
+    return results
+
+def emit_files(todo, rewrite=False, jobs=None):
+    """Parse and write [path] serially or on a process pool; yields one result per file."""
+    jobs = pool_size(jobs, JOBS, len(todo))
+    if jobs > 1:
+        log(f"Parsing {len(todo)} files with {jobs} jobs")
+    for results in run_batches(_emit_batch, batches(todo, jobs), jobs, (rewrite,), {"OUTPUT_DIR": OUTPUT_DIR}):
+        yield from results
+
+# =============================
+# Compaction
+# =============================
+def _canonical_digest(path: Path):
+    """Hash of a .chaos minus its node timestamps, which older runs set to the wall clock."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and isinstance(data.get("nodes"), list):
+        data = dict(data, nodes=[{k: v for k, v in n.items() if k != "timestamp"} if isinstance(n, dict) else n
+                                 for n in data["nodes"]])
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
 
-    processed_count = 0
-    for txt_path in sorted(txt_files):
-        print("[Janvier] Reading:", txt_path.name)
+def compact(manifest=None, dry_run=False):
+    """Delete .chaos files whose content another file in OUTPUT_DIR already holds.
 
-        title, date, conversation = parse_txt_file(txt_path)
-        if title is None:
-            print(f"[Janvier] Skipping {txt_path.name} - could not parse")
+    Of each group of duplicates the files the manifest records stay (current
+    outputs are never touched); otherwise the newest one does. Returns
+    (files removed, bytes freed).
+    """
+    claimed = manifest.claimed_outputs() if manifest is not None else set()
+    groups = {}
+    for path in OUTPUT_DIR.glob("*.chaos"):
+        try:
+            groups.setdefault(_canonical_digest(path), []).append(path)
+        except Exception as e:
+            log(f"Compaction skips {path.name}: {e}")
+    removed = freed = 0
+    for paths in groups.values():
+        if len(paths) < 2:
             continue
+        keep = {p for p in paths if os.path.abspath(p) in claimed}
+        if not keep:
+            keep = {max(paths, key=lambda p: (p.stat().st_mtime_ns, p.name))}
+        for path in paths:
+            if path in keep:
+                continue
+            size = path.stat().st_size
+            if not dry_run:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    log(f"Cannot remove {path.name}: {e}")
+                    continue
+            log(f"{'Would remove' if dry_run else 'Removed'} duplicate {path.name}")
+            removed += 1
+            freed += size
+    return removed, freed
 
-        chaos_data = convert_to_chaos(title, date, conversation)
+def main(argv=None):
+    # --force rebuilds unchanged sources, --jobs N sets the worker processes
+    # (1 parses in-process), --compact then deletes duplicate .chaos files
+    # left by earlier runs (--dry-run only lists them).
+    argv = list(sys.argv[1:] if argv is None else argv)
+    force = force_requested(argv)
+    jobs = pop_jobs(argv, log)
+    log("Booting...")
+    log(f"Rhea root: {RHEA_DIR}")
+    log(f"INPUT_DIR: {INPUT_DIR}")
+    log(f"OUTPUT_DIR: {OUTPUT_DIR}")
 
-        # Better filename construction
-        safe_title = clean_filename(title)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    if not INPUT_DIR.exists():
+        log(f"Input directory not found: {INPUT_DIR}")
+        return
 
-        out_filename = f"{date}_{timestamp}_{safe_title}.chaos"
+    log(f"INPUT_DIR exists: {INPUT_DIR.exists()}")
+    txt_files = list(INPUT_DIR.glob("*.txt"))
+    log(f"Files found: {len(txt_files)}")
 
-        # Ensure unique filename
-        outpath = OUTPUT_DIR / out_filename
-        counter = 1
-        while outpath.exists():
-            out_filename = f"{date}_{timestamp}_{safe_title}_{counter}.chaos"
-            outpath = OUTPUT_DIR / out_filename
-            counter += 1
+    manifest = None
+    if StageManifest is not None:
+        manifest = StageManifest.for_dir(OUTPUT_DIR, "janvier", STAGE_VERSION, force)
+        manifest.prune(txt_files)
+        manifest.save()
 
-        try:
-            with open(outpath, "w", encoding="utf-8") as f:
-                json.dump(chaos_data, f, indent=2, ensure_ascii=False)
-            print("[Janvier] Wrote:", outpath.name)
-            processed_count += 1
-        except Exception as e:
-            print(f"[Janvier] Error writing {outpath.name}: {e}")
+    if not txt_files:
+        log("No .txt files to process.")
+    else:
+        sweep_temp_files(OUTPUT_DIR)
+        todo = [p for p in sorted(txt_files) if manifest is None or not manifest.fresh(p)]
+        # Deleted only once nothing records them: an unchanged or duplicated
+        # source keeps its name, so its old output may be the new one too.
+        previous = [out for p in todo for out in manifest.outputs(p)] if manifest is not None else []
+        written = unchanged = 0
+        for result in emit_files(todo, rewrite=force, jobs=jobs):
+            path = Path(result["input"])
+            if result["error"] is not None:
+                log(result["error"])
+                continue
+            if result["output"] is None:
+                log(f"Skipping {path.name} - could not parse")
+            elif result["written"]:
+                log(f"Wrote: {Path(result['output']).name}")
+                written += 1
+            else:
+                unchanged += 1
+            if manifest is not None:
+                outputs = [result["output"]] if result["output"] else []
+                manifest.record(path, outputs, digest=result["sha256"], stat=result["stat"])
+        if manifest is not None:
+            manifest.discard_unclaimed(previous)
+            manifest.save()
+            log(manifest.summary())
+        log(f"Processed {written + unchanged} files successfully ({written} written, {unchanged} already on disk).")
 
-    print(f"[Janvier] Processed {processed_count} files successfully.")
+    if "--compact" in argv:
+        removed, freed = compact(manifest, dry_run="--dry-run" in argv)
+        verb = "Would remove" if "--dry-run" in argv else "Compaction removed"
+        log(f"{verb} {removed} duplicate .chaos files ({freed / (1 << 20):.1f} MB).")
 
 if __name__ == "__main__":
     main()
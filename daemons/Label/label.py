@@ -1,7 +1,21 @@
 import argparse
+import hashlib
 import json
+import sys
 from pathlib import Path
 
+try:
+    from eden_manifest import StageManifest, force_requested
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_manifest import StageManifest, force_requested
+    except ImportError:
+        StageManifest = None
+
+        def force_requested(argv=None):
+            return True
+
 """Label chaos threads with tags from a word bank.
 
 Usage examples:
@@ -23,6 +37,8 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_INPUT_DIR = Path("Rhea/outputs/Janvier/chaos_threads")
 DEFAULT_OUTPUT_DIR = Path("Rhea/outputs/Label/labeled")
 DEFAULT_WORD_BANK_FILE = Path("Label/LabelWordBank.chaos")
+# Bump when the labels layout changes; the word bank's hash is folded in below.
+STAGE_VERSION = "1"
 
 
 def resolve_path(path_value: Path, base_dir: Path) -> Path:
@@ -98,6 +114,11 @@ def parse_args():
         default=DEFAULT_WORD_BANK_FILE,
         help="Path to the LabelWordBank.chaos file (relative paths resolve from --base-dir).",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Relabel every input, even ones unchanged since the last run.",
+    )
     args = parser.parse_args()
 
     base_dir = args.base_dir.resolve()
@@ -115,16 +136,31 @@ def main():
         return
 
     wordbank = load_wordbank(args.word_bank)
-
-    for path in sorted(args.input_dir.glob("*.chaos")):
-        if not path.is_file():
+    inputs = [p for p in sorted(args.input_dir.glob("*.chaos")) if p.is_file()]
+
+    manifest = None
+    if StageManifest is not None:
+        # A new word bank changes every label, so it is part of the stage version.
+        bank_hash = hashlib.sha256(json.dumps(wordbank, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        manifest = StageManifest.for_dir(args.output_dir, "label", f"{STAGE_VERSION}:{bank_hash}",
+                                         args.force or force_requested())
+        manifest.prune(inputs)
+
+    for path in inputs:
+        if manifest is not None and manifest.fresh(path):
             continue
         result = process_file(path, wordbank)
         outname = f"{path.stem}_labels.chaos"
         outpath = args.output_dir / outname
         with outpath.open("w", encoding="utf-8") as f:
             json.dump(result, f, indent=2)
+        if manifest is not None:
+            manifest.record(path, [outpath])
         print(f"✅ Label tagged {path.name} -> {outname}")
 
+    if manifest is not None:
+        manifest.save()
+        print(f"Label {manifest.summary()}")
+
 if __name__ == "__main__":
     main()
@@ -21,6 +21,8 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_SOURCE_DIR = REPO_ROOT / "Rhea" / "outputs" / "Janvier" / "chaos_threads"
 DEFAULT_DEST_DIR = REPO_ROOT / "Rhea" / "PattyMae" / "organized"
 SUPPORTED_RELATED_EXTENSIONS: tuple[str, ...] = (".mirror.json", ".chaosmeta")
+# Aderyn keeps every summon in one append-only archive, not per-file *_summons.chaos.
+SUMMONS_ARCHIVE = "summons.jsonl"
 
 
 def ensure_dir(path: Path) -> None:
@@ -30,7 +32,9 @@ def ensure_dir(path: Path) -> None:
 
 def iter_chaos_files(source_dir: Path) -> Iterable[Path]:
 
-    return (path for path in source_dir.rglob("*.chaos") if path.is_file())
+    for path in source_dir.rglob("*"):
+        if path.is_file() and (path.suffix == ".chaos" or path.name == SUMMONS_ARCHIVE):
+            yield path
 
 
 def find_related_files(chaos_file: Path, include_related: bool) -> list[Path]:
@@ -49,7 +53,7 @@ def categorize(fname: str) -> str:
 
     if fname.endswith("_labels.chaos"):
         return "Labeled"
-    if fname.endswith("_summons.chaos"):
+    if fname.endswith("_summons.chaos") or fname == SUMMONS_ARCHIVE:
         return "Summons"
     if fname.endswith("_sacred.chaos"):
         return "Sacred"
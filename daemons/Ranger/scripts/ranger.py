@@ -24,8 +24,10 @@ import tempfile
 import platform
 import configparser
 import fnmatch
-from datetime import datetime
-import timedelta
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional
 
 # Lightweight deps only
@@ -43,10 +45,12 @@ except Exception:  # fallback if rich not installed
         def print(self, *a, **k): print(*a)
 
     Console = lambda: _Dummy()
-def Panel(*a, **k):
 
-    return  a[0] if a else ""
-    Table = object
+    def Panel(*a, **k):
+
+        return  a[0] if a else ""
+    Panel.fit = Panel
+    Table = None
 
 console = Console()
 
@@ -88,6 +92,9 @@ EDEN_LLM_MODEL = os.getenv("EDEN_LLM_MODEL", "Llama 3.2 3B Instruct")
 # Text intake limits
 MAX_TEXT_BYTES = 200_000
 
+# ask() answer cache: seconds an answer stays valid (0 disables the cache)
+ANSWER_TTL = float(os.getenv("RANGER_ANSWER_TTL", str(24 * 3600)))
+
 # What we index into FTS (keep it light)
 PLAIN_EXTS = {
     ".txt", ".md", ".py", ".json", ".csv", ".log", ".ini",
@@ -232,11 +239,44 @@ def _cfg_keep_days(cfg) -> int:
         return HUNT_ROTATE_KEEP_DAYS
 
 # ---------------------- SQLite / FTS5 ---------------
+# filetext rows share their rowid with files.id, so re-indexing one file is a
+# rowid lookup instead of a scan of the whole FTS table.
+SCHEMA_VERSION = 1
+_LOCAL = threading.local()
+
 def db() -> sqlite3.Connection:
 
-    c = sqlite3.connect(DB_PATH)
-    c.execute("PRAGMA journal_mode=WAL;")
-    return c
+    """Persistent connection for the calling thread; ``with db() as cx`` is one transaction."""
+    cx = getattr(_LOCAL, "cx", None)
+    if cx is None or _LOCAL.path != DB_PATH:
+        cx = sqlite3.connect(DB_PATH, timeout=30)
+        cx.execute("PRAGMA journal_mode=WAL;")
+        cx.execute("PRAGMA synchronous=NORMAL;")
+        _LOCAL.cx, _LOCAL.path = cx, DB_PATH
+    return cx
+
+def close_db():
+
+    cx = getattr(_LOCAL, "cx", None)
+    if cx is not None:
+        cx.close()
+        _LOCAL.cx = None
+
+def _migrate(cx: sqlite3.Connection):
+
+    if cx.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    # v0 -> v1: re-key filetext by files.id (the FTS table keeps its own copy of content).
+    cx.executescript("""
+    DROP TABLE IF EXISTS filetext_v1;
+    CREATE VIRTUAL TABLE filetext_v1 USING fts5(path, content, tokenize='porter');
+    INSERT INTO filetext_v1(rowid, path, content)
+        SELECT f.id, t.path, t.content FROM filetext t JOIN files f ON f.path = t.path
+        GROUP BY f.id;
+    DROP TABLE filetext;
+    ALTER TABLE filetext_v1 RENAME TO filetext;
+    """)
+    cx.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
 
 def init_db():
 
@@ -268,7 +308,20 @@ def init_db():
             rule TEXT,
             note TEXT
         );
+        CREATE TABLE IF NOT EXISTS answers(
+            key TEXT PRIMARY KEY,
+            question TEXT,
+            answer TEXT,
+            ts REAL
+        );
+        CREATE TABLE IF NOT EXISTS answer_paths(
+            key TEXT,
+            path TEXT
+        );
+        CREATE INDEX IF NOT EXISTS answer_paths_path ON answer_paths(path);
+        CREATE INDEX IF NOT EXISTS answer_paths_key ON answer_paths(key);
         """)
+        _migrate(cx)
     console.print(Panel.fit("DB ready", style=f"bold {PALETTE['ok']}"))
     report_to_rhea("heartbeat", {
         "status": "db_ready",
@@ -304,33 +357,236 @@ def read_text_for_index(path: str) -> str:
         return ""
 
 # ---------------------- Cataloging ------------------
-def upsert_file(path: str):
+def _stat_or_none(path: str):
 
     try:
-        st = os.stat(path)
+        return os.stat(path)
     except Exception:
-        return
-    p = pathlib.Path(path)
-    with db() as cx:
-        cx.execute("""
+        return None
+
+def _digest(path: str):
+
+    return sha1(path), read_text_for_index(path)
+
+def _apply_changes(cx: sqlite3.Connection, upserts: list, removes: list,
+                   pool: Optional[ThreadPoolExecutor] = None, stats: Optional[dict] = None):
+
+    """Apply one batch of catalog changes inside the caller's transaction.
+
+    A file whose size and mtime match its row is skipped without being read.
+    Otherwise it is hashed; the FTS row is rewritten only if the sha1 changed
+    (or the file was never indexed), else just size/mtime are refreshed.
+    """
+    stats = stats if stats is not None else {}
+    for k in ("upserts", "unchanged", "meta_only", "reindexed", "removed"):
+        stats.setdefault(k, 0)
+
+    if removes:
+        rows = [(p,) for p in removes]
+        invalidate_answers(cx, removes)
+        cx.executemany("DELETE FROM filetext WHERE rowid IN (SELECT id FROM files WHERE path=?)", rows)
+        cx.executemany("DELETE FROM files WHERE path=?", rows)
+        stats["removed"] += len(removes)
+    if not upserts:
+        return stats
+
+    known = {}
+    for i in range(0, len(upserts), 500):
+        chunk = upserts[i:i + 500]
+        q = f"SELECT path, id, size, mtime, sha1 FROM files WHERE path IN ({','.join('?' * len(chunk))})"
+        for path, fid, size, mtime, digest in cx.execute(q, chunk):
+            known[path] = (fid, size, mtime, digest)
+
+    todo = []
+    for path in upserts:
+        st = _stat_or_none(path)
+        if st is None:
+            continue
+        stats["upserts"] += 1
+        row = known.get(path)
+        if row is not None and row[1] == st.st_size and row[2] == st.st_mtime and row[3] is not None:
+            stats["unchanged"] += 1
+            continue
+        todo.append((path, st, row))
+    if not todo:
+        return stats
+
+    mapper = pool.map if pool is not None else map
+    digests = list(mapper(_digest, [t[0] for t in todo]))
+
+    meta, fresh, reindex = [], [], []
+    for (path, st, row), (digest, text) in zip(todo, digests):
+        if row is not None and digest is not None and digest == row[3]:
+            meta.append((st.st_size, st.st_mtime, row[0]))
+            stats["meta_only"] += 1
+            continue
+        p = pathlib.Path(path)
+        fresh.append((path, p.name, p.suffix.lower(), st.st_size, st.st_mtime, digest))
+        reindex.append((path, text, row[0] if row else None))
+    if meta:
+        cx.executemany("UPDATE files SET size=?, mtime=? WHERE id=?", meta)
+    if fresh:
+        cx.executemany("""
         INSERT INTO files(path, name, ext, size, mtime, sha1)
         VALUES(?,?,?,?,?,?)
-        ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime=excluded.mtime
-        """, (str(p), p.name, p.suffix.lower(), st.st_size, st.st_mtime, sha1(str(p))))
-        # FTS: replace old row and insert fresh
-        text = read_text_for_index(str(p))
-        if text:
-            cx.execute("DELETE FROM filetext WHERE path=?", (str(p),))
-            cx.execute("INSERT INTO filetext(path, content) VALUES(?,?)", (str(p), text))
+        ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime=excluded.mtime, sha1=excluded.sha1
+        """, fresh)
+        invalidate_answers(cx, [path for path, _, _ in reindex])
+        old_ids = [(fid,) for _, _, fid in reindex if fid is not None]
+        if old_ids:
+            cx.executemany("DELETE FROM filetext WHERE rowid=?", old_ids)
+        rows = []
+        for path, text, fid in reindex:
+            if not text:
+                continue
+            if fid is None:
+                fid = cx.execute("SELECT id FROM files WHERE path=?", (path,)).fetchone()[0]
+            rows.append((fid, path, text))
+        cx.executemany("INSERT INTO filetext(rowid, path, content) VALUES(?,?,?)", rows)
+        stats["reindexed"] += len(rows)
+    return stats
+
+def invalidate_answers(cx: sqlite3.Connection, paths: list):
+
+    """Drop cached ask() answers that cited any of ``paths``."""
+    for i in range(0, len(paths), 500):
+        chunk = paths[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        keys = [r[0] for r in cx.execute(f"SELECT DISTINCT key FROM answer_paths WHERE path IN ({marks})", chunk)]
+        if keys:
+            cx.executemany("DELETE FROM answers WHERE key=?", [(k,) for k in keys])
+            cx.executemany("DELETE FROM answer_paths WHERE key=?", [(k,) for k in keys])
+
+def upsert_file(path: str):
+
+    with db() as cx:
+        _apply_changes(cx, [str(pathlib.Path(path))], [])
 
 def remove_file(path: str):
 
     with db() as cx:
-        cx.execute("DELETE FROM files WHERE path=?", (path,))
-        cx.execute("DELETE FROM filetext WHERE path=?", (path,))
+        _apply_changes(cx, [], [path])
+
+class IndexWriter:
+    """Single writer thread that folds catalog changes and events into grouped transactions.
+
+    Watcher callbacks and the initial crawl only enqueue. The writer drains up
+    to ``batch_size`` items (or whatever arrived within ``interval``), keeps the
+    last change per path, and applies the batch in one transaction with
+    ``executemany``. Hashing and text reads for a batch run on ``hash_workers``
+    threads.
+    """
+
+    def __init__(self, batch_size: int = 1000, interval: float = 0.25, hash_workers: int = 4,
+                 max_queue: int = 100_000):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=hash_workers) if hash_workers > 1 else None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"batches": 0, "events": 0}
+
+    def start(self) -> "IndexWriter":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="ranger-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def upsert(self, path: str):
+        self._queue.put(("upsert", str(pathlib.Path(path))))
+
+    def remove(self, path: str):
+        self._queue.put(("remove", path))
+
+    def event(self, evtype: str, path: str, info: str = ""):
+        self._queue.put(("event", (time.time(), evtype, path, info)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is committed."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(("stop", None))
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            try:
+                batch = [self._queue.get()]
+            except Exception:
+                break
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                if batch[-1][0] in ("flush", "stop"):
+                    break
+            changes = {}
+            events, waiters = [], []
+            for kind, arg in batch:
+                if kind in ("upsert", "remove"):
+                    changes.pop(arg, None)  # keep the latest change, in arrival order
+                    changes[arg] = kind
+                elif kind == "event":
+                    events.append(arg)
+                elif kind == "flush":
+                    waiters.append(arg)
+                elif kind == "stop":
+                    stop = True
+            try:
+                self._commit(changes, events)
+            except Exception as e:
+                console.print(f"[{PALETTE['danger']}]Ranger writer error: {e}[/]")
+            for w in waiters:
+                w.set()
+        close_db()
+
+    def _commit(self, changes: dict, events: list):
+        if not changes and not events:
+            return
+        upserts = [p for p, k in changes.items() if k == "upsert"]
+        removes = [p for p, k in changes.items() if k == "remove"]
+        with db() as cx:
+            _apply_changes(cx, upserts, removes, self._pool, self.stats)
+            if events:
+                cx.executemany("INSERT INTO events(ts,type,path,info) VALUES(?,?,?,?)", events)
+        self.stats["batches"] += 1
+        self.stats["events"] += len(events)
+        for _, evtype, path, info in events:
+            report_to_rhea("event", {"event": evtype, "path": path, "info": info})
+
+_WRITER: Optional[IndexWriter] = None
+
+def start_writer(**options) -> IndexWriter:
+
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = IndexWriter(**options).start()
+    return _WRITER
+
+def stop_writer():
+
+    global _WRITER
+    if _WRITER is not None:
+        _WRITER.close()
+        _WRITER = None
 
 def log_event(evtype: str, path: str, info: str=""):
 
+    if _WRITER is not None:
+        _WRITER.event(evtype, path, info)
+        return
     with db() as cx:
         cx.execute("INSERT INTO events(ts,type,path,info) VALUES(?,?,?,?)",
                    (time.time(), evtype, path, info))
@@ -362,28 +618,33 @@ def run_rules(path: str):
 
 # ---------------------- Watcher --------------------
 class Handler(FileSystemEventHandler):
+    """Watcher callbacks only enqueue; the IndexWriter does the database work."""
+    def __init__(self, writer: IndexWriter):
+
+        super().__init__()
+        self.writer = writer
     def on_created(self, event):
 
         if event.is_directory: return
-        upsert_file(event.src_path); log_event("created", event.src_path); run_rules(event.src_path)
+        self.writer.upsert(event.src_path); log_event("created", event.src_path); run_rules(event.src_path)
     def on_modified(self, event):
 
         if event.is_directory: return
-        upsert_file(event.src_path); log_event("modified", event.src_path)
+        self.writer.upsert(event.src_path); log_event("modified", event.src_path)
     def on_moved(self, event):
 
         if event.is_directory: return
-        remove_file(event.src_path); upsert_file(event.dest_path)
+        self.writer.remove(event.src_path); self.writer.upsert(event.dest_path)
         log_event("moved", f"{event.src_path} -> {event.dest_path}")
     def on_deleted(self, event):
 
         if event.is_directory: return
-        remove_file(event.src_path); log_event("deleted", event.src_path)
+        self.writer.remove(event.src_path); log_event("deleted", event.src_path)
 
 def start_watch():
 
     obs = Observer()
-    h = Handler()
+    h = Handler(start_writer())
     for d in WATCH_DIRS:
         if os.path.isdir(d):
             obs.schedule(h, d, recursive=True)
@@ -419,19 +680,75 @@ def llm_chat(system_prompt: str, user_prompt: str, temperature: float = 0.2, max
     except Exception as e:
         return f"(LLM error: {e})"
 
+_STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "my", "me", "i", "do", "does", "of",
+              "in", "on", "to", "for", "and", "or", "what", "where", "which", "please"}
+
+def normalize_question(query: str) -> str:
+
+    """Lowercased word set minus filler words, so near-identical phrasings share a cache key."""
+    words = {w for w in re.findall(r"\w+", query.lower()) if w not in _STOPWORDS}
+    return " ".join(sorted(words))
+
+def _answer_key(query: str, rows: list) -> str:
+
+    h = hashlib.sha1(normalize_question(query).encode("utf-8"))
+    for p, snip in rows:
+        h.update(b"\0" + hashlib.sha1(f"{p}\n{snip}".encode("utf-8")).digest())
+    return h.hexdigest()
+
+def _cached_answer(cx: sqlite3.Connection, key: str) -> Optional[str]:
+
+    if ANSWER_TTL <= 0:
+        return None
+    row = cx.execute("SELECT answer, ts FROM answers WHERE key=?", (key,)).fetchone()
+    if row is None or time.time() - row[1] > ANSWER_TTL:
+        return None
+    return row[0]
+
+def _store_answer(cx: sqlite3.Connection, key: str, query: str, answer: str, paths: list):
+
+    if ANSWER_TTL <= 0 or answer.startswith("(LLM error"):
+        return
+    cx.execute("DELETE FROM answers WHERE ts < ?", (time.time() - ANSWER_TTL,))
+    cx.execute("DELETE FROM answer_paths WHERE key NOT IN (SELECT key FROM answers)")
+    cx.execute("INSERT OR REPLACE INTO answers(key, question, answer, ts) VALUES(?,?,?,?)",
+               (key, query, answer, time.time()))
+    cx.execute("DELETE FROM answer_paths WHERE key=?", (key,))
+    cx.executemany("INSERT INTO answer_paths(key, path) VALUES(?,?)", [(key, p) for p in set(paths)])
+
+def _fts_rows(cx: sqlite3.Connection, query: str, k: int) -> list:
+
+    sql = ("SELECT path, snippet(filetext, 1, '[', ']', ' … ', 10) AS snip "
+           "FROM filetext WHERE filetext MATCH ? ORDER BY rank LIMIT ?")
+    try:
+        rows = cx.execute(sql, (query, k)).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    if rows:
+        return rows
+    # Plain questions ("where are my logs?") are invalid FTS syntax or demand every
+    # filler word; rank on any of the meaningful words instead.
+    words = normalize_question(query).split()
+    if not words:
+        return []
+    return cx.execute(sql, (" OR ".join(f'"{w}"' for w in words), k)).fetchall()
+
 def ask(query: str, k: int = 25) -> str:
 
     with db() as cx:
-        rows = cx.execute(
-            "SELECT path, snippet(filetext, 1, '[', ']', ' … ', 10) AS snip "
-            "FROM filetext WHERE filetext MATCH ? ORDER BY rank LIMIT ?",
-            (query, k)
-        ).fetchall()
+        rows = _fts_rows(cx, query, k)
     if not rows:
         answer = "No matches. Try different keywords."
         report_to_rhea("query_answer", {"query": query, "answer": answer})
         return answer
 
+    key = _answer_key(query, rows[:8])
+    with db() as cx:
+        cached = _cached_answer(cx, key)
+    if cached is not None:
+        report_to_rhea("query_answer", {"query": query, "answer": cached, "cached": True})
+        return cached
+
     context = "\n\n".join(f"[{p}]\n{snip}" for p, snip in rows[:8])
     system_prompt = (
         "You are Alder Ranger, EdenOS Scout & Filewarden. "
@@ -440,6 +757,8 @@ def ask(query: str, k: int = 25) -> str:
     )
     user_prompt = f"Context:\n{context}\n\nQuestion: {query}\nAnswer:"
     answer = llm_chat(system_prompt, user_prompt, temperature=0.2, max_tokens=400)
+    with db() as cx:
+        _store_answer(cx, key, query, answer, [p for p, _ in rows[:8]])
     report_to_rhea("query_answer", {"query": query, "answer": answer})
     return answer
 
@@ -707,16 +1026,31 @@ def _handle_cli_args():
             return True
     return False
 
-def _initial_crawl():
-    console.print(Panel("Initial crawl…", style=f"bold {PALETTE['eden_sky']}"))
-    for root in WATCH_DIRS:
-        for dirpath, _, filenames in os.walk(root):
-            for fn in filenames:
-                path = os.path.join(dirpath, fn)
+def _walk_files(root: str):
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
                 try:
-                    upsert_file(path)
-                except Exception:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+                except OSError:
                     pass
+
+def _initial_crawl(watch_dirs: Optional[list] = None):
+    console.print(Panel("Initial crawl…", style=f"bold {PALETTE['eden_sky']}"))
+    writer = start_writer()
+    for root in (watch_dirs or WATCH_DIRS):
+        if os.path.isdir(root):
+            for path in _walk_files(root):
+                writer.upsert(path)
+    writer.flush()
     console.print(Panel("Crawl done.", style=f"bold {PALETTE['ok']}"))
 
 def _start_watcher_loop():
@@ -729,6 +1063,7 @@ def _start_watcher_loop():
     except KeyboardInterrupt:
         obs.stop()
     obs.join()
+    stop_writer()
 
 def main():
 
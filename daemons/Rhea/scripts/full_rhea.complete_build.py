@@ -1,36 +1,41 @@
 #!/usr/bin/env python3
 # Rhea Orchestrator — self-managing daemon system
-# - Watches ./daemons for changes
+# - Watches ./daemons for changes (debounced; re-reads only the daemons an event touches)
 # - Maintains ./configs/rhea_registry.json with schema validation
 # - Auto-discovers daemon metadata from YAML docstring headers
 # - Self-corrects common issues and keeps teams/pairs in sync
 # - CLI for scan/list/start/stop/add/validate/fix/gui
+# - Scheduler for registry tasks and configs/tasks.yaml (schedule run/list)
+# - Supervisor that owns started daemons across CLI runs (supervise up/down/status)
 
 from __future__ import annotations
 import os
 import sys
 import json
-import time
 import subprocess
 import shutil
 import difflib
+import shlex
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 
-import yaml  # PyYAML
-from jsonschema import Draft7Validator
 import builtins as _bi
 from rich.console import Console
 from rich.table import Table
 import typer
 
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-    WATCHDOG_AVAILABLE = True
-except Exception:
-    WATCHDOG_AVAILABLE = False
+# watchdog is imported by `watch` only; every other command starts without it
+WATCHDOG_AVAILABLE = importlib.util.find_spec("watchdog") is not None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from rhea_scheduler import MISFIRE_POLICIES, Scheduler, Task, load_tasks_yaml, task_from_spec  # noqa: E402
+from rhea_supervisor import (  # noqa: E402
+    RESTART_POLICIES, Supervisor, SupervisorClient, SupervisorUnavailable, ensure_supervisor,
+)
+import rhea_watch  # noqa: E402
+from rhea_watch import Debouncer, IncrementalValidator, ParseCache, WatchEngine, apply_patch, event_paths  # noqa: E402
 
 APP = typer.Typer(help="Rhea — self-managing daemon orchestrator")
 C = Console()
@@ -49,6 +54,11 @@ DIR_LOGS = RHEA_DIR / "logs"
 REGISTRY_PATH = DIR_CONFIG / "rhea_registry.json"
 SCHEMA_PATH = DIR_CONFIG / "rhea_schema.json"
 GUI_PATH = RHEA_DIR / "scripts" / "rhea_gui.self_editing.py"
+TASKS_YAML_PATHS = (DIR_CONFIG / "tasks.yaml", RHEA_DIR / "scripts" / "configs" / "tasks.yaml")
+SCHEDULE_STATE_PATH = DIR_LOGS / "schedule_state.jsonl"
+SUPERVISOR_DIR = DIR_LOGS / "supervisor"
+DISCOVERY_CACHE_PATH = DIR_LOGS / "discovery_cache.json"
+VALIDATED_PATH = DIR_LOGS / "registry_validated.json"
 
 DEFAULT_PALETTES = {
     "eden_dream": {"bg": "#0b1020", "fg": "#e6f0ff", "accent": "#7aa2f7", "muted": "#94a3b8"},
@@ -162,19 +172,41 @@ def _load_registry() -> Dict[str, Any]:
     return data
 
 
+def _validator() -> IncrementalValidator:
+    return IncrementalValidator(SCHEMA_JSON, VALIDATED_PATH)
+
+
+def _backup_registry(current: bytes):
+    # Skip the copy when the newest backup already holds exactly these bytes.
+    backups = sorted(DIR_BACKUPS.glob("registry_*.json"))
+    if backups:
+        try:
+            if backups[-1].stat().st_size == len(current) and backups[-1].read_bytes() == current:
+                return
+        except OSError:
+            pass
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    shutil.copy2(REGISTRY_PATH, DIR_BACKUPS / f"registry_{ts}.json")
+
+
 def _save_registry(data: Dict[str, Any], backup: bool = True):
-    validator = Draft7Validator(SCHEMA_JSON)
-    errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
+    errors = sorted(_validator().errors(data), key=lambda e: e.path)
     if errors:
         C.print("[red]Validation failed; not saving.[/red]")
         for e in errors:
             C.print(f"[red]- {'/'.join(map(str, e.path))}: {e.message}[/red]")
         raise typer.Exit(code=1)
-    if backup and REGISTRY_PATH.exists():
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        shutil.copy2(REGISTRY_PATH, DIR_BACKUPS / f"registry_{ts}.json")
+    payload = json.dumps(data, indent=2)
+    if REGISTRY_PATH.exists():
+        current = REGISTRY_PATH.read_bytes()
+        if current == payload.encode("utf-8"):
+            C.print("[green]Registry unchanged.[/green]")
+            return
+        if backup:
+            DIR_BACKUPS.mkdir(parents=True, exist_ok=True)
+            _backup_registry(current)
     with REGISTRY_PATH.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        f.write(payload)
     C.print("[green]Registry saved.[/green]")
 
 
@@ -185,112 +217,19 @@ def _write_schema_if_missing():
 
 
 def _read_yaml_docstring(pyfile: Path) -> Optional[Dict[str, Any]]:
-    try:
-        text = pyfile.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return None
-    # First triple-quoted block is treated as YAML
-    for quote in ('"""', "'''"):
-        if text.strip().startswith(quote):
-            end = text.find(quote, 3)
-            if end > 3:
-                block = text[3:end]
-                try:
-                    data = yaml.safe_load(block) or {}
-                    if isinstance(data, dict):
-                        return data
-                except Exception:
-                    return None
-    return None
+    return rhea_watch.read_yaml_docstring(pyfile)
 
 
 def discover_daemons() -> Dict[str, Dict[str, Any]]:
-    discovered: Dict[str, Dict[str, Any]] = {}
-    if not DIR_DAEMONS.exists():
-        return discovered
-    # Skip heavy/noisy folders from discovery
-    SKIP_PARTS = {
-        "node_modules", "Rhea_historic", "_inbox", ".git", "__pycache__", "logs"
-    }
-    for pyfile in DIR_DAEMONS.rglob("*.py"):
-        # ignore if any part of the path is in SKIP_PARTS
-        if any(part in SKIP_PARTS for part in pyfile.parts):
-            continue
-        meta = _read_yaml_docstring(pyfile)
-        if not meta:
-            continue
-        daemon_name = meta.get("daemon", {}).get("name") or meta.get("name")
-        if not daemon_name:
-            continue
-        start_cmd = meta.get("daemon", {}).get("start") or meta.get("start")
-        team = meta.get("daemon", {}).get("team") or meta.get("team", "Unassigned")
-        group = meta.get("daemon", {}).get("group") or meta.get("group", "Default")
-        tags = meta.get("daemon", {}).get("tags") or meta.get("tags") or []
-        env = meta.get("daemon", {}).get("env") or meta.get("env") or {}
-        start: Dict[str, Any]
-        if isinstance(start_cmd, str):
-            # Split on spaces, naive
-            start = {"type": "shell", "args": [start_cmd]}
-        elif isinstance(start_cmd, dict):
-            start = start_cmd
-        else:
-            start = {"type": "python", "args": [str(pyfile.name)]}
-        discovered[daemon_name] = {
-            "name": daemon_name,
-            # Store path relative to the daemons root (daemons)
-            "path": str(pyfile.relative_to(DAEMONS_ROOT)),
-            "enabled": True,
-            "tags": tags,
-            "team": team,
-            "group": group,
-            "env": env,
-            "start": start
-        }
-    return discovered
+    # RHEA_DISCOVERY_CACHE=off re-reads every file (the cache only ever skips unchanged ones)
+    off = os.environ.get("RHEA_DISCOVERY_CACHE", "1").lower() in ("0", "off", "false", "no")
+    return rhea_watch.discover_daemons(DIR_DAEMONS, None if off else ParseCache(DISCOVERY_CACHE_PATH, DIR_DAEMONS))
 
 
 # ----------------- Self-correction -----------------
 
 def reconcile_registry(reg: Dict[str, Any], discovered: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
-    logs: List[str] = []
-    # Add or update discovered daemons
-    for name, d in discovered.items():
-        if name not in reg["daemons"]:
-            reg["daemons"][name] = d
-            logs.append(f"+ added daemon {name}")
-        else:
-            # merge on path/team/group/tags/env/start; keep enabled flag
-            cur = reg["daemons"][name]
-            changed = []
-            for k in ("path", "team", "group", "tags", "env", "start"):
-                if cur.get(k) != d.get(k):
-                    cur[k] = d.get(k)
-                    changed.append(k)
-            if changed:
-                logs.append(f"~ updated {name}: {', '.join(changed)}")
-    # Disable missing files
-    for name, d in list(reg["daemons"].items()):
-        path = DAEMONS_ROOT / d.get("path", "")
-        if not path.exists():
-            if d.get("enabled", True):
-                d["enabled"] = False
-                logs.append(f"! disabled {name} (file missing)")
-    # Sync teams -> members
-    team_members: Dict[str, List[str]] = {}
-    for name, d in reg["daemons"].items():
-        team = d.get("team", "Unassigned")
-        team_members.setdefault(team, []).append(name)
-    for team, members in team_members.items():
-        t = reg["teams"].setdefault(team, {"members": []})
-        if sorted(t["members"]) != sorted(members):
-            t["members"] = sorted(members)
-            logs.append(f"~ synced team {team} members")
-    # Drop empty teams not referenced
-    for team in list(reg["teams"].keys()):
-        if team not in team_members:
-            del reg["teams"][team]
-            logs.append(f"- removed empty team {team}")
-    return reg, logs
+    return rhea_watch.reconcile_registry(reg, discovered, DAEMONS_ROOT)
 
 
 # ----------------- Process control -----------------
@@ -300,14 +239,7 @@ def _python_exe() -> str:
     return sys.executable or "python"
 
 
-def start_daemon(name: str, reg: Dict[str, Any]):
-    if name in RUNNING:
-        C.print(f"[yellow]{name} already running[/yellow]")
-        return
-    d = reg["daemons"].get(name)
-    if not d or not d.get("enabled", True):
-        C.print(f"[red]Cannot start {name}: not found or disabled[/red]")
-        return
+def _daemon_command(d: Dict[str, Any], extra_args: Optional[List[str]] = None) -> Tuple[List[str], Path, Dict[str, str]]:
     cwd = (DAEMONS_ROOT / d["path"]).parent
     env = os.environ.copy()
     env.update({k: v for k, v in d.get("env", {}).items()})
@@ -317,6 +249,54 @@ def start_daemon(name: str, reg: Dict[str, Any]):
     else:
         # shell command string or args array
         args = start.get("args", [])
+    return args + list(extra_args or []), cwd, env
+
+
+def _supervisor(bring_up: bool = False) -> Optional[SupervisorClient]:
+    """The running supervisor's client (started first if ``bring_up``), else None."""
+    if bring_up:
+        return ensure_supervisor(SUPERVISOR_DIR, _python_exe())
+    client = SupervisorClient(SUPERVISOR_DIR)
+    return client if client.alive() else None
+
+
+def _supervisor_spec(name: str, d: Dict[str, Any], restart: str) -> Dict[str, Any]:
+    args, cwd, _env = _daemon_command(d)
+    # Only the daemon's own overrides travel; the supervisor supplies the base environment.
+    return {"name": name, "argv": args, "cwd": str(cwd), "env": d.get("env", {}),
+            "restart": d.get("restart") or restart}
+
+
+def supervised_start(names: List[str], reg: Dict[str, Any], client: SupervisorClient, restart: str):
+    specs = []
+    for name in names:
+        d = reg["daemons"].get(name)
+        if not d or not d.get("enabled", True):
+            C.print(f"[red]Cannot start {name}: not found or disabled[/red]")
+            continue
+        specs.append(_supervisor_spec(name, d, restart))
+    if not specs:
+        return
+    for name, result in client.request("start", specs=specs)["results"].items():
+        colour = "cyan" if result == "started" else "yellow"
+        C.print(f"[{colour}]{name}: {result}[/{colour}]")
+
+
+def supervised_stop(names: List[str], client: SupervisorClient):
+    for name, result in client.request("stop", names=names)["results"].items():
+        colour = "green" if result == "stopped" else "yellow"
+        C.print(f"[{colour}]{name}: {result}[/{colour}]")
+
+
+def start_daemon(name: str, reg: Dict[str, Any]):
+    if name in RUNNING:
+        C.print(f"[yellow]{name} already running[/yellow]")
+        return
+    d = reg["daemons"].get(name)
+    if not d or not d.get("enabled", True):
+        C.print(f"[red]Cannot start {name}: not found or disabled[/red]")
+        return
+    args, cwd, env = _daemon_command(d)
     C.print(f"[cyan]Starting {name}[/cyan]: {' '.join(args)} @ {cwd}")
     p = subprocess.Popen(args, cwd=str(cwd), env=env)
     RUNNING[name] = p
@@ -337,18 +317,103 @@ def stop_daemon(name: str):
 
 
 # ----------------- Watchdog -----------------
-class RheaHandler(FileSystemEventHandler):
-    def on_any_event(self, event):
-        if event.is_directory:
-            return
-        if event.src_path.endswith('.py') or event.src_path.endswith('.json'):
-            C.print("[blue]Change detected; reconciling...[/blue]")
-            reg = _load_registry()
-            discovered = discover_daemons()
-            reg, logs = reconcile_registry(reg, discovered)
-            _save_registry(reg)
-            for line in logs:
-                C.print("[magenta]•[/magenta]", line)
+class RheaHandler:
+    """Only queues paths; ``watch`` coalesces them and patches the registry.
+
+    Observers call ``dispatch(event)``, so no watchdog base class is needed.
+    """
+
+    def __init__(self, debouncer: Debouncer):
+        self.debouncer = debouncer
+
+    def dispatch(self, event):
+        for path in event_paths(event):
+            self.debouncer.add(path)
+
+
+def _watch_apply(engine: WatchEngine, paths: List[str]):
+    patch = engine.changes(paths)
+    if not patch:
+        return
+    reg = _load_registry()
+    if patch.registry_edited:
+        # edited by hand or by the GUI: reconcile against the in-memory discovery, no rescan
+        reg, logs = reconcile_registry(reg, engine.entries)
+    else:
+        logs = apply_patch(reg, patch, DAEMONS_ROOT)
+    if not logs:
+        return
+    C.print(f"[blue]Change detected ({len(paths)} paths, {patch.parsed} re-read); patching registry...[/blue]")
+    _save_registry(reg)
+    engine.note_saved()
+    for line in logs:
+        C.print("[magenta]•[/magenta]", line)
+
+
+# ----------------- Scheduler -----------------
+
+class _TaskRun:
+    """One scheduled task's processes (a team or pair fans out to several)."""
+
+    def __init__(self, procs: List[subprocess.Popen]):
+        self.procs = procs
+
+    def poll(self) -> Optional[int]:
+        codes = [p.poll() for p in self.procs]
+        if any(c is None for c in codes):
+            return None
+        return max(codes) if codes else 0
+
+
+def _task_members(task: Task, reg: Dict[str, Any]) -> List[str]:
+    if task.daemon:
+        return [task.daemon]
+    if task.team:
+        return list(reg["teams"].get(task.team, {}).get("members", []))
+    if task.pair:
+        members = reg["groups"].get(task.pair, {}).get("members")
+        if isinstance(members, list):
+            return list(members)
+        for pair in reg.get("pairs", []):
+            if "".join(pair).lower() == task.pair.lower():
+                return list(pair)
+        return []
+    if task.target:
+        if task.target in reg["daemons"]:
+            return [task.target]
+        return list(reg["teams"].get(task.target, {}).get("members", []))
+    return []
+
+
+def _load_scheduled_tasks(reg: Dict[str, Any], tasks_file: Optional[Path], jitter: float) -> List[Task]:
+    tasks: List[Task] = []
+    for spec in reg.get("tasks", []):
+        # Registry tasks: `cmd` is appended to the target daemon's start args
+        task = task_from_spec({**spec, "args": shlex.split(spec.get("cmd") or "")}, jitter)
+        if task:
+            tasks.append(task)
+    paths = [tasks_file] if tasks_file else [p for p in TASKS_YAML_PATHS if p.exists()][:1]
+    for path in paths:
+        tasks.extend(load_tasks_yaml(path, jitter))
+    return tasks
+
+
+def _make_launcher(reg: Dict[str, Any]):
+    def launch(task: Task) -> Optional[_TaskRun]:
+        procs = []
+        members = _task_members(task, reg)
+        if not members:
+            C.print(f"[yellow]Task '{task.name}': no daemons resolved for {task.key}[/yellow]")
+        for name in members:
+            d = reg["daemons"].get(name)
+            if not d or not d.get("enabled", True):
+                C.print(f"[yellow]Task '{task.name}': skipping {name} (not found or disabled)[/yellow]")
+                continue
+            args, cwd, env = _daemon_command(d, task.args)
+            procs.append(subprocess.Popen(args, cwd=str(cwd), env=env))
+        C.print(f"[cyan]⏰ {task.name}[/cyan] → {', '.join(members) or '-'}")
+        return _TaskRun(procs) if procs else None
+    return launch
 
 
 # ----------------- CLI commands -----------------
@@ -375,16 +440,33 @@ def scan():
     C.print(f"[bold]{len(discovered)}[/bold] daemons discovered.")
 
 
+LIST_TABLE_MAX_ROWS = 100
+
+
+def _print_rows(title: str, columns: Tuple[str, ...], rows: List[Tuple[str, ...]]):
+    # A rich Table measures and wraps every cell (~0.7 ms a row); big registries get plain aligned columns.
+    if len(rows) <= LIST_TABLE_MAX_ROWS:
+        tbl = Table(title=title)
+        for col in columns:
+            tbl.add_column(col)
+        for row in rows:
+            tbl.add_row(*row)
+        C.print(tbl)
+        return
+    widths = [max([len(col)] + [len(row[i]) for row in rows]) for i, col in enumerate(columns)]
+    line = lambda cells: "  ".join(c.ljust(w) for c, w in zip(cells, widths)).rstrip()  # noqa: E731
+    C.print(f"[italic]{title}[/italic] ({len(rows)})")
+    C.print(line(columns), style="bold", markup=False, highlight=False)
+    C.print("\n".join(line(row) for row in rows), markup=False, highlight=False, soft_wrap=True)
+
+
 @APP.command(name="list")
 def list_cmd(kind: str = typer.Argument("daemons", help="daemons|teams|pairs|tasks")):
     reg = _load_registry()
     if kind == "daemons":
-        tbl = Table(title="Daemons")
-        for col in ("name", "enabled", "team", "group", "path"):
-            tbl.add_column(col)
-        for name, d in sorted(reg["daemons"].items()):
-            tbl.add_row(d.get("name", name), str(d.get("enabled", False)), d.get("team", ""), d.get("group", ""), d.get("path", ""))
-        C.print(tbl)
+        rows = [(d.get("name", name), str(d.get("enabled", False)), d.get("team", ""), d.get("group", ""), d.get("path", ""))
+                for name, d in sorted(reg["daemons"].items())]
+        _print_rows("Daemons", ("name", "enabled", "team", "group", "path"), rows)
     elif kind == "teams":
         tbl = Table(title="Teams")
         tbl.add_column("team"); tbl.add_column("members")
@@ -428,7 +510,7 @@ def add_daemon(from_file: Path):
 @APP.command()
 def validate():
     reg = _load_registry()
-    errors = list(Draft7Validator(SCHEMA_JSON).iter_errors(reg))
+    errors = _validator().errors(reg, full=True)
     if not errors:
         C.print("[green]Registry is valid.[/green]")
         raise typer.Exit(0)
@@ -450,47 +532,197 @@ def fix(apply: bool = typer.Option(True, help="apply fixes (otherwise just previ
             C.print("[magenta]•[/magenta]", line)
 
 
+def _check_restart(restart: str):
+    if restart not in RESTART_POLICIES:
+        C.print(f"[red]--restart must be one of {', '.join(RESTART_POLICIES)}[/red]"); raise typer.Exit(1)
+
+
+SUPERVISE_OPT = typer.Option(False, "--supervise", help="start the supervisor first if it is not running")
+RESTART_OPT = typer.Option("on-failure", help="supervised restart policy: always | on-failure | never")
+
+
 @APP.command()
-def start(name: str):
-    reg = _load_registry(); start_daemon(name, reg)
+def start(name: str, supervise: bool = SUPERVISE_OPT, restart: str = RESTART_OPT):
+    """Start a daemon (through the supervisor when one is running)."""
+    _check_restart(restart)
+    reg = _load_registry()
+    client = _supervisor(bring_up=supervise)
+    if client:
+        supervised_start([name], reg, client, restart)
+    else:
+        start_daemon(name, reg)
 
 
 @APP.command()
 def stop(name: str):
-    stop_daemon(name)
+    client = _supervisor()
+    if client:
+        supervised_stop([name], client)
+    else:
+        stop_daemon(name)
 
 
 @APP.command()
-def start_team(team: str):
+def start_team(team: str, supervise: bool = SUPERVISE_OPT, restart: str = RESTART_OPT):
+    """Start every member of a team; supervised, that is one request."""
+    _check_restart(restart)
     reg = _load_registry()
-    for name in reg["teams"].get(team, {}).get("members", []):
+    members = reg["teams"].get(team, {}).get("members", [])
+    client = _supervisor(bring_up=supervise)
+    if client:
+        supervised_start(members, reg, client, restart)
+        return
+    for name in members:
         start_daemon(name, reg)
 
 
 @APP.command()
 def stop_team(team: str):
     reg = _load_registry()
-    for name in reg["teams"].get(team, {}).get("members", []):
+    members = reg["teams"].get(team, {}).get("members", [])
+    client = _supervisor()
+    if client:
+        supervised_stop(members, client)
+        return
+    for name in members:
         stop_daemon(name)
 
 
 @APP.command()
-def watch():
+def watch(window: float = typer.Option(rhea_watch.DEBOUNCE_WINDOW, help="seconds of quiet before a batch is applied")):
     if not WATCHDOG_AVAILABLE:
         C.print("[red]watchdog not installed[/red]"); raise typer.Exit(1)
     _ensure_dirs()
-    handler = RheaHandler()
+    # One full scan up front; after that only the files events point at are re-read.
+    engine = WatchEngine(DIR_DAEMONS, REGISTRY_PATH)
+    engine.prime(discover_daemons())
+    reg, logs = reconcile_registry(_load_registry(), engine.entries)
+    if logs:
+        _save_registry(reg)
+        for line in logs:
+            C.print("[magenta]•[/magenta]", line)
+    engine.note_saved()
+    from watchdog.observers import Observer
+
+    debouncer = Debouncer(window=window)
+    handler = RheaHandler(debouncer)
     obs = Observer(); obs.schedule(handler, str(DIR_DAEMONS), recursive=True)
     obs.schedule(handler, str(DIR_CONFIG), recursive=False)
     obs.start()
-    C.print("[green]Watching for changes… Ctrl+C to stop.[/green]")
+    C.print(f"[green]Watching {len(engine.entries)} daemons for changes… Ctrl+C to stop.[/green]")
     try:
         while True:
-            time.sleep(1)
+            batch = debouncer.wait(timeout=1.0)
+            if batch:
+                _watch_apply(engine, batch)
     except KeyboardInterrupt:
         obs.stop(); obs.join()
 
 
+SUPERVISE = typer.Typer(help="Supervisor that owns daemons started by start/start-team")
+APP.add_typer(SUPERVISE, name="supervise")
+
+
+@SUPERVISE.command("up")
+def supervise_up():
+    """Start the supervisor in the background (no-op if it is running)."""
+    try:
+        client = ensure_supervisor(SUPERVISOR_DIR, _python_exe())
+    except SupervisorUnavailable as e:
+        C.print(f"[red]{e}[/red]"); raise typer.Exit(1)
+    info = client.request("ping")
+    C.print(f"[green]Supervisor running[/green] (pid {info['pid']}, {info['children']} daemon(s) known)")
+
+
+@SUPERVISE.command("down")
+def supervise_down(keep_children: bool = typer.Option(False, help="leave daemons running for the next supervisor")):
+    client = _supervisor()
+    if not client:
+        C.print("[yellow]Supervisor not running[/yellow]"); return
+    client.request("shutdown", keep_children=keep_children)
+    C.print("[green]Supervisor stopped[/green]")
+
+
+@SUPERVISE.command("status")
+def supervise_status(as_json: bool = typer.Option(False, "--json")):
+    """Daemons the supervisor owns, with state, restarts, CPU and RSS."""
+    client = _supervisor()
+    if not client:
+        C.print("[yellow]Supervisor not running[/yellow]"); raise typer.Exit(1)
+    children = client.request("status")["children"]
+    if as_json:
+        print(json.dumps(children, indent=2)); return
+    tbl = Table(title="Supervised daemons")
+    for col in ("name", "state", "pid", "restarts", "cpu %", "rss MiB", "uptime s", "last exit"):
+        tbl.add_column(col)
+
+    def fmt(v):
+        return "-" if v is None else str(v)
+    for c in children:
+        rss = None if c["rss_kb"] is None else f"{c['rss_kb'] / 1024:.1f}"
+        tbl.add_row(c["name"], c["state"], fmt(c["pid"]), str(c["restarts"]), fmt(c["cpu_percent"]),
+                    fmt(rss), fmt(c["uptime"]), fmt(c["last_exit"]))
+    C.print(tbl)
+
+
+@SUPERVISE.command("run")
+def supervise_run():
+    """Run the supervisor in the foreground until Ctrl+C."""
+    _ensure_dirs()
+    C.print(f"[green]Supervising from {SUPERVISOR_DIR}… Ctrl+C to stop.[/green]")
+    try:
+        Supervisor(SUPERVISOR_DIR).serve_forever()
+    except SupervisorUnavailable as e:
+        C.print(f"[red]{e}[/red]"); raise typer.Exit(1)
+
+
+SCHEDULE = typer.Typer(help="Run registry tasks and tasks.yaml on their schedules")
+APP.add_typer(SCHEDULE, name="schedule")
+
+
+def _build_scheduler(tasks_file: Optional[Path], max_per_team: int, jitter: float, misfire: str,
+                     grace: float) -> Scheduler:
+    if misfire not in MISFIRE_POLICIES:
+        C.print(f"[red]--misfire must be one of {', '.join(MISFIRE_POLICIES)}[/red]"); raise typer.Exit(1)
+    _ensure_dirs()
+    reg = _load_registry()
+    tasks = _load_scheduled_tasks(reg, tasks_file, jitter)
+    return Scheduler(tasks, _make_launcher(reg), state_path=SCHEDULE_STATE_PATH, max_per_team=max_per_team,
+                     misfire=misfire, misfire_grace=grace)
+
+
+@SCHEDULE.command("run")
+def schedule_run(
+    tasks_file: Optional[Path] = typer.Option(None, "--tasks", help="tasks.yaml to load (default: configs/tasks.yaml)"),
+    max_per_team: int = typer.Option(1, help="concurrent task runs allowed per team/pair/daemon"),
+    jitter: float = typer.Option(0.0, help="default random delay (seconds) added to each fire"),
+    misfire: str = typer.Option("once", help="missed runs: skip | once | all"),
+    grace: float = typer.Option(60.0, help="seconds late before a fire counts as missed"),
+):
+    """Fire scheduled tasks until Ctrl+C; state persists across restarts."""
+    sched = _build_scheduler(tasks_file, max_per_team, jitter, misfire, grace)
+    C.print(f"[green]Scheduling {len(sched.tasks)} task(s)… Ctrl+C to stop.[/green]")
+    try:
+        sched.run_forever()
+    except KeyboardInterrupt:
+        C.print(f"[green]Scheduler stopped[/green] ({sched.stats['fired']} fired)")
+
+
+@SCHEDULE.command("list")
+def schedule_list(tasks_file: Optional[Path] = typer.Option(None, "--tasks")):
+    """Show each scheduled task with its last and next fire time."""
+    sched = _build_scheduler(tasks_file, 1, 0.0, "once", 60.0)
+    tbl = Table(title="Scheduled tasks")
+    for col in ("task", "runs on", "last run", "next fire"):
+        tbl.add_column(col)
+
+    def fmt(ts):
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+    for name, st in sorted(sched.state.items(), key=lambda kv: kv[1]["next_fire"]):
+        tbl.add_row(name, sched.tasks[name].key, fmt(st.get("last_run")), fmt(st.get("next_fire")))
+    C.print(tbl)
+
+
 @APP.command()
 def gui():
     if not GUI_PATH.exists():
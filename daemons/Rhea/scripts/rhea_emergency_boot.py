@@ -5,6 +5,8 @@ Rhea Emergency Boot — triage disk space, repair layout, and start the battalio
 What it does (in order):
 1) TRIAGE: check free space, list top heavy dirs/files, optional cache purge
 2) REPAIR: build a safe move plan from simple rules → preview or apply with undo log
+   (1 and 2 come from one multi-threaded scandir pass over the root; --budget /
+   --max-entries cap it and partial results are printed while it runs)
 3) ACTIVATE: if full_rhea.complete_build.py exists, init/scan/fix and start daemons
              by TAGS (parser,label,organizer,catalog,index,sort,cleanup)
              otherwise, fallback: run every *.py under daemons/** as a process
@@ -19,16 +21,18 @@ If rich is missing, it prints plain text.
 """
 from __future__ import annotations
 import argparse
+import fnmatch
 import json
 import os
 import shutil
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Any
 
 # --- Paths -------------------------------------------------------------
 # Resolve paths relative to the Rhea package directory
@@ -110,77 +114,136 @@ def load_json(path: Path, default: Any) -> Any:
 def save_json(path: Path, obj: Any):
     path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
 
-# --- TRIAGE ------------------------------------------------------------
-def dir_size(path: Path) -> int:
-    total = 0
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if d not in SAFE_EXCLUDES]
-        for f in files:
-            try:
-                total += (Path(root)/f).stat().st_size
-            except Exception:
-                pass
-    return total
+# --- SCAN ENGINE -------------------------------------------------------
+# One traversal answers every triage/repair question. Directories fan out to a
+# thread pool breadth-first (scandir/stat release the GIL, which is what matters
+# on slow or network disks), so the shallow picture fills in first and a budget
+# cut still leaves every top-level item with a size.
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+PROGRESS_EVERY = 2.0
 
-def top_heavy(root: Path, topn: int = 20) -> List[Tuple[str,int]]:
-    sizes = []
-    for p in root.iterdir():
-        try:
-            s = dir_size(p) if p.is_dir() else p.stat().st_size
-            sizes.append((str(p), s))
-        except Exception:
-            continue
-    sizes.sort(key=lambda x: x[1], reverse=True)
-    return sizes[:topn]
-
-def purge_caches(root: Path, rules: Dict, apply: bool=False) -> List[str]:
-    hits = []
-    for pattern in rules.get("purge_dirs", []):
-        for p in root.rglob(pattern):
-            if not p.exists(): 
-                continue
-            # Safety guard: never touch root or config/logs
-            if p.resolve() in (ROOT, DIR_CONFIG.resolve(), DIR_LOGS.resolve()): 
-                continue
-            hits.append(str(p))
-            if apply:
-                try:
-                    if p.is_dir(): shutil.rmtree(p, ignore_errors=True)
-                    else: p.unlink(missing_ok=True)
-                except Exception as e:
-                    C.print(f"[red]Failed purge {p}: {e}[/red]" if RICH else f"Failed purge {p}: {e}")
-    return hits
 
-# --- REPAIR PLAN -------------------------------------------------------
 @dataclass
 class MoveOp:
     src: str
     dst: str
 
-def ext_bucket(ext: str, rules: Dict) -> str:
-    for bucket, exts in rules.get("ext_buckets", {}).items():
-        if ext.lower() in [e.lower() for e in exts]:
-            return bucket
-    return "other"
 
-def plan_repairs(root: Path, rules: Dict) -> List[MoveOp]:
-    ops: List[MoveOp] = []
-    # known safe inboxes
-    targets = rules.get("targets", {})
-    for p in root.rglob("*"):
-        if any(seg in SAFE_EXCLUDES for seg in p.parts):
-            continue
-        if not p.is_file():
-            continue
-        # Skip registry/config/this script
-        if p == REGISTRY or p.name.startswith("move_log_") or p.name == Path(__file__).name:
-            continue
-        # Keep files already under expected roots
-        if "daemons" in p.parts:
-            continue
+class _Dir(NamedTuple):
+    path: str
+    top: Optional[str]      # top-level item this directory's bytes count toward (None = the root)
+    counted: bool           # below the top level, SAFE_EXCLUDES folders are not counted (as dir_size)
+    plannable: bool         # no SAFE_EXCLUDES segment on the way down
+    in_daemons: bool        # a "daemons" segment on the way down: already where it belongs
+    in_purge: bool          # inside a purge candidate already reported
+    tail: Tuple[str, ...]   # last folder names below the root, for "a/b" purge patterns
+
+
+@dataclass
+class _DirResult:
+    subdirs: List[_Dir] = field(default_factory=list)
+    top: Optional[str] = None
+    bytes: int = 0
+    top_files: List[Tuple[str, int]] = field(default_factory=list)
+    top_dirs: List[str] = field(default_factory=list)
+    files: int = 0
+    entries: int = 0
+    errors: int = 0
+    purge: List[str] = field(default_factory=list)
+    moves: List[MoveOp] = field(default_factory=list)
 
-        ext = p.suffix
-        bucket = ext_bucket(ext, rules)
+
+@dataclass
+class ScanReport:
+    root: str
+    sizes: Dict[str, int] = field(default_factory=dict)
+    purge: List[str] = field(default_factory=list)
+    moves: List[MoveOp] = field(default_factory=list)
+    files: int = 0
+    dirs: int = 0
+    entries: int = 0
+    errors: int = 0
+    total_bytes: int = 0
+    pending: int = 0        # directories left unscanned when the budget ran out
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return self.pending == 0
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        return sorted(self.sizes.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def _merge(self, res: _DirResult):
+        self.dirs += 1
+        self.files += res.files
+        self.entries += res.entries
+        self.errors += res.errors
+        if res.bytes:
+            self.sizes[res.top] = self.sizes.get(res.top, 0) + res.bytes
+            self.total_bytes += res.bytes
+        for path in res.top_dirs:
+            self.sizes.setdefault(path, 0)
+        for path, size in res.top_files:
+            self.sizes[path] = size
+            self.total_bytes += size
+        self.purge.extend(res.purge)
+        self.moves.extend(res.moves)
+
+
+class _BucketMatcher:
+    """ext -> bucket per rules["ext_buckets"], first bucket wins; entries with * ? [ are globs."""
+
+    def __init__(self, rules: Dict):
+        self.buckets = [(bucket, [e.lower() for e in exts]) for bucket, exts in rules.get("ext_buckets", {}).items()]
+        self.memo: Dict[str, str] = {}
+
+    def __call__(self, ext: str) -> str:
+        hit = self.memo.get(ext)
+        if hit is None:
+            low = ext.lower()
+            hit = next((bucket for bucket, exts in self.buckets
+                        if any(low == e or (e.strip("*?[") != e and fnmatch.fnmatchcase(low, e)) for e in exts)),
+                       "other")
+            self.memo[ext] = hit
+        return hit
+
+
+def _suffix(name: str) -> str:
+    # Path(name).suffix without building a Path
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+
+class _Scanner:
+    def __init__(self, root: Path, rules: Dict, purge: bool, plan: bool):
+        self.root = os.fspath(root)
+        self.purge = purge
+        self.plan = plan
+        self.bucket = _BucketMatcher(rules)
+        self.targets = rules.get("targets", {})
+        self.patterns = [tuple(p.strip("/").split("/")) for p in rules.get("purge_dirs", [])] if purge else []
+        self.tail_len = max((len(p) for p in self.patterns), default=1)
+        self.skip_files = {str(REGISTRY)}
+        self.this_script = Path(__file__).name
+
+    def root_dir(self) -> _Dir:
+        parts = Path(self.root).parts
+        return _Dir(self.root, None, True, not any(seg in SAFE_EXCLUDES for seg in parts),
+                    "daemons" in parts, False, ())
+
+    def _purge_match(self, tail: Tuple[str, ...]) -> bool:
+        for pat in self.patterns:
+            if len(tail) >= len(pat) and all(fnmatch.fnmatchcase(seg, p) for seg, p in zip(tail[-len(pat):], pat)):
+                return True
+        return False
+
+    def _move(self, path: str, name: str, parent: str) -> Optional[MoveOp]:
+        if path in self.skip_files or name.startswith("move_log_") or name == self.this_script:
+            return None
+        ext = _suffix(name)
+        bucket = self.bucket(ext)
+        targets = self.targets
         if bucket == "daemon_py" and ext == ".py":
             dst_base = ROOT / targets.get("py_daemon_default", "daemons/Unsorted")
         elif bucket == "chaos":
@@ -191,18 +254,163 @@ def plan_repairs(root: Path, rules: Dict) -> List[MoveOp]:
             dst_base = ROOT / targets.get("docs_default", "_docs/_inbox")
         elif bucket == "assets":
             dst_base = ROOT / targets.get("assets_default", "_assets/_inbox")
-        else:
+        elif ext == ".py":
             # Leave unknowns in place unless they’re clearly stray python
-            if ext == ".py":
-                dst_base = ROOT / targets.get("py_daemon_default", "daemons/Unsorted")
-            else:
-                continue
-
+            dst_base = ROOT / targets.get("py_daemon_default", "daemons/Unsorted")
+        else:
+            return None
         # Preserve folder hint by nesting last parent name to avoid collisions
-        hint = p.parent.name
-        dst = dst_base / hint / p.name
-        ops.append(MoveOp(str(p), str(dst)))
-    return ops
+        return MoveOp(path, str(dst_base / parent / name))
+
+    def scan_dir(self, d: _Dir) -> _DirResult:
+        res = _DirResult(top=d.top)
+        try:
+            it = os.scandir(d.path)
+        except OSError:
+            res.errors += 1
+            return res
+        parent = os.path.basename(d.path)
+        # nothing is planned inside a purge candidate: the purge runs first and removes it
+        plan_here = self.plan and d.plannable and not d.in_daemons and not d.in_purge
+        with it:
+            for e in it:
+                res.entries += 1
+                name = e.name
+                try:
+                    is_dir = e.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    counted = d.top is None or (d.counted and name not in SAFE_EXCLUDES)
+                    plannable = d.plannable and name not in SAFE_EXCLUDES
+                    in_daemons = d.in_daemons or name == "daemons"
+                    tail = (d.tail + (name,))[-self.tail_len:]
+                    hit = bool(self.patterns) and not d.in_purge and self._purge_match(tail)
+                    if hit:
+                        res.purge.append(e.path)
+                    in_purge = d.in_purge or hit
+                    if d.top is None:
+                        res.top_dirs.append(e.path)  # listed (at 0) before its own scan runs
+                    # skip subtrees nothing is asked of (e.g. nested .git when not purging)
+                    if counted or (self.plan and plannable and not in_daemons and not in_purge) \
+                            or (self.patterns and not in_purge):
+                        res.subdirs.append(_Dir(e.path, d.top or e.path, counted, plannable, in_daemons, in_purge, tail))
+                    continue
+                res.files += 1
+                try:
+                    st = e.stat()
+                except OSError:
+                    res.errors += 1
+                    continue
+                if d.top is None:
+                    res.top_files.append((e.path, st.st_size))
+                elif d.counted:
+                    res.bytes += st.st_size
+                if plan_here and name not in SAFE_EXCLUDES and name != "daemons" and e.is_file():
+                    op = self._move(e.path, name, parent)
+                    if op:
+                        res.moves.append(op)
+        return res
+
+
+def scan_tree(root: Path, rules: Optional[Dict] = None, *, purge: bool = False, plan: bool = True,
+              workers: int = SCAN_WORKERS, budget: Optional[float] = None, max_entries: Optional[int] = None,
+              progress: Optional[Callable[[ScanReport], None]] = None,
+              progress_every: float = PROGRESS_EVERY) -> ScanReport:
+    """Sizes, heavy items, purge candidates and the repair plan in a single pass.
+
+    ``budget`` (seconds) and ``max_entries`` (directory entries read) stop the
+    walk early; the report then says how many directories were left. ``progress``
+    gets the report-so-far every ``progress_every`` seconds.
+    """
+    scanner = _Scanner(root, rules if rules is not None else DEFAULT_RULES, purge, plan)
+    report = ScanReport(root=scanner.root)
+    start = time.monotonic()
+    last = start
+    pending = deque([scanner.root_dir()])
+
+    def exhausted() -> bool:
+        return ((budget is not None and time.monotonic() - start >= budget)
+                or (max_entries is not None and report.entries >= max_entries))
+
+    def tick():
+        nonlocal last
+        now = time.monotonic()
+        report.elapsed = now - start
+        if progress and now - last >= progress_every:
+            last = now
+            progress(report)
+
+    if workers <= 1:
+        while pending and not exhausted():
+            res = scanner.scan_dir(pending.popleft())
+            report._merge(res)
+            pending.extend(res.subdirs)
+            tick()
+        report.pending = len(pending)
+    else:
+        running = set()
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            stop = False
+            while pending or running:
+                while pending and not stop and len(running) < workers * 4:
+                    running.add(ex.submit(scanner.scan_dir, pending.popleft()))
+                if not running:
+                    break
+                done, running = wait(running, timeout=progress_every, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    res = fut.result()
+                    report._merge(res)
+                    pending.extend(res.subdirs)
+                tick()
+                if not stop and exhausted():
+                    stop = True
+                    kept = {f for f in running if not f.cancel()}
+                    report.pending += len(running) - len(kept)
+                    running = kept
+            report.pending += len(pending)
+    report.moves.sort(key=lambda op: op.src)
+    report.elapsed = time.monotonic() - start
+    return report
+
+
+# --- TRIAGE ------------------------------------------------------------
+def dir_size(path: Path) -> int:
+    sizes = scan_tree(path, purge=False, plan=False).sizes
+    # as os.walk with SAFE_EXCLUDES pruned: excluded folders don't count at any depth
+    return sum(size for p, size in sizes.items()
+               if not (os.path.basename(p) in SAFE_EXCLUDES and os.path.isdir(p)))
+
+def top_heavy(root: Path, topn: int = 20) -> List[Tuple[str,int]]:
+    return scan_tree(root, purge=False, plan=False).top(topn)
+
+def purge_caches(root: Path, rules: Dict, apply: bool=False, hits: Optional[List[str]] = None) -> List[str]:
+    """Purge (or just list) cache dirs; ``hits`` from an earlier scan_tree(purge=True) skips the walk."""
+    if hits is None:
+        hits = scan_tree(root, rules, purge=True, plan=False).purge
+    guarded = (ROOT, DIR_CONFIG.resolve(), DIR_LOGS.resolve())
+    kept = []
+    for h in hits:
+        p = Path(h)
+        if not p.exists():
+            continue
+        # Safety guard: never touch root or config/logs
+        if p.resolve() in guarded:
+            continue
+        kept.append(h)
+        if apply:
+            try:
+                shutil.rmtree(p, ignore_errors=True)
+            except Exception as e:
+                C.print(f"[red]Failed purge {p}: {e}[/red]" if RICH else f"Failed purge {p}: {e}")
+    return kept
+
+# --- REPAIR PLAN -------------------------------------------------------
+def ext_bucket(ext: str, rules: Dict) -> str:
+    return _BucketMatcher(rules)(ext)
+
+def plan_repairs(root: Path, rules: Dict) -> List[MoveOp]:
+    return scan_tree(root, rules, purge=False, plan=True).moves
 
 def apply_moves(ops: List[MoveOp], limit: int, log_path: Path) -> Tuple[int,int]:
     moved = 0; skipped = 0
@@ -277,6 +485,12 @@ def start_without_rhea(parallel: int) -> int:
     return 0
 
 # --- MAIN --------------------------------------------------------------
+def print_progress(report: ScanReport):
+    lead = ", ".join(f"{Path(p).name} {bytes_to_gb(s)} GB" for p, s in report.top(3))
+    line = (f"… {report.elapsed:.0f}s: {report.files} files, {bytes_to_gb(report.total_bytes)} GB, "
+            f"{len(report.moves)} moves, {len(report.purge)} cache dirs; heaviest so far: {lead}")
+    C.print(f"[dim]{line}[/dim]" if RICH else line)
+
 def main():
     ensure_dirs()
     rules_path = DIR_CONFIG / "repair_rules.json"
@@ -292,6 +506,9 @@ def main():
     ap.add_argument("--undo", type=str, help="path to move_log_*.json to undo")
     ap.add_argument("--skip-activate", action="store_true", help="only triage/repair; do not start daemons")
     ap.add_argument("--root", type=str, default=str(ROOT), help="root directory to triage/repair")
+    ap.add_argument("--budget", type=float, help="stop the triage scan after this many seconds (partial results)")
+    ap.add_argument("--max-entries", type=int, help="stop the triage scan after reading this many directory entries")
+    ap.add_argument("--workers", type=int, default=SCAN_WORKERS, help="scan threads (1 = serial)")
     args = ap.parse_args()
 
     root = Path(args.root)
@@ -306,7 +523,14 @@ def main():
     # 1) TRIAGE
     free = freespace_gb(root)
     C.print(f"[bold]Free space:[/bold] {free} GB" if RICH else f"Free space: {free} GB")
-    heavy = top_heavy(root, topn=15)
+    report = scan_tree(root, rules, purge=args.purge_caches, plan=True, workers=args.workers,
+                       budget=args.budget, max_entries=args.max_entries, progress=print_progress)
+    C.print(f"Scanned {report.files} files in {report.dirs} dirs ({bytes_to_gb(report.total_bytes)} GB) "
+            f"in {report.elapsed:.1f}s")
+    if not report.complete:
+        msg = f"budget reached: {report.pending} dirs not scanned; sizes and plan below are partial"
+        C.print(f"[yellow]{msg}[/yellow]" if RICH else msg)
+    heavy = report.top(15)
     if RICH:
         tbl = Table(title="Top heavy items (by size)"); tbl.add_column("Path"); tbl.add_column("GB", justify="right")
         for p, sz in heavy: tbl.add_row(p, str(bytes_to_gb(sz)))
@@ -315,11 +539,11 @@ def main():
         for p, sz in heavy: print(f"{p}  {bytes_to_gb(sz)} GB")
 
     if args.purge_caches:
-        hits = purge_caches(root, rules, apply=args.apply)
+        hits = purge_caches(root, rules, apply=args.apply, hits=report.purge)
         C.print(f"[magenta]Cache hits:[/magenta] {len(hits)} (apply={args.apply})" if RICH else f"Cache hits: {len(hits)} (apply={args.apply})")
 
     # 2) REPAIR
-    ops = plan_repairs(root, rules)
+    ops = report.moves
     C.print(f"[bold]{len(ops)}[/bold] files flagged for relocation." if RICH else f"{len(ops)} files flagged for relocation.")
     if not args.apply:
         # Preview first 40 moves
@@ -10,6 +10,7 @@ from jsonschema import Draft7Validator
 
 ROOT = Path(__file__).resolve().parent.parent  # .../Rhea
 REGISTRY_PATH = ROOT / "configs" / "rhea_registry.json"
+SUPERVISOR_DIR = ROOT / "logs" / "supervisor"
 SCHEMA_PATH = ROOT / "configs" / "rhea_schema.json"
 BACKUPS = ROOT / "backups"
 BACKUPS.mkdir(parents=True, exist_ok=True)
@@ -67,6 +68,7 @@ class RheaGUI(tk.Tk):
         ttk.Button(btns, text="Validate", command=self._validate).pack(fill=tk.X)
         ttk.Button(btns, text="Diff", command=self._diff).pack(fill=tk.X)
         ttk.Button(btns, text="Reload", command=self._reload_tree).pack(fill=tk.X)
+        ttk.Button(btns, text="Running", command=self._running).pack(fill=tk.X)
 
         # Editor
         self.editor = tk.Text(right, wrap=tk.NONE)
@@ -157,6 +159,22 @@ class RheaGUI(tk.Tk):
         diff = "\n".join(difflib.unified_diff(current, edited, fromfile="saved", tofile="edited", lineterm=""))
         show_text(self, "Diff", diff or "No changes")
 
+    def _running(self):
+        # Ask the supervisor (full_rhea supervise up) what it is running; never spawns anything.
+        try:
+            from rhea_supervisor import SupervisorClient, SupervisorUnavailable
+        except ImportError:
+            messagebox.showerror("Running", "rhea_supervisor.py not found next to this GUI.")
+            return
+        try:
+            children = SupervisorClient(SUPERVISOR_DIR, timeout=5).request("status")["children"]
+        except (SupervisorUnavailable, RuntimeError) as e:
+            messagebox.showinfo("Running", f"Supervisor not running ({e}).")
+            return
+        lines = [f"{c['name']:<24} {c['state']:<9} pid={c['pid']} restarts={c['restarts']} "
+                 f"cpu={c['cpu_percent']}% rss={c['rss_kb']}kB" for c in children]
+        show_text(self, "Running daemons", "\n".join(lines) or "Nothing supervised.")
+
     def _validate(self):
         if not self.schema:
             messagebox.showinfo("Validate", "Schema not found; save anyway?")
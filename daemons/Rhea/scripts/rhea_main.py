@@ -12,6 +12,9 @@ What this does:
   - Maintains/merges rhea_registry.json (non-destructive; creates .bak backup)
   - Provides a small CLI for: health map, fixing Sheele input, running Sheele->Briar->Codexa->Janvier->Aderyn
   - Safe defaults for OpenAI export path
+  - Warm mode (--workers N / RHEA_WORKERS=N): long-lived worker processes keep
+    daemon modules imported (reloaded when the file's mtime changes) and serve
+    run/probe requests over a pipe, so repeat runs skip import + startup cost
 
 Minimal external deps:
   - None required.
@@ -20,13 +23,17 @@ Minimal external deps:
 
 from __future__ import annotations
 
+import argparse
 import importlib.util
 import json
+import multiprocessing
 import os
 import re
 import shutil
 import sys
 import time
+import zlib
+from multiprocessing.connection import wait as _wait_conns
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -201,30 +208,191 @@ def import_module_from_path(module_name: str, file_path: Path):
         err(f"Import failed for {file_path}: {e}")
         return None
 
-def probe_daemon(di: DaemonInfo) -> DaemonInfo:
-    mod = import_module_from_path(di.name, di.module_path)
+# Modules stay imported per process, keyed by (mtime_ns, size) so an edited file is re-imported.
+_MODULE_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_daemon_module(module_name: str, file_path: Path):
+    key = _file_key(file_path)
+    hit = _MODULE_CACHE.get(str(file_path))
+    if hit is not None and key is not None and hit[0] == key:
+        return hit[1]
+    mod = import_module_from_path(module_name, file_path)
+    if mod is not None and key is not None:
+        _MODULE_CACHE[str(file_path)] = (key, mod)
+    return mod
+
+
+def _probe_module(mod) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"describe": None, "health": {}, "run_callable": False}
     if mod is None:
-        di.health = {"status": "fail", "error": "import_error"}
-        return di
+        out["health"] = {"status": "fail", "error": "import_error"}
+        return out
     if hasattr(mod, "describe"):
         try:
-            di.describe = mod.describe()
+            out["describe"] = mod.describe()
         except Exception as e:
-            di.describe = {"error": f"describe_failed: {e}"}
+            out["describe"] = {"error": f"describe_failed: {e}"}
     if hasattr(mod, "healthcheck"):
         try:
             h = mod.healthcheck()
             if isinstance(h, dict):
-                di.health = h
+                out["health"] = h
             else:
-                di.health = {"status": "ok", "detail": str(h)}
+                out["health"] = {"status": "ok", "detail": str(h)}
         except Exception as e:
-            di.health = {"status": "fail", "error": f"healthcheck_failed: {e}"}
+            out["health"] = {"status": "fail", "error": f"healthcheck_failed: {e}"}
     else:
-        di.health = {"status": "unknown"}
-    di.run_callable = hasattr(mod, "run")
+        out["health"] = {"status": "unknown"}
+    out["run_callable"] = hasattr(mod, "run")
+    return out
+
+
+def _apply_probe(di: DaemonInfo, result: Dict[str, Any]) -> DaemonInfo:
+    di.describe = result.get("describe")
+    di.health = result.get("health") or {}
+    di.run_callable = bool(result.get("run_callable"))
     return di
 
+
+def probe_daemon(di: DaemonInfo, pool: Optional["WarmPool"] = None) -> DaemonInfo:
+    if pool is not None:
+        return probe_all([di], pool)[0]
+    return _apply_probe(di, _probe_module(load_daemon_module(di.name, di.module_path)))
+
+
+def probe_all(discovered: List[DaemonInfo], pool: Optional["WarmPool"] = None) -> List[DaemonInfo]:
+    if pool is None:
+        return [probe_daemon(d) for d in discovered]
+    results = pool.map("probe", discovered)
+    for di, (ok, res) in zip(discovered, results):
+        _apply_probe(di, res if ok and isinstance(res, dict) else
+                     {"health": {"status": "fail", "error": str(res)}})
+    return discovered
+
+# -----------------------------
+# Warm worker pool
+# -----------------------------
+def _worker_handle(req: Tuple[str, str, str, Any, Dict[str, Any]]) -> Tuple[bool, Any]:
+    op, name, path, payload, kwargs = req
+    mod = load_daemon_module(name, Path(path))
+    if op == "probe":
+        return True, _probe_module(mod)
+    if op == "run":
+        if mod is None or not hasattr(mod, "run"):
+            return False, None
+        return True, mod.run(payload, **kwargs)
+    return False, f"unknown op {op!r}"
+
+
+def _worker_main(conn) -> None:
+    while True:
+        try:
+            req = conn.recv()
+        except (EOFError, OSError):
+            break
+        if req is None:
+            break
+        try:
+            reply = _worker_handle(req)
+        except BaseException as e:  # a daemon calling sys.exit() must not kill the worker
+            reply = (False, f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except Exception:
+            # Unpicklable result: hand back its repr instead.
+            conn.send((reply[0], repr(reply[1])))
+
+
+class WarmPool:
+    """Long-lived worker processes that keep daemon modules imported.
+
+    Each daemon is pinned to one worker (crc32 of its name), so its module is
+    imported once and stays warm there; probes fan out across all workers.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._ctx = multiprocessing.get_context()
+        self._slots: List[Tuple[Any, Any]] = [self._spawn() for _ in range(max(1, workers))]
+
+    def _spawn(self) -> Tuple[Any, Any]:
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        proc.start()
+        child.close()
+        return proc, parent
+
+    def _slot_for(self, name: str) -> int:
+        return zlib.crc32(name.lower().encode("utf-8")) % len(self._slots)
+
+    def _respawn(self, idx: int) -> None:
+        proc, conn = self._slots[idx]
+        conn.close()
+        if proc.is_alive():
+            proc.terminate()
+        proc.join(timeout=1)
+        self._slots[idx] = self._spawn()
+
+    def request(self, op: str, di: DaemonInfo, payload: Any = None, **kwargs) -> Tuple[bool, Any]:
+        return self.map(op, [di], payload, **kwargs)[0]
+
+    def map(self, op: str, daemons: List[DaemonInfo], payload: Any = None, **kwargs) -> List[Tuple[bool, Any]]:
+        """Send one request per daemon; each worker handles its share in order."""
+        queues: Dict[int, List[int]] = {}
+        for i, di in enumerate(daemons):
+            queues.setdefault(self._slot_for(di.name), []).append(i)
+        results: List[Tuple[bool, Any]] = [(False, None)] * len(daemons)
+        inflight: Dict[Any, Tuple[int, int]] = {}
+
+        def send_next(slot: int) -> None:
+            if not queues.get(slot):
+                return
+            i = queues[slot].pop(0)
+            di = daemons[i]
+            conn = self._slots[slot][1]
+            conn.send((op, di.name, str(di.module_path), payload, kwargs))
+            inflight[conn] = (slot, i)
+
+        for slot in list(queues):
+            send_next(slot)
+        while inflight:
+            for conn in _wait_conns(list(inflight)):
+                slot, i = inflight.pop(conn)
+                try:
+                    results[i] = conn.recv()
+                except (EOFError, OSError):
+                    results[i] = (False, "worker died")
+                    self._respawn(slot)
+                send_next(slot)
+        return results
+
+    def close(self) -> None:
+        for proc, conn in self._slots:
+            try:
+                conn.send(None)
+            except Exception:
+                pass
+        for proc, conn in self._slots:
+            proc.join(timeout=2)
+            if proc.is_alive():
+                proc.terminate()
+            conn.close()
+        self._slots = []
+
+    def __enter__(self) -> "WarmPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 # -----------------------------
 # Registry management
 # -----------------------------
@@ -267,8 +435,14 @@ def ensure_sheele_input_points_to_export(reg: Dict[str, Any]) -> bool:
 # -----------------------------
 # Pipeline execution
 # -----------------------------
-def try_run_daemon(di: DaemonInfo, payload: Any = None, **kwargs) -> Tuple[bool, Any]:
-    mod = import_module_from_path(di.name, di.module_path)
+def try_run_daemon(di: DaemonInfo, payload: Any = None, pool: Optional[WarmPool] = None,
+                   **kwargs) -> Tuple[bool, Any]:
+    if pool is not None:
+        ok, res = pool.request("run", di, payload, **kwargs)
+        if not ok and res:
+            err(f"{di.name}.run failed: {res}")
+        return ok, res
+    mod = load_daemon_module(di.name, di.module_path)
     if mod is None or not hasattr(mod, "run"):
         return False, None
     try:
@@ -278,7 +452,7 @@ def try_run_daemon(di: DaemonInfo, payload: Any = None, **kwargs) -> Tuple[bool,
         err(f"{di.name}.run failed: {e}")
         return False, None
 
-def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
+def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any], pool: Optional[WarmPool] = None) -> None:
     """Pipeline: Sheele -> Briar -> Codexa -> Janvier -> Aderyn"""
     name_map = {d.name.lower(): d for d in discovered}
     sheele = name_map.get("sheele")
@@ -295,7 +469,7 @@ def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
 
     # Sheele
     log("Running Sheele…")
-    ok, sheele_out = try_run_daemon(sheele, payload={"input": str(SHEELE_DEFAULT_INPUT)}, registry=reg)
+    ok, sheele_out = try_run_daemon(sheele, payload={"input": str(SHEELE_DEFAULT_INPUT)}, pool=pool, registry=reg)
     if not ok:
         err("Sheele failed; aborting pipeline.")
         return
@@ -303,7 +477,7 @@ def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
     # Briar
     if briar and briar.run_callable:
         log("Running Briar…")
-        ok, briar_out = try_run_daemon(briar, payload=sheele_out, registry=reg)
+        ok, briar_out = try_run_daemon(briar, payload=sheele_out, pool=pool, registry=reg)
         if not ok:
             warn("Briar failed; continuing with Sheele output.")
             briar_out = sheele_out
@@ -314,7 +488,7 @@ def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
     # Codexa
     if codexa and codexa.run_callable:
         log("Running Codexa…")
-        ok, codexa_out = try_run_daemon(codexa, payload=briar_out, registry=reg)
+        ok, codexa_out = try_run_daemon(codexa, payload=briar_out, pool=pool, registry=reg)
         if not ok:
             warn("Codexa failed; continuing without Codexa output.")
             codexa_out = None
@@ -325,7 +499,7 @@ def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
     # Janvier
     if janvier and janvier.run_callable:
         log("Running Janvier…")
-        ok, janvier_out = try_run_daemon(janvier, payload=sheele_out, registry=reg)
+        ok, janvier_out = try_run_daemon(janvier, payload=sheele_out, pool=pool, registry=reg)
         if not ok:
             warn("Janvier failed.")
             janvier_out = None
@@ -336,7 +510,7 @@ def run_pipeline(discovered: List[DaemonInfo], reg: Dict[str, Any]) -> None:
     # Aderyn
     if aderyn and aderyn.run_callable:
         log("Running Aderyn…")
-        ok, aderyn_out = try_run_daemon(aderyn, payload=janvier_out, registry=reg)
+        ok, aderyn_out = try_run_daemon(aderyn, payload=janvier_out, pool=pool, registry=reg)
         if not ok:
             warn("Aderyn failed.")
     else:
@@ -365,14 +539,31 @@ def print_health_table(discovered: List[DaemonInfo]) -> None:
         print(line)
     print()
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Rhea — EdenOS Orchestrator")
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("RHEA_WORKERS", "0") or 0),
+                    help="warm worker processes for probes/runs (0 = import in-process)")
+    return ap.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    pool = WarmPool(args.workers) if args.workers > 0 else None
+    try:
+        _menu(pool)
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _menu(pool: Optional[WarmPool]):
     log("Scanning daemon directory…")
     discovered = discover_daemons()
     if not discovered:
         err(f"No daemons found under {DAEMON_DIR}")
         sys.exit(1)
     log(f"Discovered {len(discovered)} daemon(s). Probing…")
-    discovered = [probe_daemon(d) for d in discovered]
+    discovered = probe_all(discovered, pool)
     reg = load_registry()
     reg = merge_discovery_into_registry(reg, discovered)
 
@@ -393,7 +584,7 @@ def main():
             else:
                 err("Could not set Sheele input.")
         elif choice == "3":
-            run_pipeline(discovered, reg)
+            run_pipeline(discovered, reg, pool)
         elif choice == "4":
             print(f"Registry: {REGISTRY_PATH}")
             try:
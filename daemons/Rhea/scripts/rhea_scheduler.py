@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Rhea scheduler engine — fires registry tasks and configs/tasks.yaml entries.
+
+Used by ``full_rhea.complete_build.py schedule run``; standard library only
+(PyYAML is needed just to read tasks.yaml).
+
+Schedules understood:
+- ``every_minutes: 30``                  fixed interval
+- ``at: "08:30"`` / ``at: "2025-08-27 08:30"``
+                                         daily at that time (a date anchors the first run)
+- ``schedule:`` on registry tasks        ``every 30m|2h|45s``, ``daily 08:30``,
+                                         ``@hourly``, ``@daily`` or a 5-field cron line
+
+Engine:
+- min-heap of (fire time, seq, task); a tick only pops what is due
+- optional per-task jitter, added on top of the nominal time so it never drifts
+- concurrency cap per team (team / pair / daemon key); over-cap fires wait in a
+  FIFO and start as slots free up
+- misfire handling when a fire is later than ``misfire_grace`` (past its
+  jittered time):
+  ``skip`` drops missed runs, ``once`` runs one catch-up, ``all`` replays every
+  missed occurrence (bounded by ``max_catchup``)
+- last-run/next-fire state and the number of runs still waiting for a slot are
+  appended to a JSONL journal after every tick, so a restart neither re-fires
+  nor forgets runs; the journal is compacted once it holds twice as many lines
+  as there are tasks
+"""
+from __future__ import annotations
+import heapq
+import json
+import os
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Protocol, Tuple
+
+MISFIRE_POLICIES = ("skip", "once", "all")
+
+
+# ----------------- Schedules -----------------
+
+class Schedule(Protocol):
+    def next_after(self, t: float) -> float: ...
+
+
+@dataclass(frozen=True)
+class Interval:
+    seconds: float
+    anchor: float = 0.0
+
+    def next_after(self, t: float) -> float:
+        if t < self.anchor:
+            return self.anchor
+        steps = int((t - self.anchor) // self.seconds) + 1
+        return self.anchor + steps * self.seconds
+
+
+@dataclass(frozen=True)
+class Daily:
+    hour: int
+    minute: int
+    not_before: float = 0.0
+
+    def next_after(self, t: float) -> float:
+        t = max(t, self.not_before - 1)
+        dt = datetime.fromtimestamp(t)
+        cand = dt.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if cand.timestamp() <= t:
+            cand += timedelta(days=1)
+        return cand.timestamp()
+
+
+def _cron_field(spec: str, lo: int, hi: int) -> frozenset:
+    values = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_s = part.split("/", 1)
+            step = int(step_s)
+        if part in ("*", ""):
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        if start < lo or end > hi or start > end or step < 1:
+            raise ValueError(f"cron field {spec!r} out of range {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class Cron:
+    minutes: frozenset
+    hours: frozenset
+    days: frozenset
+    months: frozenset
+    weekdays: frozenset  # 0 = Sunday, like cron
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, line: str) -> "Cron":
+        fields = line.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron needs 5 fields, got {line!r}")
+        m, h, dom, mon, dow = fields
+        weekdays = frozenset(d % 7 for d in _cron_field(dow, 0, 7))
+        return cls(_cron_field(m, 0, 59), _cron_field(h, 0, 23), _cron_field(dom, 1, 31),
+                   _cron_field(mon, 1, 12), weekdays, dom == "*", dow == "*")
+
+    def _day_ok(self, dt: datetime) -> bool:
+        dom_ok = dt.day in self.days
+        dow_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return dom_ok and dow_ok
+        return dom_ok or dow_ok  # cron ORs day-of-month and day-of-week when both are set
+
+    def next_after(self, t: float) -> float:
+        dt = datetime.fromtimestamp(t).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_ok(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt.timestamp()
+        raise ValueError("cron expression never fires")
+
+
+_EVERY = re.compile(r"^every\s+(\d+(?:\.\d+)?)\s*([smhd]?)$", re.IGNORECASE)
+_UNITS = {"": 60, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_at(value: str) -> Daily:
+    value = str(value).strip()
+    try:
+        dt = datetime.fromisoformat(value)
+        return Daily(dt.hour, dt.minute, not_before=dt.timestamp())
+    except ValueError:
+        pass
+    hh, mm = value.split(":", 1)
+    return Daily(int(hh), int(mm))
+
+
+def parse_schedule(spec: Dict[str, Any]) -> Optional[Schedule]:
+    """Build a Schedule from a tasks.yaml entry or registry task; None if unscheduled."""
+    if spec.get("every_minutes") is not None:
+        return Interval(float(spec["every_minutes"]) * 60)
+    if spec.get("at"):
+        return _parse_at(spec["at"])
+    text = str(spec.get("schedule") or "").strip()
+    if not text:
+        return None
+    lowered = text.lower()
+    if lowered == "@hourly":
+        return Cron.parse("0 * * * *")
+    if lowered in ("@daily", "@midnight"):
+        return Cron.parse("0 0 * * *")
+    m = _EVERY.match(text)
+    if m:
+        return Interval(float(m.group(1)) * _UNITS[m.group(2).lower()])
+    if lowered.startswith("daily "):
+        return _parse_at(text[6:])
+    return Cron.parse(text)
+
+
+# ----------------- Tasks -----------------
+
+@dataclass
+class Task:
+    name: str
+    schedule: Schedule
+    args: List[str] = field(default_factory=list)
+    team: Optional[str] = None
+    pair: Optional[str] = None
+    daemon: Optional[str] = None
+    target: Optional[str] = None
+    cmd: Optional[str] = None
+    jitter: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Concurrency bucket: the team, pair or single daemon the task drives."""
+        return self.team or self.pair or self.daemon or self.target or self.name
+
+
+def task_from_spec(spec: Dict[str, Any], default_jitter: float = 0.0) -> Optional[Task]:
+    sched = parse_schedule(spec)
+    if sched is None or not spec.get("name"):
+        return None
+    args = spec.get("args") or []
+    if isinstance(args, str):
+        args = args.split()
+    return Task(
+        name=str(spec["name"]),
+        schedule=sched,
+        args=[str(a) for a in args],
+        team=spec.get("team"),
+        pair=spec.get("pair"),
+        daemon=spec.get("daemon"),
+        target=spec.get("target"),
+        cmd=spec.get("cmd"),
+        jitter=float(spec.get("jitter_seconds", default_jitter) or 0.0),
+    )
+
+
+def load_tasks_yaml(path: Path, default_jitter: float = 0.0) -> List[Task]:
+    """Read the task lists out of a (possibly multi-document) tasks.yaml."""
+    import yaml  # PyYAML
+    tasks: List[Task] = []
+    with path.open("r", encoding="utf-8") as f:
+        for doc in yaml.safe_load_all(f):
+            if not isinstance(doc, list):
+                continue  # e.g. the appended daemon_index documents
+            for spec in doc:
+                if isinstance(spec, dict):
+                    task = task_from_spec(spec, default_jitter)
+                    if task:
+                        tasks.append(task)
+    return tasks
+
+
+# ----------------- State journal -----------------
+
+class StateJournal:
+    """Append-only JSONL of {"task", "last_run", "next_fire", "pending"}; last line per task wins."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lines = 0
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        state: Dict[str, Dict[str, float]] = {}
+        if not self.path.exists():
+            return state
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    state[rec["task"]] = {"last_run": rec.get("last_run"), "next_fire": rec["next_fire"],
+                                          "pending": int(rec.get("pending") or 0)}
+                except Exception:
+                    continue  # torn last line after a crash
+                self.lines += 1
+        return state
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(r) + "\n" for r in records)
+        if not payload:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(payload)
+        self.lines += payload.count("\n")
+
+    def needs_compaction(self, tasks: int) -> bool:
+        return self.lines > 2 * max(tasks, 1)
+
+    def compact(self, state: Dict[str, Dict[str, float]]) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as f:
+            for name, rec in state.items():
+                f.write(json.dumps({"task": name, **rec}) + "\n")
+        os.replace(tmp, self.path)
+        self.lines = len(state)
+
+
+# ----------------- Engine -----------------
+
+class Handle(Protocol):
+    def poll(self) -> Optional[int]: ...
+
+
+Launcher = Callable[[Task], Optional[Handle]]
+
+
+class Scheduler:
+    def __init__(self, tasks: Iterable[Task], launcher: Launcher, *,
+                 clock: Callable[[], float] = time.time,
+                 state_path: Optional[Path] = None,
+                 max_per_team: int = 1,
+                 team_caps: Optional[Dict[str, int]] = None,
+                 misfire: str = "once",
+                 misfire_grace: float = 60.0,
+                 max_catchup: int = 10,
+                 rng: Optional[random.Random] = None):
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"misfire must be one of {MISFIRE_POLICIES}, got {misfire!r}")
+        self.tasks: Dict[str, Task] = {t.name: t for t in tasks}
+        self.launcher = launcher
+        self.clock = clock
+        self.max_per_team = max_per_team
+        self.team_caps = dict(team_caps or {})
+        self.misfire = misfire
+        self.misfire_grace = misfire_grace
+        self.max_catchup = max_catchup
+        self.rng = rng or random.Random()
+        self.journal = StateJournal(state_path) if state_path else None
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._nominal: Dict[str, float] = {}
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, List[Handle]] = {}
+        self._waiting: Dict[str, Deque[str]] = {}
+        self.stats = {"fired": 0, "deferred": 0, "skipped": 0, "caught_up": 0, "ticks": 0}
+        self._bootstrap()
+
+    # -- setup --------------------------------------------------------------
+
+    def _bootstrap(self) -> None:
+        now = self.clock()
+        saved = self.journal.load() if self.journal else {}
+        for name, task in self.tasks.items():
+            rec = saved.get(name)
+            if rec and rec.get("next_fire") is not None:
+                nominal = float(rec["next_fire"])
+                self.state[name] = dict(rec)
+            else:
+                nominal = task.schedule.next_after(now)
+                self.state[name] = {"last_run": None, "next_fire": nominal, "pending": 0}
+            self._push(name, nominal)
+            # Runs that were waiting for a slot when the last process stopped.
+            pending = self.state[name].get("pending") or 0
+            if pending:
+                self._waiting.setdefault(task.key, deque()).extend([name] * pending)
+        if self.journal and self.journal.needs_compaction(len(self.tasks)):
+            self.journal.compact(self.state)
+
+    def _push(self, name: str, nominal: float) -> None:
+        self._nominal[name] = nominal
+        jitter = self.tasks[name].jitter
+        fire = nominal + (self.rng.uniform(0, jitter) if jitter > 0 else 0.0)
+        self._seq += 1
+        heapq.heappush(self._heap, (fire, self._seq, name))
+
+    def cap_for(self, key: str) -> int:
+        return self.team_caps.get(key, self.max_per_team)
+
+    # -- ticking ------------------------------------------------------------
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def tick(self) -> List[str]:
+        """Reap finished runs, then launch every due or waiting task. Returns names launched."""
+        now = self.clock()
+        self.stats["ticks"] += 1
+        self._reap()
+        launched: List[str] = []
+        dirty: Dict[str, None] = {}
+
+        for key in list(self._waiting):
+            queue = self._waiting[key]
+            while queue and self._has_slot(key):
+                name = queue.popleft()
+                self._launch(name)
+                launched.append(name)
+                self.state[name]["pending"] -= 1
+                self.state[name]["last_run"] = now
+                dirty[name] = None
+            if not queue:
+                del self._waiting[key]
+
+        while self._heap and self._heap[0][0] <= now:
+            fire, _, name = heapq.heappop(self._heap)
+            task = self.tasks[name]
+            nominal = self._nominal[name]
+            runs = self._runs_due(task, nominal, fire, now)
+            nxt = task.schedule.next_after(max(nominal, now))
+            state = self.state[name]
+            for _ in range(runs):
+                if self._has_slot(task.key) and not self._waiting.get(task.key):
+                    self._launch(name)
+                    launched.append(name)
+                    state["last_run"] = now
+                else:
+                    # Journaled as pending, so a restart re-queues it instead of losing it.
+                    self._waiting.setdefault(task.key, deque()).append(name)
+                    state["pending"] = state.get("pending", 0) + 1
+                    self.stats["deferred"] += 1
+            state["next_fire"] = nxt
+            self._push(name, nxt)
+            dirty[name] = None
+
+        if dirty and self.journal:
+            self.journal.append({"task": n, **self.state[n]} for n in dirty)
+            if self.journal.needs_compaction(len(self.tasks)):
+                self.journal.compact(self.state)
+        return launched
+
+    def _runs_due(self, task: Task, nominal: float, fire: float, now: float) -> int:
+        # Lateness counts from the jittered fire time: jitter is a delay we chose.
+        if now - fire <= self.misfire_grace:
+            return 1
+        if self.misfire == "skip":
+            self.stats["skipped"] += 1
+            return 0
+        if self.misfire == "once":
+            self.stats["caught_up"] += 1
+            return 1
+        missed = 0
+        t = nominal
+        while t <= now and missed < self.max_catchup:
+            missed += 1
+            t = task.schedule.next_after(t)
+        self.stats["caught_up"] += missed
+        return missed
+
+    def _has_slot(self, key: str) -> bool:
+        return len(self._running.get(key, ())) < self.cap_for(key)
+
+    def _launch(self, name: str) -> None:
+        task = self.tasks[name]
+        handle = self.launcher(task)
+        self.stats["fired"] += 1
+        # A launcher that returns None ran the task synchronously; nothing to track.
+        if handle is not None:
+            self._running.setdefault(task.key, []).append(handle)
+
+    def _reap(self) -> None:
+        for key in list(self._running):
+            alive = [h for h in self._running[key] if h.poll() is None]
+            if alive:
+                self._running[key] = alive
+            else:
+                del self._running[key]
+
+    def running_count(self, key: Optional[str] = None) -> int:
+        if key is not None:
+            return len(self._running.get(key, ()))
+        return sum(len(v) for v in self._running.values())
+
+    # -- loop ---------------------------------------------------------------
+
+    def run_forever(self, sleep: Callable[[float], None] = time.sleep, poll: float = 1.0,
+                    on_launch: Optional[Callable[[List[str]], None]] = None) -> None:
+        while True:
+            launched = self.tick()
+            if launched and on_launch:
+                on_launch(launched)
+            nxt = self.next_due()
+            wait = poll if nxt is None else min(poll, max(0.0, nxt - self.clock()))
+            sleep(wait)
@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Rhea supervisor — keeps daemons running after the CLI that started them exits.
+
+Used by ``full_rhea.complete_build.py supervise ...`` and, when a supervisor is
+up, by ``start``/``stop``/``start-team``/``stop-team``; standard library only.
+
+- one long-lived process per state directory, guarded by a locked pidfile
+  (``supervisor.pid``)
+- children, their pids and restart counters live in a SQLite state database
+  (``supervisor.sqlite3``); a restarted supervisor re-adopts children that are
+  still alive instead of spawning them again
+- restart policies ``always`` / ``on-failure`` / ``never`` with exponential
+  backoff (``BACKOFF_BASE`` doubling up to ``BACKOFF_MAX``); a child that ran
+  for ``STABLE_AFTER`` seconds is restarted at once and its backoff reset
+- CPU% and RSS sampled per child every ``SAMPLE_INTERVAL`` seconds from /proc
+- control socket (Unix socket, or loopback TCP where there is none) speaking
+  one JSON object per line: ``ping``, ``start``, ``stop``, ``restart``,
+  ``status``, ``shutdown``. ``start``/``stop`` take many daemons at once, so a
+  whole team is one round-trip
+- SIGCHLD wakes the loop, so a crash is noticed (and restarted) immediately
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import selectors
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RESTART_POLICIES = ("always", "on-failure", "never")
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+STABLE_AFTER = 10.0
+SAMPLE_INTERVAL = 2.0
+STOP_GRACE = 5.0
+TICK = 0.5
+
+PID_FILE = "supervisor.pid"
+ADDR_FILE = "supervisor.addr"
+SOCK_FILE = "supervisor.sock"
+DB_FILE = "supervisor.sqlite3"
+LOG_FILE = "supervisor.log"
+
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLK_TCK = 100
+
+
+class SupervisorUnavailable(RuntimeError):
+    pass
+
+
+def backoff_delay(failures: int) -> float:
+    """Delay before restart number ``failures`` of a child that keeps failing fast."""
+    if failures <= 0:
+        return 0.0
+    return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (failures - 1)))
+
+
+def should_restart(policy: str, exit_code: Optional[int]) -> bool:
+    if policy == "always":
+        return True
+    if policy == "on-failure":
+        return exit_code != 0
+    return False
+
+
+# ----------------- /proc sampling -----------------
+
+def _proc_stat(pid: int) -> Optional[List[str]]:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            raw = f.read().decode("ascii", "replace")
+    except OSError:
+        return None
+    # Fields after the parenthesised command name (which may contain spaces).
+    return raw[raw.rfind(")") + 2:].split()
+
+
+def proc_start_ticks(pid: int) -> Optional[int]:
+    fields = _proc_stat(pid)
+    return int(fields[19]) if fields else None
+
+
+def sample_process(pid: int) -> Optional[Dict[str, float]]:
+    """Cumulative CPU seconds and RSS (KiB) of ``pid``; None where /proc is absent."""
+    fields = _proc_stat(pid)
+    if not fields:
+        return None
+    cpu = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+    rss_kb = 0
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii", errors="replace") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+                    break
+    except OSError:
+        pass
+    return {"cpu_seconds": cpu, "rss_kb": rss_kb}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _signal_tree(pid: int, sig: int) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(pid, sig)  # children run in their own session
+        else:
+            os.kill(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        try:
+            os.kill(pid, sig)
+        except OSError:
+            pass
+    except OSError:
+        pass
+
+
+# ----------------- State -----------------
+
+@dataclass
+class ChildSpec:
+    name: str
+    argv: List[str]
+    cwd: str
+    env: Dict[str, str] = field(default_factory=dict)
+    restart: str = "on-failure"
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ChildSpec":
+        restart = d.get("restart") or "on-failure"
+        if restart not in RESTART_POLICIES:
+            raise ValueError(f"restart must be one of {', '.join(RESTART_POLICIES)}")
+        return cls(name=str(d["name"]), argv=[str(a) for a in d["argv"]], cwd=str(d.get("cwd") or "."),
+                   env={str(k): str(v) for k, v in (d.get("env") or {}).items()}, restart=restart)
+
+
+class Child:
+    def __init__(self, spec: ChildSpec):
+        self.spec = spec
+        self.proc: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.start_ticks: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.desired = "running"
+        self.restarts = 0
+        self.failures = 0
+        self.next_start: Optional[float] = None
+        self.last_exit: Optional[int] = None
+        self.exited_at: Optional[float] = None
+        self.stop_deadline: Optional[float] = None
+        self.cpu_percent: Optional[float] = None
+        self.rss_kb: Optional[int] = None
+        self.restart_latency: Optional[float] = None
+        self._started_mono: Optional[float] = None
+        self._cpu_prev: Optional[tuple] = None
+
+    @property
+    def running(self) -> bool:
+        return self.pid is not None
+
+    @property
+    def state(self) -> str:
+        if self.pid is not None:
+            return "stopping" if self.stop_deadline else "running"
+        if self.desired == "running" and self.next_start is not None:
+            return "backoff"
+        return "stopped" if self.desired == "stopped" else "exited"
+
+    def status(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.spec.name,
+            "state": self.state,
+            "pid": self.pid,
+            "restart": self.spec.restart,
+            "restarts": self.restarts,
+            "uptime": round(time.time() - self.started_at, 1) if self.pid and self.started_at else None,
+            "cpu_percent": self.cpu_percent,
+            "rss_kb": self.rss_kb,
+            "last_exit": self.last_exit,
+            "next_start_in": round(max(0.0, self.next_start - now), 2) if self.next_start else None,
+            "restart_latency": self.restart_latency,
+        }
+
+
+class StateDB:
+    """children table: one row per supervised daemon, rewritten on every change."""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS children (
+                name TEXT PRIMARY KEY, spec TEXT, desired TEXT, pid INTEGER, start_ticks INTEGER,
+                started_at REAL, restarts INTEGER, last_exit INTEGER, cpu_percent REAL, rss_kb INTEGER,
+                updated_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def save(self, children: List[Child]) -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO children VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(c.spec.name, json.dumps(asdict(c.spec)), c.desired, c.pid, c.start_ticks, c.started_at,
+                  c.restarts, c.last_exit, c.cpu_percent, c.rss_kb, now) for c in children],
+            )
+
+    def load(self) -> List[Dict[str, Any]]:
+        cur = self.conn.execute("SELECT name, spec, desired, pid, start_ticks, started_at, restarts, last_exit FROM children")
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, row)) for row in cur]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ----------------- Supervisor -----------------
+
+class Supervisor:
+    def __init__(self, state_dir: Path, clock=time.monotonic):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        (self.state_dir / "logs").mkdir(exist_ok=True)
+        self.clock = clock
+        self.children: Dict[str, Child] = {}
+        self.db = StateDB(self.state_dir / DB_FILE)
+        self.sel = selectors.DefaultSelector()
+        self.pending_stops: List[tuple] = []
+        self.next_sample = 0.0
+        self.running = True
+        # Set by ``shutdown``: the loop runs on until every child is reaped or this passes.
+        self.shutdown_deadline: Optional[float] = None
+        self.started = time.time()
+        self._dirty = False
+        self._pidfile = None
+        self._listener: Optional[socket.socket] = None
+        self._wake_r: Optional[socket.socket] = None
+
+    # --- lifecycle ---
+    def acquire_pidfile(self) -> None:
+        path = self.state_dir / PID_FILE
+        self._pidfile = open(path, "a+")
+        try:
+            import fcntl
+            fcntl.flock(self._pidfile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            pass
+        except OSError:
+            self._pidfile.close()
+            raise SupervisorUnavailable(f"another supervisor holds {path}")
+        self._pidfile.seek(0)
+        self._pidfile.truncate()
+        self._pidfile.write(f"{os.getpid()}\n")
+        self._pidfile.flush()
+
+    def listen(self) -> None:
+        addr_path = self.state_dir / ADDR_FILE
+        if hasattr(socket, "AF_UNIX"):
+            sock_path = self.state_dir / SOCK_FILE
+            try:
+                sock_path.unlink()
+            except FileNotFoundError:
+                pass
+            srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            srv.bind(str(sock_path))
+            addr = {"family": "unix", "path": str(sock_path)}
+        else:
+            srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            srv.bind(("127.0.0.1", 0))
+            addr = {"family": "tcp", "host": "127.0.0.1", "port": srv.getsockname()[1]}
+        srv.listen(64)
+        srv.setblocking(False)
+        self.sel.register(srv, selectors.EVENT_READ, "accept")
+        self._listener = srv
+        tmp = addr_path.with_name(addr_path.name + ".tmp")
+        tmp.write_text(json.dumps(addr), encoding="utf-8")
+        os.replace(tmp, addr_path)
+
+    def _install_sigchld(self) -> None:
+        if not hasattr(signal, "SIGCHLD"):
+            return
+        r, w = socket.socketpair()
+        r.setblocking(False)
+        w.setblocking(False)
+        try:
+            signal.set_wakeup_fd(w.fileno())
+            signal.signal(signal.SIGCHLD, lambda *_: None)
+        except ValueError:  # not the main thread: fall back to TICK polling
+            r.close()
+            w.close()
+            return
+        self._wake_r, self._wake_w = r, w
+        self.sel.register(r, selectors.EVENT_READ, "wake")
+
+    def adopt(self) -> None:
+        """Pick up children recorded by a previous supervisor run."""
+        now = self.clock()
+        for row in self.db.load():
+            try:
+                spec = ChildSpec.from_dict(json.loads(row["spec"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+            child = Child(spec)
+            child.desired = row["desired"] or "stopped"
+            child.restarts = row["restarts"] or 0
+            child.last_exit = row["last_exit"]
+            pid = row["pid"]
+            alive = pid and _pid_alive(pid)
+            if alive and row["start_ticks"] is not None:
+                alive = proc_start_ticks(pid) == row["start_ticks"]  # pid not recycled
+            if alive:
+                child.pid, child.start_ticks = pid, row["start_ticks"]
+                child.started_at = row["started_at"]
+                child._started_mono = now
+            elif child.desired == "running":
+                child.next_start = now
+            self.children[spec.name] = child
+        self._dirty = True
+
+    def serve_forever(self) -> None:
+        self.acquire_pidfile()
+        self.adopt()
+        self.listen()
+        self._install_sigchld()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                signal.signal(sig, lambda *_: setattr(self, "running", False))
+            except ValueError:
+                pass
+        try:
+            while self.running:
+                self.step()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.db.save(list(self.children.values()))
+        self.db.close()
+        if self._listener is not None:
+            self.sel.unregister(self._listener)
+            self._listener.close()
+            for name in (SOCK_FILE, ADDR_FILE):
+                try:
+                    (self.state_dir / name).unlink()
+                except FileNotFoundError:
+                    pass
+        if self._pidfile is not None:
+            self._pidfile.close()
+            try:
+                (self.state_dir / PID_FILE).unlink()
+            except FileNotFoundError:
+                pass
+
+    # --- loop ---
+    def _timeout(self) -> float:
+        now = self.clock()
+        due = [now + TICK, self.next_sample]
+        due += [c.next_start for c in self.children.values() if c.next_start is not None]
+        due += [c.stop_deadline for c in self.children.values() if c.stop_deadline is not None]
+        return max(0.0, min(due) - now)
+
+    def step(self) -> None:
+        for key, _ in self.sel.select(self._timeout()):
+            if key.data == "accept":
+                self._accept()
+            elif key.data == "wake":
+                try:
+                    while key.fileobj.recv(4096):
+                        pass
+                except (BlockingIOError, InterruptedError):
+                    pass
+            else:
+                self._read(key)
+        now = self.clock()
+        self._reap(now)
+        self._restart_due(now)
+        self._finish_stops(now)
+        if self.shutdown_deadline is not None and (
+                now >= self.shutdown_deadline or all(c.pid is None for c in self.children.values())):
+            self.running = False
+        if now >= self.next_sample:
+            self._sample(now)
+            self.next_sample = now + SAMPLE_INTERVAL
+        if self._dirty:
+            self.db.save(list(self.children.values()))
+            self._dirty = False
+
+    def _spawn(self, child: Child, now: float) -> None:
+        spec = child.spec
+        env = os.environ.copy()
+        env.update(spec.env)
+        log = open(self.state_dir / "logs" / f"{spec.name}.log", "ab")
+        try:
+            child.proc = subprocess.Popen(
+                spec.argv, cwd=spec.cwd, env=env, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError as e:
+            log.write(f"[supervisor] spawn failed: {e}\n".encode("utf-8"))
+            child.proc = None
+            child.last_exit = -1
+            child.exited_at = now
+            self._schedule_restart(child, now, ran_for=0.0)
+            return
+        finally:
+            log.close()
+        child.pid = child.proc.pid
+        child.start_ticks = proc_start_ticks(child.pid)
+        child.started_at = time.time()
+        child._started_mono = now
+        child._cpu_prev = None
+        child.next_start = None
+        if child.exited_at is not None:
+            child.restart_latency = round(now - child.exited_at, 4)
+        self._dirty = True
+
+    def _schedule_restart(self, child: Child, now: float, ran_for: float) -> None:
+        if child.desired != "running" or not should_restart(child.spec.restart, child.last_exit):
+            child.next_start = None
+            return
+        child.failures = 0 if ran_for >= STABLE_AFTER else child.failures + 1
+        child.next_start = now + backoff_delay(child.failures)
+
+    def _reap(self, now: float) -> None:
+        for child in self.children.values():
+            if child.pid is None:
+                continue
+            if child.proc is not None:
+                code = child.proc.poll()
+                if code is None:
+                    continue
+            elif _pid_alive(child.pid):
+                continue
+            else:
+                code = None  # adopted child: exit status unknown
+            ran_for = now - (child._started_mono or now)
+            child.proc, child.pid, child.start_ticks = None, None, None
+            child.last_exit = code
+            child.exited_at = now
+            child.cpu_percent = child.rss_kb = None
+            if child.stop_deadline is not None:
+                # Stopped on request; ``restart`` flips desired back to running.
+                child.stop_deadline = None
+                child.next_start = now if child.desired == "running" else None
+            else:
+                self._schedule_restart(child, now, ran_for)
+            self._dirty = True
+
+    def _restart_due(self, now: float) -> None:
+        for child in self.children.values():
+            if child.pid is None and child.next_start is not None and child.next_start <= now:
+                if child.last_exit is not None or child.exited_at is not None:
+                    child.restarts += 1
+                self._spawn(child, now)
+
+    def _sample(self, now: float) -> None:
+        for child in self.children.values():
+            if child.pid is None:
+                continue
+            s = sample_process(child.pid)
+            if s is None:
+                continue
+            if child._cpu_prev is not None:
+                prev_cpu, prev_t = child._cpu_prev
+                if now > prev_t:
+                    child.cpu_percent = round(100.0 * (s["cpu_seconds"] - prev_cpu) / (now - prev_t), 1)
+            child._cpu_prev = (s["cpu_seconds"], now)
+            child.rss_kb = int(s["rss_kb"])
+            self._dirty = True
+
+    # --- commands ---
+    def cmd_start(self, specs: List[Dict[str, Any]]) -> Dict[str, str]:
+        now = self.clock()
+        results = {}
+        for raw in specs:
+            try:
+                spec = ChildSpec.from_dict(raw)
+            except (KeyError, ValueError, TypeError) as e:
+                results[str(raw.get("name", "?"))] = f"error: {e}"
+                continue
+            child = self.children.get(spec.name)
+            if child is not None and child.pid is not None:
+                child.desired = "running"
+                child.stop_deadline = None
+                results[spec.name] = "already running"
+                continue
+            if child is None:
+                child = self.children[spec.name] = Child(spec)
+            child.spec = spec
+            child.desired = "running"
+            child.failures = 0
+            child.exited_at = None
+            self._spawn(child, now)
+            results[spec.name] = "started" if child.pid else "spawn failed"
+        return results
+
+    def _begin_stop(self, names: List[str], now: float) -> Dict[str, str]:
+        results = {}
+        for name in names:
+            child = self.children.get(name)
+            if child is None:
+                results[name] = "unknown"
+                continue
+            child.desired = "stopped"
+            child.next_start = None
+            if child.pid is None:
+                results[name] = "not running"
+                continue
+            _signal_tree(child.pid, signal.SIGTERM)
+            child.stop_deadline = now + STOP_GRACE
+            results[name] = "stopped"
+        self._dirty = True
+        return results
+
+    def _finish_stops(self, now: float) -> None:
+        for child in self.children.values():
+            if child.stop_deadline is not None and child.pid is not None and now >= child.stop_deadline:
+                _signal_tree(child.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                child.stop_deadline = now + STOP_GRACE
+        still = []
+        for conn, names, results in self.pending_stops:
+            if any(self.children[n].pid is not None for n in names if n in self.children):
+                still.append((conn, names, results))
+            else:
+                self._reply(conn, {"ok": True, "results": results})
+        self.pending_stops = still
+
+    def handle(self, req: Dict[str, Any], conn=None) -> Optional[Dict[str, Any]]:
+        """Run one control request; None means the reply is sent later (stop)."""
+        cmd = req.get("cmd")
+        now = self.clock()
+        if cmd == "ping":
+            return {"ok": True, "pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                    "children": len(self.children)}
+        if cmd == "start":
+            if self.shutdown_deadline is not None:
+                return {"ok": False, "error": "supervisor is shutting down"}
+            return {"ok": True, "results": self.cmd_start(req.get("specs") or [])}
+        if cmd == "shutdown":
+            if req.get("keep_children"):
+                # Leave them running for the next supervisor to adopt.
+                self.running = False
+                return {"ok": True, "results": {}}
+            results = self._begin_stop(list(self.children), now)
+            # TERM now, KILL after STOP_GRACE, then one more grace for the kill to land.
+            self.shutdown_deadline = now + 2 * STOP_GRACE + TICK
+            return {"ok": True, "results": results}
+        if cmd in ("stop", "restart"):
+            names = list(req.get("names") or [])
+            results = self._begin_stop(names, now)
+            if cmd == "restart":
+                for name in names:
+                    child = self.children.get(name)
+                    if child is not None:
+                        child.desired = "running"
+                        if child.pid is None:
+                            child.next_start = now
+                        results[name] = "restarting"
+            waiting = [n for n in names if n in self.children and self.children[n].pid is not None]
+            if waiting and conn is not None and cmd == "stop":
+                self.pending_stops.append((conn, waiting, results))
+                return None
+            return {"ok": True, "results": results}
+        if cmd == "status":
+            names = req.get("names") or sorted(self.children)
+            return {"ok": True, "children": [self.children[n].status(now) for n in names if n in self.children]}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+    # --- socket plumbing ---
+    def _accept(self) -> None:
+        try:
+            conn, _ = self._listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(False)
+        self.sel.register(conn, selectors.EVENT_READ, bytearray())
+
+    def _read(self, key) -> None:
+        conn, buf = key.fileobj, key.data
+        try:
+            data = conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.sel.unregister(conn)
+            conn.close()
+            return
+        buf.extend(data)
+        while b"\n" in buf:
+            line, _, rest = bytes(buf).partition(b"\n")
+            buf[:] = rest
+            try:
+                req = json.loads(line)
+                reply = self.handle(req, conn)
+            except Exception as e:  # a bad request must never take the supervisor down
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            if reply is not None:
+                self._reply(conn, reply)
+
+    def _reply(self, conn, reply: Dict[str, Any]) -> None:
+        try:
+            conn.setblocking(True)
+            conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+            conn.setblocking(False)
+        except OSError:
+            pass
+
+
+# ----------------- Client -----------------
+
+class SupervisorClient:
+    """One connection per request; every command is a single round-trip."""
+
+    def __init__(self, state_dir: Path, timeout: float = 30.0):
+        self.state_dir = Path(state_dir)
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        try:
+            addr = json.loads((self.state_dir / ADDR_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raise SupervisorUnavailable(f"no supervisor in {self.state_dir}")
+        try:
+            if addr.get("family") == "unix":
+                s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                s.settimeout(self.timeout)
+                s.connect(addr["path"])
+            else:
+                s = socket.create_connection((addr["host"], addr["port"]), timeout=self.timeout)
+        except OSError as e:
+            raise SupervisorUnavailable(f"supervisor not answering: {e}")
+        return s
+
+    def request(self, cmd: str, **args) -> Dict[str, Any]:
+        with self._connect() as s:
+            s.sendall(json.dumps({"cmd": cmd, **args}).encode("utf-8") + b"\n")
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = s.recv(65536)
+                if not chunk:
+                    raise SupervisorUnavailable("supervisor closed the connection")
+                buf += chunk
+        reply = json.loads(buf)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "supervisor error"))
+        return reply
+
+    def alive(self) -> bool:
+        try:
+            self.request("ping")
+        except (SupervisorUnavailable, RuntimeError, ValueError):
+            return False
+        return True
+
+
+def ensure_supervisor(state_dir: Path, python: Optional[str] = None, timeout: float = 10.0) -> SupervisorClient:
+    """Client for the supervisor of ``state_dir``, starting one in the background if needed."""
+    state_dir = Path(state_dir)
+    client = SupervisorClient(state_dir)
+    if client.alive():
+        return client
+    state_dir.mkdir(parents=True, exist_ok=True)
+    with open(state_dir / LOG_FILE, "ab") as log:
+        subprocess.Popen(
+            [python or sys.executable, str(Path(__file__).resolve()), "serve", "--state-dir", str(state_dir)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if client.alive():
+            return client
+        time.sleep(0.05)
+    raise SupervisorUnavailable(f"supervisor did not come up; see {state_dir / LOG_FILE}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Rhea process supervisor")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    serve = sub.add_parser("serve", help="run the supervisor in the foreground")
+    serve.add_argument("--state-dir", required=True, type=Path)
+    args = ap.parse_args(argv)
+    try:
+        Supervisor(args.state_dir).serve_forever()
+    except SupervisorUnavailable as e:
+        print(f"[supervisor] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Rhea watch engine — debounced, targeted registry updates for ``full_rhea watch``.
+
+Also home of daemon discovery (YAML docstring headers) and registry
+reconciliation, which ``full_rhea.complete_build.py`` wraps; needs PyYAML only.
+
+Discovery walks the tree once with ``os.scandir``, pruning ``SKIP_PARTS`` folders
+instead of descending into them, and keeps a ``ParseCache`` of every ``.py``
+file's result keyed by relative path: a file whose (mtime_ns, size) is unchanged
+is not opened, one whose stat moved but whose content hash did not is not
+re-parsed. Only new or edited files reach YAML. ``IncrementalValidator`` does
+the same for registry saves: only daemon entries that changed are re-validated.
+
+Engine:
+- ``Debouncer`` coalesces event paths until nothing has arrived for ``window``
+  seconds (or ``max_delay`` after the first one, so an endless storm still flushes)
+- ``WatchEngine`` keeps the last discovery in memory plus a path -> daemon index;
+  a batch re-parses only the ``.py`` files it names (a ``.json`` manifest change
+  re-parses the daemons in that daemon's folder) and returns a ``Patch``
+- ``apply_patch`` applies the patch to the registry: touched daemons and their
+  teams only, with the same rules as a full ``reconcile_registry``
+- writes of the registry by the watcher itself are recognised by size/mtime and
+  do not come back as events; editor noise (opened/closed-no-write events,
+  ``~``/swap files) is dropped before it reaches the engine
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEBOUNCE_WINDOW = 0.5
+MAX_DELAY = 5.0
+WATCHED_SUFFIXES = (".py", ".json")
+IGNORED_EVENTS = frozenset({"opened", "closed_no_write"})
+SKIP_PARTS = frozenset({"node_modules", "Rhea_historic", "_inbox", ".git", "__pycache__", "logs"})
+MERGED_FIELDS = ("path", "team", "group", "tags", "env", "start")
+
+Entry = Dict[str, Any]
+
+
+# ----------------- Discovery -----------------
+
+def read_yaml_docstring(pyfile: Path) -> Optional[Dict[str, Any]]:
+    try:
+        text = pyfile.read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return None
+    return parse_yaml_docstring(text)
+
+
+def parse_yaml_docstring(text: str) -> Optional[Dict[str, Any]]:
+    # First triple-quoted block is treated as YAML
+    for quote in ('"""', "'''"):
+        if text.strip().startswith(quote):
+            end = text.find(quote, 3)
+            if end > 3:
+                import yaml  # only files that open with a docstring get this far
+
+                block = text[3:end]
+                try:
+                    data = yaml.safe_load(block) or {}
+                    if isinstance(data, dict):
+                        return data
+                except Exception:
+                    return None
+    return None
+
+
+def skipped(path: Path) -> bool:
+    return any(part in SKIP_PARTS for part in path.parts)
+
+
+def daemon_entry(pyfile: Path, daemons_root: Path,
+                 meta: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, Entry]]:
+    """Registry entry declared by ``pyfile``'s docstring header (or ``meta``), or None."""
+    if meta is None:
+        meta = read_yaml_docstring(pyfile)
+    if not meta:
+        return None
+    daemon_name = meta.get("daemon", {}).get("name") or meta.get("name")
+    if not daemon_name:
+        return None
+    start_cmd = meta.get("daemon", {}).get("start") or meta.get("start")
+    team = meta.get("daemon", {}).get("team") or meta.get("team", "Unassigned")
+    group = meta.get("daemon", {}).get("group") or meta.get("group", "Default")
+    tags = meta.get("daemon", {}).get("tags") or meta.get("tags") or []
+    env = meta.get("daemon", {}).get("env") or meta.get("env") or {}
+    start: Dict[str, Any]
+    if isinstance(start_cmd, str):
+        # Split on spaces, naive
+        start = {"type": "shell", "args": [start_cmd]}
+    elif isinstance(start_cmd, dict):
+        start = start_cmd
+    else:
+        start = {"type": "python", "args": [str(pyfile.name)]}
+    return daemon_name, {
+        "name": daemon_name,
+        # Store path relative to the daemons root (daemons)
+        "path": str(pyfile.relative_to(daemons_root)),
+        "enabled": True,
+        "tags": tags,
+        "team": team,
+        "group": group,
+        "env": env,
+        "start": start
+    }
+
+
+class ParseCache:
+    """Per-file discovery results, persisted as JSON next to Rhea's other state."""
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path], daemons_root: Path):
+        self.path = path
+        self.root = str(daemons_root)
+        self.files: Dict[str, list] = {}     # rel path -> [mtime_ns, size, sha1, name, entry]
+        self.hits = self.rehashed = self.parsed = 0
+        self._dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.VERSION and data.get("root") == self.root:
+            self.files = data.get("files") or {}
+
+    def lookup(self, rel: str, pyfile: Path, st: os.stat_result) -> Optional[Tuple[str, Entry]]:
+        rec = self.files.get(rel)
+        if rec and rec[0] == st.st_mtime_ns and rec[1] == st.st_size:
+            self.hits += 1
+            return (rec[3], rec[4]) if rec[3] else None
+        try:
+            raw = pyfile.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha1(raw).hexdigest()
+        if rec and rec[2] == digest:
+            # touched, not edited
+            self.rehashed += 1
+            hit = (rec[3], rec[4]) if rec[3] else None
+        else:
+            self.parsed += 1
+            text = raw.decode("utf-8", errors="ignore")
+            hit = daemon_entry(pyfile, Path(self.root), parse_yaml_docstring(text) or {})
+        self.files[rel] = [st.st_mtime_ns, st.st_size, digest, hit[0] if hit else None, hit[1] if hit else None]
+        self._dirty = True
+        return hit
+
+    def save(self, seen: Set[str]) -> None:
+        """Write back, forgetting files that were not ``seen`` in this walk."""
+        if len(seen) != len(self.files):
+            self.files = {rel: rec for rel, rec in self.files.items() if rel in seen}
+            self._dirty = True
+        if self.path is None or not self._dirty:
+            return
+        path = Path(self.path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"version": self.VERSION, "root": self.root, "files": self.files}),
+                           encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            # a read-only tree just means every scan runs cold
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        self._dirty = False
+
+
+def iter_py_files(daemons_root: Path):
+    """(relative path, absolute path, stat) for every .py under the root, pruning SKIP_PARTS folders."""
+    base = os.fspath(daemons_root)
+    stack = [base]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for e in entries:
+            if e.name in SKIP_PARTS:
+                continue
+            if e.is_dir(follow_symlinks=False):
+                subdirs.append(e.path)
+            elif e.name.endswith(".py"):
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                yield e.path[len(base) + 1:], Path(e.path), st
+        stack.extend(reversed(subdirs))
+
+
+def discover_daemons(daemons_root: Path, cache: Optional[ParseCache] = None) -> Dict[str, Entry]:
+    discovered: Dict[str, Entry] = {}
+    if not daemons_root.exists() or skipped(daemons_root):
+        return discovered
+    cache = cache if cache is not None else ParseCache(None, daemons_root)
+    seen: Set[str] = set()
+    for rel, pyfile, st in iter_py_files(daemons_root):
+        seen.add(rel)
+        hit = cache.lookup(rel, pyfile, st)
+        if hit:
+            discovered[hit[0]] = hit[1]
+    cache.save(seen)
+    return discovered
+
+
+# ----------------- Reconciliation -----------------
+
+def _sync_team(reg: Dict[str, Any], team: str, members: List[str], logs: List[str]) -> None:
+    if not members:
+        if team in reg["teams"]:
+            del reg["teams"][team]
+            logs.append(f"- removed empty team {team}")
+        return
+    t = reg["teams"].setdefault(team, {"members": []})
+    if sorted(t["members"]) != sorted(members):
+        t["members"] = sorted(members)
+        logs.append(f"~ synced team {team} members")
+
+
+def _merge(reg: Dict[str, Any], name: str, d: Entry, logs: List[str]) -> None:
+    if name not in reg["daemons"]:
+        reg["daemons"][name] = d
+        logs.append(f"+ added daemon {name}")
+        return
+    # merge on path/team/group/tags/env/start; keep enabled flag
+    cur = reg["daemons"][name]
+    changed = []
+    for k in MERGED_FIELDS:
+        if cur.get(k) != d.get(k):
+            cur[k] = d.get(k)
+            changed.append(k)
+    if changed:
+        logs.append(f"~ updated {name}: {', '.join(changed)}")
+
+
+def _disable_if_missing(reg: Dict[str, Any], name: str, daemons_root: Path, logs: List[str]) -> None:
+    d = reg["daemons"][name]
+    if d.get("enabled", True) and not (daemons_root / d.get("path", "")).exists():
+        d["enabled"] = False
+        logs.append(f"! disabled {name} (file missing)")
+
+
+def reconcile_registry(reg: Dict[str, Any], discovered: Dict[str, Entry],
+                       daemons_root: Path) -> Tuple[Dict[str, Any], List[str]]:
+    logs: List[str] = []
+    # Add or update discovered daemons
+    for name, d in discovered.items():
+        _merge(reg, name, dict(d), logs)
+    # Disable missing files
+    for name in list(reg["daemons"]):
+        _disable_if_missing(reg, name, daemons_root, logs)
+    # Sync teams -> members; drop empty teams not referenced
+    team_members: Dict[str, List[str]] = {}
+    for name, d in reg["daemons"].items():
+        team_members.setdefault(d.get("team", "Unassigned"), []).append(name)
+    for team, members in team_members.items():
+        _sync_team(reg, team, members, logs)
+    for team in list(reg["teams"]):
+        if team not in team_members:
+            _sync_team(reg, team, [], logs)
+    return reg, logs
+
+
+class IncrementalValidator:
+    """Draft-7 validation that re-checks only the daemons whose entry changed since the last clean pass.
+
+    Everything but ``daemons`` (palettes, teams, pairs, tasks) is small and always
+    checked; each daemon entry is checked against the daemon sub-schema only when
+    its JSON digest differs from the one recorded in ``state_path``.
+    """
+
+    def __init__(self, schema: Dict[str, Any], state_path: Optional[Path] = None):
+        self.schema = schema
+        self.state_path = state_path
+        self.schema_digest = _digest(schema)
+        self.digests: Dict[str, str] = {}
+        self.checked = 0
+        if state_path is None:
+            return
+        try:
+            data = json.loads(Path(state_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("schema") == self.schema_digest:
+            self.digests = data.get("daemons") or {}
+
+    def errors(self, data: Any, full: bool = False) -> list:
+        """jsonschema ValidationErrors for ``data``; paths are relative to the registry root."""
+        from jsonschema import Draft7Validator
+
+        daemons = data.get("daemons") if isinstance(data, dict) else None
+        if full or not isinstance(daemons, dict):
+            errors = list(Draft7Validator(self.schema).iter_errors(data))
+            self.checked = len(daemons) if isinstance(daemons, dict) else 0
+            if not errors and isinstance(daemons, dict):
+                self._remember({name: _digest(d) for name, d in daemons.items()})
+            return errors
+        errors = list(Draft7Validator(self.schema).iter_errors({**data, "daemons": {}}))
+        entry = Draft7Validator(self.schema["properties"]["daemons"]["additionalProperties"])
+        digests: Dict[str, str] = {}
+        self.checked = 0
+        for name, d in daemons.items():
+            digests[name] = digest = _digest(d)
+            if self.digests.get(name) == digest:
+                continue
+            self.checked += 1
+            for e in entry.iter_errors(d):
+                e.path.extendleft((name, "daemons"))
+                errors.append(e)
+        if not errors:
+            self._remember(digests)
+        return errors
+
+    def _remember(self, digests: Dict[str, str]) -> None:
+        if digests == self.digests:
+            return
+        self.digests = digests
+        if self.state_path is None:
+            return
+        path = Path(self.state_path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"schema": self.schema_digest, "daemons": digests}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ----------------- Watch engine -----------------
+
+class Debouncer:
+    """Thread-safe ordered set of changed paths with a quiet-period flush."""
+
+    def __init__(self, window: float = DEBOUNCE_WINDOW, max_delay: float = MAX_DELAY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.max_delay = max_delay
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._paths: Dict[str, None] = {}
+        self._first = self._last = 0.0
+        self.events = 0
+
+    def add(self, path: str) -> None:
+        with self._cond:
+            now = self.clock()
+            if not self._paths:
+                self._first = now
+            self._paths[path] = None
+            self._last = now
+            self.events += 1
+            self._cond.notify()
+
+    def _delay(self) -> Optional[float]:
+        if not self._paths:
+            return None
+        due = min(self._last + self.window, self._first + self.max_delay)
+        return due - self.clock()
+
+    def drain(self, force: bool = False) -> List[str]:
+        """The pending batch if it is due (or ``force``), else []."""
+        with self._cond:
+            delay = self._delay()
+            if delay is None or (delay > 0 and not force):
+                return []
+            batch, self._paths = list(self._paths), {}
+            return batch
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until a batch is due (returned) or ``timeout`` passes ([])."""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while True:
+                delay = self._delay()
+                if delay is not None and delay <= 0:
+                    batch, self._paths = list(self._paths), {}
+                    return batch
+                left = None if deadline is None else deadline - self.clock()
+                if left is not None and left <= 0:
+                    return []
+                waits = [w for w in (delay, left) if w is not None]
+                self._cond.wait(min(waits) if waits else None)
+
+
+def event_paths(event) -> List[str]:
+    """Paths worth queueing from a watchdog event."""
+    if event.event_type in IGNORED_EVENTS:
+        return []
+    paths = [event.src_path, getattr(event, "dest_path", "") or ""]
+    if event.is_directory:
+        # a folder moved or deleted takes its daemons with it; "modified" folders are noise
+        return [p for p in paths if p] if event.event_type in ("moved", "deleted") else []
+    return [p for p in paths if p.endswith(WATCHED_SUFFIXES)]
+
+
+@dataclass
+class Patch:
+    upserts: Dict[str, Entry] = field(default_factory=dict)
+    gone: Set[str] = field(default_factory=set)        # daemons whose file vanished or stopped declaring them
+    registry_edited: bool = False                        # someone else wrote the registry
+    parsed: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.upserts or self.gone or self.registry_edited)
+
+
+def _sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class WatchEngine:
+    def __init__(self, daemons_root: Path, registry_path: Path,
+                 parse: Callable[[Path, Path], Optional[Tuple[str, Entry]]] = daemon_entry):
+        self.root = Path(daemons_root)
+        self.registry_path = Path(registry_path)
+        self.parse = parse
+        self.entries: Dict[str, Entry] = {}
+        self.by_path: Dict[str, str] = {}    # relative .py path -> daemon name
+        self._own_sig: Optional[Tuple[int, int]] = None
+        self.batches = 0
+        self.parsed = 0
+
+    def prime(self, discovered: Dict[str, Entry]) -> None:
+        self.entries = {name: dict(d) for name, d in discovered.items()}
+        self.by_path = {d["path"]: name for name, d in self.entries.items()}
+
+    def note_saved(self) -> None:
+        """Call after writing the registry so the resulting event is ignored."""
+        self._own_sig = _sig(self.registry_path)
+
+    def _indexed_under(self, rel: str) -> List[str]:
+        prefix = rel.rstrip(os.sep) + os.sep
+        return [p for p in self.by_path if p.startswith(prefix)]
+
+    def _affected(self, paths: Iterable[str], patch: Patch) -> Set[str]:
+        files: Set[str] = set()
+        registry = str(self.registry_path)
+        for p in paths:
+            if p == registry:
+                if _sig(self.registry_path) != self._own_sig:
+                    patch.registry_edited = True
+                continue
+            path = Path(p)
+            try:
+                rel = path.relative_to(self.root)
+            except ValueError:
+                continue
+            if not rel.parts or skipped(path):
+                continue
+            if path.suffix == ".py":
+                files.add(str(rel))
+            elif path.suffix == ".json":
+                # manifests sit beside their daemon: re-read that daemon folder's headers
+                files.update(self._indexed_under(rel.parts[0]))
+            else:
+                # a folder that moved or went away, or one that arrived
+                files.update(self._indexed_under(str(rel)))
+                if path.is_dir():
+                    files.update(str(f.relative_to(self.root)) for f in path.rglob("*.py") if not skipped(f))
+        return files
+
+    def changes(self, paths: Iterable[str]) -> Patch:
+        """Re-parse what ``paths`` touch; update the in-memory discovery; return the delta."""
+        patch = Patch()
+        for rel in sorted(self._affected(paths, patch)):
+            hit = self.parse(self.root / rel, self.root) if (self.root / rel).is_file() else None
+            patch.parsed += 1
+            old = self.by_path.pop(rel, None)
+            if old is not None and self.entries.get(old, {}).get("path") == rel and (not hit or hit[0] != old):
+                del self.entries[old]
+                patch.gone.add(old)
+                patch.upserts.pop(old, None)
+            if hit:
+                name, entry = hit
+                self.by_path[rel] = name
+                if self.entries.get(name) != entry:
+                    self.entries[name] = entry
+                    patch.upserts[name] = entry
+                    patch.gone.discard(name)
+        self.batches += 1
+        self.parsed += patch.parsed
+        return patch
+
+
+def apply_patch(reg: Dict[str, Any], patch: Patch, daemons_root: Path) -> List[str]:
+    """Apply a targeted patch: same result as reconcile_registry over a fresh discovery,
+    provided the registry was reconciled before."""
+    logs: List[str] = []
+    teams: Set[str] = set()
+    for name, d in patch.upserts.items():
+        if name in reg["daemons"]:
+            teams.add(reg["daemons"][name].get("team", "Unassigned"))
+        _merge(reg, name, dict(d), logs)
+        teams.add(d.get("team", "Unassigned"))
+    for name in patch.gone:
+        if name in reg["daemons"]:
+            _disable_if_missing(reg, name, daemons_root, logs)
+    for team in sorted(teams):
+        members = [n for n, d in reg["daemons"].items() if d.get("team", "Unassigned") == team]
+        _sync_team(reg, team, members, logs)
+    return logs
@@ -1,10 +1,17 @@
 import json
 import os
-from collections import defaultdict
+import sys
+from collections import Counter, defaultdict
 from datetime import datetime
 from difflib import SequenceMatcher
 from pathlib import Path
 
+try:
+    from eden_conversations import iter_export
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    from eden_conversations import iter_export
+
 # Get paths relative to script location
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -13,6 +20,18 @@ DEFAULT_RAW = str(RHEA_DIR / "inputs" / "conversations.json")
 RAW_FILE = os.environ.get("SHEELE_RAW_FILE", DEFAULT_RAW)
 OUTPUT_DIR = str(RHEA_DIR / "outputs" / "Sheele" / "split_conversations")
 FRACTURE_LOG = os.path.join(OUTPUT_DIR, "sheele_fracture_log.json")
+# "auto" streams exports larger than STREAM_AUTO_MB; "1"/"0" force it on/off.
+STREAM_MODE = os.environ.get("SHEELE_STREAM", "auto")
+STREAM_AUTO_MB = float(os.environ.get("SHEELE_STREAM_AUTO_MB", "256"))
+# Fragment matching: SequenceMatcher only scores the MATCH_CANDIDATES conversations
+# sharing the most rare shingles with a fragment; SHEELE_MATCH=exhaustive scores every pair.
+MATCH_MODE = os.environ.get("SHEELE_MATCH", "index")
+MATCH_CANDIDATES = int(os.environ.get("SHEELE_MATCH_CANDIDATES", "8"))
+MATCH_THRESHOLD = 0.6
+SHINGLE_SIZE = 4
+PROBE_SHINGLES = 32
+# Streaming ingest indexes conversation text in blocks of about this many characters.
+MATCH_BLOCK_CHARS = 64 << 20
 
 def similar(a, b):
 
@@ -47,51 +66,250 @@ def extract_title(messages):
                 return text[:50].replace('\n', ' ')
     return None
 
-def try_assign_fractures(fractures, conversations):
+def _messages_text(messages):
+    return ''.join(m.get('text', '') for m in messages if isinstance(m, dict))
+
+def try_assign_fractures(fractures, conversations, exhaustive=None):
+    if exhaustive is None:
+        exhaustive = MATCH_MODE.strip().lower() == "exhaustive"
+    if exhaustive:
+        return _assign_exhaustive(fractures, conversations)
+
+    ids = list(conversations)
+    index = ShingleIndex()
+    for cid in ids:
+        index.add(_messages_text(conversations[cid]))
+    unassigned = []
+    for f in fractures:
+        messages = f.get('messages', [])
+        f_texts = _messages_text(messages)
+        best_score, best = _best_match(f_texts, index.candidates(f_texts), index.texts)
+        if best_score > MATCH_THRESHOLD:
+            conversations[ids[best]].extend(messages)
+            # Later fragments are scored against the extended thread, as before.
+            index.extend(best, f_texts)
+        else:
+            unassigned.append(f)
+    return conversations, unassigned
+
+def _assign_exhaustive(fractures, conversations):
 
     assigned = []
     unassigned = []
     for f in fractures:
-        f_texts = ''.join(m.get('text', '') for m in f.get('messages', []) if isinstance(m, dict))
+        f_texts = _messages_text(f.get('messages', []))
         best_fit = None
         best_score = 0
         for cid, convo in conversations.items():
-            convo_texts = ''.join(m.get('text', '') for m in convo if isinstance(m, dict))
+            convo_texts = _messages_text(convo)
             score = similar(f_texts, convo_texts)
             if score > best_score:
                 best_fit = cid
                 best_score = score
-        if best_score > 0.6:
+        if best_score > MATCH_THRESHOLD:
             conversations[best_fit].extend(f.get('messages', []))
             assigned.append(f)
         else:
             unassigned.append(f)
     return conversations, unassigned
 
+# =============================
+# Fragment candidate index
+# =============================
+class ShingleIndex:
+    """Inverted index of character shingles, to pick which texts are worth a SequenceMatcher.
+
+    A query probes only its PROBE_SHINGLES rarest shingles (prefix filtering):
+    a text similar enough to pass MATCH_THRESHOLD shares most of the query's
+    shingles, rare ones included, while common shingles would only add votes
+    for every text in the index.
+    """
+
+    def __init__(self, size=SHINGLE_SIZE, probe=PROBE_SHINGLES):
+        self.size = size
+        self.probe = probe
+        self.texts = []
+        self.postings = defaultdict(list)
+
+    def shingles(self, text):
+        n = self.size
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, text):
+        idx = len(self.texts)
+        self.texts.append(text)
+        for g in self.shingles(text):
+            self.postings[g].append(idx)
+        return idx
+
+    def extend(self, idx, text):
+        old = self.texts[idx]
+        self.texts[idx] = old + text
+        for g in self.shingles(old + text) - self.shingles(old):
+            self.postings[g].append(idx)
+
+    def candidates(self, text, k=None):
+        """Indexes of the texts most likely to match, in index order."""
+        k = MATCH_CANDIDATES if k is None else k
+        postings = self.postings
+        probe = sorted((len(postings[g]), g) for g in self.shingles(text) if g in postings)
+        if not probe:
+            # Too short to shingle, or nothing in common: only length can still rule texts out.
+            return [i for i, t in enumerate(self.texts) if _ratio_bound(len(text), len(t)) > MATCH_THRESHOLD]
+        votes = Counter()
+        for _, g in probe[:self.probe]:
+            votes.update(postings[g])
+        return sorted(idx for idx, _ in votes.most_common(k))
+
+def _ratio_bound(a, b):
+    # SequenceMatcher.real_quick_ratio() from the lengths alone.
+    return 2.0 * min(a, b) / (a + b) if a + b else 1.0
+
+def _best_match(text, ids, texts, floor=0):
+    """(score, index) of the best text among ids; ties keep the earliest, like a full scan."""
+    best_score, best = floor, None
+    for idx in ids:
+        other = texts[idx]
+        bound = _ratio_bound(len(text), len(other))
+        if bound <= best_score or bound <= MATCH_THRESHOLD:
+            continue
+        score = similar(text, other)
+        if score > best_score:
+            best_score, best = score, idx
+    return best_score, best
+
+def write_conversation(cid, messages, date_str=None, indent=2):
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+    title = extract_title(messages) or f"thread_{cid}"
+    fname = f"{date_str}_{cid}_{title[:40].replace(' ', '_')}.json"
+    outpath = os.path.join(OUTPUT_DIR, fname)
+    record = {
+        "id": cid,
+        "title": title,
+        "create_time": date_str,
+        "messages": messages
+    }
+    with open(outpath, 'w', encoding='utf-8') as f:
+        if indent is None:
+            # One-shot C encoder; the indented path goes through the pure-Python one.
+            f.write(json.dumps(record))
+        else:
+            json.dump(record, f, indent=indent)
+    return outpath
+
 def save_conversations(conversations):
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     for cid, messages in conversations.items():
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        title = extract_title(messages) or f"thread_{cid}"
-        fname = f"{date_str}_{cid}_{title[:40].replace(' ', '_')}.json"
-        outpath = os.path.join(OUTPUT_DIR, fname)
-        with open(outpath, 'w', encoding='utf-8') as f:
-            json.dump({
-                "id": cid,
-                "title": title,
-                "create_time": date_str,
-                "messages": messages
-            }, f, indent=2)
+        write_conversation(cid, messages)
+
+# =============================
+# Streaming ingest
+# =============================
+def stream_ingest(raw_file, limit=0):
+    """Split an export without loading it: each conversation is written as soon as it is parsed.
+
+    Fragments without an id are held back (they are small and rare) and matched
+    in a second streaming pass; a match is appended to the conversation's
+    already-written file. Unlike the in-memory path, fragments are scored
+    against the conversations as exported, not as extended by earlier matches.
+    As there, ``limit`` caps the conversations written, not the fragments read
+    or the conversations they are scored against.
+    Returns (written, unassigned fragments).
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    written = {}
+    fractures = []
+    for entry, _ in iter_export(raw_file):
+        if not isinstance(entry, dict):
+            continue
+        conv_id = entry.get("conversation_id") or entry.get("id")
+        if not conv_id:
+            fractures.append(entry)
+            continue
+        if conv_id not in written and limit > 0 and len(written) >= limit:
+            continue
+        outpath = write_conversation(conv_id, [entry], date_str, indent=None)
+        previous = written.get(conv_id)
+        if previous and previous != outpath:
+            # Same id seen again with a new title: keep only the latest, like the dict path.
+            os.remove(previous)
+        written[conv_id] = outpath
+    if not fractures:
+        return written, []
+
+    best = [(0, None)] * len(fractures)
+    texts = [_messages_text(f.get('messages', [])) for f in fractures]
+    exhaustive = MATCH_MODE.strip().lower() == "exhaustive"
+    block_ids, block = [], ShingleIndex()
+    block_chars = 0
+
+    def match_block():
+        for i, f_text in enumerate(texts):
+            ids = range(len(block_ids)) if exhaustive else block.candidates(f_text)
+            score, idx = _best_match(f_text, ids, block.texts, best[i][0])
+            if idx is not None:
+                best[i] = (score, block_ids[idx])
+
+    for entry, _ in iter_export(raw_file):
+        if not isinstance(entry, dict):
+            continue
+        conv_id = entry.get("conversation_id") or entry.get("id")
+        if not conv_id:
+            continue
+        convo_text = _messages_text([entry])
+        block_ids.append(conv_id)
+        block_chars += len(convo_text)
+        if exhaustive:
+            block.texts.append(convo_text)
+        else:
+            block.add(convo_text)
+        if block_chars >= MATCH_BLOCK_CHARS:
+            match_block()
+            block_ids, block = [], ShingleIndex()
+            block_chars = 0
+    if block_ids:
+        match_block()
+
+    lost = []
+    matched = defaultdict(list)
+    for f, (score, conv_id) in zip(fractures, best):
+        if score > 0.6:
+            matched[conv_id].extend(f.get('messages', []))
+        else:
+            lost.append(f)
+    for conv_id, extra in matched.items():
+        if conv_id not in written:
+            continue  # its conversation is past the limit
+        with open(written[conv_id], 'r', encoding='utf-8') as fh:
+            record = json.load(fh)
+        record["messages"].extend(extra)
+        with open(written[conv_id], 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(record))
+    return written, lost
+
+def _want_stream(raw_file, forced=False):
+    if forced:
+        return True
+    mode = STREAM_MODE.strip().lower()
+    if mode in ("1", "on", "true", "yes"):
+        return True
+    if mode in ("0", "off", "false", "no"):
+        return False
+    return os.path.getsize(raw_file) >= STREAM_AUTO_MB * 1024 * 1024
 
 def main():
     import sys
 
-    # Get limit from command line args or environment
+    # Get limit from command line args or environment; --stream forces streaming ingest
+    args = sys.argv[1:]
+    forced_stream = "--stream" in args
+    args = [a for a in args if a != "--stream"]
     limit = None
-    if len(sys.argv) > 1:
+    if args:
         try:
-            limit = int(sys.argv[1])
+            limit = int(args[0])
         except ValueError:
             pass
     if limit is None:
@@ -101,6 +319,12 @@ def main():
     if not os.path.exists(RAW_FILE):
         print(f"? Sheele: RAW_FILE not found at {RAW_FILE}. Set SHEELE_RAW_FILE or place conversations.json.")
         return
+    if _want_stream(RAW_FILE, forced_stream):
+        written, lost = stream_ingest(RAW_FILE, limit)
+        print(f"Sheele streamed {len(written)} threads with {len(lost)} unassigned fragments.")
+        with open(FRACTURE_LOG, 'w', encoding='utf-8') as f:
+            json.dump(lost, f, indent=2)
+        return
     with open(RAW_FILE, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
@@ -2,6 +2,8 @@
 # Requires: pip install watchdog
 # Purpose: Watch folders, hash new/changed files, and move duplicates to a dump folder.
 #          Keeps a SQLite index so it survives restarts and doesn’t rehash forever.
+#          Only files that share a size with a known file are read at all, and then
+#          only a head/tail sample unless that collides too (shared eden_dedupe engine).
 
 import os
 import sys
@@ -15,6 +17,15 @@ import signal
 from pathlib import Path
 from queue import Queue, Empty
 
+try:
+    from eden_dedupe import DedupeIndex, HashCache
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / "shared" / "Daemon_tools" / "scripts"))
+    try:
+        from eden_dedupe import DedupeIndex, HashCache
+    except ImportError:
+        DedupeIndex = HashCache = None
+
 # ========= USER SETTINGS =========
 WATCH_FOLDERS = [
     r"C:\Path\To\Folder1",
@@ -62,7 +73,8 @@ logging.basicConfig(
 )
 log = logging.getLogger("tidbit")
 
-# SQLite index (hash -> canonical path)
+# SQLite index: known files by size, plus a (dev, inode, size, mtime) -> hash cache.
+# Without the shared tools, the older hash -> path table (every file hashed in full).
 DB_PATH = str(Path(LOG_FILE).with_suffix(".sqlite3"))
 conn = sqlite3.connect(DB_PATH, check_same_thread=False)
 conn.execute(
@@ -73,18 +85,12 @@ CREATE TABLE IF NOT EXISTS files(
 )
 """
 )
-# Cache: (size, head_hash) -> full_hash to avoid rehashing identical patterns
-conn.execute(
-    """
-CREATE TABLE IF NOT EXISTS quick_cache(
-    size INTEGER NOT NULL,
-    head_hash TEXT NOT NULL,
-    full_hash TEXT NOT NULL,
-    PRIMARY KEY (size, head_hash)
-)
-"""
-)
 conn.commit()
+if DedupeIndex is not None:
+    hash_cache = HashCache(conn)
+    index = DedupeIndex(conn, hash_cache)
+else:
+    hash_cache = index = None
 
 
 # -------- Helpers --------
@@ -118,42 +124,39 @@ def sha256_file(path: str, block=1024 * 1024) -> str:
     return h.hexdigest()
 
 
-def quick_fingerprint(path: str, head_bytes=1024 * 1024):
-    """Return (size, head_sha256) for quick pre-check to avoid full hashing repeats."""
-    size = os.path.getsize(path)
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        h.update(f.read(head_bytes))
-    return (size, h.hexdigest())
+def get_or_compute_full_hash(path: str) -> str:
+    """Full hash, read from disk only if this inode changed since it was last hashed."""
+    if hash_cache is None:
+        return sha256_file(path)
+    return hash_cache.full(path)
 
 
-def get_or_compute_full_hash(path: str) -> str:
-    """Use quick_cache to avoid re-hashing identical files repeatedly."""
-    size, head = quick_fingerprint(path)
-    cur = conn.execute(
-        "SELECT full_hash FROM quick_cache WHERE size=? AND head_hash=?",
-        (size, head),
-    )
-    row = cur.fetchone()
-    if row:
-        # Still compute to verify; if it matches, trust cache next time
-        try:
-            full = sha256_file(path)
-            if full == row[0]:
-                return full
-        except Exception:
-            pass
-    # Compute and store
+def migrate_legacy_index():
+    """Hand files kept in the older hash -> path table over to the size index.
+
+    Keepers stay keepers: they are adopted in the order they were first kept,
+    ahead of anything the startup crawl finds. The old head-hash cache goes.
+    """
+    rows = conn.execute("SELECT path FROM files ORDER BY rowid").fetchall()
+    if rows:
+        adopted = index.adopt(r[0] for r in rows)
+        log.info(f"[MIGRATE] {adopted} of {len(rows)} known files moved to the size index")
+        conn.execute("DELETE FROM files")
+    conn.execute("DROP TABLE IF EXISTS quick_cache")
+    conn.commit()
+
+
+def find_keeper(path: str):
+    """Path of an earlier identical file, or None after remembering ``path`` as a keeper."""
+    if index is not None:
+        return index.check(path)
     full = sha256_file(path)
-    try:
-        conn.execute(
-            "INSERT OR REPLACE INTO quick_cache(size, head_hash, full_hash) VALUES(?,?,?)",
-            (size, head, full),
-        )
-        conn.commit()
-    except Exception:
-        pass
-    return full
+    row = conn.execute("SELECT path FROM files WHERE hash=?", (full,)).fetchone()
+    if row:
+        return row[0]
+    conn.execute("INSERT INTO files(hash, path) VALUES(?,?)", (full, path))
+    conn.commit()
+    return None
 
 
 def policy_for(path: str) -> str:
@@ -261,16 +264,13 @@ def scanner_worker():
             continue
 
         try:
-            full_hash = get_or_compute_full_hash(path)
+            keeper = find_keeper(norm(path))
         except Exception as e:
             log.warning(f"[SKIP] Hash failed for {path}: {e}")
             q.task_done()
             continue
 
-        cur = conn.execute("SELECT path FROM files WHERE hash=?", (full_hash,))
-        row = cur.fetchone()
-        if row:
-            keeper = row[0]
+        if keeper:
             if norm(keeper) == norm(path):
                 log.debug(f"[SEEN] {path}")
             else:
@@ -285,15 +285,7 @@ def scanner_worker():
                     except Exception as e:
                         log.error(f"[FAIL MOVE] {path}: {e}")
         else:
-            try:
-                conn.execute(
-                    "INSERT INTO files(hash, path) VALUES(?,?)",
-                    (full_hash, norm(path)),
-                )
-                conn.commit()
-                log.info(f"[KEEP] {path}")
-            except Exception as e:
-                log.error(f"[DB] Failed to remember {path}: {e}")
+            log.info(f"[KEEP] {path}")
 
         q.task_done()
 
@@ -320,6 +312,8 @@ def main():
     threading.Thread(target=scanner_worker, daemon=True).start()
 
     # Seed existing files
+    if index is not None:
+        migrate_legacy_index()
     initial_walk()
 
     # Observe
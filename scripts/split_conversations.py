@@ -1,7 +1,14 @@
-import json
 import os
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
+
+try:
+    from eden_conversations import STATE_FILE, split_export
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[1] / "shared" / "Daemon_tools" / "scripts"))
+    from eden_conversations import STATE_FILE, split_export
 
 # Path to your exported ChatGPT data file
 INPUT_FILE = "conversations.json"
@@ -81,26 +88,20 @@ def format_conversation(conv, index):
 
     return title_clean, "\n".join(header + body_lines)
 
+def render(conv, index):
+    title_clean, text = format_conversation(conv, index)
+    output_path = os.path.join(OUTPUT_DIR, f"{title_clean}.txt")
+    print(f"Saved: {output_path}")
+    return [(output_path, text)]
+
 def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    conversations = data.get("conversations", data)
-    count = 0
-
-    for i, conv in enumerate(conversations, start=1):
-        title_clean, text = format_conversation(conv, i)
-        output_path = os.path.join(OUTPUT_DIR, f"{title_clean}.txt")
-
-        with open(output_path, "w", encoding="utf-8") as out:
-            out.write(text)
-
-        count += 1
-        print(f"Saved: {output_path}")
+    # Conversations are parsed one at a time; unchanged ones are not rewritten.
+    stats = split_export(INPUT_FILE, os.path.join(OUTPUT_DIR, STATE_FILE), render)
 
-    print(f"\n✅ Done! Exported {count} conversations to '{OUTPUT_DIR}'")
+    print(f"\n✅ Done! Exported {stats['conversations']} conversations to '{OUTPUT_DIR}' "
+          f"({stats['written']} written, {stats['skipped']} unchanged)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
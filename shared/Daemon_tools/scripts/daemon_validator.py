@@ -23,17 +23,40 @@ Example::
 If no directories are supplied, the current working directory will be
 scanned by default.
 
+The roots are walked once into a filename index, each daemon file is read
+and parsed a single time, and files are analysed in parallel across
+processes (``--jobs``).  Results are cached by content hash in the Eden
+cache folder, so unchanged files are not re-analysed on the next run
+(``--no-cache`` disables this).
+
 The script prints a summary table to standard output, detailing which
 issues were detected for each daemon, or indicating that the file was
 not found.  You can customise the list of daemon names at the top of
 this file.
 """
 
+import argparse
 import ast
+import builtins
+import hashlib
+import json
 import os
 import re
 import sys
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .eden_paths import cache_dir
+except Exception:
+    # Allow running as a plain script
+    _HERE = os.path.dirname(os.path.abspath(__file__))
+    if _HERE not in sys.path:
+        sys.path.append(_HERE)
+    try:
+        from eden_paths import cache_dir  # type: ignore
+    except Exception:
+        cache_dir = None
 
 
 ###############################################################################
@@ -71,6 +94,14 @@ REGEX_PATTERNS = {
     "eval_exec": re.compile(r"\b(eval|exec)\s*\(")
 }
 
+# Bump when the checks change so cached results are recomputed.
+RULES_VERSION = 1
+
+# Below this many files a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 8
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
 
 ###############################################################################
 # Helper functions
@@ -104,6 +135,22 @@ def find_daemon_file(root_dirs: List[str], daemon_name: str) -> str:
     return ""
 
 
+def build_file_index(root_dirs: List[str]) -> Dict[str, str]:
+    """Walk every root once and map lowercase ``.py`` filenames to paths.
+
+    The first occurrence wins, in the same order ``find_daemon_file``
+    would have found it, so lookups return identical paths.
+    """
+    index: Dict[str, str] = {}
+    for root in root_dirs:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                key = filename.lower()
+                if key.endswith(".py") and key not in index:
+                    index[key] = os.path.join(dirpath, filename)
+    return index
+
+
 def analyze_ast(file_path: str) -> Dict[str, int]:
     """Perform AST‑based checks on the given Python file.
 
@@ -125,6 +172,14 @@ def analyze_ast(file_path: str) -> Dict[str, int]:
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             source = f.read()
+    except Exception:
+        return {"undefined_var": -1, "unused_import": -1}
+    return analyze_source(source, file_path)
+
+
+def analyze_source(source: str, file_path: str = "<unknown>") -> Dict[str, int]:
+    """AST checks of ``analyze_ast`` on source text that is already in memory."""
+    try:
         tree = ast.parse(source, filename=file_path)
     except SyntaxError:
         # If the file cannot be parsed, skip AST checks
@@ -152,7 +207,7 @@ def analyze_ast(file_path: str) -> Dict[str, int]:
         for scope in reversed(scopes):
             if name in scope:
                 return True
-        return name in dir(__builtins__)
+        return name in _BUILTIN_NAMES
 
     # Collect imports and usage for unused import detection
     imported_names: Dict[str, int] = {}
@@ -236,24 +291,148 @@ def scan_file(file_path: str) -> Dict[str, int]:
     detected.  A value of ``-1`` indicates the file could not be parsed
     for that particular check (e.g., due to a syntax error).
     """
-    results: Dict[str, int] = {name: 0 for name in REGEX_PATTERNS}
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        with open(file_path, "rb") as f:
+            raw = f.read()
     except Exception:
         # If the file can't be read, return errors indicated by -1
-        for key in results:
-            results[key] = -1
-        return results
+        return {name: -1 for name in REGEX_PATTERNS}
+    return scan_bytes(raw, file_path)
+
+
+def scan_bytes(raw: bytes, file_path: str = "<unknown>") -> Dict[str, int]:
+    """Regex and AST scans over one in-memory copy of a file."""
+    try:
+        code = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return {name: -1 for name in REGEX_PATTERNS}
+    # Match text-mode reads: the patterns and line numbers expect \n endings.
+    code = code.replace("\r\n", "\n").replace("\r", "\n")
+    results: Dict[str, int] = {}
 
     # Regex scans
     for issue_name, pattern in REGEX_PATTERNS.items():
         results[issue_name] = len(pattern.findall(code))
 
     # AST‑based scans
-    ast_results = analyze_ast(file_path)
-    # Combine AST results into the final dictionary
-    results.update(ast_results)
+    results.update(analyze_source(code, file_path))
+    return results
+
+
+###############################################################################
+# Validation engine
+###############################################################################
+
+def _cache_file() -> Optional[str]:
+    if cache_dir is None:
+        return None
+    try:
+        return str(cache_dir() / "daemon_validator.json")
+    except OSError:
+        return None
+
+
+def _load_cache(path: Optional[str]) -> Dict[str, dict]:
+    if not path:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("rules") != RULES_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_cache(path: Optional[str], files: Dict[str, dict]) -> None:
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"rules": RULES_VERSION, "files": files}, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _scan_job(job: Tuple[str, bytes]) -> Dict[str, int]:
+    file_path, raw = job
+    return scan_bytes(raw, file_path)
+
+
+def validate(root_dirs: List[str], daemons: Optional[List[str]] = None, jobs: Optional[int] = None,
+             use_cache: bool = True, cache_path: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Find and scan every daemon with one walk, one read per file and a process pool.
+
+    A cached entry is reused outright when the file's size and mtime are
+    unchanged, and after re-hashing when only the mtime moved.
+    """
+    daemons = DAEMONS if daemons is None else daemons
+    index = build_file_index(root_dirs)
+    cache_path = cache_path or (_cache_file() if use_cache else None)
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    located: Dict[str, str] = {}
+    for daemon in daemons:
+        path = index.get(f"{daemon}.py".lower())
+        if path:
+            located[daemon] = path
+
+    scanned: Dict[str, Dict[str, int]] = {}
+    todo: List[Tuple[str, bytes]] = []
+    fresh: Dict[str, dict] = {}
+    for path in dict.fromkeys(located.values()):
+        try:
+            st = os.stat(path)
+        except OSError:
+            scanned[path] = {name: -1 for name in REGEX_PATTERNS}
+            continue
+        hit = cache.get(path)
+        if hit and hit.get("size") == st.st_size and hit.get("mtime_ns") == st.st_mtime_ns:
+            scanned[path] = hit["result"]
+            fresh[path] = hit
+            continue
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            scanned[path] = {name: -1 for name in REGEX_PATTERNS}
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        if hit and hit.get("sha256") == digest:
+            scanned[path] = hit["result"]
+        else:
+            todo.append((path, raw))
+        fresh[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest,
+                       "result": scanned.get(path)}
+
+    workers = jobs if jobs is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(todo) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_scan_job, todo, chunksize=max(1, len(todo) // (workers * 4))))
+    else:
+        outcomes = [_scan_job(job) for job in todo]
+    for (path, _), result in zip(todo, outcomes):
+        scanned[path] = result
+        fresh[path]["result"] = result
+
+    if use_cache:
+        cache.update(fresh)
+        _save_cache(cache_path, cache)
+
+    results: Dict[str, Dict[str, int]] = {}
+    for daemon in daemons:
+        path = located.get(daemon)
+        entry: Dict[str, int] = {"found": 1 if path else 0}
+        if path:
+            entry.update(scanned[path])
+        results[daemon] = entry
     return results
 
 
@@ -299,8 +478,14 @@ def format_report(data: Dict[str, Dict[str, int]]) -> str:
 
 
 def main(args: List[str]) -> None:
+    parser = argparse.ArgumentParser(description="Static checks for Eden daemon scripts")
+    parser.add_argument("roots", nargs="*", help="Directories to search (default: cwd)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyse every file")
+    opts = parser.parse_args(args)
+
     # Determine directories to search.  If none provided, use current dir.
-    search_dirs = args if args else [os.getcwd()]
+    search_dirs = opts.roots if opts.roots else [os.getcwd()]
 
     # Ensure search directories exist
     valid_dirs = []
@@ -314,17 +499,7 @@ def main(args: List[str]) -> None:
         print("[ERROR] No valid search directories provided.")
         return
 
-    results: Dict[str, Dict[str, int]] = {}
-    for daemon in DAEMONS:
-        entry: Dict[str, int] = {}
-        file_path = find_daemon_file(valid_dirs, daemon)
-        if file_path:
-            entry["found"] = 1
-            issues = scan_file(file_path)
-            entry.update(issues)
-        else:
-            entry["found"] = 0
-        results[daemon] = entry
+    results = validate(valid_dirs, jobs=opts.jobs, use_cache=not opts.no_cache)
 
     report = format_report(results)
     print(report)
@@ -1,29 +1,223 @@
+"""chaos_index.db helpers.
+
+``log_to_db`` used to open a connection, insert one row and commit for every
+converted file. Rows now go through a process-wide ``ChaosIndexWriter``: one
+persistent WAL-mode connection, a fixed INSERT statement (compiled once and
+reused from sqlite3's statement cache) and ``executemany`` commits every
+``batch_size`` rows or ``flush_interval`` seconds, whichever comes first.
+``bulk_load`` is for backfilling large archives in one pass.
+"""
+import atexit
 import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
 
 DB_PATH = "chaos_index.db"
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS chaos_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            original_name TEXT,
-            converted_name TEXT,
-            agent TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            tags TEXT
-        )
-    ''')
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS chaos_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        original_name TEXT,
+        converted_name TEXT,
+        agent TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        tags TEXT
+    )
+'''
+
+# Covering indexes for the usual lookups: by file name, by agent (the
+# converter "type") and by date; each carries the columns those queries return.
+INDEXES = {
+    "chaos_files_by_name": "chaos_files(original_name, converted_name, timestamp)",
+    "chaos_files_by_agent": "chaos_files(agent, timestamp, original_name, converted_name)",
+    "chaos_files_by_date": "chaos_files(timestamp, original_name, converted_name, agent)",
+}
+
+INSERT_SQL = '''
+    INSERT INTO chaos_files (original_name, converted_name, agent, tags, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+_STAMP = (0, "")
+
+
+def _now() -> str:
+    # Same format and clock (UTC) as SQLite's CURRENT_TIMESTAMP, taken when the
+    # row is logged rather than when its batch is committed. Formatted once a second.
+    global _STAMP
+    second = int(time.time())
+    if second != _STAMP[0]:
+        _STAMP = (second, datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+    return _STAMP[1]
+
+
+def _create_indexes(conn):
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(SCHEMA)
+    _create_indexes(conn)
     conn.commit()
-    conn.close()
+    return conn
+
+
+class ChaosIndexWriter:
+    """Buffered inserts into ``chaos_files`` over one connection.
+
+    Safe to share between threads. A background thread commits whatever is
+    buffered every ``flush_interval`` seconds so rows never sit for long.
+    A batch that fails to commit (e.g. the database is busy) stays buffered
+    and goes out with the next flush; ``add()`` still raises the error, but
+    the row it was given is kept.
+    """
+
+    def __init__(self, db_path=None, batch_size=500, flush_interval=1.0):
+        self.db_path = db_path or DB_PATH
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.conn = _connect(self.db_path)
+        self.rows_written = 0
+        self.commits = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        if flush_interval and flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name="chaos-index-writer", daemon=True)
+            self._thread.start()
+
+    def add(self, original, converted, agent="Unknown", tags=None, timestamp=None):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ChaosIndexWriter is closed")
+            self._pending.append((original, converted, agent, tags, timestamp or _now()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows = self._pending
+        with self.conn:
+            self.conn.executemany(INSERT_SQL, rows)
+        self._pending = []  # only once committed: a failed batch stays buffered
+        self.rows_written += len(rows)
+        self.commits += 1
+
+    def _run(self):
+        while not self._wake.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # rows stay buffered and are retried on the next tick
+        self.flush()
+
+    def bulk_load(self, rows, chunk_size=50_000):
+        """Backfill ``(original, converted, agent, tags[, timestamp])`` rows.
+
+        Indexes are dropped for the load and rebuilt once at the end, and
+        syncing is off until then: a crash mid-load can lose the backfill
+        (just run it again) but never rows logged before it.
+        """
+        count = 0
+        with self._lock:
+            self._flush_locked()
+            conn = self.conn
+            conn.execute("PRAGMA synchronous=OFF")
+            try:
+                for name in INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+                batch = []
+                for row in rows:
+                    row = tuple(row)
+                    if len(row) == 4:
+                        row = row + (_now(),)
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        conn.executemany(INSERT_SQL, batch)
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    conn.executemany(INSERT_SQL, batch)
+                    count += len(batch)
+                _create_indexes(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                _create_indexes(conn)
+                conn.commit()
+                raise
+            finally:
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self.rows_written += count
+            self.commits += 1
+        return count
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._flush_locked()
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer():
+    """The shared writer for the current ``DB_PATH`` (reopened if it changes)."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None or _WRITER.db_path != DB_PATH:
+            if _WRITER is not None:
+                _WRITER.close()
+            _WRITER = ChaosIndexWriter(DB_PATH)
+        return _WRITER
+
+
+def flush_db():
+    if _WRITER is not None:
+        _WRITER.flush()
+
+
+def close_db():
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is not None:
+            _WRITER.close()
+            _WRITER = None
+
+
+atexit.register(close_db)
+
+
+def init_db():
+    get_writer()
+
 
 def log_to_db(original, converted, agent="Unknown", tags=None):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO chaos_files (original_name, converted_name, agent, tags)
-        VALUES (?, ?, ?, ?)
-    ''', (original, converted, agent, tags))
-    conn.commit()
-    conn.close()
+    get_writer().add(original, converted, agent=agent, tags=tags)
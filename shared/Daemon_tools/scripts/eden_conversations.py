@@ -0,0 +1,254 @@
+"""Streaming, incremental splitting of ChatGPT ``conversations.json`` exports.
+
+``iter_export`` parses the export one conversation at a time (a top-level
+array, or an object whose ``"conversations"`` member is one), so memory is
+bounded by the largest conversation rather than the whole file. Each
+conversation comes with a digest of its raw JSON text.
+
+``split_export`` drives a per-script ``render`` callback and keeps a small
+state file beside the output: a conversation whose id, ``update_time`` and
+digest match the previous run, and whose files are all still there, is not
+rewritten. Each conversation keeps the number it was first given, so a new
+export that adds a few conversations only writes those files, even when they
+are inserted ahead of older ones. On a first run the numbering is the export
+order, as before.
+
+``iter_turns`` walks a ``mapping`` tree iteratively (no recursion limit on
+deep threads) in the same order as the old recursive walkers.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+READ_CHUNK = 1 << 20
+STATE_VERSION = 1
+STATE_FILE = ".split_state.json"
+
+_WS = " \t\n\r"
+
+
+class _Stream:
+    """Just enough of a JSON tokenizer to step through containers lazily."""
+
+    def __init__(self, f, chunk: int = READ_CHUNK):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, want: int) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(max(self.chunk, want))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self.buf, self.pos = "", 0
+            if not self._fill(self.chunk):
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise json.JSONDecodeError(f"Expecting {ch!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Tuple[object, str]:
+        """Decode the next value; returns it with its raw text."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off mid-value: read more (doubling) and retry.
+                if not self._fill(len(self.buf)):
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof and isinstance(obj, (int, float)):
+                # A number at the end of the buffer may continue in the next chunk.
+                if self._fill(self.chunk):
+                    continue
+            raw = self.buf[self.pos:end]
+            self.pos = end
+            return obj, raw
+
+    def items(self) -> Iterator[Tuple[object, str]]:
+        """Elements of the array starting at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+
+def iter_export(path, chunk: int = READ_CHUNK) -> Iterator[Tuple[dict, str]]:
+    """Yield ``(conversation, digest)`` pairs from an export without loading it whole.
+
+    Raises ``json.JSONDecodeError`` on malformed input, after yielding every
+    conversation before the fault.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        s = _Stream(f, chunk)
+        top = s.peek()
+        if top == "":
+            return
+        if top == "{":
+            s.pos += 1
+            while s.peek() not in ("}", ""):
+                key, _ = s.value()
+                s.expect(":")
+                if key == "conversations" and s.peek() == "[":
+                    items = s.items()
+                    break
+                s.value()
+                if s.peek() == ",":
+                    s.pos += 1
+            else:
+                return
+        else:
+            items = s.items()
+        for conv, raw in items:
+            yield conv, hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def iter_turns(mapping: dict, root_id) -> Iterator[dict]:
+    """Nodes of ``mapping`` reachable from ``root_id``, depth-first, parents first."""
+    stack = [root_id]
+    seen = set()
+    while stack:
+        node_id = stack.pop()
+        node = mapping.get(node_id)
+        if not node or node_id in seen:
+            continue
+        seen.add(node_id)
+        yield node
+        stack.extend(reversed(node.get("children") or []))
+
+
+def conversation_key(conv: dict, index: int) -> str:
+    key = (conv.get("id") or conv.get("conversation_id")) if isinstance(conv, dict) else None
+    return str(key) if key else f"#{index}"
+
+
+class SplitState:
+    """Per-output record of what each conversation was last written as."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conversations: Dict[str, dict] = {}
+        self.next_number = 1
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == STATE_VERSION:
+            self.conversations = data.get("conversations", {})
+            self.next_number = data.get("next_number", len(self.conversations) + 1)
+
+    def number(self, key: str) -> int:
+        entry = self.conversations.get(key)
+        if entry:
+            return entry["number"]
+        n = self.next_number
+        self.next_number += 1
+        self.conversations[key] = {"number": n, "files": []}
+        return n
+
+    def unchanged(self, key: str, update_time, digest: str) -> bool:
+        entry = self.conversations.get(key) or {}
+        return (
+            entry.get("digest") == digest
+            and entry.get("update_time") == update_time
+            and bool(entry.get("files"))
+            and all(os.path.exists(p) for p in entry["files"])
+        )
+
+    def record(self, key: str, update_time, digest: str, files: List[str]) -> List[str]:
+        """Store the new outputs; returns the previous files that were not rewritten."""
+        entry = self.conversations[key]
+        stale = [p for p in entry.get("files", []) if p not in files]
+        entry.update(update_time=update_time, digest=digest, files=files)
+        if stale:
+            # Title-named outputs can collide; never remove another conversation's file.
+            owned = {p for k, e in self.conversations.items() if k != key for p in e.get("files", ())}
+            stale = [p for p in stale if p not in owned]
+        return stale
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"version": STATE_VERSION, "next_number": self.next_number, "conversations": self.conversations}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
+
+Render = Callable[[dict, int], Iterable[Tuple[os.PathLike, str]]]
+
+
+def split_export(
+    source,
+    state_path,
+    render: Render,
+    progress: Optional[Callable[[int], None]] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Split ``source`` with ``render(conversation, number) -> [(path, text), ...]``.
+
+    Only new or changed conversations are rendered and written; files a
+    conversation no longer renders to (e.g. after a title change) are removed.
+    """
+    state = SplitState(state_path)
+    stats = {"conversations": 0, "written": 0, "skipped": 0, "files_written": 0, "files_removed": 0}
+    try:
+        for index, (conv, digest) in enumerate(iter_export(source), start=1):
+            stats["conversations"] += 1
+            key = conversation_key(conv, index)
+            number = state.number(key)
+            update_time = conv.get("update_time") if isinstance(conv, dict) else None
+            if not force and state.unchanged(key, update_time, digest):
+                stats["skipped"] += 1
+            else:
+                files = []
+                for path, text in render(conv, number):
+                    path = Path(path)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, "w", encoding="utf-8") as out:
+                        out.write(text)
+                    files.append(str(path))
+                for old in state.record(key, update_time, digest, files):
+                    try:
+                        os.remove(old)
+                        stats["files_removed"] += 1
+                    except FileNotFoundError:
+                        pass
+                stats["written"] += 1
+                stats["files_written"] += len(files)
+            if progress:
+                progress(index)
+    finally:
+        state.save()
+    return stats
@@ -5,6 +5,7 @@ import json
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -12,6 +13,9 @@ try:
     from .eden_paths import eden_root, daemons_root, events_bus_path
     from .eden_discovery import discover, describe
     from .eden_safety import SafetyContext, log_event
+    from . import eden_events
+    from .eden_follow import LEVELS, EventFilter, Follower
+    from . import eden_doctor
 except Exception:
     # Allow running as a plain script without package context
     import pathlib as _pl
@@ -21,6 +25,9 @@ except Exception:
     from eden_paths import eden_root, daemons_root, events_bus_path  # type: ignore
     from eden_discovery import discover, describe  # type: ignore
     from eden_safety import SafetyContext, log_event  # type: ignore
+    import eden_events  # type: ignore
+    from eden_follow import LEVELS, EventFilter, Follower  # type: ignore
+    import eden_doctor  # type: ignore
 
 
 def _print_table(rows):
@@ -119,114 +126,82 @@ def cmd_watch(args) -> int:
     return rc
 
 
-def _iter_events():
-    p = events_bus_path()
-    if not p.exists():
-        return []
-    out = []
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                out.append(json.loads(line))
-            except Exception:
-                continue
-    return out
+def _since_arg(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        return eden_events.normalize_ts(value)
+    except ValueError:
+        raise SystemExit(f"Invalid --since value: {value!r} (expected ISO date/time)")
+
+
+def _iter_events(since: Optional[str] = None, daemon: Optional[str] = None, action: Optional[str] = None,
+                 stop_at=None):
+    # Streams from the indexed segments; only blocks that can match are read.
+    return eden_events.iter_events(since=since, daemon=daemon or None, action=action or None, stop_at=stop_at)
 
 
 def cmd_tail(args) -> int:
-    filt_d = (args.daemon or "").lower()
-    filt_a = (args.action or "").lower()
+    match = EventFilter(args.daemon, args.action, getattr(args, "outcome", None), getattr(args, "level", None))
     def show(e):
+        if not match(e):
+            return False
         d = e.get("daemon", "")
         a = e.get("action", "")
-        if filt_d and d.lower() != filt_d:
-            return False
-        if filt_a and a.lower() != filt_a:
-            return False
-        print(f"[{d}] {a} -> {e.get('target','')} ({e.get('outcome','')})" + (f" err={e.get('error')}" if e.get('error') else ""))
+        print(f"[{d}] {a} -> {e.get('target','')} ({e.get('outcome','')})" + (f" err={e.get('error')}" if e.get('error') else ""),
+              flush=bool(args.follow))
         return True
-    for e in _iter_events():
+    since = _since_arg(args.since)
+    stop_at = None
+    if args.follow:
+        # History is replayed up to exactly where the follower starts: nothing
+        # appended in between is lost or shown twice.
+        follower = Follower(events_bus_path(), backend="poll" if getattr(args, "poll", False) else "auto")
+        stop_at = follower.position() or (None, None, 0)
+    events = _iter_events(since=since, daemon=args.daemon, action=args.action, stop_at=stop_at)
+    if args.lines:
+        from collections import deque
+        events = deque((e for e in events if match(e)), maxlen=args.lines)
+    for e in events:
         show(e)
     if args.follow:
-        path = events_bus_path()
-        if not path.exists():
-            path.touch()
-        with path.open("r", encoding="utf-8") as f:
-            f.seek(0, 2)
-            while True:
-                line = f.readline()
-                if not line:
-                    try:
-                        import time as _t
-                        _t.sleep(0.5)
-                        continue
-                    except KeyboardInterrupt:
-                        break
-                try:
-                    e = json.loads(line)
-                except Exception:
-                    continue
+        try:
+            for e in follower.events(match):
                 show(e)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            follower.close()
     return 0
 
 
 def cmd_report(args) -> int:
     from datetime import date
-    rows = _iter_events()
-    if args.daemon:
-        rows = [r for r in rows if r.get("daemon","" ).lower() == args.daemon.lower()]
+    since = _since_arg(args.since)
     if args.daily:
-        today = date.today().isoformat()
-        # if entries had timestamp, we would filter; we aggregate anyway
-    agg: dict = {}
-    for r in rows:
-        key = (r.get("daemon",""), r.get("outcome",""))
-        agg[key] = agg.get(key, 0) + 1
+        today = date.today().isoformat() + "T00:00:00"
+        since = max(since, today) if since else today
+    agg = eden_events.summarize(since=since, daemon=args.daemon or None)
     print("daemon        outcome     count")
     print("------------  ----------  -----")
     for (d, o), c in sorted(agg.items()):
         print(f"{d:12}  {o:10}  {c}")
-    print(f"Total events: {len(rows)}")
+    print(f"Total events: {sum(agg.values())}")
     return 0
 
 
 def cmd_doctor(args) -> int:
-    infos = discover()
-    print("name        script     describe  healthcheck  status  notes")
-    print("----------  ---------  --------  -----------  ------  -----")
-    for info in infos:
-        name = info.name
-        script = info.script
-        desc_ok = "no"; hc_ok = "no"; status = "ok"; notes = []
-        mod = None
-        if script and Path(script).exists():
-            try:
-                import importlib.util as ilu
-                spec = ilu.spec_from_file_location(f"eden.daemon.{name}", script)
-                if spec and spec.loader:
-                    mod = ilu.module_from_spec(spec)
-                    spec.loader.exec_module(mod)  # type: ignore
-            except Exception as e:
-                status = "warn"; notes.append(f"import: {e}")
-        else:
-            status = "warn"; notes.append("missing script")
-        if mod is not None:
-            desc_ok = "yes" if callable(getattr(mod, "describe", None)) else "no"
-            hc_fn = getattr(mod, "healthcheck", None)
-            hc_ok = "yes" if callable(hc_fn) else "no"
-            if callable(hc_fn):
-                try:
-                    res = hc_fn()
-                    if isinstance(res, dict):
-                        notes.append(res.get("notes",""))
-                        if res.get("status") in ("warn","fail"):
-                            status = res.get("status")
-                except Exception as e:
-                    status = "warn"; notes.append(f"hc err: {e}")
-        print(f"{name:10}  {('yes' if script else 'no'):9}  {desc_ok:8}  {hc_ok:11}  {status:6}  {'; '.join([n for n in notes if n])}")
+    # Each check runs in its own subprocess with a deadline; see eden_doctor.
+    start = time.perf_counter()
+    results = eden_doctor.run_doctor(discover(), jobs=args.jobs, timeout=args.timeout,
+                                     use_cache=not args.no_cache)
+    if args.output:
+        Path(args.output).write_text(eden_doctor.render(results, args.format) + "\n", encoding="utf-8")
+    if args.output or args.format == "table":
+        print(eden_doctor.format_table(results))
+        print(eden_doctor.summary(results, time.perf_counter() - start))
+    else:
+        print(eden_doctor.render(results, args.format))
 
     if args.fix:
         try:
@@ -278,13 +253,24 @@ def build_parser() -> argparse.ArgumentParser:
     # doctor
     sp = sub.add_parser("doctor", help="Check daemons for readiness")
     sp.add_argument("--fix", action="store_true", help="Attempt to auto-fix manifests via Saphira")
+    sp.add_argument("-j", "--jobs", type=int, default=None, help="Checks to run at once")
+    sp.add_argument("--timeout", type=float, default=eden_doctor.DEFAULT_TIMEOUT,
+                    help="Seconds before a daemon's check is killed and marked fail")
+    sp.add_argument("--no-cache", action="store_true", help="Re-run every check")
+    sp.add_argument("--format", choices=eden_doctor.FORMATS, default="table")
+    sp.add_argument("--output", help="Write the report to this file")
     sp.set_defaults(func=cmd_doctor)
 
     # tail events
     sp = sub.add_parser("tail", help="Tail events bus")
     sp.add_argument("--daemon", help="Filter by daemon name")
     sp.add_argument("--action", help="Filter by action")
+    sp.add_argument("--outcome", help="Filter by outcome")
+    sp.add_argument("--level", choices=LEVELS, help="Only events at or above this level")
+    sp.add_argument("--since", help="ISO date/time to start from")
+    sp.add_argument("-n", "--lines", type=int, help="Only show the last N matching events")
     sp.add_argument("--follow", action="store_true")
+    sp.add_argument("--poll", action="store_true", help="Follow by polling instead of inotify")
     sp.set_defaults(func=cmd_tail)
 
     # report
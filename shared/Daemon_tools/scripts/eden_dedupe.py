@@ -0,0 +1,317 @@
+"""Tiered duplicate detection shared by Blaze and Tidbit.
+
+Hashing every byte of every file is what makes a naive dedupe slow, and on a
+large tree almost all of it is wasted: most files are the only one of their
+size. Candidates are narrowed in tiers and each tier only reads what the
+previous one could not rule out:
+
+1. group by size (stat only, no reads)
+2. within a size group, hash a head + tail sample (``SAMPLE_BYTES`` each)
+3. full sha256 only for files whose samples still collide
+
+Files no larger than two samples are hashed in full at tier 2, since the
+sample would read them entirely anyway.
+
+Hashes are kept in ``HashCache`` keyed by (device, inode, size, mtime_ns), so
+an unchanged file is never read twice across runs. ``IOCounter`` tallies the
+bytes actually read so callers can report the saving.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SAMPLE_BYTES = 64 * 1024
+READ_CHUNK = 1024 * 1024
+
+
+class IOCounter:
+    def __init__(self):
+        self.bytes_read = 0
+        self.files_opened = 0
+        self.sample_hashes = 0
+        self.full_hashes = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    def add(self, nbytes: int, kind: str) -> None:
+        with self._lock:
+            self.bytes_read += nbytes
+            self.files_opened += 1
+            if kind == "full":
+                self.full_hashes += 1
+            else:
+                self.sample_hashes += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"bytes_read": self.bytes_read, "files_opened": self.files_opened,
+                "sample_hashes": self.sample_hashes, "full_hashes": self.full_hashes,
+                "cache_hits": self.cache_hits}
+
+
+def _key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def full_hash(path: str, counter: Optional[IOCounter] = None) -> str:
+    h = hashlib.sha256()
+    read = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+            h.update(chunk)
+            read += len(chunk)
+    if counter is not None:
+        counter.add(read, "full")
+    return h.hexdigest()
+
+
+def sample_hash(path: str, size: int, counter: Optional[IOCounter] = None) -> str:
+    """Hash of the first and last ``SAMPLE_BYTES``; the full hash for small files."""
+    if size <= 2 * SAMPLE_BYTES:
+        return full_hash(path, counter)
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        head = f.read(SAMPLE_BYTES)
+        f.seek(size - SAMPLE_BYTES)
+        tail = f.read(SAMPLE_BYTES)
+    h.update(head)
+    h.update(tail)
+    if counter is not None:
+        counter.add(len(head) + len(tail), "sample")
+    return h.hexdigest()
+
+
+class HashCache:
+    """Persistent (dev, inode, size, mtime_ns) -> sample/full hash store.
+
+    Pass an existing sqlite3 connection to share a daemon's database, or a
+    path to open a dedicated one.
+    """
+
+    def __init__(self, db, counter: Optional[IOCounter] = None):
+        if isinstance(db, sqlite3.Connection):
+            self.conn = db
+        else:
+            self.conn = sqlite3.connect(str(db), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.counter = counter or IOCounter()
+        self._lock = threading.RLock()
+        self._pending = 0
+        self.conn.execute(
+            """
+        CREATE TABLE IF NOT EXISTS hash_cache(
+            dev INTEGER NOT NULL,
+            ino INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sample TEXT,
+            full TEXT,
+            PRIMARY KEY (dev, ino, size, mtime_ns)
+        )
+        """
+        )
+        self.conn.commit()
+
+    def _get(self, key) -> Tuple[Optional[str], Optional[str]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT sample, full FROM hash_cache WHERE dev=? AND ino=? AND size=? AND mtime_ns=?", key
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def _put(self, key, sample: Optional[str], full: Optional[str]) -> None:
+        with self._lock:
+            # A new mtime/size means a new key; drop stale rows for the same inode.
+            self.conn.execute("DELETE FROM hash_cache WHERE dev=? AND ino=? AND (size!=? OR mtime_ns!=?)", key)
+            self.conn.execute(
+                "INSERT INTO hash_cache(dev, ino, size, mtime_ns, sample, full) VALUES(?,?,?,?,?,?) "
+                "ON CONFLICT(dev, ino, size, mtime_ns) DO UPDATE SET "
+                "sample=COALESCE(excluded.sample, sample), full=COALESCE(excluded.full, full)",
+                (*key, sample, full),
+            )
+            self._pending += 1
+            if self._pending >= 500:
+                self.commit()
+
+    def commit(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self._pending = 0
+
+    def sample(self, path: str, st: Optional[os.stat_result] = None) -> str:
+        st = st or os.stat(path)
+        key = _key(st)
+        sample, full = self._get(key)
+        if sample is not None:
+            self.counter.cache_hits += 1
+            return sample
+        sample = sample_hash(path, st.st_size, self.counter)
+        small = st.st_size <= 2 * SAMPLE_BYTES
+        self._put(key, sample, sample if small else None)
+        return sample
+
+    def full(self, path: str, st: Optional[os.stat_result] = None) -> str:
+        st = st or os.stat(path)
+        key = _key(st)
+        _, full = self._get(key)
+        if full is not None:
+            self.counter.cache_hits += 1
+            return full
+        full = full_hash(path, self.counter)
+        self._put(key, full if st.st_size <= 2 * SAMPLE_BYTES else None, full)
+        return full
+
+
+def _group(items: List[Tuple[str, os.stat_result]], keyfn) -> List[List[Tuple[str, os.stat_result]]]:
+    groups: Dict[object, List[Tuple[str, os.stat_result]]] = {}
+    for item in items:
+        try:
+            k = keyfn(item)
+        except OSError:
+            continue
+        groups.setdefault(k, []).append(item)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def find_duplicates(paths: Iterable[str], cache: Optional[HashCache] = None,
+                    counter: Optional[IOCounter] = None) -> List[List[str]]:
+    """Groups of identical files, each in input order (the first is the original).
+
+    Hard links to the same inode are one file, not duplicates.
+    """
+    if cache is not None:
+        counter = cache.counter
+    counter = counter or IOCounter()
+
+    by_size: Dict[int, List[Tuple[str, os.stat_result]]] = {}
+    seen_inodes = set()
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        ident = (st.st_dev, st.st_ino)
+        if ident in seen_inodes:
+            continue
+        seen_inodes.add(ident)
+        by_size.setdefault(st.st_size, []).append((p, st))
+
+    if cache is not None:
+        sample_of = lambda item: cache.sample(item[0], item[1])
+        full_of = lambda item: cache.full(item[0], item[1])
+    else:
+        sample_of = lambda item: sample_hash(item[0], item[1].st_size, counter)
+        full_of = lambda item: full_hash(item[0], counter)
+
+    out: List[List[str]] = []
+    for size, group in by_size.items():
+        if len(group) < 2:
+            continue
+        if size == 0:
+            out.append([p for p, _ in group])
+            continue
+        for sampled in _group(group, sample_of):
+            if size <= 2 * SAMPLE_BYTES:
+                out.append([p for p, _ in sampled])  # the sample was the whole file
+                continue
+            for same in _group(sampled, full_of):
+                out.append([p for p, _ in same])
+    if cache is not None:
+        cache.commit()
+    return sorted(out, key=lambda g: g[0])
+
+
+class DedupeIndex:
+    """Incremental form of ``find_duplicates`` for watchers (Tidbit).
+
+    Every file seen is remembered with its size; sample and full hashes are
+    filled in lazily, only once another file of the same size shows up.
+    ``check(path)`` returns the path of an earlier identical file, or None
+    after remembering ``path`` as a keeper.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, cache: Optional[HashCache] = None):
+        self.conn = conn
+        self.cache = cache or HashCache(conn)
+        self._lock = threading.RLock()
+        self.conn.executescript(
+            """
+        CREATE TABLE IF NOT EXISTS dedupe_files(
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            seq INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS dedupe_files_size ON dedupe_files(size, seq);
+        """
+        )
+        self.conn.commit()
+
+    def _candidates(self, path: str, size: int) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT path FROM dedupe_files WHERE size=? AND path!=? ORDER BY seq", (size, path)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def _remember(self, path: str, size: int, commit: bool = True) -> None:
+        self.conn.execute(
+            "INSERT INTO dedupe_files(path, size, seq) "
+            "VALUES(?, ?, COALESCE((SELECT MAX(seq) FROM dedupe_files), 0) + 1) "
+            "ON CONFLICT(path) DO UPDATE SET size=excluded.size",
+            (path, size),
+        )
+        if commit:
+            self.conn.commit()
+
+    def adopt(self, paths: Iterable[str]) -> int:
+        """Remember existing ``paths`` as keepers, in order (e.g. an older index's rows).
+
+        Nothing is hashed; returns how many were still on disk.
+        """
+        adopted = 0
+        with self._lock:
+            for path in paths:
+                try:
+                    size = os.stat(path).st_size
+                except OSError:
+                    continue
+                self._remember(path, size, commit=False)
+                adopted += 1
+            self.conn.commit()
+        return adopted
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM dedupe_files WHERE path=?", (path,))
+            self.conn.commit()
+
+    def check(self, path: str) -> Optional[str]:
+        with self._lock:
+            st = os.stat(path)
+            live: List[Tuple[str, os.stat_result]] = []
+            for cand in self._candidates(path, st.st_size):
+                try:
+                    cst = os.stat(cand)
+                except OSError:
+                    self.forget(cand)
+                    continue
+                if cst.st_size != st.st_size:
+                    self._remember(cand, cst.st_size)  # it changed since; re-file it
+                    continue
+                if (cst.st_dev, cst.st_ino) == (st.st_dev, st.st_ino):
+                    continue
+                live.append((cand, cst))
+            keeper = None
+            if live:
+                mine = self.cache.sample(path, st)
+                same = [(c, cst) for c, cst in live if self.cache.sample(c, cst) == mine]
+                if same and st.st_size > 2 * SAMPLE_BYTES:
+                    mine = self.cache.full(path, st)
+                    same = [(c, cst) for c, cst in same if self.cache.full(c, cst) == mine]
+                if same:
+                    keeper = same[0][0]
+            self.cache.commit()
+            if keeper is None:
+                self._remember(path, st.st_size)
+            return keeper
@@ -1,11 +1,12 @@
 from __future__ import annotations
 import json
+import os
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, List, Optional
 
 try:
-    from .eden_paths import daemons_root, daemon_dir
+    from .eden_paths import daemons_root, daemon_dir, cache_dir
 except Exception:
     # Allow usage as a plain script
     import sys as _sys
@@ -13,12 +14,12 @@ except Exception:
     _HERE = _Path(__file__).resolve().parent
     if str(_HERE) not in _sys.path:
         _sys.path.append(str(_HERE))
-    from eden_paths import daemons_root, daemon_dir  # type: ignore
+    from eden_paths import daemons_root, daemon_dir, cache_dir  # type: ignore
 
 
 SKIP_FOLDERS = {
     ".git", ".venv", ".vscode", "Daemon_tools", "CODE_REPORTS", "Digitari_v0_1",
-    "Rhea", "specialty_folders", "_logs", "_template", "bin", "tools",
+    "Rhea", "specialty_folders", "_logs", "_cache", "_template", "bin", "tools",
     # Archived / app-like, not daemons
     "Aethercore", "Cradle", "archived_tools", "RitualGUI"
 }
@@ -34,6 +35,11 @@ KNOWN_SAFETY: Dict[str, str] = {
     "Handel": "mutating",
 }
 
+MANIFEST_SUFFIXES = ("daemon_role.json", "daemon_function.json", "daemon_mirror.json", "daemon_voice.json")
+
+# Bump when DaemonInfo fields or the inspection rules change so old caches are dropped.
+CACHE_VERSION = 1
+
 
 @dataclass
 class DaemonInfo:
@@ -59,71 +65,212 @@ def _read_json(path: Path) -> Optional[dict]:
 def _manifest_for(name: str, base: Path) -> Dict[str, str]:
     # Saphira naming pattern: <name>.<daemon_*.json>
     out: Dict[str, str] = {}
-    for suffix in ("daemon_role.json", "daemon_function.json", "daemon_mirror.json", "daemon_voice.json"):
+    for suffix in MANIFEST_SUFFIXES:
         p = base / f"{name.lower()}.{suffix}"
         if p.exists():
             out[suffix] = str(p)
     return out
 
 
-def discover() -> List[DaemonInfo]:
-    root = daemons_root()
-    infos: List[DaemonInfo] = []
-
-    for child in sorted([p for p in root.iterdir() if p.is_dir()], key=lambda x: x.name.lower()):
-        if child.name.startswith(".") or child.name == "__pycache__":
-            continue
-        if child.name in SKIP_FOLDERS:
-            continue
-
-        script_dir = child / "scripts"
-        primary_script = script_dir / f"{child.name.lower()}.py"
-        script_path: Optional[Path] = None
-        if primary_script.exists():
-            script_path = primary_script
-        else:
-            # fallback: any .py under scripts
-            cands = list(script_dir.glob("*.py")) if script_dir.exists() else []
-            if cands:
-                script_path = cands[0]
-
-        manifest = _manifest_for(child.name, child)
-        role = "Unknown"
-        if "daemon_role.json" in "|".join(manifest.keys()):
-            # try to extract role/description
-            for k, v in manifest.items():
-                if k.endswith("daemon_role.json"):
-                    data = _read_json(Path(v))
-                    if isinstance(data, dict):
-                        role = data.get("role") or data.get("name") or role
-        # else try mirror/profile
-        if role == "Unknown":
-            for k, v in manifest.items():
+def _daemon_folders(root: Path) -> List[Path]:
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return []
+    folders = []
+    with it:
+        for entry in it:
+            if entry.name.startswith(".") or entry.name == "__pycache__":
+                continue
+            if entry.name in SKIP_FOLDERS or not entry.is_dir():
+                continue
+            folders.append(entry.path)
+    return [Path(p) for p in sorted(folders, key=lambda x: os.path.basename(x).lower())]
+
+
+def _inspect(child: Path) -> DaemonInfo:
+    script_dir = child / "scripts"
+    primary_script = script_dir / f"{child.name.lower()}.py"
+    script_path: Optional[Path] = None
+    if primary_script.exists():
+        script_path = primary_script
+    else:
+        # fallback: any .py under scripts
+        cands = list(script_dir.glob("*.py")) if script_dir.exists() else []
+        if cands:
+            script_path = cands[0]
+
+    manifest = _manifest_for(child.name, child)
+    role = "Unknown"
+    if "daemon_role.json" in "|".join(manifest.keys()):
+        # try to extract role/description
+        for k, v in manifest.items():
+            if k.endswith("daemon_role.json"):
                 data = _read_json(Path(v))
                 if isinstance(data, dict):
-                    role = data.get("description") or data.get("name") or role
+                    role = data.get("role") or data.get("name") or role
+    # else try mirror/profile
+    if role == "Unknown":
+        for k, v in manifest.items():
+            data = _read_json(Path(v))
+            if isinstance(data, dict):
+                role = data.get("description") or data.get("name") or role
+
+    safety = KNOWN_SAFETY.get(child.name, "normal")
+    status = "ready" if script_path else ("meta-only" if manifest else "missing")
+
+    return DaemonInfo(
+        name=child.name,
+        role=role,
+        safety_level=safety,
+        status=status,
+        folder=str(child),
+        script=str(script_path) if script_path else None,
+        manifest=manifest or None,
+    )
+
+
+# --- Discovery cache ---------------------------------------------------------
+#
+# discover() used to re-glob scripts and re-parse every manifest on each call.
+# The cache stores each DaemonInfo next to a fingerprint of the mtimes that
+# could change it: the daemon folder (entries added/removed), its scripts/
+# folder, and each manifest file (content edits). A warm call only stats those
+# paths; a daemon whose fingerprint moved is re-inspected on its own.
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fingerprint(child: Path) -> Dict[str, Optional[int]]:
+    # Plain string paths: pathlib joins dominate a warm scan otherwise.
+    base = os.fspath(child)
+    stem = os.path.join(base, os.path.basename(base).lower())
+    fp: Dict[str, Optional[int]] = {
+        "dir": _mtime(base),
+        "scripts": _mtime(os.path.join(base, "scripts")),
+    }
+    for suffix in MANIFEST_SUFFIXES:
+        fp[suffix] = _mtime(f"{stem}.{suffix}")
+    return fp
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("EDEN_DISCOVERY_CACHE", "1").lower() not in ("0", "off", "false", "no")
 
-        safety = KNOWN_SAFETY.get(child.name, "normal")
-        status = "ready" if script_path else ("meta-only" if manifest else "missing")
 
-        infos.append(
-            DaemonInfo(
-                name=child.name,
-                role=role,
-                safety_level=safety,
-                status=status,
-                folder=str(child),
-                script=str(script_path) if script_path else None,
-                manifest=manifest or None,
-            )
-        )
+def cache_path() -> Path:
+    return cache_dir() / "discovery.json"
 
-    return infos
+
+# Parsed cache file memo, keyed by (path, mtime_ns, size), for repeat calls in one process.
+_LOADED: Dict[str, object] = {}
+
+
+def _load_cache(root: Path) -> Dict[str, dict]:
+    """Return the cached entries for ``root`` keyed by lowercase daemon name."""
+    try:
+        path = cache_path()
+        st = os.stat(path)
+    except OSError:
+        return {}
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if _LOADED.get("key") == key:
+        data = _LOADED["data"]
+    else:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+        _LOADED.update(key=key, data=data)
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("root") != str(root):
+        return {}
+    entries = data.get("daemons")
+    return dict(entries) if isinstance(entries, dict) else {}
+
+
+def _save_cache(root: Path, entries: Dict[str, dict]) -> None:
+    payload = {"version": CACHE_VERSION, "root": str(root), "daemons": entries}
+    tmp = None
+    try:
+        path = cache_path()
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only work root just means every call runs cold.
+        if tmp is not None:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _entry(child: Path, fp: Dict[str, Optional[int]]) -> dict:
+    return {"fingerprint": fp, "info": _inspect(child).to_dict()}
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    """Drop one daemon's cached entry, or the whole cache when ``name`` is None."""
+    root = daemons_root()
+    if name is None:
+        try:
+            cache_path().unlink()
+        except OSError:
+            pass
+        return
+    entries = _load_cache(root)
+    if entries.pop(name.lower(), None) is not None:
+        _save_cache(root, entries)
+
+
+def discover(use_cache: bool = True) -> List[DaemonInfo]:
+    root = daemons_root()
+    if not (use_cache and _cache_enabled()):
+        return [_inspect(child) for child in _daemon_folders(root)]
+
+    cached = _load_cache(root)
+    entries: Dict[str, dict] = {}
+    dirty = False
+    for child in _daemon_folders(root):
+        key = child.name.lower()
+        fp = _fingerprint(child)
+        hit = cached.get(key)
+        if hit and hit.get("fingerprint") == fp and hit.get("info", {}).get("folder") == str(child):
+            entries[key] = hit
+        else:
+            entries[key] = _entry(child, fp)
+            dirty = True
+    if dirty or entries.keys() != cached.keys():
+        _save_cache(root, entries)
+    return [DaemonInfo(**e["info"]) for e in entries.values()]
 
 
 def describe(name: str) -> Optional[Dict]:
     folder = daemon_dir(name)
     if not folder.exists():
         return None
+    if not _cache_enabled():
+        info = [d for d in discover(use_cache=False) if d.name.lower() == name.lower()]
+        return info[0].to_dict() if info else None
+
+    # O(1) path: look the name up in the cache and only re-check that folder.
+    root = daemons_root()
+    entries = _load_cache(root)
+    hit = entries.get(name.lower())
+    if hit:
+        child = Path(hit["info"]["folder"])
+        fp = _fingerprint(child)
+        if fp.get("dir") is not None:
+            if hit.get("fingerprint") != fp:
+                hit = entries[name.lower()] = _entry(child, fp)
+                _save_cache(root, entries)
+            return dict(hit["info"])
+
+    # Unknown or removed: fall back to a full pass, which also rebuilds the cache.
     info = [d for d in discover() if d.name.lower() == name.lower()]
     return info[0].to_dict() if info else None
@@ -0,0 +1,368 @@
+"""Parallel, isolated health checks for ``eden_daemon doctor``.
+
+Each daemon script is imported and its ``describe``/``healthcheck`` probed
+in its own child process, ``jobs`` at a time, so a slow or hanging import
+costs at most ``timeout`` seconds for that daemon alone and a 100-daemon run
+takes about as long as its slowest check. A child that overruns is killed
+along with anything it spawned and reported as ``fail``.
+
+On Linux children are forked from the doctor itself, so each one starts in
+a millisecond instead of paying for a fresh interpreter; a single thread
+multiplexes them with ``multiprocessing.connection.wait`` (as Rhea's warm
+pool does). Elsewhere each check is a ``python eden_doctor.py --check``
+subprocess.
+
+Results are cached in ``_cache/doctor.json`` keyed by the source mtimes of
+the script's folder (the script and its sibling ``.py`` files), and expire
+after ``EDEN_DOCTOR_CACHE_TTL`` seconds so checks against the outside world
+are still re-run now and then. Timeouts and crashed children are never
+cached.
+
+Reports render as the classic table, JSON, or JUnit XML for CI.
+"""
+from __future__ import annotations
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait as _wait_any
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .eden_paths import cache_dir, eden_root
+except Exception:
+    # Allow usage as a plain script (and as the per-check child process)
+    import sys as _sys
+    from pathlib import Path as _Path
+    _HERE = _Path(__file__).resolve().parent
+    if str(_HERE) not in _sys.path:
+        _sys.path.append(str(_HERE))
+    from eden_paths import cache_dir, eden_root  # type: ignore
+
+CACHE_VERSION = 1
+DEFAULT_TIMEOUT = float(os.environ.get("EDEN_DOCTOR_TIMEOUT", "30"))
+CACHE_TTL = float(os.environ.get("EDEN_DOCTOR_CACHE_TTL", "600"))
+FORMATS = ("table", "json", "junit")
+
+
+def default_jobs() -> int:
+    # Checks mostly sleep on imports and I/O, so run well past the core count.
+    return min(64, (os.cpu_count() or 1) * 16)
+
+
+def _use_fork() -> bool:
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+# --- The check itself (runs in the child) -------------------------------------
+
+
+def check_module(name: str, script: Optional[str]) -> Dict:
+    """Import ``script`` and probe it, exactly as doctor always has."""
+    result = {"name": name, "script": script, "describe": False, "healthcheck": False,
+              "status": "ok", "notes": []}
+    notes: List[str] = result["notes"]
+    mod = None
+    if script and Path(script).exists():
+        try:
+            import importlib.util as ilu
+            spec = ilu.spec_from_file_location(f"eden.daemon.{name}", script)
+            if spec and spec.loader:
+                mod = ilu.module_from_spec(spec)
+                spec.loader.exec_module(mod)  # type: ignore
+        except BaseException as e:
+            result["status"] = "warn"
+            notes.append(f"import: {e}")
+    else:
+        result["status"] = "warn"
+        notes.append("missing script")
+    if mod is not None:
+        result["describe"] = callable(getattr(mod, "describe", None))
+        hc_fn = getattr(mod, "healthcheck", None)
+        result["healthcheck"] = callable(hc_fn)
+        if callable(hc_fn):
+            try:
+                res = hc_fn()
+                if isinstance(res, dict):
+                    if res.get("notes"):
+                        notes.append(str(res["notes"]))
+                    if res.get("status") in ("warn", "fail"):
+                        result["status"] = res["status"]
+            except BaseException as e:
+                result["status"] = "warn"
+                notes.append(f"hc err: {e}")
+    return result
+
+
+def _child_main(name: str, script: str) -> int:
+    out = sys.stdout
+    # Whatever the daemon prints goes to stderr; stdout carries only the result.
+    with contextlib.redirect_stdout(sys.stderr):
+        result = check_module(name, script or None)
+    out.write(json.dumps(result) + "\n")
+    out.flush()
+    return 0
+
+
+def _fork_child(conn, name: str, script: str, sink_fd: int) -> None:
+    os.setsid()  # own process group, so a timeout kills whatever it spawned too
+    os.dup2(sink_fd, 1)
+    os.dup2(sink_fd, 2)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    conn.send(check_module(name, script))
+    conn.close()
+    # Skip interpreter shutdown: it would wait on any threads the daemon started.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)
+
+
+# --- Running checks -----------------------------------------------------------
+
+
+def _kill_tree(proc) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+    except OSError:
+        pass
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+
+def _timed_out(name: str, script: str, timeout: float, seconds: float) -> Dict:
+    return {"name": name, "script": script, "describe": False, "healthcheck": False,
+            "status": "fail", "notes": [f"timeout after {timeout:g}s"],
+            "seconds": round(seconds, 3), "timeout": True}
+
+
+def _crashed(name: str, script: str, why: str, seconds: float) -> Dict:
+    return {"name": name, "script": script, "describe": False, "healthcheck": False,
+            "status": "warn", "notes": [f"crashed: {why}"], "seconds": round(seconds, 3), "crashed": True}
+
+
+def _last_line(data: bytes) -> str:
+    lines = data.decode("utf-8", "replace").strip().splitlines()
+    return lines[-1] if lines else ""
+
+
+def _run_forked(todo: List[tuple], jobs: int, timeout: float) -> Dict[int, Dict]:
+    """Fork one child per check, at most ``jobs`` alive, from this thread."""
+    ctx = multiprocessing.get_context("fork")
+    pending = list(todo)
+    running: Dict[object, tuple] = {}
+    done: Dict[int, Dict] = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            i, info = pending.pop(0)
+            if not info.script or not Path(info.script).exists():
+                done[i] = dict(check_module(info.name, info.script), seconds=0.0)
+                continue
+            reader, writer = ctx.Pipe(duplex=False)
+            sink = tempfile.TemporaryFile()
+            proc = ctx.Process(target=_fork_child, args=(writer, info.name, info.script, sink.fileno()))
+            proc.start()
+            writer.close()
+            running[reader] = (i, info, proc, time.monotonic(), sink)
+        if not running:
+            continue
+        deadline = min(entry[3] for entry in running.values()) + timeout
+        for conn in _wait_any(list(running), timeout=max(0.0, deadline - time.monotonic())):
+            i, info, proc, start, sink = running.pop(conn)
+            try:
+                done[i] = dict(conn.recv(), seconds=round(time.monotonic() - start, 3))
+            except (EOFError, OSError):
+                proc.join(1)
+                sink.seek(0)
+                why = _last_line(sink.read()) or f"exit {proc.exitcode}"
+                done[i] = _crashed(info.name, info.script, why, time.monotonic() - start)
+            _kill_tree(proc)  # reap anything the daemon left running in its group
+            proc.join()
+            conn.close()
+            sink.close()
+        now = time.monotonic()
+        for conn, (i, info, proc, start, sink) in list(running.items()):
+            if now - start >= timeout:
+                _kill_tree(proc)
+                proc.join()
+                done[i] = _timed_out(info.name, info.script, timeout, now - start)
+                del running[conn]
+                conn.close()
+                sink.close()
+    return done
+
+
+def run_check(name: str, script: Optional[str], timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """Run ``check_module`` in a fresh interpreter with a hard deadline."""
+    if not script or not Path(script).exists():
+        return dict(check_module(name, script), seconds=0.0)
+    env = os.environ.copy()
+    env.setdefault("EDEN_ROOT", str(eden_root()))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--check", name, script],
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        env=env, start_new_session=hasattr(os, "killpg"),
+    )
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_tree(proc)
+        proc.communicate()
+        return _timed_out(name, script, timeout, time.perf_counter() - start)
+    seconds = round(time.perf_counter() - start, 3)
+    try:
+        result = json.loads(_last_line(out))
+    except ValueError:
+        return _crashed(name, script, _last_line(err) or f"exit {proc.returncode}", seconds)
+    result["seconds"] = seconds
+    return result
+
+
+def source_key(script: Optional[str]) -> Optional[List[int]]:
+    """(size, mtime_ns) of the script plus the newest mtime among its sibling .py files."""
+    if not script:
+        return None
+    try:
+        st = os.stat(script)
+        newest = st.st_mtime_ns
+        with os.scandir(os.path.dirname(script) or ".") as it:
+            for entry in it:
+                if entry.name.endswith(".py"):
+                    newest = max(newest, entry.stat().st_mtime_ns)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, newest]
+
+
+def cache_path() -> Path:
+    return cache_dir() / "doctor.json"
+
+
+def _load_cache() -> Dict[str, dict]:
+    try:
+        data = json.loads(cache_path().read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    entries = data.get("daemons")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_cache(entries: Dict[str, dict]) -> None:
+    path = cache_path()
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "daemons": entries}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def run_doctor(infos: Iterable, jobs: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT,
+               use_cache: bool = True) -> List[Dict]:
+    """Check every DaemonInfo; results come back in discovery order."""
+    infos = list(infos)
+    cached = _load_cache() if use_cache else {}
+    now = time.time()
+    results: List[Optional[Dict]] = [None] * len(infos)
+    todo = []
+    for i, info in enumerate(infos):
+        key = source_key(info.script)
+        hit = cached.get(info.name.lower())
+        if (hit and key is not None and hit.get("key") == key and hit.get("script") == info.script
+                and now - hit.get("at", 0) < CACHE_TTL):
+            results[i] = dict(hit["result"], cached=True)
+        else:
+            todo.append((i, info, key))
+
+    if todo:
+        jobs = max(1, jobs or default_jobs())
+        if _use_fork():
+            fresh = _run_forked([(i, info) for i, info, _ in todo], jobs, timeout)
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {i: pool.submit(run_check, info.name, info.script, timeout) for i, info, _ in todo}
+                fresh = {i: fut.result() for i, fut in futures.items()}
+        for i, info, key in todo:
+            res = fresh[i]
+            res["cached"] = False
+            results[i] = res
+            if key is not None and not (res.get("timeout") or res.get("crashed")):
+                cached[info.name.lower()] = {"key": key, "script": info.script, "at": now, "result": res}
+        if use_cache:
+            _save_cache(cached)
+    return [r for r in results if r is not None]
+
+
+# --- Reports ------------------------------------------------------------------
+
+
+def format_table(results: List[Dict]) -> str:
+    lines = ["name        script     describe  healthcheck  status  notes",
+             "----------  ---------  --------  -----------  ------  -----"]
+    for r in results:
+        notes = "; ".join(n for n in r.get("notes", []) if n)
+        lines.append(f"{r['name']:10}  {('yes' if r.get('script') else 'no'):9}  "
+                     f"{('yes' if r.get('describe') else 'no'):8}  {('yes' if r.get('healthcheck') else 'no'):11}  "
+                     f"{r['status']:6}  {notes}")
+    return "\n".join(lines)
+
+
+def summary(results: List[Dict], seconds: float) -> str:
+    cached = sum(1 for r in results if r.get("cached"))
+    timeouts = sum(1 for r in results if r.get("timeout"))
+    return f"{len(results)} daemons checked in {seconds:.1f}s ({cached} cached, {timeouts} timed out)"
+
+
+def to_json(results: List[Dict]) -> str:
+    return json.dumps({"daemons": results}, indent=2)
+
+
+def to_junit(results: List[Dict]) -> str:
+    failures = sum(1 for r in results if r["status"] == "fail")
+    suite = ET.Element("testsuite", name="eden-doctor", tests=str(len(results)),
+                       failures=str(failures), errors="0", skipped="0",
+                       time=f"{sum(r.get('seconds', 0.0) for r in results):.3f}")
+    for r in results:
+        case = ET.SubElement(suite, "testcase", classname="eden.doctor", name=r["name"],
+                             time=f"{r.get('seconds', 0.0):.3f}")
+        notes = "; ".join(n for n in r.get("notes", []) if n)
+        if r["status"] == "fail":
+            ET.SubElement(case, "failure", message=notes or "healthcheck failed").text = notes
+        elif r["status"] == "warn":
+            ET.SubElement(case, "system-out").text = f"warn: {notes}"
+    return ET.tostring(suite, encoding="unicode")
+
+
+def render(results: List[Dict], fmt: str) -> str:
+    if fmt == "json":
+        return to_json(results)
+    if fmt == "junit":
+        return to_junit(results)
+    return format_table(results)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--check":
+        _child_main(sys.argv[2], sys.argv[3])
+        sys.stderr.flush()
+        os._exit(0)  # don't wait on threads the daemon started
+    print("usage: eden_doctor.py --check NAME SCRIPT (use `eden_daemon doctor` instead)", file=sys.stderr)
+    raise SystemExit(2)
@@ -0,0 +1,363 @@
+"""Segmented, indexed storage for the Eden events bus.
+
+``events.jsonl`` stays the live segment that ``log_event`` appends to and
+``tail --follow`` watches. Once it holds events from an earlier day, or grows
+past the size cap, it is sealed into ``_logs/events/events-<day>-<seq>.jsonl``.
+
+Every segment has a sidecar ``.idx`` file built incrementally from the bytes
+already indexed, so readers never re-parse history they have seen. The index
+splits the segment into ~256 KiB blocks and records, per block, its byte
+offset and timestamp range, plus which blocks each daemon appears in and the
+per-day (daemon, outcome) counts. Queries pick blocks from the index and seek
+straight to them; memory stays bounded by one block no matter how large the
+bus grows.
+"""
+from __future__ import annotations
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .eden_paths import events_bus_path, events_segments_dir
+except Exception:
+    # Fallback for direct script use
+    import sys as _sys
+    from pathlib import Path as _Path
+    _HERE = _Path(__file__).resolve().parent
+    if str(_HERE) not in _sys.path:
+        _sys.path.append(str(_HERE))
+    from eden_paths import events_bus_path, events_segments_dir  # type: ignore
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+BLOCK_BYTES = 256 * 1024
+DEFAULT_SEGMENT_MB = 64
+
+
+def segment_max_bytes() -> int:
+    try:
+        mb = float(os.environ.get("EDEN_EVENTS_SEGMENT_MB", DEFAULT_SEGMENT_MB))
+    except ValueError:
+        mb = DEFAULT_SEGMENT_MB
+    return max(int(mb * 1024 * 1024), BLOCK_BYTES)
+
+
+def normalize_ts(value: str) -> str:
+    """Turn an ISO date or datetime into the ``YYYY-MM-DDTHH:MM:SS`` form log_event writes."""
+    return datetime.fromisoformat(value.strip()).isoformat(timespec="seconds")
+
+
+# --- Rotation ----------------------------------------------------------------
+
+
+def _first_day(path: Path) -> str:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            ts = json.loads(f.readline()).get("timestamp") or ""
+        if len(ts) >= 10:
+            return ts[:10]
+    except Exception:
+        pass
+    return date.fromtimestamp(path.stat().st_mtime).isoformat()
+
+
+def _next_segment_name(day: str) -> Path:
+    seg_dir = events_segments_dir()
+    seq = 0
+    for p in seg_dir.glob(f"events-{day}-*.jsonl"):
+        try:
+            seq = max(seq, int(p.stem.rsplit("-", 1)[1]) + 1)
+        except ValueError:
+            continue
+    return seg_dir / f"events-{day}-{seq:03d}.jsonl"
+
+
+def needs_rotation(path: Optional[Path] = None, today: Optional[date] = None) -> bool:
+    path = path or events_bus_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if st.st_size == 0:
+        return False
+    if st.st_size >= segment_max_bytes():
+        return True
+    # mtime is the last append: an older day means every event inside is older too.
+    return date.fromtimestamp(st.st_mtime) != (today or date.today())
+
+
+def rotate(path: Optional[Path] = None) -> Optional[Path]:
+    """Seal the live segment into the segments folder. Returns the new segment path."""
+    path = path or events_bus_path()
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    target = _next_segment_name(_first_day(path))
+    try:
+        os.replace(path, target)
+    except FileNotFoundError:
+        # Another writer sealed it first.
+        return None
+    idx = _index_path(path)
+    try:
+        os.replace(idx, _index_path(target))
+    except OSError:
+        pass
+    return target
+
+
+def maybe_rotate(path: Optional[Path] = None) -> Optional[Path]:
+    path = path or events_bus_path()
+    if needs_rotation(path):
+        return rotate(path)
+    return None
+
+
+def segments() -> List[Path]:
+    """All segments oldest first, live ``events.jsonl`` last."""
+    out = sorted(events_segments_dir().glob("events-*.jsonl"))
+    live = events_bus_path()
+    if live.exists():
+        out.append(live)
+    return out
+
+
+# --- Index -------------------------------------------------------------------
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + INDEX_SUFFIX)
+
+
+def _empty_index(ino: int) -> dict:
+    return {
+        "version": INDEX_VERSION,
+        "ino": ino,
+        "size": 0,
+        "count": 0,
+        "first_ts": None,
+        "last_ts": None,
+        # [offset, min_ts, max_ts, count]
+        "blocks": [],
+        # daemon (lowercase) -> sorted block numbers
+        "daemons": {},
+        # day -> daemon -> outcome -> count
+        "daily": {},
+    }
+
+
+def _load_index(segment: Path) -> Optional[dict]:
+    try:
+        data = json.loads(_index_path(segment).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) and data.get("version") == INDEX_VERSION else None
+
+
+def _save_index(segment: Path, idx: dict) -> None:
+    path = _index_path(segment)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(idx, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def index_segment(segment: Path) -> dict:
+    """Load the sidecar index and extend it over any bytes appended since."""
+    st = segment.stat()
+    idx = _load_index(segment)
+    if idx is None or idx.get("ino") != st.st_ino or idx.get("size", 0) > st.st_size:
+        idx = _empty_index(st.st_ino)
+    if idx["size"] == st.st_size:
+        return idx
+
+    blocks = idx["blocks"]
+    daemons: Dict[str, List[int]] = idx["daemons"]
+    daily: Dict[str, Dict[str, Dict[str, int]]] = idx["daily"]
+    offset = indexed = idx["size"]
+    with segment.open("rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # a writer is mid-line; pick it up next time
+            start = offset
+            offset += len(raw)
+            try:
+                e = json.loads(raw)
+            except Exception:
+                continue
+            if not isinstance(e, dict):
+                continue
+            if not blocks or start - blocks[-1][0] >= BLOCK_BYTES:
+                blocks.append([start, None, None, 0])
+            block = blocks[-1]
+            bno = len(blocks) - 1
+            ts = str(e.get("timestamp") or "")
+            if block[1] is None or ts < block[1]:
+                block[1] = ts
+            if block[2] is None or ts > block[2]:
+                block[2] = ts
+            block[3] += 1
+
+            d = str(e.get("daemon", ""))
+            seen = daemons.setdefault(d.lower(), [])
+            if not seen or seen[-1] != bno:
+                seen.append(bno)
+            per_day = daily.setdefault(ts[:10], {}).setdefault(d, {})
+            outcome = str(e.get("outcome", ""))
+            per_day[outcome] = per_day.get(outcome, 0) + 1
+            idx["count"] += 1
+
+    if blocks:
+        idx["first_ts"] = min(b[1] for b in blocks if b[1] is not None)
+        idx["last_ts"] = max(b[2] for b in blocks if b[2] is not None)
+    idx["size"] = offset
+    if offset != indexed:
+        _save_index(segment, idx)
+    return idx
+
+
+# --- Queries -----------------------------------------------------------------
+
+
+def _overlaps(lo: Optional[str], hi: Optional[str], since: Optional[str], until: Optional[str]) -> bool:
+    if lo is None or hi is None:
+        return False
+    if since is not None and hi < since:
+        return False
+    if until is not None and lo >= until:
+        return False
+    return True
+
+
+def _ranges(idx: dict, since: Optional[str], until: Optional[str], daemon: Optional[str]) -> List[Tuple[int, int]]:
+    """Byte ranges of the blocks that may hold matching events, adjacent blocks merged."""
+    blocks = idx["blocks"]
+    if daemon is not None:
+        candidates = idx["daemons"].get(daemon.lower(), [])
+    else:
+        candidates = range(len(blocks))
+    out: List[Tuple[int, int]] = []
+    for bno in candidates:
+        _, lo, hi, _ = blocks[bno]
+        if not _overlaps(lo, hi, since, until):
+            continue
+        start = blocks[bno][0]
+        end = blocks[bno + 1][0] if bno + 1 < len(blocks) else idx["size"]
+        if out and out[-1][1] == start:
+            out[-1] = (out[-1][0], end)
+        else:
+            out.append((start, end))
+    return out
+
+
+def _matches(e: dict, since: Optional[str], until: Optional[str], daemon: Optional[str],
+             action: Optional[str]) -> bool:
+    if daemon is not None and str(e.get("daemon", "")).lower() != daemon.lower():
+        return False
+    if action is not None and str(e.get("action", "")).lower() != action.lower():
+        return False
+    ts = str(e.get("timestamp") or "")
+    if since is not None and ts < since:
+        return False
+    if until is not None and ts >= until:
+        return False
+    return True
+
+
+def _read_ranges(segment: Path, ranges: List[Tuple[int, int]], needle: Optional[str] = None) -> Iterator[dict]:
+    # ``needle`` is a cheap substring prefilter so non-matching lines skip json.loads.
+    probe = needle.lower().encode("utf-8") if needle else None
+    with segment.open("rb") as f:
+        for start, end in ranges:
+            f.seek(start)
+            pos = start
+            while pos < end:
+                raw = f.readline()
+                if not raw:
+                    break
+                pos += len(raw)
+                if probe is not None and probe not in raw.lower():
+                    continue
+                try:
+                    e = json.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(e, dict):
+                    yield e
+
+
+def iter_events(since: Optional[str] = None, until: Optional[str] = None, daemon: Optional[str] = None,
+                action: Optional[str] = None,
+                stop_at: Optional[Tuple[Optional[int], Optional[int], int]] = None) -> Iterator[dict]:
+    """Stream events oldest first, reading only the blocks the indexes point at.
+
+    ``since``/``until`` are normalized ISO timestamps (inclusive/exclusive).
+    ``stop_at`` is a ``Follower.position()``: the segment with that
+    ``(st_dev, st_ino)`` is read only up to its offset and nothing newer is
+    read. Without such a segment the live one is left out (the follower
+    reads it from the start).
+    """
+    live = events_bus_path()
+    for segment in segments():
+        end = None
+        if stop_at is not None:
+            try:
+                st = segment.stat()
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == tuple(stop_at[:2]):
+                end = stop_at[2]
+            elif segment == live:
+                return
+        try:
+            idx = index_segment(segment)
+        except OSError:
+            continue
+        if _overlaps(idx["first_ts"], idx["last_ts"], since, until):
+            ranges = _ranges(idx, since, until, daemon)
+            if end is not None:
+                ranges = [(start, min(stop, end)) for start, stop in ranges if start < end]
+            if ranges:
+                for e in _read_ranges(segment, ranges, needle=daemon):
+                    if _matches(e, since, until, daemon, action):
+                        yield e
+        if end is not None:
+            return
+
+
+def summarize(since: Optional[str] = None, daemon: Optional[str] = None) -> Dict[Tuple[str, str], int]:
+    """Count events per (daemon, outcome) from ``since`` onwards.
+
+    Segments that start at or after ``since`` are answered from the index's
+    daily counts without touching event data; only a segment straddling
+    ``since`` is scanned.
+    """
+    agg: Dict[Tuple[str, str], int] = {}
+    for segment in segments():
+        try:
+            idx = index_segment(segment)
+        except OSError:
+            continue
+        if not _overlaps(idx["first_ts"], idx["last_ts"], since, None):
+            continue
+        if since is None or idx["first_ts"] >= since:
+            for per_daemon in idx["daily"].values():
+                for d, outcomes in per_daemon.items():
+                    if daemon is not None and d.lower() != daemon.lower():
+                        continue
+                    for o, c in outcomes.items():
+                        agg[(d, o)] = agg.get((d, o), 0) + c
+            continue
+        for e in _read_ranges(segment, _ranges(idx, since, None, daemon), needle=daemon):
+            if _matches(e, since, None, daemon, None):
+                key = (str(e.get("daemon", "")), str(e.get("outcome", "")))
+                agg[key] = agg.get(key, 0) + 1
+    return agg
@@ -1,35 +1,49 @@
 from __future__ import annotations
 import argparse
-import time
+import json
 
 from .eden_paths import events_bus_path
+from .eden_follow import LEVELS, EventFilter, Follower
 
 
 def main(argv=None) -> int:
     ap = argparse.ArgumentParser(description="Tail Eden events bus (events.jsonl)")
     ap.add_argument("--follow", action="store_true", help="Follow (tail -f)")
+    ap.add_argument("--daemon", help="Only events from this daemon")
+    ap.add_argument("--action", help="Only events with this action")
+    ap.add_argument("--outcome", help="Only events with this outcome")
+    ap.add_argument("--level", choices=LEVELS, help="Only events at or above this level")
+    ap.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
     args = ap.parse_args(argv)
 
+    match = EventFilter(args.daemon, args.action, args.outcome, args.level)
     path = events_bus_path()
-    if not path.exists():
+    if not path.exists() and not args.follow:
         print(f"No events bus found at {path}")
         return 0
 
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            print(line.rstrip())
-        if args.follow:
-            while True:
-                where = f.tell()
-                line = f.readline()
-                if not line:
-                    time.sleep(0.5)
-                    f.seek(where)
-                else:
-                    print(line.rstrip())
+    # Starting from offset 0 prints the live segment, then keeps following it.
+    with Follower(path, from_start=True, backend="poll" if args.poll else "auto") as follower:
+        lines = iter(follower) if args.follow else follower.poll()
+        try:
+            for raw in lines:
+                if match and not _wanted(raw, match):
+                    continue
+                print(raw.decode("utf-8", "replace").rstrip(), flush=args.follow)
+        except KeyboardInterrupt:
+            pass
     return 0
 
 
+def _wanted(raw: bytes, match: EventFilter) -> bool:
+    if not match.wants_line(raw):
+        return False
+    try:
+        e = json.loads(raw)
+    except Exception:
+        return False
+    return isinstance(e, dict) and match(e)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
-
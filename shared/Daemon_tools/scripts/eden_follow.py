@@ -0,0 +1,293 @@
+"""Event-driven follower for the Eden events bus (``tail --follow``).
+
+On Linux the bus directory is watched with inotify, so an appended event is
+picked up as soon as the write lands and an idle follower sleeps in
+``select`` without waking. Elsewhere, or when inotify is unavailable, the
+file is polled every ``POLL_INTERVAL`` seconds.
+
+Either way the follower survives the bus being sealed into a segment
+(``eden_events.rotate``: the inode changes, the old file is drained first and
+the new one read from the start) and being truncated in place (read again
+from offset 0). Partial lines are held back until their newline arrives.
+
+``EventFilter`` applies the daemon/action/outcome/level filters in the
+follower, with a cheap byte prefilter so lines for other daemons are never
+parsed.
+"""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+LEVELS = ("debug", "info", "warning", "error")
+POLL_INTERVAL = float(os.environ.get("EDEN_FOLLOW_POLL", "0.25"))
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+# --- Filters -----------------------------------------------------------------
+
+
+def event_level(e: dict) -> str:
+    """An explicit ``level`` field, else one derived from outcome/error."""
+    level = str(e.get("level", "")).lower()
+    if level == "warn":
+        return "warning"
+    if level in LEVELS:
+        return level
+    outcome = str(e.get("outcome", "")).lower()
+    if e.get("error") or outcome in ("error", "fail", "failed") or (
+            outcome.startswith("exit:") and outcome != "exit:0"):
+        return "error"
+    if outcome in ("warn", "warning", "skipped", "timeout"):
+        return "warning"
+    return "info"
+
+
+class EventFilter:
+    """Exact, case-insensitive daemon/action/outcome match plus a minimum level."""
+
+    def __init__(self, daemon: Optional[str] = None, action: Optional[str] = None,
+                 outcome: Optional[str] = None, level: Optional[str] = None):
+        if level is not None and level.lower() not in LEVELS:
+            raise ValueError(f"level must be one of {LEVELS}, got {level!r}")
+        self.daemon = daemon.lower() if daemon else None
+        self.action = action.lower() if action else None
+        self.outcome = outcome.lower() if outcome else None
+        self.min_level = LEVELS.index(level.lower()) if level else 0
+        # Every wanted value must appear verbatim in the raw line (json.dumps
+        # escapes non-ASCII, so only ASCII values are safe to probe).
+        self._probes = [v.encode("ascii") for v in (self.daemon, self.action, self.outcome)
+                        if v and v.isascii()]
+
+    def __bool__(self) -> bool:
+        return bool(self.daemon or self.action or self.outcome or self.min_level)
+
+    def wants_line(self, raw: bytes) -> bool:
+        if not self._probes:
+            return True
+        low = raw.lower()
+        return all(p in low for p in self._probes)
+
+    def __call__(self, e: dict) -> bool:
+        if self.daemon is not None and str(e.get("daemon", "")).lower() != self.daemon:
+            return False
+        if self.action is not None and str(e.get("action", "")).lower() != self.action:
+            return False
+        if self.outcome is not None and str(e.get("outcome", "")).lower() != self.outcome:
+            return False
+        if self.min_level and LEVELS.index(event_level(e)) < self.min_level:
+            return False
+        return True
+
+
+# --- Watchers ----------------------------------------------------------------
+
+
+class _Inotify:
+    """Directory watch that wakes only for changes to one file name."""
+
+    def __init__(self, directory: Path, name: str):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux-only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("libc has no inotify")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (_IN_MODIFY | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+                | _IN_DELETE_SELF | _IN_MOVE_SELF)
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+        self.name = os.fsencode(name)
+        self._wake_r, self._wake_w = os.pipe()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until the followed file changes (True) or ``interrupt`` / timeout (False)."""
+        ready, _, _ = select.select([self.fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            return False
+        if self.fd not in ready:
+            return False
+        relevant = False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(buf):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, pos)
+                name = buf[pos + _EVENT_HEADER.size:pos + _EVENT_HEADER.size + length].rstrip(b"\0")
+                pos += _EVENT_HEADER.size + length
+                if name == self.name or mask & (_IN_Q_OVERFLOW | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                    relevant = True
+        return relevant
+
+    def interrupt(self) -> None:
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class Follower:
+    """Yield raw lines appended to ``path``, following rotation and truncation.
+
+    ``backend`` is ``"auto"`` (inotify if available), ``"inotify"`` or
+    ``"poll"``. Call ``close()`` from another thread to stop iteration.
+    """
+
+    def __init__(self, path: Path, from_start: bool = False, backend: str = "auto",
+                 poll_interval: Optional[float] = None):
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"backend must be auto, inotify or poll, got {backend!r}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = POLL_INTERVAL if poll_interval is None else poll_interval
+        self.rotations = 0
+        self.truncations = 0
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._iterating = False
+        self._fh = None
+        self._ident = None
+        self._buf = b""
+        self._watch: Optional[_Inotify] = None
+        if backend != "poll":
+            try:
+                self._watch = _Inotify(self.path.parent, self.path.name)
+            except OSError:
+                if backend == "inotify":
+                    raise
+        self.backend = "inotify" if self._watch else "poll"
+        self._open(at_end=not from_start)
+
+    def _open(self, at_end: bool) -> None:
+        try:
+            fh = self.path.open("rb")
+        except FileNotFoundError:
+            self._fh = self._ident = None
+            return
+        st = os.fstat(fh.fileno())
+        if at_end:
+            fh.seek(0, os.SEEK_END)
+        self._fh, self._ident, self._buf = fh, (st.st_dev, st.st_ino), b""
+
+    def position(self) -> Optional[Tuple[int, int, int]]:
+        """``(st_dev, st_ino, offset)`` of the next line to be yielded; None while the file is missing.
+
+        Hand it to ``eden_events.iter_events(stop_at=...)`` to replay history
+        up to exactly where this follower carries on.
+        """
+        if self._fh is None:
+            return None
+        return self._ident + (self._fh.tell() - len(self._buf),)
+
+    def _drain(self) -> List[bytes]:
+        if self._fh is None:
+            return []
+        data = self._fh.read()
+        if not data:
+            return []
+        lines = (self._buf + data).split(b"\n")
+        self._buf = lines.pop()
+        return [line for line in lines if line.strip()]
+
+    def poll(self) -> List[bytes]:
+        """Complete lines written since the last call."""
+        out = self._drain()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return out  # sealed into a segment; the next append recreates it
+        if self._fh is None or (st.st_dev, st.st_ino) != self._ident:
+            if self._fh is not None:
+                out += self._drain()  # a writer that opened before the rename
+                self._fh.close()
+                self.rotations += 1
+            self._open(at_end=False)
+            out += self._drain()
+        elif st.st_size < self._fh.tell():
+            self.truncations += 1
+            self._fh.seek(0)
+            self._buf = b""
+            out += self._drain()
+        return out
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._watch is not None:
+            self._watch.wait(timeout)
+        else:
+            self._closed.wait(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._iterating = True
+        try:
+            while not self._closed.is_set():
+                yield from self.poll()
+                self.wait()
+        finally:
+            self._release()
+
+    def events(self, match: Optional[EventFilter] = None) -> Iterator[dict]:
+        for raw in self:
+            if match is not None and not match.wants_line(raw):
+                continue
+            try:
+                e = json.loads(raw)
+            except Exception:
+                continue
+            if isinstance(e, dict) and (match is None or match(e)):
+                yield e
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            if self._watch is not None:
+                self._watch.interrupt()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._iterating = False
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self._watch is not None:
+                self._watch.close()
+                self._watch = None
+
+    def __enter__(self) -> "Follower":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if not self._iterating:
+            self._release()
@@ -0,0 +1,219 @@
+"""Batching single-writer service behind ``eden_safety.log_event``.
+
+In direct mode every event opens and appends to two files (the per-daemon
+``.log`` and the shared events bus). Chatty daemons (Ranger, Tidbit, Archive)
+emit thousands of events a minute, so batch mode moves that work off the
+caller: ``submit`` only captures the raw fields and a ``time.time()`` stamp
+into a bounded queue, and one background thread formats timestamps, runs
+``json.dumps`` and writes each destination once per batch.
+
+A batch is flushed when ``flush_at`` events are waiting or ``interval``
+seconds have passed, whichever comes first. Anything still queued is drained
+at interpreter exit. When the queue is full the caller waits up to
+``put_timeout`` and then writes the queue and its own event synchronously,
+so events are never dropped or reordered.
+
+``fsync`` policy: ``none`` leaves durability to the OS, ``interval`` fsyncs
+at most every ``fsync_interval`` seconds, ``every`` fsyncs after each write.
+"""
+from __future__ import annotations
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .eden_paths import logs_dir, events_bus_path
+    from .eden_events import maybe_rotate
+except Exception:
+    # Fallback for direct script use
+    import sys as _sys
+    from pathlib import Path as _Path
+    _HERE = _Path(__file__).resolve().parent
+    if str(_HERE) not in _sys.path:
+        _sys.path.append(str(_HERE))
+    from eden_paths import logs_dir, events_bus_path  # type: ignore
+    from eden_events import maybe_rotate  # type: ignore
+
+
+FSYNC_POLICIES = ("none", "interval", "every")
+
+# (log dir or None for the default, daemon, action, target, outcome, error, extra, unix time)
+Record = Tuple[Optional[Path], str, str, str, str, Optional[str], Optional[Dict[str, Any]], float]
+
+
+def format_entry(daemon: str, action: str, target: str, outcome: str, error: Optional[str],
+                 extra: Optional[Dict[str, Any]], ts: float) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "daemon": daemon,
+        "action": action,
+        "target": target,
+        "outcome": outcome,
+        "timestamp": datetime.fromtimestamp(ts).isoformat(timespec="seconds"),
+    }
+    if error:
+        entry["error"] = error
+    if extra:
+        entry.update(extra)
+    return entry
+
+
+class EventWriter:
+    def __init__(self, max_queue: int = 10000, flush_at: int = 500, interval: float = 0.5,
+                 fsync: str = "none", fsync_interval: float = 1.0, put_timeout: float = 1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.flush_at = max(1, flush_at)
+        self.interval = interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Record]" = queue.Queue(maxsize=max_queue)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        # Held from drain to write, so batches reach the files in queue order.
+        self._order_lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"events": 0, "batches": 0, "sync_fallbacks": 0}
+
+    # -- caller side --------------------------------------------------------
+
+    def start(self) -> "EventWriter":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="eden-log-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, record: Record) -> None:
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            self.stats["sync_fallbacks"] += 1
+            with self._order_lock:
+                self._write(self._drain() + [record])
+            return
+        if self._queue.qsize() >= self.flush_at:
+            self._wake.set()
+
+    def flush(self, sync: bool = False) -> None:
+        """Write everything queued so far from the calling thread."""
+        with self._order_lock:
+            self._write(self._drain(), force_sync=sync)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        self.flush(sync=self.fsync != "none")
+
+    # -- flusher side -------------------------------------------------------
+
+    def _drain(self, limit: Optional[int] = None) -> List[Record]:
+        batch: List[Record] = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            while True:
+                with self._order_lock:
+                    batch = self._drain(limit=self.flush_at * 4)
+                    if not batch:
+                        break
+                    self._write(batch)
+
+    def _write(self, batch: List[Record], force_sync: bool = False) -> None:
+        if not batch:
+            return
+        grouped: Dict[Path, List[str]] = {}
+        bus_lines: List[str] = []
+        default_dir: Optional[Path] = None
+        for log_dir, daemon, action, target, outcome, error, extra, ts in batch:
+            line = json.dumps(format_entry(daemon, action, target, outcome, error, extra, ts),
+                              ensure_ascii=False) + "\n"
+            if log_dir is None:
+                default_dir = log_dir = default_dir or logs_dir()
+            grouped.setdefault(log_dir / f"{daemon}.log", []).append(line)
+            bus_lines.append(line)
+        with self._write_lock:
+            bus = events_bus_path()
+            maybe_rotate(bus)
+            grouped.setdefault(bus, []).extend(bus_lines)
+            sync = self._should_fsync() or force_sync
+            for path, lines in grouped.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            self.stats["events"] += len(batch)
+            self.stats["batches"] += 1
+
+    def _should_fsync(self) -> bool:
+        if self.fsync == "every":
+            return True
+        if self.fsync == "interval":
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                self._last_fsync = now
+                return True
+        return False
+
+
+_WRITER: Optional[EventWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer() -> Optional[EventWriter]:
+    return _WRITER
+
+
+def start_writer(**options: Any) -> EventWriter:
+    """Start (or replace) the process-wide batching writer."""
+    global _WRITER
+    with _WRITER_LOCK:
+        old, _WRITER = _WRITER, EventWriter(**options).start()
+        if old is not None:
+            old.close()
+        return _WRITER
+
+
+def stop_writer() -> None:
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+        if writer is not None:
+            writer.close()
+
+
+def _reset_after_fork() -> None:
+    # The flusher thread does not survive fork(); give the child its own writer.
+    global _WRITER, _WRITER_LOCK
+    _WRITER_LOCK = threading.Lock()
+    if _WRITER is not None:
+        old = _WRITER
+        _WRITER = EventWriter(max_queue=old._queue.maxsize, flush_at=old.flush_at, interval=old.interval,
+                              fsync=old.fsync, fsync_interval=old.fsync_interval,
+                              put_timeout=old.put_timeout).start()
+
+
+atexit.register(stop_writer)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,208 @@
+"""Content-hash manifest for incremental Red Thread stages.
+
+Each stage (Briar, Codexa, Janvier, Aderyn, Label) keeps one manifest in its
+output folder. Per input it records the content hash, the (size, mtime_ns)
+seen when that hash was taken, the stage version and the outputs written.
+
+On the next run an input whose stat still matches is reused without reading
+it; one whose stat moved is re-hashed, and only a real content change (or a
+new stage version, or a missing output) triggers a rebuild. Inputs that
+disappeared have their outputs deleted by ``prune``. ``force=True`` rebuilds
+everything but still records, so the following run is incremental again.
+
+Content-addressed stages may record one output for several inputs; such an
+output is only deleted once no input records it (see ``discard_unclaimed``).
+
+    manifest = StageManifest.for_dir(OUTPUT_DIR, "briar", version="1")
+    for path in inputs:
+        if manifest.fresh(path):
+            continue
+        manifest.discard_outputs(path)
+        manifest.record(path, write_outputs(path))
+    manifest.prune(inputs)
+    manifest.save()
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MANIFEST_VERSION = 1
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def force_requested(argv: Optional[List[str]] = None) -> bool:
+    """``--force`` on the command line or ``EDEN_FORCE=1`` in the environment."""
+    if argv is not None and "--force" in argv:
+        return True
+    return os.environ.get("EDEN_FORCE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class StageManifest:
+    def __init__(self, path: Path, stage: str, version: str = "1", force: bool = False):
+        self.path = Path(path)
+        self.stage = stage
+        self.version = str(version)
+        self.force = force
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.stats = {"reused": 0, "rebuilt": 0, "removed": 0, "outputs_deleted": 0}
+        self._load()
+
+    @classmethod
+    def for_dir(cls, output_dir: Path, stage: str, version: str = "1", force: bool = False) -> "StageManifest":
+        return cls(Path(output_dir) / f".{stage.lower()}_manifest.json", stage, version, force)
+
+    # -- persistence --------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if isinstance(data, dict) and data.get("manifest_version") == MANIFEST_VERSION:
+            self._entries = data.get("entries") or {}
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"manifest_version": MANIFEST_VERSION, "stage": self.stage, "entries": self._entries}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    # -- keys and outputs ---------------------------------------------------
+
+    @staticmethod
+    def _key(input_path: Path) -> str:
+        return os.path.abspath(input_path)
+
+    def _out_ref(self, output: Path) -> str:
+        # Outputs under the manifest's folder are stored relative so the tree can move.
+        base = str(self.path.parent)
+        out = os.path.abspath(output)
+        return out[len(base) + 1:] if out.startswith(base + os.sep) else out
+
+    def _out_path(self, ref: str) -> str:
+        return ref if os.path.isabs(ref) else os.path.join(self.path.parent, ref)
+
+    def outputs(self, input_path: Path) -> List[Path]:
+        entry = self._entries.get(self._key(input_path))
+        return [Path(self._out_path(r)) for r in entry["outputs"]] if entry else []
+
+    def claimed_outputs(self, exclude: Iterable[str] = ()) -> Set[str]:
+        """Absolute paths of every recorded output, leaving out the inputs keyed in ``exclude``."""
+        skip = set(exclude)
+        return {os.path.abspath(self._out_path(r))
+                for key, entry in self._entries.items() if key not in skip for r in entry["outputs"]}
+
+    # -- checks -------------------------------------------------------------
+
+    def _stat(self, input_path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(input_path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def fresh(self, input_path: Path) -> bool:
+        """True when ``input_path`` can be skipped; counts it as reused."""
+        if self.force:
+            return False
+        entry = self._entries.get(self._key(input_path))
+        if entry is None or entry.get("version") != self.version:
+            return False
+        stat = self._stat(input_path)
+        if stat is None:
+            return False
+        if [stat[0], stat[1]] != entry.get("stat"):
+            try:
+                digest = file_hash(input_path)
+            except OSError:
+                return False
+            if digest != entry.get("sha256"):
+                return False
+            entry["stat"] = [stat[0], stat[1]]  # touched but unchanged
+            self._dirty = True
+        if not all(os.path.exists(self._out_path(r)) for r in entry["outputs"]):
+            return False
+        self.stats["reused"] += 1
+        return True
+
+    # -- updates ------------------------------------------------------------
+
+    def discard_outputs(self, input_path: Path, keep: Iterable[Path] = ()) -> int:
+        """Delete the outputs last recorded for ``input_path`` (except ``keep``)."""
+        return self._delete(self.outputs(input_path), {os.path.abspath(p) for p in keep})
+
+    def discard_unclaimed(self, outputs: Iterable[Path]) -> int:
+        """Delete those of ``outputs`` that no input records any more."""
+        return self._delete(outputs, self.claimed_outputs())
+
+    def _delete(self, outputs: Iterable[Path], keep_set: Set[str]) -> int:
+        deleted = 0
+        for out in outputs:
+            if os.path.abspath(out) in keep_set:
+                continue
+            try:
+                Path(out).unlink()
+                deleted += 1
+            except OSError:
+                pass
+        self.stats["outputs_deleted"] += deleted
+        return deleted
+
+    def record(self, input_path: Path, outputs: Iterable[Path], digest: Optional[str] = None,
+               stat: Optional[Tuple[int, int]] = None) -> None:
+        """Remember ``input_path`` as built into ``outputs``; counts it as rebuilt.
+
+        ``digest`` and ``stat`` (size, mtime_ns) are the input's ``file_hash``
+        and stat when the caller, e.g. a worker process, already took them.
+        """
+        if stat is None or digest is None:
+            stat = self._stat(input_path)
+        if digest is None:
+            try:
+                digest = file_hash(input_path)
+            except OSError:
+                return
+        self._entries[self._key(input_path)] = {
+            "sha256": digest,
+            "stat": [stat[0], stat[1]] if stat else None,
+            "version": self.version,
+            "outputs": [self._out_ref(Path(p)) for p in outputs],
+        }
+        self.stats["rebuilt"] += 1
+        self._dirty = True
+
+    def prune(self, current_inputs: Iterable[Path]) -> int:
+        """Drop entries for inputs that no longer exist and delete their outputs."""
+        current = {self._key(p) for p in current_inputs}
+        gone = [k for k in self._entries if k not in current]
+        if gone:
+            # An output another input still records (content-addressed stages) stays.
+            keep_set = self.claimed_outputs(exclude=gone)
+            for key in gone:
+                self._delete(self.outputs(Path(key)), keep_set)
+                del self._entries[key]
+            self.stats["removed"] += len(gone)
+            self._dirty = True
+        return len(gone)
+
+    def summary(self) -> str:
+        s = self.stats
+        forced = " (forced)" if self.force else ""
+        return (f"manifest{forced}: {s['reused']} reused, {s['rebuilt']} rebuilt, "
+                f"{s['removed']} removed, {s['outputs_deleted']} stale outputs deleted")
@@ -76,6 +76,18 @@ def events_bus_path() -> Path:
     return logs_dir() / "events.jsonl"
 
 
+def events_segments_dir() -> Path:
+    p = logs_dir() / "events"
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+def cache_dir() -> Path:
+    p = eden_work_root() / "daemons" / "_cache"
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
 def daemon_dir(name: str) -> Path:
     return daemons_root() / name
 
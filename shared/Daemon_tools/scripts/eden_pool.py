@@ -0,0 +1,85 @@
+"""Batch process pool for the Red Thread stages (Briar, Janvier).
+
+Inputs are cut into small batches that a pool of worker processes takes off
+one shared queue, so a worker that finishes early simply takes the next one.
+Runs with few inputs (or ``--jobs 1``) stay in-process.
+
+    jobs = pop_jobs(args, log)                    # consumes "--jobs N"
+    jobs = pool_size(jobs, default_jobs("BRIAR_JOBS"), len(todo))
+    sweep_temp_files(OUTPUT_DIR)
+    settings = {"OUTPUT_DIR": OUTPUT_DIR}
+    for out in run_batches(convert_batch, batches(todo, jobs), jobs, (flag,), settings):
+        merge(out)
+
+Workers get ``settings`` as module globals of the batch function, plus
+``QUIET = True``: they report through their results, not the console.
+"""
+from __future__ import annotations
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Below this many inputs a pool costs more than it saves.
+PARALLEL_MIN_FILES = 256
+BATCH_MAX = 64
+
+
+def default_jobs(env_var: str) -> int:
+    """Worker processes from ``env_var``, else one per CPU."""
+    return int(os.environ.get(env_var, "0")) or (os.cpu_count() or 1)
+
+
+def pop_jobs(args: List[str], log: Callable[[str], None] = print) -> Optional[int]:
+    """Remove ``--jobs N`` from ``args``; returns N, or None when absent or not a number."""
+    if "--jobs" not in args:
+        return None
+    at = args.index("--jobs")
+    jobs = None
+    try:
+        jobs = int(args[at + 1])
+    except (IndexError, ValueError):
+        log("--jobs needs a number; using the default")
+    del args[at:at + 2]
+    return jobs
+
+
+def pool_size(jobs: Optional[int], default: int, files: int) -> int:
+    """Processes to use for ``files`` inputs: 1 keeps the work in-process."""
+    jobs = default if jobs is None else max(1, jobs)
+    return 1 if files < PARALLEL_MIN_FILES else jobs
+
+
+def batches(todo: Sequence, jobs: int) -> List[Sequence]:
+    size = max(1, min(BATCH_MAX, len(todo) // (jobs * 8) or 1))
+    return [todo[i:i + size] for i in range(0, len(todo), size)]
+
+
+def _init_worker(fn: Callable, settings: Dict[str, Any]) -> None:
+    fn.__globals__.update(settings, QUIET=True)
+
+
+def run_batches(fn: Callable, work: Sequence, jobs: int, args: Sequence = (),
+                settings: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Yield ``fn(batch, *args)`` for every batch, in completion order when pooled."""
+    if jobs == 1:
+        for batch in work:
+            yield fn(batch, *args)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(fn, settings or {})) as pool:
+        pending = {pool.submit(fn, batch, *args) for batch in work}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                yield fut.result()
+
+
+def sweep_temp_files(*dirs: Path) -> None:
+    # Leftovers of an interrupted run; live names only ever appear via link/replace.
+    for d in dirs:
+        if d.is_dir():
+            for tmp in d.glob(".*.tmp"):
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
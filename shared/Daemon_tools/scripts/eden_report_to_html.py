@@ -1,8 +1,29 @@
+"""Render the .chaos logs in LOG_DIR as HTML.
+
+``render_report`` is the default: it streams each page straight to disk,
+splits entries into pages of ``PAGE_SIZE`` grouped by daemon and by day
+(the log's modification date) with an index page linking them, and keeps a
+small SQLite state file next to the pages so a rerun only re-reads logs whose
+size or mtime changed and only rewrites pages whose entries changed.
+
+``build_html``/``save_html`` still produce the old single-file report
+(``--single``).
+"""
+import argparse
+import hashlib
+import html as htmlmod
 import os
+import re
+import sqlite3
+import time
 from datetime import datetime
 
 LOG_DIR = "chaos_logs"
 EXPORT_FILE = "eden_log_report.html"
+REPORT_DIR = "eden_log_report"
+STATE_FILE = ".report_state.sqlite3"
+PAGE_SIZE = 1000
+RENDER_VERSION = 1
 
 def load_logs():
     logs = {}
@@ -70,8 +91,279 @@ def save_html(html):
         f.write(html)
     print(f"📁 HTML report saved to: {EXPORT_FILE}")
 
+# --- streaming, paginated renderer -------------------------------------------
+
+STYLE = """<style>
+    body { font-family: 'Segoe UI', sans-serif; background: #1e1e2f; color: #eee; padding: 2em; }
+    h1 { color: #ffc6ff; }
+    a { color: #7fffd4; }
+    .entry { border-bottom: 1px solid #444; margin-bottom: 1em; padding-bottom: 1em; }
+    .agent { color: #7fffd4; font-weight: bold; }
+    .report { color: #fceaff; margin-left: 1em; }
+    .activity-chart div { background: #ff9de2; height: 20px; margin: 3px 0; color: #111; padding-left: 5px; }
+    .nav { margin: 1em 0; }
+</style>"""
+
+# (kind, sources column, output subdirectory)
+GROUPS = (("daemon", "agent", "by_daemon"), ("day", "day", "by_day"))
+
+
+def scan_log(path):
+    """First [AGENT] and [REPORT] of one log, reading only as far as needed."""
+    agent = report = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if agent is None and line.startswith("[AGENT]") and ": " in line:
+                agent = line.split(": ")[1]
+            elif report is None and line.startswith("[REPORT]"):
+                report = line[9:]
+            if agent is not None and report is not None:
+                break
+    return agent or "Unknown", "(No report)" if report is None else report
+
+
+def open_state(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(out_dir, STATE_FILE))
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=OFF;
+        PRAGMA cache_size=-65536;
+        CREATE TABLE IF NOT EXISTS sources (
+            name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER,
+            agent TEXT, day TEXT, entry TEXT
+        );
+        CREATE INDEX IF NOT EXISTS sources_by_agent ON sources(agent, name, size, mtime_ns);
+        CREATE INDEX IF NOT EXISTS sources_by_day ON sources(day, name, size, mtime_ns);
+        CREATE TABLE IF NOT EXISTS pages (path TEXT PRIMARY KEY, sig TEXT, seen INTEGER);
+    """)
+    return conn
+
+
+def render_entry(name, agent, report):
+    esc = htmlmod.escape
+    return (
+        f'<div class="entry">\n<div class="agent">{esc(agent)}</div>\n'
+        f'<div class="report">{esc(report)}</div>\n'
+        f'<div class="filename"><small>{esc(name)}</small></div>\n</div>\n'
+    )
+
+
+def _stat_logs(log_dir, chunk=10_000):
+    batch = []
+    with os.scandir(log_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".chaos") and entry.is_file():
+                st = entry.stat()
+                batch.append((entry.name, st.st_size, st.st_mtime_ns))
+                if len(batch) >= chunk:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def sync_sources(conn, log_dir):
+    """Bring the sources table in line with log_dir; returns (read, reused, removed).
+
+    The directory listing goes into a temp table and is diffed in SQL, so
+    only new or changed logs are opened and nothing is held per log in Python.
+    """
+    read = 0
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS listing (name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)")
+        conn.execute("DELETE FROM listing")
+        for batch in _stat_logs(log_dir):
+            conn.executemany("INSERT OR REPLACE INTO listing VALUES (?, ?, ?)", batch)
+        removed = conn.execute("DELETE FROM sources WHERE name NOT IN (SELECT name FROM listing)").rowcount
+        reused = conn.execute("""
+            DELETE FROM listing WHERE EXISTS (
+                SELECT 1 FROM sources s
+                WHERE s.name = listing.name AND s.size = listing.size AND s.mtime_ns = listing.mtime_ns
+            )
+        """).rowcount
+        changed = conn.execute("SELECT name, size, mtime_ns FROM listing")
+        while True:
+            batch = changed.fetchmany(1000)
+            if not batch:
+                break
+            rows = []
+            for name, size, mtime_ns in batch:
+                agent, report = scan_log(os.path.join(log_dir, name))
+                day = time.strftime("%Y-%m-%d", time.localtime(mtime_ns / 1e9))
+                rows.append((name, size, mtime_ns, agent, day, render_entry(name, agent, report)))
+            conn.executemany("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)", rows)
+            read += len(rows)
+        conn.execute("DELETE FROM listing")
+    return read, reused, removed
+
+
+def slug(key):
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", key).strip("._") or "_"
+    if safe != key:
+        safe += "-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+    return safe
+
+
+def page_path(sub, key, number):
+    return f"{sub}/{slug(key)}-{number:04d}.html"
+
+
+def _atomic_write(path, write):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _head(f, title):
+    f.write(f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n<title>{htmlmod.escape(title)}</title>\n')
+    f.write(STYLE)
+    f.write("\n</head>\n<body>\n")
+
+
+def write_page(path, kind, key, number, pages, entries, sub):
+    def nav(f):
+        links = ['<a href="../index.html">index</a>']
+        if number > 1:
+            links.append(f'<a href="{os.path.basename(page_path(sub, key, number - 1))}">&larr; prev</a>')
+        if number < pages:
+            links.append(f'<a href="{os.path.basename(page_path(sub, key, number + 1))}">next &rarr;</a>')
+        f.write(f'<div class="nav">Page {number} of {pages} &middot; {" &middot; ".join(links)}</div>\n')
+
+    def write(f):
+        esc = htmlmod.escape
+        _head(f, f"Eden CHAOS Log Report: {kind} {key} ({number}/{pages})")
+        f.write(f"<h1>🪐 {esc(kind.title())}: {esc(key)}</h1>\n")
+        nav(f)
+        f.writelines(entries)
+        nav(f)
+        f.write("</body></html>\n")
+
+    _atomic_write(path, write)
+
+
+def page_signature(kind, key, number, pages, rows):
+    h = hashlib.sha1(repr((RENDER_VERSION, kind, key, number, pages)).encode("utf-8"))
+    for name, size, mtime_ns in rows:
+        h.update(f"\0{name}\0{size}\0{mtime_ns}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def render_pages(conn, out_dir, run, page_size=PAGE_SIZE):
+    """Write every group page whose entries changed; returns (written, kept, removed, groups)."""
+    written = kept = 0
+    groups = {}
+    with conn:
+        for kind, column, sub in GROUPS:
+            os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+            counts = conn.execute(f"SELECT {column}, COUNT(*) FROM sources GROUP BY {column} ORDER BY {column}").fetchall()
+            groups[kind] = []
+            for key, count in counts:
+                pages = -(-count // page_size)
+                groups[kind].append((key, count, pages))
+                cur = conn.execute(
+                    f"SELECT name, size, mtime_ns FROM sources WHERE {column} = ? ORDER BY name", (key,)
+                )
+                for number in range(1, pages + 1):
+                    rows = cur.fetchmany(page_size)
+                    rel = page_path(sub, key, number)
+                    sig = page_signature(kind, key, number, pages, rows)
+                    path = os.path.join(out_dir, rel)
+                    old = conn.execute("SELECT sig FROM pages WHERE path = ?", (rel,)).fetchone()
+                    if old and old[0] == sig and os.path.exists(path):
+                        kept += 1
+                    else:
+                        entries = conn.execute(
+                            f"SELECT entry FROM sources WHERE {column} = ? AND name BETWEEN ? AND ? ORDER BY name",
+                            (key, rows[0][0], rows[-1][0]),
+                        )
+                        write_page(path, kind, key, number, pages, (r[0] for r in entries), sub)
+                        written += 1
+                    conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (rel, sig, run))
+        stale = [r[0] for r in conn.execute("SELECT path FROM pages WHERE seen != ?", (run,))]
+        for rel in stale:
+            try:
+                os.remove(os.path.join(out_dir, rel))
+            except FileNotFoundError:
+                pass
+        conn.execute("DELETE FROM pages WHERE seen != ?", (run,))
+    return written, kept, len(stale), groups
+
+
+def write_index(out_dir, groups):
+    def write(f):
+        esc = htmlmod.escape
+        _head(f, "Eden CHAOS Log Report")
+        f.write("<h1>🪐 Eden CHAOS Log Report</h1>\n")
+        f.write(f"<p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>\n")
+        daemons = sorted(groups.get("daemon", []), key=lambda g: -g[1])
+        top = max((count for _, count, _ in daemons), default=1)
+        f.write('<h2>📊 Agent Activity Summary</h2>\n<div class="activity-chart">\n')
+        for key, count, _ in daemons:
+            f.write(f"<div style='width:{max(1, 400 * count // top)}px'>{esc(key)} ({count})</div>\n")
+        f.write("</div>\n")
+        for kind, title, sub in (("daemon", "🧚 By daemon", "by_daemon"), ("day", "📅 By day", "by_day")):
+            f.write(f"<h2>{title}</h2>\n<ul>\n")
+            for key, count, pages in groups.get(kind, []):
+                f.write(
+                    f'<li><a href="{page_path(sub, key, 1)}">{esc(key)}</a> '
+                    f"({count} entries, {pages} page{'s' if pages != 1 else ''})</li>\n"
+                )
+            f.write("</ul>\n")
+        f.write("</body></html>\n")
+
+    _atomic_write(os.path.join(out_dir, "index.html"), write)
+
+
+def render_report(log_dir=None, out_dir=None, page_size=PAGE_SIZE):
+    log_dir = log_dir or LOG_DIR
+    out_dir = out_dir or REPORT_DIR
+    run = time.time_ns()
+    conn = open_state(out_dir)
+    try:
+        read, reused, removed = sync_sources(conn, log_dir)
+        written, kept, pruned, groups = render_pages(conn, out_dir, run, page_size)
+    finally:
+        conn.close()
+    write_index(out_dir, groups)
+    return {
+        "logs_read": read,
+        "logs_reused": reused,
+        "logs_removed": removed,
+        "pages_written": written,
+        "pages_kept": kept,
+        "pages_removed": pruned,
+    }
+
+
+def main(argv=None):
+    global LOG_DIR, EXPORT_FILE
+    ap = argparse.ArgumentParser(description="Render .chaos logs as an HTML report")
+    ap.add_argument("--logs", default=LOG_DIR, help="directory of .chaos logs")
+    ap.add_argument("--out", default=None, help=f"output directory (default {REPORT_DIR}; with --single, the file)")
+    ap.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    ap.add_argument("--single", action="store_true", help="write the old one-file report")
+    args = ap.parse_args(argv)
+
+    if args.single:
+        LOG_DIR = args.logs
+        EXPORT_FILE = args.out or EXPORT_FILE
+        logs = load_logs()
+        entries, activity = extract_data(logs)
+        html = build_html(entries, activity)
+        save_html(html)
+        return 0
+    out_dir = args.out or REPORT_DIR
+    stats = render_report(args.logs, out_dir, max(1, args.page_size))
+    print(
+        f"📁 HTML report saved to: {os.path.join(out_dir, 'index.html')} "
+        f"({stats['logs_read']} logs read, {stats['logs_reused']} unchanged; "
+        f"{stats['pages_written']} pages written, {stats['pages_kept']} kept, {stats['pages_removed']} removed)"
+    )
+    return 0
+
+
 if __name__ == "__main__":
-    logs = load_logs()
-    entries, activity = extract_data(logs)
-    html = build_html(entries, activity)
-    save_html(html)
+    raise SystemExit(main())
@@ -1,12 +1,16 @@
 from __future__ import annotations
 import json
+import os
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional, Dict, Any
 
 try:
     from .eden_paths import logs_dir, events_bus_path
+    from .eden_events import maybe_rotate
+    from . import eden_log_writer
 except Exception:
     # Fallback for direct script use
     import sys as _sys
@@ -15,6 +19,8 @@ except Exception:
     if str(_HERE) not in _sys.path:
         _sys.path.append(str(_HERE))
     from eden_paths import logs_dir, events_bus_path  # type: ignore
+    from eden_events import maybe_rotate  # type: ignore
+    import eden_log_writer  # type: ignore
 
 
 # Simple Rook-like command filter
@@ -31,24 +37,49 @@ def _jsonl_append(path: Path, obj: Dict[str, Any]) -> None:
         f.write(json.dumps(obj, ensure_ascii=False) + "\n")
 
 
+def configure_logging(mode: str = "direct", **options: Any) -> None:
+    """Pick how log_event writes: ``direct`` (two appends per event) or ``batch``.
+
+    ``batch`` options are passed to ``eden_log_writer.EventWriter``: max_queue,
+    flush_at, interval, fsync (none/interval/every), fsync_interval.
+    """
+    if mode == "batch":
+        eden_log_writer.start_writer(**options)
+    elif mode == "direct":
+        eden_log_writer.stop_writer()
+    else:
+        raise ValueError(f"Unknown logging mode: {mode!r}")
+
+
+def _configure_from_env() -> None:
+    if os.environ.get("EDEN_LOG_MODE", "direct").lower() != "batch":
+        return
+    options: Dict[str, Any] = {"fsync": os.environ.get("EDEN_LOG_FSYNC", "none").lower()}
+    if os.environ.get("EDEN_LOG_FLUSH_AT"):
+        options["flush_at"] = int(os.environ["EDEN_LOG_FLUSH_AT"])
+    if os.environ.get("EDEN_LOG_FLUSH_INTERVAL"):
+        options["interval"] = float(os.environ["EDEN_LOG_FLUSH_INTERVAL"])
+    configure_logging("batch", **options)
+
+
 def log_event(daemon: str, action: str, target: str = "", outcome: str = "", error: Optional[str] = None,
               extra: Optional[Dict[str, Any]] = None, log_dir: Optional[Path] = None) -> None:
-    from datetime import datetime
-    entry: Dict[str, Any] = {
-        "daemon": daemon,
-        "action": action,
-        "target": target,
-        "outcome": outcome,
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-    }
-    if error:
-        entry["error"] = error
-    if extra:
-        entry.update(extra)
-
+    writer = eden_log_writer.get_writer()
+    if writer is not None:
+        # Formatting and file I/O happen on the writer thread.
+        writer.submit((log_dir, daemon, action, target, outcome, error, dict(extra) if extra else None,
+                       time.time()))
+        return
+
+    entry = eden_log_writer.format_entry(daemon, action, target, outcome, error, extra, time.time())
     ldir = log_dir or logs_dir()
     _jsonl_append(ldir / f"{daemon}.log", entry)
-    _jsonl_append(events_bus_path(), entry)
+    bus = events_bus_path()
+    maybe_rotate(bus)
+    _jsonl_append(bus, entry)
+
+
+_configure_from_env()
 
 
 @dataclass
@@ -0,0 +1,32 @@
+"""Shared fixtures: loading daemon scripts that are not importable as packages."""
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def load_daemon(monkeypatch):
+    """Load a script by repo-relative path, patching its module globals for the test.
+
+        briar = load_daemon("daemons/Briar/briar.py", INPUT_DIR=tmp_path / "sheele")
+
+    Each call executes a fresh copy named ``<stem>_under_test``. ``register=True``
+    also puts it in ``sys.modules`` until the test ends, for pool workers that
+    unpickle its functions by module name.
+    """
+    def load(relpath: str, register: bool = False, **settings):
+        path = ROOT / relpath
+        name = f"{path.stem}_under_test"
+        spec = importlib.util.spec_from_file_location(name, path)
+        mod = importlib.util.module_from_spec(spec)
+        if register:
+            monkeypatch.setitem(sys.modules, name, mod)
+        spec.loader.exec_module(mod)
+        for attr, value in settings.items():
+            monkeypatch.setattr(mod, attr, value)
+        return mod
+    return load
@@ -0,0 +1,81 @@
+"""Aderyn's compiled summon detector and append-only summon archive."""
+import json
+import random
+import re
+
+import pytest
+
+
+@pytest.fixture
+def aderyn(tmp_path, load_daemon):
+    mod = load_daemon("daemons/Aderyn/aderyn.py", INPUT_DIR=tmp_path / "janvier", OUTPUT_DIR=tmp_path / "library")
+    mod.INPUT_DIR.mkdir()
+    mod.OUTPUT_DIR.mkdir()
+    return mod
+
+
+def test_detector_agrees_with_searching_each_pattern(aderyn):
+    patterns = aderyn.SUMMON_PATTERNS + [r"\bsum\b", r"\bsummoner\b", r"rise (again|anew)", r"\b(\w+) \1\b",
+                                         r"conj.re", r"\bnon-stop\b", r"^begin"]
+    detector = aderyn.SummonDetector(patterns)
+    words = ["summon", "summoner", "sum", "call", "forth", "conjXre", "rise", "again", "i", "am", "become",
+             "non-stop", "begin", "x", "-"]
+    rng = random.Random(4)
+    for _ in range(5000):
+        text = rng.choice([" ", "", "-"]).join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+        expected = [i for i, p in enumerate(patterns) if re.search(p, text)]
+        got = detector.search(text)
+        assert (got in expected) if expected else got is None, text
+    assert aderyn.match_summon("Then I CALL FORTH the tide") == r"\bcall forth\b"
+    assert not aderyn.detect_summons("the summoner waits")
+
+
+def _chaos(aderyn, name, title, texts):
+    nodes = [{"id": f"node_{i}", "role": "KIN", "content": t, "timestamp": None} for i, t in enumerate(texts)]
+    (aderyn.INPUT_DIR / name).write_text(json.dumps({"title": title, "date": "2024-05-01", "nodes": nodes}),
+                                         encoding="utf-8")
+
+
+def _archive(aderyn):
+    path = aderyn.OUTPUT_DIR / aderyn.ARCHIVE_NAME
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_archive_only_appends_new_summons_and_recovers(aderyn):
+    _chaos(aderyn, "a.chaos", "Rite", ["we summon the lantern", "plain talk", "conjure a door"])
+    _chaos(aderyn, "b.chaos", "Other", ["nothing here"])
+    assert len(aderyn.archive_summons()) == 2
+    first = _archive(aderyn)
+    assert [e["pattern"] for e in first] == [r"\bsummon\b", r"\bconjure\b"]
+    assert aderyn.archive_summons() == []
+
+    # A copy of the same conversation adds nothing; a new summon is appended after the old ones.
+    _chaos(aderyn, "a_copy.chaos", "Rite", ["we summon the lantern", "invoke the river"])
+    added = aderyn.archive_summons()
+    assert [e["text"] for e in added] == ["invoke the river"]
+    assert _archive(aderyn)[:2] == first and len(_archive(aderyn)) == 3
+
+    # Cut short after the archive append but before the index one, with a torn line behind it.
+    index = aderyn.OUTPUT_DIR / aderyn.INDEX_NAME
+    lines = index.read_text(encoding="ascii").splitlines(keepends=True)
+    index.write_text("".join(lines[:2]) + lines[2][:5], encoding="ascii")
+    with open(aderyn.OUTPUT_DIR / aderyn.ARCHIVE_NAME, "ab") as f:
+        f.write(b'{"key": "torn')
+    _chaos(aderyn, "c.chaos", "Third", ["i am become the lamp"])
+    assert [e["source"] for e in aderyn.archive_summons()] == ["c.chaos"]
+    entries = _archive(aderyn)
+    assert len(entries) == 4 and len({e["key"] for e in entries}) == 4
+
+    # Losing the archive rescans every input.
+    (aderyn.OUTPUT_DIR / aderyn.ARCHIVE_NAME).unlink()
+    assert len(aderyn.archive_summons()) == 4
+
+
+def test_pattymae_sorts_the_summons_archive(aderyn, load_daemon):
+    pattymae = load_daemon("daemons/PattyMae/pattymae.py")
+    _chaos(aderyn, "a.chaos", "Rite", ["we summon the lantern"])
+    aderyn.archive_summons()
+    found = sorted(p.name for p in pattymae.iter_chaos_files(aderyn.OUTPUT_DIR))
+    assert found == [aderyn.ARCHIVE_NAME]
+    assert pattymae.categorize(aderyn.ARCHIVE_NAME) == "Summons"
+    assert pattymae.categorize("old_summons.chaos") == "Summons"
@@ -0,0 +1,67 @@
+"""Briar batch conversion: process pool vs in-process, atomic outputs, merged summary."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def briar(tmp_path, monkeypatch, load_daemon):
+    # Registered: workers unpickle _convert_batch by module name.
+    mod = load_daemon("daemons/Briar/briar.py", register=True, INPUT_DIR=tmp_path / "sheele")
+    monkeypatch.setattr(sys.modules["eden_pool"], "PARALLEL_MIN_FILES", 0)
+    mod.INPUT_DIR.mkdir()
+    return mod
+
+
+def _corpus(input_dir: Path) -> None:
+    for i in range(40):
+        turns = {str(t): {"message": {"author": {"role": "user" if t % 2 else "assistant"},
+                                      "content": {"parts": [f"turn {t} of {i}"]}}} for t in range(i % 5 + 1)}
+        convo = {"title": f"Talk: {i % 7}", "create_time": 1700000000 + i, "messages": [{"mapping": turns}]}
+        (input_dir / f"c{i:02d}.json").write_text(json.dumps(convo), encoding="utf-8")
+    (input_dir / "broken.json").write_bytes(b"{\xff not json")
+    (input_dir / "empty.json").write_text(json.dumps({"title": "empty", "messages": []}), encoding="utf-8")
+
+
+def _run(briar, monkeypatch, out: Path, jobs: str):
+    monkeypatch.setattr(briar, "OUTPUT_DIR", out)
+    monkeypatch.setattr(briar, "QUARANTINE_DIR", out / "_quarantine")
+    monkeypatch.setattr(sys, "argv", ["briar", "--jobs", jobs])
+    briar.main()
+    files = {p.relative_to(out).as_posix(): p.read_bytes() for p in out.rglob("*") if p.is_file()}
+    return files, json.loads((out / briar.SUMMARY_NAME).read_text(encoding="utf-8"))
+
+
+def test_pool_matches_serial_and_merges_summary(briar, tmp_path, monkeypatch):
+    _corpus(briar.INPUT_DIR)
+    serial, s_summary = _run(briar, monkeypatch, tmp_path / "serial", "1")
+    pooled, p_summary = _run(briar, monkeypatch, tmp_path / "pooled", "3")
+
+    def outputs(files):
+        return {k: v for k, v in files.items() if not k.startswith(".")}
+
+    assert outputs(pooled) == outputs(serial)
+    assert not [k for k in pooled if k.endswith(".tmp")]
+    assert pooled["_quarantine/decode_error_broken.json"] == b"{\xff not json"
+    for summary, jobs in ((s_summary, 1), (p_summary, 3)):
+        assert summary["jobs"] == jobs
+        assert (summary["files"], summary["saved"], summary["errors"]) == (42, 40, 0)
+        assert summary["quarantined"] == {"decode_error": 1, "no_messages": 1}
+        assert sum(w["files"] for w in summary["workers"].values()) == 42
+    assert len(p_summary["workers"]) > 1
+
+    # Recorded by the parent from the workers' hashes: a rerun reuses everything.
+    again, summary = _run(briar, monkeypatch, tmp_path / "pooled", "3")
+    assert summary["files"] == 0 and outputs(again) == outputs(pooled)
+
+
+def test_publish_takes_the_next_free_name(briar, tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "a.txt").write_text("taken", encoding="utf-8")
+    names = (out / ("a.txt" if n == 0 else f"a_{n}.txt") for n in range(5))
+    assert briar.publish(["new\n"], names) == out / "a_1.txt"
+    assert (out / "a.txt").read_text(encoding="utf-8") == "taken"
+    assert sorted(p.name for p in out.iterdir()) == ["a.txt", "a_1.txt"]
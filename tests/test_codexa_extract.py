@@ -0,0 +1,73 @@
+"""Codexa streaming fence extractor and corpus-wide block dedupe."""
+import random
+
+import pytest
+
+
+@pytest.fixture
+def codexa(tmp_path, load_daemon):
+    mod = load_daemon("daemons/Codexa/codexa.py", SRC_DIR=tmp_path / "txt", OUT_DIR=tmp_path / "blocks",
+                      LOG_FILE=tmp_path / "codexa.log")
+    mod.SRC_DIR.mkdir()
+    yield mod
+    mod._close_log()
+
+
+def _regex(codexa, text):
+    return [(m.group(1) or "plain", m.group(2)) for m in codexa.CODEBLOCK.finditer(text)]
+
+
+def test_streaming_extractor_matches_the_regex(codexa):
+    cases = [
+        "[KIN] ```python\nprint('hi')\n```\nafter",
+        "```js\n\n\n  indented()\n```",
+        "````py\nx = 1\n``````sh\necho two\n```",
+        "```py extra\nnot a fence\n```\ncode\n```",
+        "```py\n```\nfirst line is code\n```",
+        "```py\n\t\n```",                   # the regex salvages the blank line
+        "```c++ \nint main();\n```trailing",
+        "```\nunterminated",
+    ]
+    rng = random.Random(2)
+    pieces = ["```", "```py", "[KIN] ```sh", "````", "text", "  x", "", "\t", "```c ", "a ``` b"]
+    cases += ["\n".join(rng.choice(pieces) for _ in range(rng.randint(1, 10))) + rng.choice(["", "\n"])
+              for _ in range(3000)]
+    for text in cases:
+        assert codexa.extract_blocks(text) == _regex(codexa, text), repr(text)
+
+
+def _outputs(codexa):
+    return sorted(p.relative_to(codexa.OUT_DIR).as_posix() for p in codexa.OUT_DIR.rglob("*.chaos"))
+
+
+def test_duplicates_are_stored_once_and_survive_until_unreferenced(codexa, monkeypatch, capsys):
+    monkeypatch.setattr(codexa, "SPOOL_BYTES", 8)  # exercise the on-disk spool
+    shared = "```python\nprint('shared')\n```\n"
+    (codexa.SRC_DIR / "a.txt").write_text(shared + "```sh\necho a\n```\n", encoding="utf-8")
+    (codexa.SRC_DIR / "b.txt").write_text("[KIN] " + shared + shared, encoding="utf-8")
+
+    codexa.main([])
+    assert _outputs(codexa) == ["python/a.block1.python.codeblock.chaos", "sh/a.block2.sh.codeblock.chaos"]
+    body = (codexa.OUT_DIR / "python" / "a.block1.python.codeblock.chaos").read_text(encoding="utf-8")
+    assert body == "# source: a\n# lang: python\n# extracted_by: CodexaV3\n\nprint('shared')\n"
+    assert "Wrote 2 .codeblock.chaos files across all languages (2 duplicates skipped, 0 removed)" \
+        in capsys.readouterr().out
+
+    mtime = (codexa.OUT_DIR / "python" / "a.block1.python.codeblock.chaos").stat().st_mtime_ns
+    codexa.main(["--force"])
+    assert "No new code blocks (4 already stored, 0 removed)" in capsys.readouterr().out
+    assert (codexa.OUT_DIR / "python" / "a.block1.python.codeblock.chaos").stat().st_mtime_ns == mtime
+
+    # a.txt loses the shared block: b.txt still has it, so its file stays.
+    (codexa.SRC_DIR / "a.txt").write_text("```python\nprint('new')\n```\n", encoding="utf-8")
+    codexa.main([])
+    outs = _outputs(codexa)
+    assert "python/a.block1.python.codeblock.chaos" in outs and "sh/a.block2.sh.codeblock.chaos" not in outs
+    new = [o for o in outs if o not in ("python/a.block1.python.codeblock.chaos",)]
+    assert len(new) == 1 and "print('new')" in (codexa.OUT_DIR / new[0]).read_text(encoding="utf-8")
+
+    (codexa.SRC_DIR / "b.txt").unlink()
+    codexa.main([])
+    assert _outputs(codexa) == new
+    codexa._close_log()
+    assert "[CodexaV3] Wrote a.block1.python.codeblock.chaos" in codexa.LOG_FILE.read_text(encoding="utf-8")
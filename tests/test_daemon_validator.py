@@ -0,0 +1,81 @@
+"""daemon_validator engine: one-walk index, single read per file, process pool and hash cache."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import daemon_validator as dv  # noqa: E402
+
+SOURCES = {
+    "Rhea": "import os\nimport json\n\ndef f(x=[]):\n    while True:\n        eval(x)\n",
+    "Codexa": "API_KEY = 'abcdefgh12345'\nprint(undefined_thing)\nopen('x.txt')\n",
+    "Briar": "def broken(:\n",
+    "Label": "import re\r\nprint(re.sub('a', 'b', 'c'))\r\n",
+}
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for i in range(30):
+        d = roots[i % 2] / f"pkg{i}" / "sub"
+        d.mkdir(parents=True)
+        (d / f"helper{i}.py").write_text("x = 1\n", encoding="utf-8")
+    for i, (name, src) in enumerate(SOURCES.items()):
+        d = roots[i % 2] / f"pkg{i}" / "sub"
+        (d / f"{name.lower()}.py").write_bytes(src.encode("utf-8"))
+    # Same name in the second root: the first root must win, as before.
+    (roots[1] / "rhea.py").write_text("pass\n", encoding="utf-8")
+    (roots[0] / "bad.py").write_bytes(b"\xff\xfe not utf-8")
+    return [str(r) for r in roots]
+
+
+def _legacy(roots, daemons):
+    out = {}
+    for daemon in daemons:
+        path = dv.find_daemon_file(roots, daemon)
+        out[daemon] = {"found": 1, **dv.scan_file(path)} if path else {"found": 0}
+    return out
+
+
+def test_matches_per_daemon_walk(tree, monkeypatch):
+    monkeypatch.setattr(dv, "PARALLEL_MIN_FILES", 1)
+    daemons = list(SOURCES) + ["Bad", "Nobody"]
+    got = dv.validate(tree, daemons=daemons, jobs=2, use_cache=False)
+    assert got == _legacy(tree, daemons)
+    assert got["Rhea"]["mutable_default"] == 1 and got["Rhea"]["unused_import"] == 2
+    assert got["Codexa"]["hardcoded_secret"] == 1 and got["Codexa"]["undefined_var"] == 1
+    assert got["Briar"]["undefined_var"] == -1
+    assert got["Label"]["unused_import"] == 0
+    assert got["Bad"] == {"found": 1, **{k: -1 for k in dv.REGEX_PATTERNS}}
+    assert got["Nobody"] == {"found": 0}
+
+
+def test_cache_reuses_unchanged_files(tree, monkeypatch):
+    daemons = list(SOURCES)
+    first = dv.validate(tree, daemons=daemons, jobs=1)
+    scanned = []
+    real = dv._scan_job
+    monkeypatch.setattr(dv, "_scan_job", lambda job: scanned.append(job[0]) or real(job))
+
+    assert dv.validate(tree, daemons=daemons, jobs=1) == first
+    assert scanned == []
+
+    label = Path(dv.build_file_index(tree)["label.py"])
+    st = label.stat()
+    os.utime(label, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched, same bytes
+    assert dv.validate(tree, daemons=daemons, jobs=1) == first
+    assert scanned == []
+
+    codexa = Path(dv.build_file_index(tree)["codexa.py"])
+    codexa.write_text("x = 1\n", encoding="utf-8")
+    os.utime(codexa, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    again = dv.validate(tree, daemons=daemons, jobs=1)
+    assert scanned == [str(codexa)]
+    assert again["Codexa"]["hardcoded_secret"] == 0
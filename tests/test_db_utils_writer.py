@@ -0,0 +1,107 @@
+"""chaos_index.db writer: batched commits, interval flush, bulk load and covering indexes."""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import db_utils  # noqa: E402
+
+
+def _rows(db):
+    with sqlite3.connect(db) as conn:
+        return conn.execute("SELECT original_name, converted_name, agent, tags FROM chaos_files ORDER BY id").fetchall()
+
+
+def test_batches_and_flushes(tmp_path):
+    db = str(tmp_path / "chaos_index.db")
+    with db_utils.ChaosIndexWriter(db, batch_size=3, flush_interval=0) as writer:
+        for i in range(7):
+            writer.add(f"f{i}.chaos", f"f{i}.converted.chaos", agent="Handel", tags="x")
+        assert len(_rows(db)) == 6 and writer.commits == 2
+        writer.flush()
+        assert len(_rows(db)) == 7
+    assert _rows(db)[0] == ("f0.chaos", "f0.converted.chaos", "Handel", "x")
+    with pytest.raises(RuntimeError):
+        writer.add("late", "late")
+
+
+class _BusyOnce:
+    """Connection stand-in whose first ``executemany`` fails like a locked database."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.failures = 1
+
+    def executemany(self, sql, rows):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self.conn.executemany(sql, rows)
+
+    def __enter__(self):
+        return self.conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self.conn.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def test_failed_flush_keeps_rows_for_the_next_one(tmp_path):
+    db = str(tmp_path / "chaos_index.db")
+    with db_utils.ChaosIndexWriter(db, batch_size=3, flush_interval=0) as writer:
+        writer.conn = _BusyOnce(writer.conn)
+        writer.add("f0.chaos", "f0.converted.chaos")
+        writer.add("f1.chaos", "f1.converted.chaos")
+        with pytest.raises(sqlite3.OperationalError):
+            writer.add("f2.chaos", "f2.converted.chaos")
+        assert _rows(db) == [] and writer.rows_written == 0
+        writer.flush()
+        assert [r[0] for r in _rows(db)] == ["f0.chaos", "f1.chaos", "f2.chaos"]
+        assert writer.rows_written == 3 and writer.commits == 1
+        writer.conn = writer.conn.conn
+
+
+def test_interval_flush_and_log_to_db(tmp_path, monkeypatch):
+    db = str(tmp_path / "chaos_index.db")
+    monkeypatch.setattr(db_utils, "DB_PATH", db)
+    try:
+        db_utils.init_db()
+        monkeypatch.setattr(db_utils.get_writer(), "flush_interval", 0.05)
+        db_utils.log_to_db("a.chaos", "a.converted.chaos", agent="Unknown")
+        deadline = time.time() + 5
+        while not _rows(db) and time.time() < deadline:
+            time.sleep(0.02)
+        assert _rows(db) == [("a.chaos", "a.converted.chaos", "Unknown", None)]
+        with sqlite3.connect(db) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            stamp = conn.execute("SELECT timestamp FROM chaos_files").fetchone()[0]
+        assert len(stamp) == 19
+    finally:
+        db_utils.close_db()
+
+
+def test_bulk_load_rebuilds_covering_indexes(tmp_path):
+    db = str(tmp_path / "chaos_index.db")
+    with db_utils.ChaosIndexWriter(db, flush_interval=0) as writer:
+        writer.add("before.chaos", "before.converted.chaos")
+        rows = ((f"f{i}.chaos", f"f{i}.converted.chaos", "Handel" if i % 2 else "Unknown", None) for i in range(1000))
+        assert writer.bulk_load(rows, chunk_size=300) == 1000
+    assert len(_rows(db)) == 1001
+    with sqlite3.connect(db) as conn:
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert set(db_utils.INDEXES) <= names
+        plans = {
+            "SELECT converted_name, timestamp FROM chaos_files WHERE original_name = ?": ("f1.chaos",),
+            "SELECT original_name FROM chaos_files WHERE agent = ? AND timestamp >= ?": ("Handel", "2000"),
+            "SELECT original_name, agent FROM chaos_files WHERE timestamp BETWEEN ? AND ?": ("2000", "3000"),
+        }
+        for sql, args in plans.items():
+            plan = " ".join(r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, args))
+            assert "COVERING INDEX" in plan, plan
@@ -0,0 +1,114 @@
+"""Tiered dedupe engine (size -> head/tail sample -> full hash) and Blaze's use of it."""
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "shared" / "Daemon_tools" / "scripts"))
+
+from eden_dedupe import SAMPLE_BYTES, DedupeIndex, HashCache, IOCounter, find_duplicates  # noqa: E402
+
+BIG = 4 * SAMPLE_BYTES
+
+
+def _write(path: Path, data: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def _tree(base: Path) -> dict:
+    body = os.urandom(BIG)
+    middle_changed = bytearray(body)
+    middle_changed[BIG // 2] ^= 0xFF
+    return {
+        "orig": _write(base / "a" / "orig.bin", body),
+        "copy": _write(base / "b" / "copy.bin", body),
+        "middle": _write(base / "c" / "middle.bin", bytes(middle_changed)),
+        "head": _write(base / "c" / "head.bin", b"x" + body[1:]),
+        "lonely": _write(base / "d" / "lonely.bin", os.urandom(BIG + 1)),
+        "small1": _write(base / "e" / "small1.txt", b"same small text"),
+        "small2": _write(base / "e" / "small2.txt", b"same small text"),
+    }
+
+
+def test_tiers_only_read_what_they_must(tmp_path):
+    f = _tree(tmp_path)
+    counter = IOCounter()
+    groups = find_duplicates(sorted(f.values()), counter=counter)
+    assert sorted(groups) == sorted([[f["orig"], f["copy"]], [f["small1"], f["small2"]]])
+    # lonely is never opened; head differs at the sample tier; only
+    # orig/copy/middle need full hashes.
+    assert counter.full_hashes == 3 + 2
+    assert counter.sample_hashes == 4
+    assert counter.bytes_read == 4 * 2 * SAMPLE_BYTES + 3 * BIG + 2 * len(b"same small text")
+
+
+def test_hash_cache_persists_and_tracks_changes(tmp_path):
+    f = _tree(tmp_path / "tree")
+    db = tmp_path / "cache.sqlite3"
+    cache = HashCache(db)
+    first = find_duplicates(f.values(), cache)
+    cache.conn.close()
+
+    cache = HashCache(db)
+    assert find_duplicates(f.values(), cache) == first
+    assert cache.counter.bytes_read == 0
+
+    Path(f["copy"]).write_bytes(os.urandom(BIG))
+    os.utime(f["copy"], (time.time() + 5, time.time() + 5))
+    assert [f["orig"], f["copy"]] not in find_duplicates(f.values(), cache)
+    assert cache.counter.bytes_read == 2 * SAMPLE_BYTES  # only the edited file is re-read
+    cache.conn.close()
+
+
+def test_hard_links_are_not_duplicates(tmp_path):
+    a = _write(tmp_path / "a.bin", os.urandom(BIG))
+    os.link(a, tmp_path / "b.bin")
+    assert find_duplicates([a, str(tmp_path / "b.bin")]) == []
+
+
+def test_dedupe_index_defers_hashing_until_a_size_collides(tmp_path):
+    f = _tree(tmp_path / "tree")
+    index = DedupeIndex(sqlite3.connect(":memory:"))
+    counter = index.cache.counter
+    assert index.check(f["orig"]) is None
+    assert index.check(f["lonely"]) is None
+    assert counter.bytes_read == 0
+    assert index.check(f["head"]) is None
+    assert counter.full_hashes == 0
+    assert index.check(f["middle"]) is None
+    assert index.check(f["copy"]) == f["orig"]
+    assert index.check(f["orig"]) is None  # re-seen keeper is not its own duplicate
+
+    os.remove(f["orig"])
+    assert index.check(f["copy"]) is None  # vanished keeper is forgotten
+
+
+def test_dedupe_index_adopts_an_older_index_in_order(tmp_path):
+    kept = _write(tmp_path / "kept.bin", b"k" * 100)
+    later = _write(tmp_path / "later.bin", b"k" * 100)
+    index = DedupeIndex(sqlite3.connect(":memory:"))
+    assert index.adopt([kept, str(tmp_path / "gone.bin")]) == 1
+    assert index.cache.counter.files_opened == 0
+    # The adopted file stays the keeper for a copy found afterwards.
+    assert index.check(later) == kept
+
+
+def test_blaze_dedupe_report(tmp_path, capsys, load_daemon):
+    blaze = load_daemon("daemons/Blaze/blaze.py")
+    assert blaze.find_duplicates is not None
+
+    f = _tree(tmp_path)
+    dupes = blaze.blaze_dedupe(tmp_path, quiet=False)
+    assert sorted(dupes) == sorted([(f["copy"], f["orig"]), (f["small2"], f["small1"])])
+    (report,) = (tmp_path / "_logs" / "Blaze" / "dedupe").glob("dedupe_*.jsonl")
+    lines = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert {"dupe": f["copy"], "original": f["orig"]} in lines
+    assert "full hashes" in capsys.readouterr().out
+
+    # The reports and hash cache under _logs/Blaze are not dedupe candidates.
+    assert sorted(blaze.blaze_dedupe(tmp_path, quiet=True)) == sorted(dupes)
@@ -0,0 +1,107 @@
+"""Streaming export splitter: lazy parsing, iterative mapping walk, incremental re-splits."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_conversations as ec  # noqa: E402
+from shared.Daemon_tools.scripts import json_stitcher  # noqa: E402
+
+
+def _conv(cid, title, update_time=1.0, text="hi"):
+    return {
+        "id": cid,
+        "title": title,
+        "update_time": update_time,
+        "current_node": "a",
+        "mapping": {
+            "a": {"message": {"author": {"role": "user"}, "content": {"parts": [text]}}, "children": ["b"]},
+            "b": {"message": {"author": {"role": "assistant"}, "content": {"parts": ["ok"]}}, "children": []},
+        },
+    }
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_iter_export_matches_json_load(tmp_path, wrap):
+    convs = [_conv(f"c{i}", f"Title {i} ✨", 1.5e9 + i, "x" * (i * 37)) for i in range(20)]
+    data = {"user": {"n": 1.25}, "conversations": convs, "tail": []} if wrap else convs
+    path = tmp_path / "conversations.json"
+    path.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+    got = list(ec.iter_export(path, chunk=7))
+    assert [c for c, _ in got] == convs
+    assert len({d for _, d in got}) == 20
+
+    path.write_text(json.dumps(convs)[:-40], encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(ec.iter_export(path, chunk=64))
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1 << 20])
+def test_iter_export_odd_values_bom_and_empty_input(tmp_path, chunk):
+    data = [
+        {"id": "a", "text": "héllo ✨ \"quoted\" [not, an, array]", "n": [1, 2.5, -3e4]},
+        12345678901234567890,
+        "plain string",
+        {"nested": {"deep": [{"x": None}, True, False]}},
+        [],
+        {"big": "x" * 5000},
+    ]
+    path = tmp_path / "conversations.json"
+    path.write_text("\ufeff  [\n" + ",\n ".join(json.dumps(d, ensure_ascii=False) for d in data) + "\n]\n",
+                    encoding="utf-8")
+    assert [v for v, _ in ec.iter_export(path, chunk=chunk)] == data
+    for empty in ("[ ]", "", '{"id": "a"}'):
+        path.write_text(empty, encoding="utf-8")
+        assert list(ec.iter_export(path, chunk=chunk)) == []
+
+
+def test_iter_turns_is_iterative_and_ordered():
+    mapping = {"r": {"children": ["a", "b"]}, "a": {"children": ["a1", "a2"]}, "a1": {}, "a2": {"children": []},
+               "b": {"children": ["r"]}}
+    order = []
+
+    def walk(node_id):
+        node = mapping.get(node_id)
+        if not node or node_id in order:
+            return
+        order.append(node_id)
+        for child in node.get("children", []):
+            walk(child)
+
+    walk("r")
+    ids = {id(v): k for k, v in mapping.items()}
+    assert [ids[id(n)] for n in ec.iter_turns(mapping, "r")] == order
+
+    deep = {str(i): {"children": [str(i + 1)]} for i in range(sys.getrecursionlimit() * 3)}
+    assert sum(1 for _ in ec.iter_turns(deep, "0")) == len(deep)
+
+
+def test_resplit_touches_only_new_and_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_stitcher, "OUTPUT_DIR", tmp_path / "out")
+    state = tmp_path / "out" / ec.STATE_FILE
+    export = tmp_path / "conversations.json"
+    convs = [_conv(f"c{i}", f"T{i}") for i in range(5)]
+    export.write_text(json.dumps(convs), encoding="utf-8")
+
+    first = ec.split_export(export, state, json_stitcher.render)
+    assert first["written"] == 5
+    assert json.loads((tmp_path / "out" / "conversation_3.json").read_text(encoding="utf-8"))["id"] == "c2"
+
+    written = []
+    render = lambda conv, n: written.append(conv["id"]) or json_stitcher.render(conv, n)  # noqa: E731
+    convs[1] = _conv("c1", "T1", update_time=2.0, text="edited")
+    convs = [_conv("new1", "N1"), _conv("new2", "N2")] + convs
+    export.write_text(json.dumps(convs), encoding="utf-8")
+    second = ec.split_export(export, state, render)
+    assert written == ["new1", "new2", "c1"] and second["skipped"] == 4
+    assert json.loads((tmp_path / "out" / "conversation_6.json").read_text(encoding="utf-8"))["id"] == "new1"
+    assert json.loads((tmp_path / "out" / "conversation_3.json").read_text(encoding="utf-8"))["id"] == "c2"
+
+    (tmp_path / "out" / "conversation_5.json").unlink()
+    written.clear()
+    ec.split_export(export, state, render)
+    assert written == ["c4"]
@@ -0,0 +1,112 @@
+"""Discovery cache: warm hits, per-daemon invalidation and describe() lookups."""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_discovery  # noqa: E402
+
+
+def _make_daemon(base: Path, name: str, role: str = "Tester") -> Path:
+    folder = base / "daemons" / name
+    (folder / "scripts").mkdir(parents=True)
+    (folder / "scripts" / f"{name.lower()}.py").write_text("# daemon\n")
+    (folder / f"{name.lower()}.daemon_role.json").write_text(json.dumps({"role": role}))
+    return folder
+
+
+def _bump(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def eden(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    monkeypatch.delenv("EDEN_DISCOVERY_CACHE", raising=False)
+    eden_discovery._LOADED.clear()
+    return tmp_path
+
+
+def test_warm_discover_skips_inspection(eden, monkeypatch):
+    _make_daemon(eden, "Alpha")
+    _make_daemon(eden, "Beta")
+    cold = [d.to_dict() for d in eden_discovery.discover()]
+    assert eden_discovery.cache_path().exists()
+
+    def boom(_child):
+        raise AssertionError("warm discover should not re-inspect")
+
+    monkeypatch.setattr(eden_discovery, "_inspect", boom)
+    warm = [d.to_dict() for d in eden_discovery.discover()]
+    assert warm == cold
+    assert [d["name"] for d in warm] == ["Alpha", "Beta"]
+
+
+def test_manifest_edit_reinspects_only_that_daemon(eden, monkeypatch):
+    _make_daemon(eden, "Alpha")
+    beta = _make_daemon(eden, "Beta")
+    eden_discovery.discover()
+
+    role_file = beta / "beta.daemon_role.json"
+    role_file.write_text(json.dumps({"role": "Edited"}))
+    _bump(role_file)
+
+    seen = []
+    real = eden_discovery._inspect
+    monkeypatch.setattr(eden_discovery, "_inspect", lambda child: seen.append(child.name) or real(child))
+    roles = {d.name: d.role for d in eden_discovery.discover()}
+    assert seen == ["Beta"]
+    assert roles == {"Alpha": "Tester", "Beta": "Edited"}
+
+
+def test_added_and_removed_daemons_are_picked_up(eden):
+    _make_daemon(eden, "Alpha")
+    assert [d.name for d in eden_discovery.discover()] == ["Alpha"]
+    _make_daemon(eden, "Gamma")
+    assert [d.name for d in eden_discovery.discover()] == ["Alpha", "Gamma"]
+    (eden / "daemons" / "Alpha" / "scripts" / "alpha.py").unlink()
+    (eden / "daemons" / "Alpha" / "scripts").rmdir()
+    (eden / "daemons" / "Alpha" / "alpha.daemon_role.json").unlink()
+    (eden / "daemons" / "Alpha").rmdir()
+    assert [d.name for d in eden_discovery.discover()] == ["Gamma"]
+
+
+def test_describe_uses_cache_and_invalidate(eden, monkeypatch):
+    _make_daemon(eden, "Alpha", role="First")
+    eden_discovery.discover()
+    monkeypatch.setattr(eden_discovery, "discover", lambda *a, **k: pytest.fail("full scan"))
+    info = eden_discovery.describe("Alpha")
+    assert info["role"] == "First"
+    assert eden_discovery.describe("Missing") is None
+
+    eden_discovery.invalidate("Alpha")
+    monkeypatch.undo()
+    monkeypatch.setenv("EDEN_ROOT", str(eden))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(eden))
+    assert eden_discovery.describe("Alpha")["role"] == "First"
+
+
+def test_cache_can_be_disabled(eden, monkeypatch):
+    monkeypatch.setenv("EDEN_DISCOVERY_CACHE", "off")
+    _make_daemon(eden, "Alpha")
+    assert [d.name for d in eden_discovery.discover()] == ["Alpha"]
+    assert not (eden / "daemons" / "_cache" / "discovery.json").exists()
+
+
+def test_read_only_work_root_runs_cold(eden, monkeypatch):
+    _make_daemon(eden, "Alpha")
+
+    def read_only():
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(eden_discovery, "cache_dir", read_only)
+    assert [d.name for d in eden_discovery.discover()] == ["Alpha"]
+    assert eden_discovery.describe("Alpha")["name"] == "Alpha"
+    eden_discovery.invalidate("Alpha")
@@ -0,0 +1,90 @@
+"""Doctor engine: isolated parallel checks, timeouts, mtime-keyed cache and reports."""
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_daemon, eden_discovery, eden_doctor  # noqa: E402
+
+SCRIPTS = {
+    "Alpha": "def describe():\n    return {}\n\ndef healthcheck():\n    return {'status': 'ok', 'notes': 'fine'}\n",
+    "Bravo": "print('chatty import')\n\ndef healthcheck():\n    return {'status': 'warn', 'notes': 'disk low'}\n",
+    "Hang": "import time\ntime.sleep(60)\n",
+    "Crash": "import os\nos._exit(3)\n",
+    "Broken": "raise RuntimeError('bad config')\n",
+    "Threads": "import threading, time\nthreading.Thread(target=time.sleep, args=(60,)).start()\n",
+}
+
+
+@pytest.fixture
+def eden(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    eden_discovery._LOADED.clear()
+    for name, body in SCRIPTS.items():
+        scripts = tmp_path / "daemons" / name / "scripts"
+        scripts.mkdir(parents=True)
+        (scripts / f"{name.lower()}.py").write_text(body, encoding="utf-8")
+    return tmp_path
+
+
+def _by_name(results):
+    return {r["name"]: r for r in results}
+
+
+def test_checks_run_isolated_in_parallel_with_timeouts(eden):
+    start = time.perf_counter()
+    results = _by_name(eden_doctor.run_doctor(eden_discovery.discover(), jobs=5, timeout=2))
+    assert time.perf_counter() - start < 8
+    assert results["Alpha"]["status"] == "ok" and results["Alpha"]["describe"] and results["Alpha"]["healthcheck"]
+    assert results["Alpha"]["notes"] == ["fine"]
+    assert results["Bravo"]["status"] == "warn" and results["Bravo"]["notes"] == ["disk low"]
+    assert results["Hang"]["status"] == "fail" and results["Hang"]["timeout"]
+    assert results["Crash"]["status"] == "warn" and results["Crash"]["crashed"]
+    assert results["Broken"]["status"] == "warn" and "bad config" in results["Broken"]["notes"][0]
+    assert results["Threads"]["status"] == "ok"  # a lingering non-daemon thread doesn't block
+
+
+def test_subprocess_fallback(eden):
+    scripts = eden / "daemons"
+    ok = eden_doctor.run_check("Bravo", str(scripts / "Bravo" / "scripts" / "bravo.py"), timeout=10)
+    assert ok["status"] == "warn" and ok["notes"] == ["disk low"]
+    hung = eden_doctor.run_check("Hang", str(scripts / "Hang" / "scripts" / "hang.py"), timeout=1)
+    assert hung["timeout"] and hung["seconds"] < 5
+
+
+def test_cache_is_keyed_by_source_mtime(eden):
+    infos = [i for i in eden_discovery.discover() if i.name != "Hang"]
+    eden_doctor.run_doctor(infos, timeout=5)
+    warm = _by_name(eden_doctor.run_doctor(infos, timeout=5))
+    assert {n for n, r in warm.items() if r["cached"]} == {"Alpha", "Bravo", "Broken", "Threads"}
+
+    helper = eden / "daemons" / "Alpha" / "scripts" / "helper.py"
+    helper.write_text("X = 1\n", encoding="utf-8")
+    st = helper.stat()
+    os.utime(helper, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    again = _by_name(eden_doctor.run_doctor(infos, timeout=5))
+    assert not again["Alpha"]["cached"] and again["Bravo"]["cached"]
+    assert not any(r["cached"] for r in eden_doctor.run_doctor(infos, timeout=5, use_cache=False))
+
+
+def test_reports(eden, tmp_path, capsys):
+    out = tmp_path / "doctor.xml"
+    eden_daemon.main(["doctor", "--timeout", "2", "--format", "junit", "--output", str(out), "--no-cache"])
+    table = capsys.readouterr().out
+    assert "Bravo" in table and "6 daemons checked" in table
+    suite = ET.parse(out).getroot()
+    assert suite.get("tests") == "6" and suite.get("failures") == "1"
+    failed = [c.get("name") for c in suite if c.find("failure") is not None]
+    assert failed == ["Hang"]
+
+    eden_daemon.main(["doctor", "--timeout", "2", "--format", "json", "--no-cache"])
+    data = json.loads(capsys.readouterr().out)
+    assert sorted(r["name"] for r in data["daemons"]) == sorted(SCRIPTS)
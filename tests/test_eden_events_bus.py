@@ -0,0 +1,114 @@
+"""Segmented events bus: rotation, incremental indexes and time/daemon queries."""
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_daemon, eden_events  # noqa: E402
+from shared.Daemon_tools.scripts.eden_paths import events_bus_path, events_segments_dir  # noqa: E402
+
+
+@pytest.fixture
+def bus(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    monkeypatch.setattr(eden_events, "BLOCK_BYTES", 512)
+    return events_bus_path()
+
+
+def _write(path: Path, events) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e) + "\n")
+
+
+def _events(day: str, n: int, daemons=("Ranger", "Tidbit")):
+    base = datetime.fromisoformat(day)
+    return [
+        {"daemon": daemons[i % len(daemons)], "action": "scan", "target": str(i),
+         "outcome": "ok" if i % 3 else "error",
+         "timestamp": (base + timedelta(minutes=i)).isoformat(timespec="seconds")}
+        for i in range(n)
+    ]
+
+
+def _brute(events, since=None, daemon=None):
+    return [e for e in events
+            if (since is None or e["timestamp"] >= since)
+            and (daemon is None or e["daemon"].lower() == daemon.lower())]
+
+
+def test_rotation_seals_old_day(bus):
+    _write(bus, _events("2026-01-01", 5))
+    yesterday = datetime(2026, 1, 1, 12).timestamp()
+    os.utime(bus, (yesterday, yesterday))
+    assert eden_events.needs_rotation(bus, today=date(2026, 1, 2))
+    sealed = eden_events.rotate(bus)
+    assert sealed == events_segments_dir() / "events-2026-01-01-000.jsonl"
+    assert not bus.exists()
+    _write(bus, _events("2026-01-02", 3))
+    assert eden_events.segments() == [sealed, bus]
+
+
+def test_size_cap_triggers_rotation(bus, monkeypatch):
+    monkeypatch.setattr(eden_events, "segment_max_bytes", lambda: 1000)
+    _write(bus, _events(date.today().isoformat(), 20))
+    assert eden_events.needs_rotation(bus)
+    first = eden_events.rotate(bus)
+    _write(bus, _events(date.today().isoformat(), 20))
+    second = eden_events.rotate(bus)
+    assert first.name.endswith("-000.jsonl") and second.name.endswith("-001.jsonl")
+
+
+def test_queries_match_brute_force(bus):
+    old = _events("2026-01-01", 200) + _events("2026-01-02", 200, daemons=("Ranger", "Archive"))
+    seg = events_segments_dir() / "events-2026-01-01-000.jsonl"
+    _write(seg, old)
+    new = _events("2026-01-03", 100)
+    _write(bus, new)
+    everything = old + new
+
+    assert list(eden_events.iter_events()) == everything
+    since = "2026-01-02T01:30:00"
+    assert list(eden_events.iter_events(since=since)) == _brute(everything, since=since)
+    assert list(eden_events.iter_events(daemon="archive")) == _brute(everything, daemon="Archive")
+
+    idx = eden_events.index_segment(seg)
+    assert len(idx["blocks"]) > 2
+    assert idx["daemons"]["archive"][0] > 0
+
+    for s in (None, since, "2026-01-03T00:00:00"):
+        expected = {}
+        for e in _brute(everything, since=s):
+            key = (e["daemon"], e["outcome"])
+            expected[key] = expected.get(key, 0) + 1
+        assert eden_events.summarize(since=s) == expected
+
+
+def test_index_extends_incrementally_and_rebuilds_on_truncate(bus):
+    _write(bus, _events("2026-01-01", 10))
+    assert eden_events.index_segment(bus)["count"] == 10
+    with bus.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(_events("2026-01-01", 1)[0]) + "\n" + '{"daemon": "half')
+    assert eden_events.index_segment(bus)["count"] == 11
+    bus.write_text(json.dumps(_events("2026-01-05", 1)[0]) + "\n", encoding="utf-8")
+    idx = eden_events.index_segment(bus)
+    assert idx["count"] == 1 and idx["first_ts"].startswith("2026-01-05")
+
+
+def test_report_daily_and_since_flags(bus, capsys):
+    today = date.today().isoformat()
+    _write(events_segments_dir() / "events-2000-01-01-000.jsonl", _events("2000-01-01", 6))
+    _write(bus, _events(today, 4))
+    assert eden_daemon.main(["report", "--daily"]) == 0
+    assert "Total events: 4" in capsys.readouterr().out
+    assert eden_daemon.main(["report", "--since", "2000-01-01T00:03"]) == 0
+    assert "Total events: 7" in capsys.readouterr().out
+    assert eden_daemon.main(["tail", "--daemon", "tidbit", "-n", "1"]) == 0
+    assert capsys.readouterr().out.count("[Tidbit]") == 1
@@ -0,0 +1,145 @@
+"""Events bus follower: inotify/poll backends, rotation, truncation and filters."""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_daemon, eden_events, eden_events_tail  # noqa: E402
+from shared.Daemon_tools.scripts.eden_follow import EventFilter, Follower, event_level  # noqa: E402
+from shared.Daemon_tools.scripts.eden_paths import events_bus_path  # noqa: E402
+
+BACKENDS = ["poll"] + (["inotify"] if sys.platform.startswith("linux") else [])
+
+
+@pytest.fixture
+def bus(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    return events_bus_path()
+
+
+def _append(path: Path, *events, raw: bytes = b"") -> None:
+    with path.open("ab") as f:
+        for e in events:
+            f.write(json.dumps(e).encode("utf-8") + b"\n")
+        f.write(raw)
+
+
+def _event(i, daemon="Ranger", outcome="ok"):
+    return {"daemon": daemon, "action": "scan", "target": str(i), "outcome": outcome,
+            "timestamp": "2026-01-01T00:00:00"}
+
+
+class _Collector:
+    def __init__(self, follower):
+        self.follower = follower
+        self.q = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        for e in self.follower.events():
+            self.q.put(e)
+
+    def take(self, n, timeout=5.0):
+        return [self.q.get(timeout=timeout)["target"] for _ in range(n)]
+
+    def stop(self):
+        self.follower.close()
+        self.thread.join(5)
+        assert not self.thread.is_alive()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_follow_appends_partial_lines_rotation_and_truncation(bus, backend):
+    _append(bus, _event("old"))
+    c = _Collector(Follower(bus, backend=backend, poll_interval=0.02))
+    assert c.follower.backend == backend
+    time.sleep(0.05)
+
+    _append(bus, _event(1), raw=b'{"daemon": "Ranger", "target": "2"')
+    assert c.take(1) == ["1"]
+    _append(bus, raw=b', "outcome": "ok"}\n')
+    assert c.take(1) == ["2"]
+
+    _append(bus, _event(3))
+    eden_events.rotate(bus)
+    _append(bus, _event(4))
+    assert c.take(2) == ["3", "4"]
+    assert c.follower.rotations == 1
+
+    bus.write_bytes(b"")
+    time.sleep(0.1)
+    _append(bus, _event(5))
+    assert c.take(1) == ["5"]
+    c.stop()
+
+
+@pytest.mark.skipif("inotify" not in BACKENDS, reason="inotify is Linux-only")
+def test_inotify_wakes_within_milliseconds_and_ignores_other_files(bus):
+    c = _Collector(Follower(bus, backend="inotify"))
+    time.sleep(0.05)
+    (bus.parent / "Ranger.log").write_text("noise\n", encoding="utf-8")
+    start = time.perf_counter()
+    _append(bus, _event("fast"))
+    assert c.take(1) == ["fast"]
+    assert time.perf_counter() - start < 0.1
+    c.stop()
+
+
+def test_filters_and_levels():
+    assert event_level({"outcome": "ok"}) == "info"
+    assert event_level({"outcome": "exit:2"}) == "error"
+    assert event_level({"outcome": "exit:0"}) == "info"
+    assert event_level({"outcome": "ok", "error": "boom"}) == "error"
+    assert event_level({"outcome": "ok", "level": "WARN"}) == "warning"
+
+    match = EventFilter(daemon="tidbit", level="warning")
+    assert match({"daemon": "Tidbit", "outcome": "error"})
+    assert not match({"daemon": "Tidbit", "outcome": "ok"})
+    assert not match({"daemon": "Ranger", "outcome": "error"})
+    assert not match.wants_line(b'{"daemon": "Ranger"}')
+    assert not EventFilter()
+    with pytest.raises(ValueError):
+        EventFilter(level="loud")
+
+
+def test_events_tail_cli_filters(bus, capsys):
+    _append(bus, _event(1), _event(2, outcome="error"), _event(3, daemon="Blaze", outcome="error"))
+    eden_events_tail.main(["--daemon", "ranger", "--level", "error"])
+    out = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["target"] for line in out] == ["2"]
+    eden_events_tail.main(["--outcome", "error"])
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+@pytest.mark.parametrize("lines", [None, 10])
+def test_tail_follow_hands_over_without_gap_or_repeat(bus, monkeypatch, capsys, lines):
+    _append(bus, _event(1), _event(2))
+
+    class Racing(Follower):
+        """Appends just before and just after opening, then yields one poll instead of blocking."""
+
+        def __init__(self, *args, **kwargs):
+            _append(bus, _event("before"))
+            super().__init__(*args, **kwargs)
+            _append(bus, _event("after"))
+
+        def __iter__(self):
+            yield from self.poll()
+            self._release()
+
+    monkeypatch.setattr(eden_daemon, "Follower", Racing)
+    args = argparse.Namespace(daemon=None, action=None, outcome=None, level=None, since=None, lines=lines,
+                              follow=True, poll=True)
+    eden_daemon.cmd_tail(args)
+    shown = [line.split(" -> ")[1].split(" ")[0] for line in capsys.readouterr().out.splitlines()]
+    assert shown == ["1", "2", "before", "after"]
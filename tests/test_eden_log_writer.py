@@ -0,0 +1,86 @@
+"""Batching log writer: ordering, flush triggers, fsync policy and drain on exit."""
+import json
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_log_writer, eden_safety  # noqa: E402
+
+
+@pytest.fixture
+def work(tmp_path, monkeypatch):
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    monkeypatch.setenv("EDEN_WORK_ROOT", str(tmp_path))
+    yield tmp_path / "daemons" / "_logs"
+    eden_safety.configure_logging("direct")
+
+
+def _lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_batch_mode_matches_direct_output(work):
+    eden_safety.log_event("Ranger", "scan", target="a", outcome="ok")
+    eden_safety.configure_logging("batch", interval=60)
+    for i in range(25):
+        eden_safety.log_event("Ranger" if i % 2 else "Tidbit", "scan", target=str(i), outcome="ok",
+                              extra={"n": i})
+    assert eden_log_writer.get_writer() is not None
+    eden_safety.configure_logging("direct")
+
+    bus = _lines(work / "events.jsonl")
+    assert [e["target"] for e in bus] == ["a"] + [str(i) for i in range(25)]
+    assert set(bus[0]) == {"daemon", "action", "target", "outcome", "timestamp"}
+    assert bus[3]["n"] == 2
+    assert len(_lines(work / "Tidbit.log")) == 13
+    assert len(_lines(work / "Ranger.log")) == 13
+
+
+def test_size_trigger_flushes_before_interval(work):
+    writer = eden_log_writer.start_writer(flush_at=10, interval=60)
+    for i in range(10):
+        eden_safety.log_event("Archive", "convert", target=str(i))
+    for _ in range(200):
+        if writer.stats["events"] == 10:
+            break
+        time.sleep(0.01)
+    assert writer.stats["events"] == 10
+    assert len(_lines(work / "events.jsonl")) == 10
+
+
+def test_full_queue_falls_back_to_sync_write(work):
+    writer = eden_log_writer.EventWriter(max_queue=2, flush_at=100, put_timeout=0)
+    for i in range(5):
+        writer.submit((None, "Ranger", "scan", str(i), "ok", None, None, 0.0))
+    # The third event finds the queue full and writes it, behind the two queued ahead of it.
+    assert writer.stats["sync_fallbacks"] == 1
+    assert [e["target"] for e in _lines(work / "events.jsonl")] == ["0", "1", "2"]
+    writer.close()
+    for log in ("events.jsonl", "Ranger.log"):
+        assert [e["target"] for e in _lines(work / log)] == ["0", "1", "2", "3", "4"]
+
+
+def test_invalid_fsync_policy_rejected():
+    with pytest.raises(ValueError):
+        eden_log_writer.EventWriter(fsync="sometimes")
+
+
+def test_queued_events_drain_at_exit(tmp_path):
+    script = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {str(ROOT)!r})
+        from shared.Daemon_tools.scripts import eden_safety
+        eden_safety.configure_logging("batch", interval=60, fsync="every")
+        for i in range(500):
+            eden_safety.log_event("Ranger", "scan", target=str(i))
+    """)
+    env = {"EDEN_ROOT": str(tmp_path), "EDEN_WORK_ROOT": str(tmp_path), "PATH": ""}
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+    assert len(_lines(tmp_path / "daemons" / "_logs" / "events.jsonl")) == 500
@@ -0,0 +1,56 @@
+"""eden_report_to_html: streamed, paginated pages that are only rewritten when their logs change."""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.Daemon_tools.scripts import eden_report_to_html as rep  # noqa: E402
+
+DAY1 = 1_700_000_000
+DAY2 = DAY1 + 86_400
+
+
+def _log(logs, name, agent, report, when):
+    path = logs / name
+    path.write_text(f"[AGENT]: {agent}\r\n[NOTE] x\n[REPORT] {report}\n", encoding="utf-8")
+    os.utime(path, (when, when))
+    return path
+
+
+def test_pages_match_legacy_and_update_incrementally(tmp_path, monkeypatch):
+    logs, out = tmp_path / "logs", tmp_path / "out"
+    logs.mkdir()
+    for i in range(5):
+        _log(logs, f"rhea_{i}.chaos", "Rhea", f"pass {i} <ok>", DAY1 if i < 3 else DAY2)
+    _log(logs, "codexa.chaos", "Codexa", "indexed", DAY2)
+    (logs / "bare.chaos").write_text("nothing here\n", encoding="utf-8")
+    os.utime(logs / "bare.chaos", (DAY1, DAY1))
+
+    monkeypatch.setattr(rep, "LOG_DIR", str(logs))
+    legacy, _ = rep.extract_data(rep.load_logs())
+    assert sorted((a, r, f) for a, r, f in legacy) == sorted(
+        (*rep.scan_log(str(logs / f)), f) for _, _, f in legacy
+    )
+
+    first = rep.render_report(str(logs), str(out), page_size=2)
+    assert first["logs_read"] == 7 and first["pages_written"] == 3 + 1 + 1 + 2 + 2  # Rhea, Codexa, Unknown, two days
+    rhea2 = (out / rep.page_path("by_daemon", "Rhea", 2)).read_text(encoding="utf-8")
+    assert "pass 2 &lt;ok&gt;" in rhea2 and "pass 3" in rhea2 and "pass 4" not in rhea2
+    assert "Page 2 of 3" in rhea2
+    index = (out / "index.html").read_text(encoding="utf-8")
+    assert "Rhea-0001.html" in index and "Unknown" in index
+
+    again = rep.render_report(str(logs), str(out), page_size=2)
+    assert again["logs_read"] == 0 and again["pages_written"] == 0
+
+    _log(logs, "codexa.chaos", "Codexa", "re-indexed!", DAY2)
+    changed = rep.render_report(str(logs), str(out), page_size=2)
+    assert changed["logs_read"] == 1 and changed["pages_written"] == 2  # Codexa page + its day page
+    assert "re-indexed!" in (out / rep.page_path("by_daemon", "Codexa", 1)).read_text(encoding="utf-8")
+
+    (logs / "codexa.chaos").unlink()
+    gone = rep.render_report(str(logs), str(out), page_size=2)
+    assert gone["logs_removed"] == 1 and gone["pages_removed"] == 2  # Codexa page, DAY2 page 2
+    assert not (out / rep.page_path("by_daemon", "Codexa", 1)).exists()
@@ -0,0 +1,90 @@
+"""Janvier content-addressed .chaos output: stable names, idempotent reruns, compaction."""
+import json
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def janvier(tmp_path, monkeypatch, load_daemon):
+    # Registered: workers unpickle _emit_batch by module name.
+    mod = load_daemon("daemons/Janvier/janvier.py", register=True,
+                      INPUT_DIR=tmp_path / "briar", OUTPUT_DIR=tmp_path / "janvier")
+    monkeypatch.setattr(sys.modules["eden_pool"], "PARALLEL_MIN_FILES", 0)
+    mod.INPUT_DIR.mkdir()
+    return mod
+
+
+def _transcript(title, date, text):
+    return f"--- Conversation: {title} ({date}) ---\n\n[DREAMBEARER] {text}\n[KIN] reply to {text}\n"
+
+
+def _outputs(janvier):
+    return {p.name: p.stat().st_mtime_ns for p in janvier.OUTPUT_DIR.glob("*.chaos")}
+
+
+def test_names_follow_source_content_and_reruns_write_nothing(janvier, capsys):
+    src = janvier.INPUT_DIR
+    for i in range(6):
+        (src / f"{i:03d}_talk.txt").write_text(_transcript(f"Talk {i}", "2024-03-0%d" % (i + 1), f"hi {i}"),
+                                               encoding="utf-8")
+    (src / "twin.txt").write_bytes((src / "000_talk.txt").read_bytes())
+    (src / "nodate.txt").write_text("--- Conversation: Loose ---\n\n[KIN] no date here\n", encoding="utf-8")
+
+    janvier.main(["--jobs", "3"])
+    first = _outputs(janvier)
+    assert len(first) == 7  # the twin shares 000_talk's file
+    digest = janvier.hashlib.sha256((src / "000_talk.txt").read_bytes()).hexdigest()
+    assert f"2024-03-01_Talk 0.{digest[:12]}.v{janvier.STAGE_VERSION}.chaos" in first
+    loose = [n for n in first if n.startswith("undated_Untitled.")]
+    chaos = json.loads((janvier.OUTPUT_DIR / loose[0]).read_text(encoding="utf-8"))
+    assert chaos["date"] == "undated" and chaos["nodes"][0]["timestamp"] is None
+
+    capsys.readouterr()
+    janvier.main(["--jobs", "1"])
+    assert "manifest: 8 reused, 0 rebuilt" in capsys.readouterr().out
+    janvier.main(["--force", "--jobs", "3"])
+    assert set(_outputs(janvier)) == set(first)
+
+    # Removing one twin keeps the file the other still records.
+    (src / "twin.txt").unlink()
+    janvier.main([])
+    assert set(_outputs(janvier)) == set(first)
+    (src / "000_talk.txt").write_text(_transcript("Talk 0", "2024-03-01", "edited"), encoding="utf-8")
+    janvier.main([])
+    now = _outputs(janvier)
+    assert len(now) == 7 and f"2024-03-01_Talk 0.{digest[:12]}.v{janvier.STAGE_VERSION}.chaos" not in now
+
+
+def test_stage_version_bump_rewrites_every_output(janvier, monkeypatch, capsys):
+    for i in range(3):
+        (janvier.INPUT_DIR / f"{i}.txt").write_text(_transcript(f"Talk {i}", "2024-03-01", f"hi {i}"),
+                                                    encoding="utf-8")
+    janvier.main([])
+    old = _outputs(janvier)
+    monkeypatch.setattr(janvier, "STAGE_VERSION", "next")
+    capsys.readouterr()
+    janvier.main([])
+    assert "(3 written, 0 already on disk)" in capsys.readouterr().out
+    now = _outputs(janvier)
+    assert len(now) == 3 and not set(now) & set(old) and all(n.endswith(".vnext.chaos") for n in now)
+
+
+def test_compact_removes_historical_duplicates(janvier, capsys):
+    (janvier.INPUT_DIR / "a.txt").write_text(_transcript("Alpha", "2024-01-02", "hello"), encoding="utf-8")
+    janvier.main([])
+    (current,) = _outputs(janvier)
+    body = json.loads((janvier.OUTPUT_DIR / current).read_text(encoding="utf-8"))
+
+    # Copies an older Janvier left behind: wall-clock node timestamps, timestamped names.
+    for n, stamp in enumerate(("20240105_101010", "20240106_090909")):
+        old = dict(body, nodes=[dict(node, timestamp=f"2024-01-0{5 + n}T10:00:00") for node in body["nodes"]])
+        (janvier.OUTPUT_DIR / f"2024-01-02_{stamp}_Alpha.chaos").write_text(json.dumps(old), encoding="utf-8")
+    (janvier.OUTPUT_DIR / "2024-01-02_20240105_101010_Beta.chaos").write_text(
+        json.dumps(dict(body, title="Beta")), encoding="utf-8")
+
+    janvier.main(["--compact", "--dry-run"])
+    assert "Would remove 2 duplicate .chaos files" in capsys.readouterr().out
+    assert len(_outputs(janvier)) == 4
+    janvier.main(["--compact"])
+    assert sorted(_outputs(janvier)) == ["2024-01-02_20240105_101010_Beta.chaos", current]
@@ -0,0 +1,110 @@
+"""Ranger ask() answer cache against a local stub LLM server."""
+import http.server
+import json
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("watchdog")
+pytest.importorskip("requests")
+
+LATENCY = 0.3
+
+
+class StubLLM(http.server.BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_POST(self):
+        type(self).calls += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(LATENCY)
+        question = body["messages"][-1]["content"].rsplit("Question: ", 1)[-1]
+        reply = {"choices": [{"message": {"content": f"answer #{type(self).calls} to {question}"}}]}
+        data = json.dumps(reply).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def llm_server():
+    StubLLM.calls = 0
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubLLM)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.fixture
+def ranger(tmp_path, monkeypatch, llm_server, load_daemon):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    mod = load_daemon("daemons/Ranger/scripts/ranger.py", DB_PATH=str(tmp_path / "ranger.db"),
+                      RHEA_INBOX=str(tmp_path / "inbox"), EDEN_LLM_BASE_URL=llm_server)
+    mod.init_db()
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name, text in {"logs.md": "the largest logs live in the archive folder",
+                       "garden.md": "garden notes about lanterns"}.items():
+        (docs / name).write_text(text, encoding="utf-8")
+        mod.upsert_file(str(docs / name))
+    yield mod
+    mod.close_db()
+
+
+def _timed_ask(ranger, q):
+    start = time.perf_counter()
+    answer = ranger.ask(q)
+    return answer, time.perf_counter() - start
+
+
+def test_repeat_and_near_identical_questions_hit_the_cache(ranger):
+    first, slow = _timed_ask(ranger, "Where are my largest logs?")
+    assert StubLLM.calls == 1 and slow >= LATENCY
+
+    for q in ("Where are my largest logs?", "where are the LARGEST logs", "largest logs"):
+        answer, fast = _timed_ask(ranger, q)
+        assert answer == first
+        assert fast < 0.05
+    assert StubLLM.calls == 1
+
+    ranger.ask("garden lanterns")
+    assert StubLLM.calls == 2
+
+
+def test_reindexing_a_cited_file_invalidates(ranger, tmp_path):
+    ranger.ask("largest logs")
+    ranger.ask("garden lanterns")
+    assert StubLLM.calls == 2
+
+    logs = tmp_path / "docs" / "logs.md"
+    logs.write_text("the largest logs moved to cold storage", encoding="utf-8")
+    os.utime(logs, (time.time() + 5, time.time() + 5))
+    ranger.upsert_file(str(logs))
+
+    assert "answer #3" in ranger.ask("largest logs")
+    ranger.ask("garden lanterns")  # cited only garden.md: still cached
+    assert StubLLM.calls == 3
+    with ranger.db() as cx:
+        assert cx.execute("SELECT COUNT(*) FROM answers").fetchone()[0] == 2
+
+
+def test_ttl_expiry_and_errors_are_not_cached(ranger, monkeypatch):
+    ranger.ask("largest logs")
+    monkeypatch.setattr(ranger, "ANSWER_TTL", 0.2)
+    time.sleep(0.3)
+    ranger.ask("largest logs")
+    assert StubLLM.calls == 2
+
+    monkeypatch.setattr(ranger, "EDEN_LLM_BASE_URL", "http://127.0.0.1:9/v1")
+    assert ranger.ask("garden lanterns").startswith("(LLM error")
+    with ranger.db() as cx:
+        assert cx.execute("SELECT COUNT(*) FROM answers WHERE answer LIKE '(LLM error%'").fetchone()[0] == 0
@@ -0,0 +1,97 @@
+"""Ranger catalog: persistent connections, batched writer and skip-unchanged indexing."""
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("watchdog")
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def ranger(tmp_path, monkeypatch, load_daemon):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("EDEN_ROOT", str(tmp_path))
+    mod = load_daemon("daemons/Ranger/scripts/ranger.py", DB_PATH=str(tmp_path / "ranger.db"),
+                      RHEA_INBOX=str(tmp_path / "inbox"))
+    mod.init_db()
+    yield mod
+    mod.stop_writer()
+    mod.close_db()
+
+
+def _tree(base: Path, n: int) -> Path:
+    for i in range(n):
+        d = base / f"d{i % 5}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"note{i}.md").write_text(f"lantern note {i} alpha{i}", encoding="utf-8")
+    return base
+
+
+def _search(ranger, term):
+    with ranger.db() as cx:
+        return [r[0] for r in cx.execute("SELECT path FROM filetext WHERE filetext MATCH ?", (term,))]
+
+
+def test_crawl_then_recrawl_skips_unchanged(ranger, tmp_path):
+    tree = _tree(tmp_path / "tree", 40)
+    ranger._initial_crawl([str(tree)])
+    stats = ranger._WRITER.stats
+    assert stats["reindexed"] == 40 and len(_search(ranger, "lantern")) == 40
+
+    ranger._initial_crawl([str(tree)])
+    assert stats["unchanged"] == 40 and stats["reindexed"] == 40
+
+    touched = tree / "d0" / "note0.md"
+    os.utime(touched, (time.time() + 5, time.time() + 5))
+    edited = tree / "d1" / "note1.md"
+    edited.write_text("ember rewritten", encoding="utf-8")
+    os.utime(edited, (time.time() + 5, time.time() + 5))
+    ranger._initial_crawl([str(tree)])
+    assert stats["meta_only"] == 1 and stats["reindexed"] == 41
+    assert _search(ranger, "ember") == [str(edited)]
+    assert _search(ranger, "alpha1") == []
+
+
+def test_writer_coalesces_event_burst(ranger, tmp_path):
+    tree = _tree(tmp_path / "tree", 50)
+    files = sorted(str(p) for p in tree.rglob("*.md"))
+    writer = ranger.start_writer(batch_size=10_000, interval=0.5)
+    for _ in range(20):
+        for f in files:
+            writer.upsert(f)
+            ranger.log_event("modified", f)
+    writer.remove(files[0])
+    assert writer.flush(timeout=30)
+    with ranger.db() as cx:
+        assert cx.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 49
+        assert cx.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1000
+    assert writer.stats["reindexed"] == 49 and writer.stats["batches"] <= 3
+    assert str(files[0]) not in _search(ranger, "lantern")
+
+
+def test_connection_is_reused_per_thread(ranger):
+    assert ranger.db() is ranger.db()
+
+
+def test_v0_database_is_migrated_to_rowid_keyed_fts(tmp_path, ranger):
+    old = tmp_path / "old.db"
+    cx = sqlite3.connect(old)
+    cx.executescript("""
+    CREATE TABLE files(id INTEGER PRIMARY KEY, path TEXT UNIQUE, name TEXT, ext TEXT,
+                       size INTEGER, mtime REAL, sha1 TEXT, tags TEXT);
+    CREATE VIRTUAL TABLE filetext USING fts5(path, content, tokenize='porter');
+    INSERT INTO files(id, path) VALUES (7, '/a.md'), (9, '/b.md');
+    INSERT INTO filetext(rowid, path, content) VALUES (1, '/b.md', 'beta words'), (2, '/a.md', 'alpha words');
+    """)
+    cx.commit()
+    cx.close()
+    ranger.close_db()
+    ranger.DB_PATH = str(old)
+    ranger.init_db()
+    with ranger.db() as cx:
+        assert dict(cx.execute("SELECT path, rowid FROM filetext")) == {"/a.md": 7, "/b.md": 9}
+    ranger.remove_file("/a.md")
+    assert _search(ranger, "words") == ["/b.md"]
@@ -0,0 +1,86 @@
+"""Emergency boot scan engine: one pass for sizes, cache candidates and the repair plan."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_emergency_boot as eb  # noqa: E402
+
+
+def _file(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "triage"
+    _file(root / "big" / "a.bin", 1000)
+    _file(root / "big" / "node_modules" / "x.js", 5000)      # excluded below the top level
+    _file(root / "big" / "build" / "o.txt", 10)
+    _file(root / "big" / "build" / "node_modules" / "y.js", 7)
+    _file(root / "node_modules" / "pkg" / "index.js", 300)   # top-level items always count
+    _file(root / "note.md", 50)
+    _file(root / "misc" / "stray.py", 20)
+    _file(root / "misc" / "x.chaos", 5)
+    _file(root / "misc" / "photo.PNG", 5)
+    _file(root / "misc" / ".m2" / "repository" / "lib.jar", 70)
+    _file(root / "misc" / "__pycache__" / "m.pyc", 3)
+    _file(root / "daemons" / "keep.py", 1)
+    _file(root / "venv" / "lib" / "mod.py", 2)
+    return root
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_single_pass_report(tree, workers):
+    rules = eb.DEFAULT_RULES
+    report = eb.scan_tree(tree, rules, purge=True, workers=workers)
+    assert report.complete and report.errors == 0
+    assert report.sizes == {
+        str(tree / "big"): 1010, str(tree / "node_modules"): 300, str(tree / "note.md"): 50,
+        str(tree / "misc"): 30, str(tree / "daemons"): 1, str(tree / "venv"): 2,
+    }
+    assert report.top(2) == [(str(tree / "big"), 1010), (str(tree / "node_modules"), 300)]
+    assert sorted(report.purge) == sorted(str(tree / p) for p in (
+        "big/node_modules", "big/build", "node_modules", "misc/.m2/repository", "misc/__pycache__"))
+
+    moves = {Path(op.src).relative_to(tree).as_posix(): Path(op.dst).relative_to(eb.ROOT).as_posix()
+             for op in report.moves}
+    assert moves == {
+        "note.md": "_docs/_inbox/triage/note.md",
+        "misc/stray.py": "daemons/Unsorted/misc/stray.py",
+        "misc/x.chaos": "EchoTree/_inbox_chaos/misc/x.chaos",   # ".chaos*" is a glob
+        "misc/photo.PNG": "_assets/_inbox/misc/photo.PNG",
+    }
+    # without a purge the cache dirs stay, so their files are planned like any other
+    planned = eb.plan_repairs(tree, rules)
+    assert [Path(op.src).relative_to(tree).as_posix() for op in planned if op not in report.moves] \
+        == ["big/build/o.txt"]
+    assert eb.top_heavy(tree, 1) == [(str(tree / "big"), 1010)]
+    assert eb.dir_size(tree / "big") == 1010
+
+
+def test_budget_returns_partial_results_and_streams(tree):
+    seen = []
+    report = eb.scan_tree(tree, purge=True, workers=1, max_entries=5, progress=seen.append, progress_every=0)
+    assert not report.complete and report.pending > 0
+    assert seen and seen[-1] is report
+    # breadth-first: every top-level item is already listed
+    assert set(report.sizes) == {str(p) for p in tree.iterdir()}
+
+
+def test_no_moves_planned_inside_purged_dirs(tree):
+    report = eb.scan_tree(tree, purge=True, workers=1)
+    hits = eb.purge_caches(tree, eb.DEFAULT_RULES, apply=True, hits=report.purge)
+    assert str(tree / "big" / "build") in hits and not (tree / "big" / "build").exists()
+    assert report.moves and all(Path(op.src).exists() for op in report.moves)
+
+
+def test_purge_apply_removes_only_candidates(tree):
+    hits = eb.purge_caches(tree, eb.DEFAULT_RULES, apply=True)
+    assert len(hits) == 5 and not (tree / "misc" / "__pycache__").exists()
+    assert (tree / "misc" / "stray.py").exists() and (tree / "big" / "a.bin").exists()
@@ -0,0 +1,193 @@
+"""Rhea scheduler engine driven by a simulated clock."""
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+from rhea_scheduler import Cron, Daily, Interval, Scheduler, Task, load_tasks_yaml, parse_schedule  # noqa: E402
+
+START = datetime(2026, 1, 5, 12, 0).timestamp()  # a Monday
+
+
+class SimClock:
+    def __init__(self, t: float = START):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
+
+class FakeRun:
+    """Process stand-in that finishes once the sim clock passes ``done_at``."""
+
+    def __init__(self, clock: SimClock, duration: float):
+        self.clock = clock
+        self.done_at = clock.t + duration
+
+    def poll(self):
+        return 0 if self.clock.t >= self.done_at else None
+
+
+def _launcher(clock, log, duration=0.0):
+    def launch(task):
+        log.append((task.name, clock.t))
+        return FakeRun(clock, duration)
+    return launch
+
+
+def test_parse_schedule_variants():
+    assert parse_schedule({"every_minutes": 30}) == Interval(1800)
+    assert parse_schedule({"schedule": "every 2h"}) == Interval(7200)
+    assert isinstance(parse_schedule({"at": "2025-08-27 08:30"}), Daily)
+    assert isinstance(parse_schedule({"schedule": "*/15 9-17 * * 1-5"}), Cron)
+    assert parse_schedule({"name": "manual"}) is None
+    with pytest.raises(ValueError):
+        parse_schedule({"schedule": "61 * * * *"})
+
+
+def test_cron_next_after():
+    cron = Cron.parse("*/15 9-17 * * 1-5")
+    saturday = datetime(2026, 1, 10, 8, 0).timestamp()
+    assert datetime.fromtimestamp(cron.next_after(saturday)) == datetime(2026, 1, 12, 9, 0)
+    assert datetime.fromtimestamp(cron.next_after(START)) == datetime(2026, 1, 5, 12, 15)
+
+
+def test_daily_at_respects_anchor_date():
+    sched = parse_schedule({"at": "2026-01-07 08:30"})
+    assert datetime.fromtimestamp(sched.next_after(START)) == datetime(2026, 1, 7, 8, 30)
+    assert datetime.fromtimestamp(sched.next_after(sched.next_after(START))) == datetime(2026, 1, 8, 8, 30)
+
+
+def test_fires_in_order_with_team_cap():
+    clock, log = SimClock(), []
+    tasks = [Task("a", Interval(600), team="T"), Task("b", Interval(600), team="T"), Task("c", Interval(600), team="U")]
+    sched = Scheduler(tasks, _launcher(clock, log, duration=90), clock=clock, max_per_team=1)
+    clock.advance(600)
+    sched.tick()
+    assert sorted(n for n, _ in log) == ["a", "c"]
+    assert sched.running_count("T") == 1 and sched.stats["deferred"] == 1
+    clock.advance(90)
+    sched.tick()
+    assert [n for n, _ in log][2:] == ["b"]
+
+
+def test_jitter_stays_within_bound_and_does_not_drift():
+    clock, log = SimClock(), []
+    sched = Scheduler([Task("j", Interval(600), jitter=30)], _launcher(clock, log), clock=clock,
+                      rng=random.Random(7))
+    for _ in range(6 * 60 + 5):
+        clock.advance(10)
+        sched.tick()
+    nominal = [Interval(600).next_after(START) + 600 * i for i in range(len(log))]
+    assert len(log) == 6
+    assert all(0 <= t - n <= 40 for (_, t), n in zip(log, nominal))
+
+
+def test_jitter_beyond_grace_is_not_a_misfire():
+    clock, log = SimClock(), []
+    sched = Scheduler([Task("h", Interval(3600), jitter=600)], _launcher(clock, log), clock=clock,
+                      misfire="skip", misfire_grace=60, rng=random.Random(3))
+    for _ in range(24 * 60 + 15):
+        clock.advance(60)
+        sched.tick()
+    assert len(log) == 24 and sched.stats["skipped"] == 0
+
+
+@pytest.mark.parametrize("policy,expected", [("skip", 0), ("once", 1), ("all", 5)])
+def test_misfire_policies(policy, expected):
+    clock, log = SimClock(), []
+    sched = Scheduler([Task("m", Interval(60))], _launcher(clock, log), clock=clock, misfire=policy,
+                      misfire_grace=5, max_per_team=10)
+    clock.advance(60 * 5 + 30)  # the machine slept through five fires
+    sched.tick()
+    assert len(log) == expected
+    assert sched.state["m"]["next_fire"] > clock.t
+
+
+def test_restart_neither_refires_nor_loses_runs(tmp_path):
+    state = tmp_path / "state.jsonl"
+    clock, log = SimClock(), []
+    tasks = [Task("hourly", Interval(3600)), Task("quarter", Interval(900))]
+    sched = Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state)
+    clock.advance(3600)
+    sched.tick()
+    fired = len(log)
+    assert fired == 2
+
+    # Restart immediately: nothing is due again.
+    again = Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state)
+    again.tick()
+    assert len(log) == fired
+
+    # Down for 40 minutes: the missed quarter-hour run is caught up once.
+    clock.advance(40 * 60)
+    later = Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state, misfire="once")
+    later.tick()
+    assert [n for n, _ in log[fired:]] == ["quarter"]
+
+
+
+def test_restart_requeues_runs_waiting_for_a_slot(tmp_path):
+    state = tmp_path / "state.jsonl"
+    clock, log = SimClock(), []
+    tasks = [Task("a", Interval(600), team="T"), Task("b", Interval(600), team="T")]
+    sched = Scheduler(tasks, _launcher(clock, log, duration=300), clock=clock, state_path=state)
+    clock.advance(600)
+    sched.tick()
+    assert [n for n, _ in log] == ["a"] and sched.state["b"]["pending"] == 1
+    assert sched.state["b"]["last_run"] is None  # deferred, not run
+
+    # Stopped while "b" waits; the next process starts it instead of dropping it.
+    clock.advance(60)
+    again = Scheduler(tasks, _launcher(clock, log, duration=300), clock=clock, state_path=state)
+    again.tick()
+    assert [n for n, _ in log] == ["a", "b"]
+    assert again.state["b"] == {"last_run": clock.t, "next_fire": START + 1200, "pending": 0}
+    third = Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state)
+    third.tick()
+    assert len(log) == 2
+
+
+def test_journal_is_compacted_while_running(tmp_path):
+    state = tmp_path / "state.jsonl"
+    clock, log = SimClock(), []
+    tasks = [Task("q", Interval(60)), Task("r", Interval(90))]
+    sched = Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state, max_per_team=5)
+    for _ in range(24 * 60 + 15):
+        clock.advance(60)
+        sched.tick()
+    assert len(log) > 2000
+    assert len(state.read_text(encoding="utf-8").splitlines()) <= 2 * len(tasks) + len(tasks)
+    assert Scheduler(tasks, _launcher(clock, log), clock=clock, state_path=state).state == sched.state
+
+
+def test_repo_tasks_yaml_loads():
+    tasks = load_tasks_yaml(ROOT / "daemons" / "Rhea" / "scripts" / "configs" / "tasks.yaml")
+    assert len(tasks) > 10
+    assert {t.key for t in tasks} >= {"Sovereignty", "LabelQuill", "Tempest"}
+
+
+def test_ten_thousand_tasks_sub_millisecond_tick(tmp_path):
+    rng = random.Random(1)
+    clock, fired = SimClock(), []
+    tasks = [Task(f"t{i}", Interval(60 * rng.randint(5, 240)), team=f"team{i % 200}", jitter=rng.random() * 30)
+             for i in range(10_000)]
+    sched = Scheduler(tasks, lambda t: fired.append(t.name), clock=clock, max_per_team=50,
+                      state_path=tmp_path / "state.jsonl", rng=rng)
+    ticks = 6 * 3600  # six simulated hours at one tick per second
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        clock.advance(1)
+        sched.tick()
+    per_tick = (time.perf_counter() - t0) / ticks
+    assert len(fired) > 10_000
+    assert per_tick < 1e-3, f"{per_tick * 1e6:.0f}µs per tick"
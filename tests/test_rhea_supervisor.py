@@ -0,0 +1,102 @@
+"""Rhea supervisor: detached process, batched control requests, restarts with backoff, adoption."""
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_supervisor as rs  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc and Unix sockets")
+
+SLEEPER = [sys.executable, "-c", "import time\nwhile True: time.sleep(1)"]
+
+
+def _wait(pred, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = pred()
+        if value:
+            return value
+        time.sleep(0.05)
+    raise AssertionError("timed out")
+
+
+def _status(client):
+    return {c["name"]: c for c in client.request("status")["children"]}
+
+
+@pytest.fixture
+def supervisor(tmp_path):
+    client = rs.ensure_supervisor(tmp_path / "sup")
+    yield client
+    if client.alive():
+        client.request("shutdown")
+    _wait(lambda: not (tmp_path / "sup" / rs.PID_FILE).exists())
+
+
+def test_backoff_and_policies():
+    assert [rs.backoff_delay(n) for n in range(6)] == [0.0, 0.5, 1.0, 2.0, 4.0, 8.0]
+    assert rs.backoff_delay(50) == rs.BACKOFF_MAX
+    assert rs.should_restart("on-failure", 1) and not rs.should_restart("on-failure", 0)
+    assert rs.should_restart("always", 0) and not rs.should_restart("never", 1)
+
+
+def test_team_start_stop_restart_and_sampling(supervisor, tmp_path):
+    specs = [{"name": f"d{i}", "argv": SLEEPER, "cwd": str(tmp_path)} for i in range(4)]
+    specs.append({"name": "flaky", "argv": [sys.executable, "-c", "raise SystemExit(3)"], "cwd": str(tmp_path)})
+    results = supervisor.request("start", specs=specs)["results"]
+    assert set(results.values()) == {"started"}
+    assert supervisor.request("start", specs=specs[:1])["results"] == {"d0": "already running"}
+
+    first = _status(supervisor)["d1"]
+    os.kill(first["pid"], signal.SIGKILL)
+    restarted = _wait(lambda: (s := _status(supervisor)["d1"])["pid"] not in (None, first["pid"]) and s)
+    assert restarted["restarts"] == 1 and restarted["last_exit"] == -signal.SIGKILL
+    assert restarted["restart_latency"] < rs.BACKOFF_BASE + 0.5
+
+    flaky = _wait(lambda: (s := _status(supervisor)["flaky"])["restarts"] >= 3 and s)
+    assert flaky["last_exit"] == 3  # 0.5 + 1 + 2 s of backoff so far, still retrying
+
+    sampled = _wait(lambda: (s := _status(supervisor)["d0"])["rss_kb"] and s["cpu_percent"] is not None and s,
+                    timeout=3 * rs.SAMPLE_INTERVAL + 2)
+    assert sampled["rss_kb"] > 1000
+
+    pids = [c["pid"] for c in _status(supervisor).values() if c["name"].startswith("d")]
+    stopped = supervisor.request("stop", names=["d0", "d1", "d2", "d3", "flaky"])["results"]
+    assert stopped["d0"] == "stopped"
+    assert not any(rs._pid_alive(p) and rs.proc_start_ticks(p) for p in pids)
+    assert {c["state"] for c in _status(supervisor).values()} == {"stopped"}
+
+
+def test_new_supervisor_adopts_running_children(supervisor, tmp_path):
+    supervisor.request("start", specs=[{"name": "keep", "argv": SLEEPER, "cwd": str(tmp_path)}])
+    pid = _status(supervisor)["keep"]["pid"]
+    supervisor.request("shutdown", keep_children=True)
+    _wait(lambda: not (tmp_path / "sup" / rs.PID_FILE).exists())
+    assert rs._pid_alive(pid)
+
+    client = rs.ensure_supervisor(tmp_path / "sup")
+    adopted = _status(client)["keep"]
+    assert adopted["pid"] == pid and adopted["state"] == "running"
+    client.request("stop", names=["keep"])
+    _wait(lambda: not rs.proc_start_ticks(pid))
+
+
+def test_shutdown_kills_children_that_ignore_sigterm(supervisor, tmp_path):
+    stubborn = [sys.executable, "-c",
+                "import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\nwhile True: time.sleep(1)"]
+    supervisor.request("start", specs=[{"name": "stubborn", "argv": stubborn, "cwd": str(tmp_path)}])
+    pid = _status(supervisor)["stubborn"]["pid"]
+    time.sleep(0.5)  # let it install the handler
+    supervisor.request("shutdown")
+    _wait(lambda: not (tmp_path / "sup" / rs.PID_FILE).exists(), timeout=3 * rs.STOP_GRACE)
+    assert not rs.proc_start_ticks(pid)
+
+    client = rs.ensure_supervisor(tmp_path / "sup")
+    assert _status(client)["stubborn"]["state"] == "stopped"
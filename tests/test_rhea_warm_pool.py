@@ -0,0 +1,73 @@
+"""Rhea module cache and warm worker pool."""
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_main  # noqa: E402
+
+COUNTER = """
+import os
+CALLS = 0
+def describe():
+    return {"pid": os.getpid()}
+def healthcheck():
+    return {"status": "ok"}
+def run(payload=None, **kwargs):
+    global CALLS
+    CALLS += 1
+    if payload == "exit":
+        raise SystemExit(3)
+    return {"version": VERSION, "calls": CALLS, "payload": payload, "kwargs": sorted(kwargs)}
+"""
+
+
+def _daemon(tmp_path: Path, name: str = "Echo", version: int = 1) -> "rhea_main.DaemonInfo":
+    folder = tmp_path / name
+    folder.mkdir(exist_ok=True)
+    path = folder / f"{name.lower()}.py"
+    path.write_text(f"VERSION = {version}\n" + COUNTER, encoding="utf-8")
+    return rhea_main.DaemonInfo(name=name, path=folder, module_path=path)
+
+
+def _bump(path: Path, version: int) -> None:
+    path.write_text(f"VERSION = {version}\n" + COUNTER, encoding="utf-8")
+    os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+
+
+def test_in_process_cache_reuses_module_until_file_changes(tmp_path):
+    di = _daemon(tmp_path)
+    assert rhea_main.try_run_daemon(di)[1]["calls"] == 1
+    assert rhea_main.try_run_daemon(di)[1]["calls"] == 2
+
+    _bump(di.module_path, 2)
+    ok, res = rhea_main.try_run_daemon(di)
+    assert ok and res["version"] == 2 and res["calls"] == 1
+
+
+def test_pool_keeps_modules_warm_and_reloads_edits(tmp_path):
+    di = _daemon(tmp_path)
+    with rhea_main.WarmPool(2) as pool:
+        assert pool.request("run", di, "a", registry={})[1]["calls"] == 1
+        ok, res = rhea_main.try_run_daemon(di, payload="b", pool=pool, registry={})
+        assert ok and res == {"version": 1, "calls": 2, "payload": "b", "kwargs": ["registry"]}
+
+        _bump(di.module_path, 2)
+        ok, res = rhea_main.try_run_daemon(di, pool=pool)
+        assert ok and res["version"] == 2 and res["calls"] == 1
+
+
+def test_pool_survives_daemon_exit_and_probes_in_parallel(tmp_path):
+    daemons = [_daemon(tmp_path, f"D{i}") for i in range(6)]
+    with rhea_main.WarmPool(3) as pool:
+        ok, res = rhea_main.try_run_daemon(daemons[0], payload="exit", pool=pool)
+        assert not ok and "SystemExit" in res
+        assert rhea_main.try_run_daemon(daemons[0], pool=pool)[1]["calls"] == 2
+
+        probed = rhea_main.probe_all(daemons, pool)
+        assert all(d.health == {"status": "ok"} and d.run_callable for d in probed)
+        assert len({d.describe["pid"] for d in probed}) > 1
+        assert os.getpid() not in {d.describe["pid"] for d in probed}
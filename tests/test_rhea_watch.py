@@ -0,0 +1,165 @@
+"""Rhea watch engine: debounced batches, targeted re-parse, patches equal to a full reconcile."""
+import copy
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "daemons" / "Rhea" / "scripts"))
+
+import rhea_watch as rw  # noqa: E402
+
+
+def _daemon(root: Path, folder: str, name: str, team: str = "Alpha") -> Path:
+    path = root / folder / "scripts" / f"{name.lower()}.py"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f'"""\ndaemon:\n  name: {name}\n  team: {team}\n"""\nprint("hi")\n', encoding="utf-8")
+    return path
+
+
+def _empty_registry():
+    return {"daemons": {}, "teams": {}}
+
+
+def test_debouncer_coalesces_until_quiet():
+    now = [0.0]
+    d = rw.Debouncer(window=0.5, max_delay=3.0, clock=lambda: now[0])
+    for i in range(10):
+        d.add("a.py" if i % 2 else "b.py")
+        now[0] += 0.1
+    assert d.drain() == []
+    now[0] += 0.5
+    assert d.drain() == ["b.py", "a.py"] and d.drain() == []
+
+    # a storm that never goes quiet still flushes after max_delay
+    start = now[0]
+    for _ in range(40):
+        d.add("c.py")
+        now[0] += 0.1
+        if d.drain():
+            break
+    assert 3.0 - 1e-9 <= now[0] - start < 3.2
+
+
+def test_event_filtering():
+    ev = lambda kind, src, dest="", is_dir=False: SimpleNamespace(  # noqa: E731
+        event_type=kind, src_path=src, dest_path=dest, is_directory=is_dir)
+    assert rw.event_paths(ev("opened", "/d/a.py")) == []
+    assert rw.event_paths(ev("modified", "/d/a.py~")) == []
+    assert rw.event_paths(ev("moved", "/d/.a.py.swp", "/d/a.py")) == ["/d/a.py"]
+    assert rw.event_paths(ev("modified", "/d/Foo", is_dir=True)) == []
+    assert rw.event_paths(ev("deleted", "/d/Foo", is_dir=True)) == ["/d/Foo"]
+
+
+def test_targeted_patches_match_full_reconcile(tmp_path):
+    root = tmp_path / "daemons"
+    registry = root / "Rhea" / "configs" / "rhea_registry.json"
+    a = _daemon(root, "Ash", "Ash")
+    b = _daemon(root, "Birch", "Birch")
+    _daemon(root, "Cedar", "Cedar", team="Beta")
+    (root / "Cedar" / "logs").mkdir()
+    _daemon(root / "Cedar", "logs", "Hidden")
+
+    parsed = []
+    engine = rw.WatchEngine(root, registry, parse=lambda p, r: parsed.append(p.name) or rw.daemon_entry(p, r))
+    engine.prime(rw.discover_daemons(root))
+    assert sorted(engine.entries) == ["Ash", "Birch", "Cedar"]
+    reg, _ = rw.reconcile_registry(_empty_registry(), engine.entries, root)
+
+    def step(paths):
+        patch = engine.changes([str(p) for p in paths])
+        logs = rw.apply_patch(reg, patch, root)
+        full, _ = rw.reconcile_registry(copy.deepcopy(reg), rw.discover_daemons(root), root)
+        assert reg == full
+        return patch, logs
+
+    # re-saving a file without touching its header changes nothing
+    patch, logs = step([a, a, a])
+    assert not patch and logs == [] and parsed == ["ash.py"]
+
+    a.write_text(a.read_text().replace("team: Alpha", "team: Beta"))
+    patch, logs = step([a])
+    assert set(patch.upserts) == {"Ash"} and "~ synced team Beta members" in logs
+    assert reg["teams"]["Beta"]["members"] == ["Ash", "Cedar"]
+
+    # a manifest edit re-reads only that daemon's folder
+    parsed.clear()
+    (root / "Birch" / "configs").mkdir()
+    step([root / "Birch" / "configs" / "birch.daemon_profile.json"])
+    assert parsed == ["birch.py"]
+
+    b.unlink()
+    patch, logs = step([b])
+    assert patch.gone == {"Birch"} and logs[0] == "! disabled Birch (file missing)"
+
+    new = _daemon(root, "Dune", "Dune", team="Gamma")
+    patch, logs = step([new.parent.parent])  # folder moved in
+    assert "+ added daemon Dune" in logs and reg["teams"]["Gamma"]["members"] == ["Dune"]
+
+    assert not engine.changes([str(root / "Cedar" / "logs" / "scripts" / "hidden.py")])
+
+
+def test_own_registry_writes_are_ignored(tmp_path):
+    registry = tmp_path / "rhea_registry.json"
+    engine = rw.WatchEngine(tmp_path, registry)
+    registry.write_text("{}")
+    engine.note_saved()
+    assert not engine.changes([str(registry)])
+    registry.write_text('{"daemons": {}}')
+    assert engine.changes([str(registry)]).registry_edited
+
+
+def test_parse_cache_skips_unchanged_files(tmp_path):
+    root = tmp_path / "daemons"
+    a = _daemon(root, "Ash", "Ash")
+    _daemon(root, "Birch", "Birch")
+    (root / "Ash" / "scripts" / "helper.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "Ash" / "node_modules").mkdir()
+    _daemon(root / "Ash", "node_modules", "Vendored")
+    cache_path = tmp_path / "cache.json"
+
+    cold = rw.ParseCache(cache_path, root)
+    found = rw.discover_daemons(root, cold)
+    assert sorted(found) == ["Ash", "Birch"] and cold.parsed == 3
+    assert found == rw.discover_daemons(root)
+
+    warm = rw.ParseCache(cache_path, root)
+    assert rw.discover_daemons(root, warm) == found and (warm.hits, warm.parsed) == (3, 0)
+
+    a.touch()
+    os.utime(a, ns=(a.stat().st_atime_ns, a.stat().st_mtime_ns + 10**9))
+    touched = rw.ParseCache(cache_path, root)
+    rw.discover_daemons(root, touched)
+    assert (touched.rehashed, touched.parsed) == (1, 0)
+
+    a.write_text(a.read_text(encoding="utf-8").replace("team: Alpha", "team: Omega"), encoding="utf-8")
+    (root / "Ash" / "scripts" / "helper.py").unlink()
+    edited = rw.ParseCache(cache_path, root)
+    assert rw.discover_daemons(root, edited)["Ash"]["team"] == "Omega" and edited.parsed == 1
+    assert len(rw.ParseCache(cache_path, root).files) == 2
+
+
+def test_incremental_validator_checks_changed_entries(tmp_path):
+    pytest.importorskip("jsonschema")
+    entry = {"type": "object", "required": ["name", "team"], "properties": {"team": {"type": "string"}}}
+    schema = {"type": "object", "required": ["daemons"],
+              "properties": {"daemons": {"type": "object", "additionalProperties": entry},
+                             "teams": {"type": "object"}}}
+    reg = {"daemons": {f"d{i}": {"name": f"d{i}", "team": "A"} for i in range(50)}, "teams": {}}
+    state = tmp_path / "validated.json"
+
+    v = rw.IncrementalValidator(schema, state)
+    assert v.errors(reg) == [] and v.checked == 50
+    v = rw.IncrementalValidator(schema, state)
+    reg["daemons"]["d7"]["team"] = 3
+    errors = v.errors(reg)
+    assert v.checked == 1 and [list(e.path) for e in errors] == [["daemons", "d7", "team"]]
+    reg["daemons"]["d7"]["team"] = "B"
+    reg["teams"] = []
+    assert [list(e.path) for e in v.errors(reg)] == [["teams"]]
+    reg["teams"] = {}
+    assert v.errors(reg) == [] and v.checked == 1
+    assert rw.IncrementalValidator({**schema, "title": "v2"}, state).digests == {}
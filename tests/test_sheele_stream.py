@@ -0,0 +1,111 @@
+"""Sheele streaming ingest of conversations.json."""
+import copy
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def sheele(tmp_path, load_daemon):
+    return load_daemon("daemons/Sheele/sheele.py", OUTPUT_DIR=str(tmp_path / "out"))
+
+
+def _outputs(out_dir: Path):
+    return {p.name: json.loads(p.read_text(encoding="utf-8")) for p in out_dir.glob("*.json")}
+
+
+def test_stream_ingest_matches_in_memory_split(sheele, tmp_path, monkeypatch):
+    entries = [{"id": f"c{i}", "title": f"t{i}", "mapping": {"n": {"message": {"parts": ["hi" * i]}}}}
+               for i in range(30)]
+    entries.append({"id": "c3", "title": "replaced"})
+    entries.append({"title": "orphan", "messages": [{"text": "lost fragment"}]})
+    raw = tmp_path / "conversations.json"
+    raw.write_text(json.dumps(entries), encoding="utf-8")
+
+    grouped, fractures = sheele.group_by_conversation(entries)
+    grouped, expected_lost = sheele.try_assign_fractures(fractures, grouped)
+    sheele.save_conversations(grouped)
+    expected = _outputs(tmp_path / "out")
+
+    monkeypatch.setattr(sheele, "OUTPUT_DIR", str(tmp_path / "streamed"))
+    written, lost = sheele.stream_ingest(raw)
+    assert _outputs(tmp_path / "streamed") == expected
+    assert len(written) == 30 and lost == expected_lost
+
+    monkeypatch.setattr(sheele, "OUTPUT_DIR", str(tmp_path / "limited"))
+    written, _ = sheele.stream_ingest(raw, limit=5)
+    assert sorted(written) == [f"c{i}" for i in range(5)]
+    assert len(_outputs(tmp_path / "limited")) == 5
+
+
+def test_limit_caps_conversations_not_fragments(sheele, tmp_path, monkeypatch):
+    entries = [{"id": f"c{i}", "text": f"thread {i} talks about lantern number {i} by the river"}
+               for i in range(10)]
+    entries += [{"messages": [{"text": "thread 1 talks about lantern number 1"}]},
+                {"messages": [{"text": "thread 7 talks about lantern number 7"}]},
+                {"messages": [{"text": "zq"}]}]
+    raw = tmp_path / "conversations.json"
+    raw.write_text(json.dumps(entries), encoding="utf-8")
+
+    grouped, fractures = sheele.group_by_conversation(entries)
+    grouped, expected_lost = sheele.try_assign_fractures(fractures, grouped)
+    sheele.save_conversations(dict(list(grouped.items())[:3]))
+    expected = _outputs(tmp_path / "out")
+    assert len(expected_lost) == 1
+
+    monkeypatch.setattr(sheele, "OUTPUT_DIR", str(tmp_path / "streamed"))
+    written, lost = sheele.stream_ingest(raw, limit=3)
+    assert sorted(written) == ["c0", "c1", "c2"]
+    assert lost == expected_lost
+    assert _outputs(tmp_path / "streamed") == expected
+
+
+def test_stream_ingest_reassigns_fragments(sheele, tmp_path):
+    entries = [
+        {"id": "keep", "text": "the lantern by the river"},
+        {"id": "other", "text": "zzzz qqqq"},
+        {"messages": [{"text": "the lantern by the river"}]},
+    ]
+    raw = tmp_path / "conversations.json"
+    raw.write_text(json.dumps(entries), encoding="utf-8")
+
+    written, lost = sheele.stream_ingest(raw)
+    assert lost == []
+    record = json.loads(Path(written["keep"]).read_text(encoding="utf-8"))
+    assert record["messages"][-1] == {"text": "the lantern by the river"}
+
+
+def test_indexed_matching_agrees_with_exhaustive(sheele, tmp_path, monkeypatch):
+    rng = random.Random(5)
+    vocab = ["".join(rng.choices("etaoinshrdlu", k=rng.randint(2, 7))) for _ in range(300)]
+    threads = {f"c{i}": [{"text": " ".join(rng.choices(vocab, k=rng.randint(8, 40)))}] for i in range(60)}
+    threads["twin"] = copy.deepcopy(threads["c4"])  # ties go to the earlier thread
+    threads["empty"] = [{"text": ""}]
+    fractures = [{"messages": [{"text": threads[f"c{i}"][0]["text"][3:-3]}]} for i in range(0, 60, 4)]
+    fractures += [{"messages": [{"text": "zq"}]}, {"messages": []}, {"title": "no messages"},
+                  {"messages": [{"text": " ".join(rng.choices(vocab, k=20))}]}]
+
+    expected = sheele.try_assign_fractures(copy.deepcopy(fractures), copy.deepcopy(threads), exhaustive=True)
+    got = sheele.try_assign_fractures(copy.deepcopy(fractures), copy.deepcopy(threads), exhaustive=False)
+    assert got == expected
+    assert len(got[0]["c4"]) == 2 and len(got[0]["twin"]) == 1
+    assert 0 < len(got[1]) < len(fractures)
+
+    index = sheele.ShingleIndex()
+    for cid in threads:
+        index.add(sheele._messages_text(threads[cid]))
+    assert len(index.candidates(fractures[1]["messages"][0]["text"], k=3)) <= 3
+    assert index.candidates("") == [list(threads).index("empty")]
+
+    raw = tmp_path / "conversations.json"
+    raw.write_text(json.dumps([dict(m, id=cid) for cid, (m,) in threads.items()] + fractures), encoding="utf-8")
+    results = {}
+    for mode in ("exhaustive", "index"):
+        monkeypatch.setattr(sheele, "MATCH_MODE", mode)
+        monkeypatch.setattr(sheele, "MATCH_BLOCK_CHARS", 500)  # several index blocks
+        monkeypatch.setattr(sheele, "OUTPUT_DIR", str(tmp_path / mode))
+        _, lost = sheele.stream_ingest(raw)
+        results[mode] = (lost, _outputs(tmp_path / mode))
+    assert results["index"] == results["exhaustive"]
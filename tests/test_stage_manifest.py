@@ -0,0 +1,107 @@
+"""Incremental stage manifest shared by the Red Thread daemons."""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "shared" / "Daemon_tools" / "scripts"))
+
+from eden_manifest import StageManifest  # noqa: E402
+
+
+def _bump_mtime(path: Path) -> None:
+    os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+
+
+def _build(manifest: StageManifest, inputs, out_dir: Path):
+    rebuilt = []
+    for p in inputs:
+        if manifest.fresh(p):
+            continue
+        manifest.discard_outputs(p)
+        out = out_dir / f"{p.stem}.out"
+        out.write_text(p.read_text().upper())
+        manifest.record(p, [out])
+        rebuilt.append(p.name)
+    manifest.prune(inputs)
+    manifest.save()
+    return rebuilt
+
+
+def test_manifest_skips_unchanged_and_cleans_removed(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    src.mkdir(), out.mkdir()
+    inputs = [src / f"{n}.txt" for n in "abc"]
+    for p in inputs:
+        p.write_text(p.stem)
+
+    assert _build(StageManifest.for_dir(out, "t"), inputs, out) == ["a.txt", "b.txt", "c.txt"]
+
+    m = StageManifest.for_dir(out, "t")
+    assert _build(m, inputs, out) == []
+    assert m.stats["reused"] == 3
+
+    _bump_mtime(inputs[0])  # touched, same content
+    inputs[1].write_text("changed")
+    _bump_mtime(inputs[1])
+    inputs[2].unlink()
+    m = StageManifest.for_dir(out, "t")
+    assert _build(m, inputs[:2], out) == ["b.txt"]
+    assert m.stats == {"reused": 1, "rebuilt": 1, "removed": 1, "outputs_deleted": 2}
+    assert sorted(p.name for p in out.glob("*.out")) == ["a.out", "b.out"]
+    assert (out / "b.out").read_text() == "CHANGED"
+
+
+def test_manifest_rebuilds_on_version_force_or_missing_output(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    src.mkdir(), out.mkdir()
+    inputs = [src / f"{n}.txt" for n in "ab"]
+    for p in inputs:
+        p.write_text(p.stem)
+    _build(StageManifest.for_dir(out, "t", version="1"), inputs, out)
+
+    assert _build(StageManifest.for_dir(out, "t", version="2"), inputs, out) == ["a.txt", "b.txt"]
+    assert _build(StageManifest.for_dir(out, "t", version="2", force=True), inputs, out) == ["a.txt", "b.txt"]
+    (out / "a.out").unlink()
+    assert _build(StageManifest.for_dir(out, "t", version="2"), inputs, out) == ["a.txt"]
+
+
+def test_briar_and_janvier_rerun_incrementally(tmp_path, monkeypatch, capsys, load_daemon):
+    sheele_out, briar_out, janvier_out = tmp_path / "sheele", tmp_path / "briar", tmp_path / "janvier"
+    sheele_out.mkdir()
+    briar = load_daemon("daemons/Briar/briar.py", INPUT_DIR=sheele_out, OUTPUT_DIR=briar_out,
+                        QUARANTINE_DIR=briar_out / "_quarantine")
+    janvier = load_daemon("daemons/Janvier/janvier.py", INPUT_DIR=briar_out, OUTPUT_DIR=janvier_out)
+    monkeypatch.setattr(sys, "argv", ["briar"])
+
+    def convo(i, text):
+        turn = {"message": {"author": {"role": "user"}, "content": {"parts": [text]}}}
+        return {"title": f"Talk {i}", "create_time": 1700000000 + i, "messages": [{"mapping": {"0": turn}}]}
+
+    for i in range(4):
+        (sheele_out / f"c{i}.json").write_text(json.dumps(convo(i, f"hello {i}")), encoding="utf-8")
+
+    def run():
+        briar.main()
+        janvier.main([])
+        return sorted(p.name for p in briar_out.glob("*.txt")), sorted(p.name for p in janvier_out.glob("*.chaos"))
+
+    txt, chaos = run()
+    assert len(txt) == 4 and len(chaos) == 4
+    capsys.readouterr()
+
+    assert run() == (txt, chaos)
+    log = capsys.readouterr().out
+    assert "manifest: 4 reused, 0 rebuilt" in log and "Reading:" not in log
+
+    (sheele_out / "c1.json").write_text(json.dumps(convo(1, "edited")), encoding="utf-8")
+    _bump_mtime(sheele_out / "c1.json")
+    (sheele_out / "c3.json").unlink()
+    txt2, chaos2 = run()
+    assert len(txt2) == 3 and len(chaos2) == 3
+    log = capsys.readouterr().out
+    assert "[Briar] manifest: 2 reused, 1 rebuilt, 1 removed" in log
+    # Briar numbers its transcripts by position, so the edited one lands under a new name.
+    assert "[Janvier] manifest: 2 reused, 1 rebuilt, 2 removed" in log